@@ -16,29 +16,36 @@ from tools.python_runtime import ensure_desired_interpreter
 ensure_desired_interpreter(__file__)
 
 import argparse
+import array
 import ast
-import audioop
 import atexit
 import base64
 import builtins
+import codecs
 import copy
 import ctypes
 import configparser
 import contextlib
-import difflib
+import gzip
 import hashlib
+import heapq
 import importlib
 import importlib.util
 import io
 import json
+import locale
 import logging
 import math
+import multiprocessing
 import os
+import pickle
 import platform
 import queue
 import re
+import selectors
 import shlex
 import shutil
+import sqlite3
 import subprocess
 import sys
 import tempfile
@@ -47,9 +54,13 @@ import time
 import traceback
 import uuid
 import warnings
+import wave
 import zipfile
-from collections import Counter, defaultdict, deque
-from functools import lru_cache
+import zlib
+from collections import Counter, OrderedDict, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache, partial
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import UTC, datetime
@@ -60,6 +71,7 @@ from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
+    Collection,
     Deque,
     Dict,
     Iterable,
@@ -67,6 +79,7 @@ from typing import (
     List,
     Mapping,
     MutableMapping,
+    NoReturn,
     Optional,
     Protocol,
     Sequence,
@@ -356,6 +369,13 @@ _MODEL_TOKEN_LIMITS: Dict[str, int] = {
 _DEFAULT_MAX_TOKENS = 8192
 _WORD_RE = re.compile(r"\S+")
 
+TOKEN_CACHE_SIZE = 4096
+"""Distinct texts whose token counts are remembered (LRU, keyed by hash)."""
+
+_TOKEN_COUNT_CHUNK = 65_536
+_TOKEN_CACHE: "OrderedDict[Tuple[str, bytes], int]" = OrderedDict()
+_TOKEN_CACHE_LOCK = threading.Lock()
+
 
 @lru_cache(maxsize=32)
 def _encoding_for_model(model: Optional[str]) -> Any:
@@ -394,11 +414,34 @@ def prompt_token_budget(model: Optional[str], headroom_pct: int) -> int:
 
 
 def count_tokens(text: str, model: Optional[str] = None) -> int:
-    """Count tokens for *text* using an optional tokenizer fallback."""
+    """Count tokens for *text* using an optional tokenizer fallback.
+
+    Counts are memoised in a content-hash LRU per tokenizer, so conversation
+    lines and reference payloads are only tokenised once across sends.
+    """
 
     if not text:
         return 0
     encoding = _encoding_for_model(model)
+    digest = hashlib.blake2b(
+        text.encode("utf-8", "surrogatepass"), digest_size=16
+    ).digest()
+    name = str(getattr(encoding, "name", "")) if encoding is not None else ""
+    key = (name, digest)
+    with _TOKEN_CACHE_LOCK:
+        cached = _TOKEN_CACHE.get(key)
+        if cached is not None:
+            _TOKEN_CACHE.move_to_end(key)
+            return cached
+    count = _count_tokens_uncached(text, encoding)
+    with _TOKEN_CACHE_LOCK:
+        _TOKEN_CACHE[key] = count
+        while len(_TOKEN_CACHE) > TOKEN_CACHE_SIZE:
+            _TOKEN_CACHE.popitem(last=False)
+    return count
+
+
+def _count_tokens_uncached(text: str, encoding: Any) -> int:
     if encoding is not None:
         try:
             return len(encoding.encode(text))
@@ -407,8 +450,69 @@ def count_tokens(text: str, model: Optional[str] = None) -> int:
     tokens = _WORD_RE.findall(text)
     if tokens:
         return len(tokens)
+    # Fallback heuristic when whitespace tokenisation fails (e.g. CJK text).
     return max(1, math.ceil(len(text) / 4))
 
+
+def count_tokens_capped(text: str, cap: int, model: Optional[str] = None) -> int:
+    """Count tokens for *text*, stopping early once the total exceeds ``cap``.
+
+    Large texts are counted in line-aligned chunks, so a multi-megabyte
+    payload that cannot fit is rejected after tokenising only about ``cap``
+    tokens' worth of it.  Any result above ``cap`` is a lower bound.
+    """
+
+    if len(text) <= _TOKEN_COUNT_CHUNK:
+        return count_tokens(text, model)
+    total = 0
+    start = 0
+    while start < len(text):
+        end = min(len(text), start + _TOKEN_COUNT_CHUNK)
+        if end < len(text):
+            newline = text.rfind("\n", start, end)
+            if newline > start:
+                end = newline + 1
+        total += count_tokens(text[start:end], model)
+        if total > cap:
+            return total
+        start = end
+    return total
+
+
+def pack_by_priority(
+    candidates: Sequence[Tuple[str, str]],
+    budget: int,
+    model: Optional[str] = None,
+    *,
+    contiguous: Collection[str] = (),
+) -> Tuple[List[bool], int]:
+    """Greedily admit ``(group, text)`` candidates into ``budget`` by priority.
+
+    Each text is counted against the remaining budget only, so oversized
+    items stop tokenising early.  Groups named in ``contiguous`` admit no
+    further items after their first miss.  Returns one inclusion flag per
+    candidate and the tokens used.
+    """
+
+    remaining = max(0, int(budget))
+    closed: Set[str] = set()
+    flags: List[bool] = []
+    used = 0
+    for group, text in candidates:
+        if group in closed or (remaining <= 0 and text):
+            flags.append(False)
+            continue
+        tokens = count_tokens_capped(text, remaining, model)
+        if tokens <= remaining:
+            flags.append(True)
+            remaining -= tokens
+            used += tokens
+        else:
+            flags.append(False)
+            if group in contiguous:
+                closed.add(group)
+    return flags, used
+
 # ============================================================================
 # Safety Guardrails (Inlined from Dev_Logic/safety.py)
 # ============================================================================
@@ -1349,6 +1453,110 @@ def analyze_image(
     return VisionResult(summary=summary)
 
 
+OCR_MAX_WORKERS = max(1, min(4, os.cpu_count() or 1))
+"""Tesseract calls allowed in flight at once; each runs in its own subprocess."""
+
+VISION_MAX_CONCURRENCY = 2
+"""Vision-model requests allowed in flight at once, across all chat turns."""
+
+IMAGE_RESULT_CACHE_SIZE = 128
+"""OCR and vision results remembered by image content hash (LRU)."""
+
+_IMAGE_RESULT_CACHE: "OrderedDict[Tuple[str, ...], Any]" = OrderedDict()
+_IMAGE_RESULT_LOCK = threading.Lock()
+_VISION_SLOTS = threading.BoundedSemaphore(VISION_MAX_CONCURRENCY)
+_OCR_SLOTS = threading.BoundedSemaphore(OCR_MAX_WORKERS)
+
+
+def image_digest(image_path: Path | str) -> str:
+    """Return a content hash for *image_path*, or ``""`` when it is unreadable."""
+
+    digest = hashlib.blake2b(digest_size=20)
+    try:
+        with Path(image_path).open("rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b""):
+                digest.update(chunk)
+    except OSError:
+        return ""
+    return digest.hexdigest()
+
+
+def _cached_image_result(key: Tuple[str, ...]) -> Any:
+    with _IMAGE_RESULT_LOCK:
+        value = _IMAGE_RESULT_CACHE.get(key)
+        if value is not None:
+            _IMAGE_RESULT_CACHE.move_to_end(key)
+        return value
+
+
+def _remember_image_result(key: Tuple[str, ...], value: Any) -> None:
+    with _IMAGE_RESULT_LOCK:
+        _IMAGE_RESULT_CACHE[key] = value
+        _IMAGE_RESULT_CACHE.move_to_end(key)
+        while len(_IMAGE_RESULT_CACHE) > IMAGE_RESULT_CACHE_SIZE:
+            _IMAGE_RESULT_CACHE.popitem(last=False)
+
+
+def perform_ocr_cached(
+    image_path: Path | str,
+    *,
+    digest: Optional[str] = None,
+    engine: Optional[Any] = None,
+    language: str = "eng",
+) -> OCRResult:
+    """Run :func:`perform_ocr` under the shared Tesseract cap, caching by content.
+
+    Results from the default engine are keyed by the image's content hash and
+    language, so a re-sent screenshot skips Tesseract.  A custom *engine* is
+    never cached because its output need not match Tesseract's.
+    """
+
+    if engine is not None:
+        with _OCR_SLOTS:
+            return perform_ocr(image_path, engine=engine, language=language)
+    if digest is None:
+        digest = image_digest(image_path)
+    key = ("ocr", digest, language)
+    cached = _cached_image_result(key) if digest else None
+    if cached is not None:
+        return cached
+    with _OCR_SLOTS:
+        result = perform_ocr(image_path, language=language)
+    if result.ok and digest:
+        _remember_image_result(key, result)
+    return result
+
+
+def analyze_image_cached(
+    image_path: Path | str,
+    ocr_text: str,
+    *,
+    client: Optional[VisionClient],
+    model: str,
+    user_text: str = "",
+    digest: Optional[str] = None,
+) -> VisionResult:
+    """Run :func:`analyze_image` under the shared concurrency cap, caching by content.
+
+    The cache key covers the image hash, model, OCR text and user request, so
+    re-sending a screenshot with the same request skips the vision model.
+    """
+
+    if digest is None:
+        digest = image_digest(image_path)
+    key = ("vision", digest, model, ocr_text, user_text)
+    cached = _cached_image_result(key) if digest else None
+    if cached is not None:
+        return cached
+    with _VISION_SLOTS:
+        result = analyze_image(
+            image_path, ocr_text, client=client, model=model, user_text=user_text
+        )
+    if result.ok and digest:
+        _remember_image_result(key, result)
+    return result
+
+
 # ============================================================================
 # Repository Index (Inlined from Dev_Logic/memory_manager.py)
 # ============================================================================
@@ -1358,6 +1566,9 @@ DATASETS_ROOT = DEV_LOGIC_ROOT / "datasets"
 
 Vector = List[float]
 TextEmbedder = Callable[[str], Sequence[float]]
+TextBatchEmbedder = Callable[[Sequence[str]], Sequence[Sequence[float]]]
+
+_REPO_INDEX_LOGGER = logging.getLogger(f"{VD_LOGGER_NAME}.repo_index")
 
 _FALLBACK_EMBED_DIM = 16
 _REPO_DEFAULT_EXCLUDE = {
@@ -1371,6 +1582,10 @@ _REPO_DEFAULT_EXCLUDE = {
 _MAX_INDEX_FILE_SIZE = 256_000
 _WINDOW_SIZE = 60
 _WINDOW_OVERLAP = 10
+_FILE_MANIFEST_VERSION = 1
+_EMBEDDINGS_FILENAME = "embeddings.f32"
+_PARALLEL_MIN_FILES = 32
+_EMBED_BATCH_SIZE = 64
 
 
 def _hash_embedding(data: bytes, dims: int = _FALLBACK_EMBED_DIM) -> Vector:
@@ -1430,6 +1645,180 @@ def _cosine(a: Vector, b: Vector) -> float:
     return dot / (da * db)
 
 
+class _VectorMatrix:
+    """Contiguous float32 embedding matrix with precomputed row norms.
+
+    Rows are grouped by dimension so a query only scores against vectors of the
+    same width, mirroring ``_cosine`` which treats length mismatches as zero
+    similarity.  Without NumPy the same interface is served by plain lists.
+    """
+
+    __slots__ = ("size", "_groups")
+
+    def __init__(self, vectors: Sequence[Vector]) -> None:
+        self.size = len(vectors)
+        by_dim: Dict[int, List[int]] = {}
+        for row, vec in enumerate(vectors):
+            if vec:
+                by_dim.setdefault(len(vec), []).append(row)
+        self._groups: Dict[int, Tuple[Any, Any, Any]] = {}
+        for dim, rows in by_dim.items():
+            if np is not None:
+                matrix = np.asarray(
+                    [vectors[row] for row in rows], dtype=np.float32
+                )
+                norms = np.linalg.norm(matrix, axis=1)
+                self._groups[dim] = (
+                    np.asarray(rows, dtype=np.intp),
+                    matrix,
+                    norms,
+                )
+            else:
+                members = [vectors[row] for row in rows]
+                norms = [math.sqrt(sum(x * x for x in vec)) for vec in members]
+                self._groups[dim] = (rows, members, norms)
+
+    @classmethod
+    def from_packed(
+        cls, size: int, owners: Sequence[int], packed: Any, dim: int
+    ) -> "_VectorMatrix":
+        """Wrap a block from ``_pack_vectors``/``_read_vectors`` without copying."""
+
+        matrix = cls([])
+        matrix.size = size
+        if owners and dim:
+            if np is not None:
+                norms = np.linalg.norm(packed, axis=1)
+                matrix._groups[dim] = (
+                    np.asarray(owners, dtype=np.intp),
+                    packed,
+                    norms,
+                )
+            else:
+                members = _vector_rows(packed, dim)
+                norms = [math.sqrt(sum(x * x for x in vec)) for vec in members]
+                matrix._groups[dim] = (list(owners), members, norms)
+        return matrix
+
+    def scores(self, query_vec: Vector) -> Any:
+        """Return the cosine similarity of ``query_vec`` against every row."""
+
+        group = self._groups.get(len(query_vec)) if query_vec else None
+        if np is not None:
+            result = np.zeros(self.size, dtype=np.float32)
+            if group is None:
+                return result
+            rows, matrix, norms = group
+            query = np.asarray(query_vec, dtype=np.float32)
+            denom = norms * np.float32(np.linalg.norm(query))
+            valid = denom > 0
+            dots = matrix @ query
+            safe = np.where(valid, denom, 1.0)
+            result[rows] = np.where(valid, dots / safe, 0.0)
+            return result
+        result_list = [0.0] * self.size
+        if group is None:
+            return result_list
+        rows, members, norms = group
+        query_norm = math.sqrt(sum(x * x for x in query_vec))
+        if query_norm == 0:
+            return result_list
+        for row, vec, norm in zip(rows, members, norms):
+            if norm == 0:
+                continue
+            dot = sum(x * y for x, y in zip(query_vec, vec))
+            result_list[row] = dot / (norm * query_norm)
+        return result_list
+
+
+def _dominant_width(vectors: Iterable[Sequence[float]]) -> int:
+    """Return the most common non-zero width among ``vectors`` (0 when none)."""
+
+    counts = Counter(len(vec) for vec in vectors if len(vec))
+    return counts.most_common(1)[0][0] if counts else 0
+
+
+def _pack_vectors(
+    vectors: Sequence[Sequence[float]], dim: int
+) -> Tuple[Any, List[int]]:
+    """Pack every ``dim``-wide vector into one float32 block.
+
+    Returns the block (``(n, dim)`` NumPy array, or flat ``array('f')``) and the
+    input positions that were kept; vectors of any other width are skipped.
+    """
+
+    owners = [
+        index for index, vec in enumerate(vectors) if dim and len(vec) == dim
+    ]
+    if np is not None:
+        packed = np.empty((len(owners), dim), dtype=np.float32)
+        for row, index in enumerate(owners):
+            packed[row] = vectors[index]
+        return packed, owners
+    flat = array.array("f")
+    for index in owners:
+        flat.extend(vectors[index])
+    return flat, owners
+
+
+def _vector_rows(packed: Any, dim: int) -> List[Sequence[float]]:
+    if not dim:
+        return []
+    if np is not None:
+        return list(packed)
+    view = memoryview(packed)
+    return [view[start : start + dim] for start in range(0, len(packed), dim)]
+
+
+def _write_vectors(path: Path, packed: Any) -> None:
+    with path.open("wb") as handle:
+        if np is not None:
+            np.ascontiguousarray(packed, dtype="<f4").tofile(handle)
+            return
+        data = packed
+        if sys.byteorder != "little":
+            data = array.array("f", packed)
+            data.byteswap()
+        handle.write(data.tobytes())
+
+
+def _read_vectors(path: Path, dim: int, rows: int) -> Optional[Any]:
+    if not dim or rows <= 0:
+        return None
+    try:
+        if np is not None:
+            data = np.fromfile(path, dtype="<f4")
+        else:
+            data = array.array("f")
+            data.frombytes(path.read_bytes())
+            if sys.byteorder != "little":
+                data.byteswap()
+    except (OSError, ValueError):
+        return None
+    if len(data) != rows * dim:
+        return None
+    if np is not None:
+        return data.reshape(rows, dim).astype(np.float32, copy=False)
+    return data
+
+
+def _top_k(scores: Any, k: int) -> List[Tuple[int, float]]:
+    """Return ``(row, score)`` pairs for the ``k`` best positive scores."""
+
+    if k <= 0:
+        return []
+    if np is not None:
+        positive = np.flatnonzero(scores > 0)
+        if positive.size > k:
+            best = np.argpartition(scores[positive], -k)[-k:]
+            positive = np.sort(positive[best])
+        order = positive[np.argsort(-scores[positive], kind="stable")]
+        return [(int(row), float(scores[row])) for row in order]
+    candidates = ((score, row) for row, score in enumerate(scores) if score > 0)
+    best = heapq.nlargest(k, candidates, key=lambda item: item[0])
+    return [(row, score) for score, row in best]
+
+
 @dataclass(slots=True)
 class _RepoSegment:
     path: Path
@@ -1446,12 +1835,12 @@ class _RepoIndexRecord:
     start_line: int
     end_line: int
     text: str
-    embedding: Vector
+    embedding: Sequence[float]
     metadata: Dict[str, Any]
     timestamp: float
 
     def score(self, query_vec: Vector) -> float:
-        if not self.embedding or not query_vec:
+        if not len(self.embedding) or not query_vec:
             return 0.0
         return _cosine(query_vec, self.embedding)
 
@@ -1461,6 +1850,91 @@ def _segment_identifier(path: str, start_line: int, end_line: int) -> str:
     return hashlib.blake2b(payload, digest_size=16).hexdigest()
 
 
+@dataclass(slots=True)
+class _RepoFileState:
+    """Per-file fingerprint used to skip unchanged files during rebuilds."""
+
+    size: int
+    mtime_ns: int
+    digest: str
+    indexed: bool
+    embedded: bool
+    segments: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "mtime_ns": self.mtime_ns,
+            "blake2b": self.digest,
+            "indexed": self.indexed,
+            "embedded": self.embedded,
+            "segments": self.segments,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Mapping[str, Any]) -> Optional["_RepoFileState"]:
+        try:
+            return cls(
+                size=int(payload["size"]),
+                mtime_ns=int(payload["mtime_ns"]),
+                digest=str(payload.get("blake2b") or ""),
+                indexed=bool(payload.get("indexed", True)),
+                embedded=bool(payload.get("embedded", False)),
+                segments=int(payload.get("segments") or 0),
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+
+def _file_key(base_root: Path | str, rel_path: str) -> str:
+    return (Path(base_root) / rel_path).as_posix()
+
+
+def _decode_text(data: Optional[bytes]) -> Optional[str]:
+    if data is None:
+        return None
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+
+
+def _forked_workers() -> bool:
+    """Return ``True`` when pool workers fork rather than re-import ACAGi.
+
+    Spawned workers re-run this module's top level (settings, memory files,
+    interpreter checks), so repository scans stay serial on those platforms.
+    """
+
+    method = multiprocessing.get_start_method(allow_none=True)
+    return (method or multiprocessing.get_all_start_methods()[0]) == "fork"
+
+
+def _scan_in_worker(
+    index_cls: type, path: str, size: int, known_digest: str
+) -> Tuple[str, bool, Optional[List["_RepoSegment"]]]:
+    """Process-pool entry point mirroring ``RepositoryIndex._scan_file``.
+
+    Segmentation helpers only depend on their arguments, so a bare instance
+    (no roots, lock or cache) is enough inside the worker process.
+    """
+
+    return index_cls.__new__(index_cls)._scan_file(Path(path), size, known_digest)
+
+
+def _record_entry(record: _RepoIndexRecord, row: int) -> Dict[str, Any]:
+    return {
+        "id": record.identifier,
+        "path": record.path,
+        "start_line": record.start_line,
+        "end_line": record.end_line,
+        "text": record.text,
+        "row": row,
+        "metadata": record.metadata,
+        "ts": record.timestamp,
+    }
+
+
 class RepositoryIndex:
     """Build and query a lightweight repository text index."""
 
@@ -1470,10 +1944,12 @@ class RepositoryIndex:
         data_root: Optional[Path | str] = None,
         *,
         text_embedder: Optional[TextEmbedder] = None,
+        text_batch_embedder: Optional[TextBatchEmbedder] = None,
         enable_embeddings: bool = True,
         include_extensions: Optional[Sequence[str]] = None,
         exclude_dirs: Optional[Sequence[str]] = None,
         extra_roots: Optional[Sequence[Path | str]] = None,
+        workers: int = 1,
     ) -> None:
         base_repo = (
             Path(repo_root)
@@ -1490,8 +1966,12 @@ class RepositoryIndex:
         self.index_dir = self.data_root / "repo_index"
         self.index_path = self.index_dir / "index.jsonl"
         self.manifest_path = self.index_dir / "manifest.json"
+        self.files_manifest_path = self.index_dir / "files.json"
+        self.embeddings_path = self.index_dir / _EMBEDDINGS_FILENAME
         self.enable_embeddings = enable_embeddings
         self._text_embedder = text_embedder or _fallback_repo_embedding
+        self._batch_embedder = text_batch_embedder
+        self.workers = workers
         self._include_extensions = (
             tuple(include_extensions) if include_extensions else None
         )
@@ -1513,83 +1993,204 @@ class RepositoryIndex:
         self._extra_roots: Tuple[Path, ...] = tuple(extras)
         self._roots: Tuple[Path, ...] = (self.repo_root, *self._extra_roots)
         self._records: List[_RepoIndexRecord] = []
+        self._matrix: Optional[_VectorMatrix] = None
+        self._packed: Any = None
+        self._packed_owners: List[int] = []
+        self._embed_dim = 0
+        self._embeddings_intact = True
         self._loaded = False
         self._lock = RLock()
 
-    def rebuild(self) -> Dict[str, Any]:
-        segments: List[Tuple[Path, _RepoSegment]] = []
-        files_indexed = 0
+    def rebuild(
+        self, *, incremental: bool = True, workers: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Rebuild the index, re-embedding only files that changed.
+
+        A per-file manifest (size, mtime, BLAKE2b digest) is kept beside
+        ``manifest.json``.  Unchanged files reuse their cached segments and
+        embeddings, deleted files drop out, and ``incremental=False`` forces a
+        full rebuild.  ``workers`` (defaulting to the constructor value) fans
+        reading and segmentation out to a process pool and embeds in batches;
+        records are still written in walk order.
+        """
+
         timestamp = time.time()
+        worker_count = self._resolve_workers(workers)
+        previous_files: Dict[str, _RepoFileState] = {}
+        previous_records: Dict[str, List[_RepoIndexRecord]] = {}
+        if incremental:
+            self.load()
+            if self._embeddings_intact:
+                previous_files = self._load_file_manifest()
+            if previous_files:
+                with self._lock:
+                    for record in self._records:
+                        key = self._record_file_key(record)
+                        previous_records.setdefault(key, []).append(record)
+
+        # Pass 1: walk and stat; size+mtime matches are reused outright.
+        slots: List[List[_RepoIndexRecord]] = []
+        pending: List[
+            Tuple[int, Path, Path, str, os.stat_result, Optional[_RepoFileState]]
+        ] = []
+        file_states: Dict[str, _RepoFileState] = {}
+        files_indexed = 0
+        files_changed = 0
+        files_reused = 0
 
         for base_root, path in self._iter_repo_files():
-            text = self._read_file_text(path)
-            if text is None:
+            rel_path = self._relative_path(path, base_root)
+            key = _file_key(base_root, rel_path)
+            try:
+                stat = path.stat()
+            except OSError:
                 continue
-            files_indexed += 1
-            for segment in self._segment_file(path, text):
-                segments.append((base_root, segment))
-
-        entries = []
-        for base_root, segment in segments:
-            rel_path = self._relative_path(segment.path, base_root)
-            embedding: Vector = []
-            if self.enable_embeddings and segment.text.strip():
-                embedding = self._embed_text(segment.text)
-            record_id = _segment_identifier(
-                rel_path, segment.start_line, segment.end_line
+            previous = previous_files.get(key)
+            reused: Optional[List[_RepoIndexRecord]] = None
+            if (
+                previous is not None
+                and previous.embedded == self.enable_embeddings
+            ):
+                reused = self._reuse_file_records(
+                    previous, previous_records.get(key)
+                )
+            if (
+                reused is not None
+                and previous is not None
+                and previous.size == stat.st_size
+                and previous.mtime_ns == stat.st_mtime_ns
+            ):
+                file_states[key] = previous
+                slots.append(reused)
+                files_reused += 1
+                if previous.indexed:
+                    files_indexed += 1
+                continue
+            slots.append([])
+            pending.append(
+                (
+                    len(slots) - 1,
+                    base_root,
+                    path,
+                    key,
+                    stat,
+                    previous if reused is not None else None,
+                )
             )
-            metadata = dict(segment.metadata)
-            metadata.setdefault("scan_root", str(base_root))
-            entry = {
-                "id": record_id,
-                "path": rel_path,
-                "start_line": segment.start_line,
-                "end_line": segment.end_line,
-                "text": segment.text,
-                "embedding": embedding,
-                "metadata": metadata,
-                "ts": timestamp,
-            }
-            entries.append(entry)
 
-        self.index_dir.mkdir(parents=True, exist_ok=True)
-        tmp_path = self._write_index(entries)
-        tmp_path.replace(self.index_path)
+        # Pass 2: read, hash and segment the queued files.
+        scans = self._scan_files(
+            [
+                (path, stat.st_size, previous.digest if previous else "")
+                for _, _, path, _, stat, previous in pending
+            ],
+            worker_count,
+        )
+        new_segments: List[Tuple[int, Path, _RepoSegment]] = []
+        for job, scan in zip(pending, scans):
+            slot, base_root, path, key, stat, previous = job
+            digest, indexed, segments = scan
+            if segments is None and previous is not None:
+                previous.size = stat.st_size
+                previous.mtime_ns = stat.st_mtime_ns
+                file_states[key] = previous
+                slots[slot] = previous_records.get(key) or []
+                files_reused += 1
+                if previous.indexed:
+                    files_indexed += 1
+                continue
+            segments = segments or []
+            files_changed += 1
+            if indexed:
+                files_indexed += 1
+            new_segments.extend((slot, base_root, segment) for segment in segments)
+            file_states[key] = _RepoFileState(
+                size=stat.st_size,
+                mtime_ns=stat.st_mtime_ns,
+                digest=digest,
+                indexed=indexed,
+                embedded=self.enable_embeddings,
+                segments=len(segments),
+            )
+
+        # Pass 3: embed the new segments, then stitch records back in order.
+        embeddings: List[Vector] = [[] for _ in new_segments]
+        if self.enable_embeddings:
+            embeddings = self._embed_many(
+                [segment.text for _, _, segment in new_segments], worker_count
+            )
+        for (slot, base_root, segment), embedding in zip(new_segments, embeddings):
+            slots[slot].append(
+                self._make_record(base_root, segment, embedding, timestamp)
+            )
+        records: List[_RepoIndexRecord] = [
+            record for slot in slots for record in slot
+        ]
+
+        files_removed = len(set(previous_files) - set(file_states))
+        unchanged = (
+            bool(previous_files) and not files_changed and not files_removed
+        )
 
-        embed_dim = 0
-        if entries and entries[0]["embedding"]:
-            embed_dim = len(entries[0]["embedding"])
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        if unchanged and self.index_path.exists():
+            packed = self._packed
+            owners = self._packed_owners
+            embed_dim = self._embed_dim
+        else:
+            # Prefer the width the embedder produces now, so stale reused
+            # vectors are the ones flagged for re-embedding.
+            embed_dim = _dominant_width(embeddings) or _dominant_width(
+                record.embedding for record in records
+            )
+            packed, owners = _pack_vectors(
+                [record.embedding for record in records], embed_dim
+            )
+            rows = [-1] * len(records)
+            for row, index in enumerate(owners):
+                rows[index] = row
+            self._flag_dropped_embeddings(records, rows, embed_dim, file_states)
+            tmp_vectors = self.embeddings_path.with_suffix(".tmp")
+            _write_vectors(tmp_vectors, packed)
+            tmp_vectors.replace(self.embeddings_path)
+            tmp_path = self._write_index(
+                [_record_entry(record, row) for record, row in zip(records, rows)]
+            )
+            tmp_path.replace(self.index_path)
+            # Re-point records at the new block so the previous one is freed.
+            views = _vector_rows(packed, embed_dim)
+            for record, row in zip(records, rows):
+                record.embedding = views[row] if row >= 0 else []
 
         manifest = {
             "timestamp": timestamp,
-            "segments": len(entries),
+            "segments": len(records),
             "files_indexed": files_indexed,
+            "files_changed": files_changed,
+            "files_removed": files_removed,
             "embedding_dim": embed_dim,
+            "embedding_rows": len(owners),
+            "embeddings_file": _EMBEDDINGS_FILENAME,
         }
         with self.manifest_path.open("w", encoding="utf-8") as handle:
             json.dump(manifest, handle, ensure_ascii=False, indent=2)
-
-        records = [
-            _RepoIndexRecord(
-                identifier=entry["id"],
-                path=str(entry["path"]),
-                start_line=int(entry["start_line"]),
-                end_line=int(entry["end_line"]),
-                text=str(entry["text"]),
-                embedding=_ensure_vector(entry.get("embedding")),
-                metadata=dict(entry.get("metadata") or {}),
-                timestamp=float(entry.get("ts") or timestamp),
-            )
-            for entry in entries
-        ]
+        self._write_file_manifest(file_states)
 
         with self._lock:
             self._records = records
+            self._matrix = None
+            self._packed = packed
+            self._packed_owners = owners
+            self._embed_dim = embed_dim
+            self._embeddings_intact = True
             self._loaded = True
 
         return {
             "files_indexed": files_indexed,
-            "segments": len(entries),
+            "files_changed": files_changed,
+            "files_reused": files_reused,
+            "files_removed": files_removed,
+            "segments": len(records),
             "timestamp": timestamp,
             "index_path": self.index_path,
         }
@@ -1626,19 +2227,20 @@ class RepositoryIndex:
         self.load()
 
         with self._lock:
-            records = list(self._records)
-
-        scored: List[Tuple[float, _RepoIndexRecord]] = []
-        for record in records:
-            score = record.score(query_vec)
-            if score <= 0:
-                continue
-            scored.append((score, record))
-
-        scored.sort(key=lambda item: item[0], reverse=True)
+            records = self._records
+            matrix = self._matrix
+            if matrix is None:
+                matrix = _VectorMatrix.from_packed(
+                    len(records),
+                    self._packed_owners,
+                    self._packed,
+                    self._embed_dim,
+                )
+                self._matrix = matrix
 
         results: List[Dict[str, Any]] = []
-        for score, record in scored[:k]:
+        for row, score in _top_k(matrix.scores(query_vec), k):
+            record = records[row]
             results.append(
                 {
                     "id": record.identifier,
@@ -1692,17 +2294,210 @@ class RepositoryIndex:
 
     def _read_file_text(self, path: Path) -> Optional[str]:
         try:
-            if path.stat().st_size > _MAX_INDEX_FILE_SIZE:
-                return None
+            size = path.stat().st_size
         except OSError:
             return None
-        try:
-            return path.read_text(encoding="utf-8")
-        except UnicodeDecodeError:
+        return _decode_text(self._read_file_bytes(path, size))
+
+    def _read_file_bytes(self, path: Path, size: int) -> Optional[bytes]:
+        if size > _MAX_INDEX_FILE_SIZE:
             return None
+        try:
+            return path.read_bytes()
         except OSError:
             return None
 
+    def _resolve_workers(self, workers: Optional[int]) -> int:
+        count = self.workers if workers is None else workers
+        if count <= 0:
+            return os.cpu_count() or 1
+        return count
+
+    def _scan_file(
+        self, path: Path, size: int, known_digest: str = ""
+    ) -> Tuple[str, bool, Optional[List[_RepoSegment]]]:
+        """Return ``(digest, indexed, segments)`` for ``path``.
+
+        ``segments`` is ``None`` when the digest equals ``known_digest`` and
+        parsing was skipped.
+        """
+
+        data = self._read_file_bytes(path, size)
+        digest = hashlib.blake2b(data).hexdigest() if data is not None else ""
+        if known_digest and digest == known_digest:
+            return digest, True, None
+        text = _decode_text(data)
+        if text is None:
+            return digest, False, []
+        return digest, True, self._segment_file(path, text)
+
+    def _scan_files(
+        self, jobs: Sequence[Tuple[Path, int, str]], workers: int
+    ) -> List[Tuple[str, bool, Optional[List[_RepoSegment]]]]:
+        if (
+            workers > 1
+            and len(jobs) >= _PARALLEL_MIN_FILES
+            and _forked_workers()
+        ):
+            chunksize = max(1, len(jobs) // (workers * 4))
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    return list(
+                        pool.map(
+                            _scan_in_worker,
+                            [type(self)] * len(jobs),
+                            [path.as_posix() for path, _, _ in jobs],
+                            [size for _, size, _ in jobs],
+                            [digest for _, _, digest in jobs],
+                            chunksize=chunksize,
+                        )
+                    )
+            except (OSError, BrokenProcessPool, pickle.PicklingError) as exc:
+                _REPO_INDEX_LOGGER.warning(
+                    "Parallel repository scan failed, continuing serially: %s",
+                    exc,
+                )
+        return [self._scan_file(path, size, digest) for path, size, digest in jobs]
+
+    def _embed_many(self, texts: Sequence[str], workers: int) -> List[Vector]:
+        # Whitespace-only segments keep an empty embedding, as they always have.
+        vectors: List[Vector] = [[] for _ in texts]
+        live = [index for index, text in enumerate(texts) if text.strip()]
+        if not live:
+            return vectors
+        embedded = self._embed_texts([texts[index] for index in live], workers)
+        for index, vector in zip(live, embedded):
+            vectors[index] = vector
+        return vectors
+
+    def _embed_texts(self, texts: Sequence[str], workers: int) -> List[Vector]:
+        if self._batch_embedder is not None:
+            vectors: List[Vector] = []
+            for start in range(0, len(texts), _EMBED_BATCH_SIZE):
+                batch = list(texts[start : start + _EMBED_BATCH_SIZE])
+                result = list(self._batch_embedder(batch))
+                if len(result) != len(batch):
+                    raise ValueError(
+                        f"Batch embedder returned {len(result)} vectors "
+                        f"for {len(batch)} texts"
+                    )
+                vectors.extend([float(value) for value in vec] for vec in result)
+            return vectors
+        if workers > 1 and len(texts) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(self._embed_text, texts))
+        return [self._embed_text(text) for text in texts]
+
+    def _make_record(
+        self,
+        base_root: Path,
+        segment: _RepoSegment,
+        embedding: Vector,
+        timestamp: float,
+    ) -> _RepoIndexRecord:
+        rel_path = self._relative_path(segment.path, base_root)
+        metadata = dict(segment.metadata)
+        metadata.setdefault("scan_root", str(base_root))
+        return _RepoIndexRecord(
+            identifier=_segment_identifier(
+                rel_path, segment.start_line, segment.end_line
+            ),
+            path=rel_path,
+            start_line=segment.start_line,
+            end_line=segment.end_line,
+            text=segment.text,
+            embedding=embedding,
+            metadata=metadata,
+            timestamp=timestamp,
+        )
+
+    def _record_file_key(self, record: _RepoIndexRecord) -> str:
+        scan_root = record.metadata.get("scan_root") or str(self.repo_root)
+        return _file_key(scan_root, record.path)
+
+    def _flag_dropped_embeddings(
+        self,
+        records: Sequence[_RepoIndexRecord],
+        rows: Sequence[int],
+        embed_dim: int,
+        file_states: Mapping[str, _RepoFileState],
+    ) -> None:
+        """Mark files whose vectors did not fit ``embed_dim`` for re-embedding.
+
+        Mixed widths happen when the hashed fallback and a real embedder both
+        contributed to one build; the odd ones out cannot share the block, so
+        their files are recorded as unembedded and redone on the next build.
+        """
+
+        dropped = [
+            index
+            for index, record in enumerate(records)
+            if len(record.embedding) and rows[index] < 0
+        ]
+        if not dropped:
+            return
+        keys = {self._record_file_key(records[index]) for index in dropped}
+        _REPO_INDEX_LOGGER.warning(
+            "Dropped %d repository embeddings not %d wide; re-embedding %d file(s) "
+            "on the next build",
+            len(dropped),
+            embed_dim,
+            len(keys),
+        )
+        for key in keys:
+            state = file_states.get(key)
+            if state is not None:
+                state.embedded = False
+
+    def _reuse_file_records(
+        self,
+        state: _RepoFileState,
+        previous: Optional[List[_RepoIndexRecord]],
+    ) -> Optional[List[_RepoIndexRecord]]:
+        cached = previous or []
+        if len(cached) != state.segments:
+            return None
+        return cached
+
+    def _load_file_manifest(self) -> Dict[str, _RepoFileState]:
+        if not self.files_manifest_path.exists() or not self.index_path.exists():
+            return {}
+        try:
+            with self.files_manifest_path.open("r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        if (
+            not isinstance(payload, Mapping)
+            or payload.get("version") != _FILE_MANIFEST_VERSION
+        ):
+            return {}
+        files = payload.get("files")
+        if not isinstance(files, Mapping):
+            return {}
+        states: Dict[str, _RepoFileState] = {}
+        for key, entry in files.items():
+            if not isinstance(entry, Mapping):
+                continue
+            state = _RepoFileState.from_dict(entry)
+            if state is not None:
+                states[str(key)] = state
+        return states
+
+    def _write_file_manifest(self, states: Mapping[str, _RepoFileState]) -> None:
+        payload = {
+            "version": _FILE_MANIFEST_VERSION,
+            "files": {key: state.to_dict() for key, state in states.items()},
+        }
+        tmp_file = tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", delete=False, dir=self.index_dir
+        )
+        try:
+            json.dump(payload, tmp_file, ensure_ascii=False)
+        finally:
+            tmp_file.close()
+        Path(tmp_file.name).replace(self.files_manifest_path)
+
     def _segment_file(self, path: Path, text: str) -> List[_RepoSegment]:
         suffix = path.suffix.lower()
         lines = text.splitlines()
@@ -1902,12 +2697,42 @@ class RepositoryIndex:
             tmp_file.close()
         return Path(tmp_file.name)
 
+    def _read_manifest(self) -> Dict[str, Any]:
+        try:
+            with self.manifest_path.open("r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        return payload if isinstance(payload, dict) else {}
+
     def _load_locked(self) -> None:
+        """Load slim JSONL metadata plus the float32 embedding sidecar.
+
+        Entries written before the sidecar existed carry an inline
+        ``embedding`` list; those are still honoured and get packed on load.
+        """
+
         records: List[_RepoIndexRecord] = []
+        self._matrix = None
+        self._packed = None
+        self._packed_owners = []
+        self._embed_dim = 0
+        self._embeddings_intact = True
         if not self.index_path.exists():
             self._records = []
             self._loaded = True
             return
+
+        manifest = self._read_manifest()
+        dim = int(manifest.get("embedding_dim") or 0)
+        stored = _read_vectors(
+            self.embeddings_path, dim, int(manifest.get("embedding_rows") or 0)
+        )
+        stored_rows = _vector_rows(stored, dim) if stored is not None else []
+
+        vectors: List[Sequence[float]] = []
+        embedded = 0
+        in_order = True
         with self.index_path.open("r", encoding="utf-8") as handle:
             for line in handle:
                 payload = line.strip()
@@ -1917,17 +2742,50 @@ class RepositoryIndex:
                     entry = json.loads(payload)
                 except json.JSONDecodeError:
                     continue
+                embedding: Sequence[float] = []
+                row = entry.get("row")
+                if isinstance(row, int) and row >= 0:
+                    if row < len(stored_rows):
+                        embedding = stored_rows[row]
+                        in_order = in_order and row == embedded
+                        embedded += 1
+                    else:
+                        self._embeddings_intact = False
+                elif "embedding" in entry:
+                    embedding = _ensure_vector(entry.get("embedding"))
+                    in_order = False
                 record = _RepoIndexRecord(
                     identifier=str(entry.get("id") or ""),
                     path=str(entry.get("path") or ""),
                     start_line=int(entry.get("start_line") or 1),
                     end_line=int(entry.get("end_line") or 1),
                     text=str(entry.get("text") or ""),
-                    embedding=_ensure_vector(entry.get("embedding")),
+                    embedding=embedding,
                     metadata=dict(entry.get("metadata") or {}),
                     timestamp=float(entry.get("ts") or 0.0),
                 )
                 records.append(record)
+                vectors.append(embedding)
+
+        if in_order and stored is not None and embedded == len(stored_rows):
+            self._packed = stored
+            self._packed_owners = [
+                index for index, vec in enumerate(vectors) if len(vec)
+            ]
+            self._embed_dim = dim
+        else:
+            dim = next((len(vec) for vec in vectors if len(vec)), 0)
+            self._packed, self._packed_owners = _pack_vectors(vectors, dim)
+            self._embed_dim = dim
+            dropped = sum(1 for vec in vectors if len(vec)) - len(self._packed_owners)
+            if dropped:
+                _REPO_INDEX_LOGGER.warning(
+                    "Ignoring %d stored repository embeddings not %d wide; "
+                    "the next build re-embeds every file",
+                    dropped,
+                    dim,
+                )
+                self._embeddings_intact = False
         self._records = records
         self._loaded = True
 
@@ -2452,10 +3310,12 @@ DEFAULT_RUNTIME_CONFIG = {
     "ui": {
         "status_variant": "detailed",
         "status_refresh_seconds": "15",
+        "bus_telemetry": "false",
     },
     "mode": {
         "offline": "false",
         "sandbox": "restricted",
+        "git_diff_session": "off",
     },
     "limits": {
         "share_limit": "5",
@@ -2480,9 +3340,11 @@ class RuntimeSettings:
         ``[ui]``
             ``status_variant`` – ``minimal`` or ``detailed`` controls the status bar text.
             ``status_refresh_seconds`` – poll cadence for UI refresh helpers.
+            ``bus_telemetry`` – collect event-bus rates/latencies on ``system.bus``.
         ``[mode]``
             ``offline`` – boolean toggle gating remote integrations and telemetry.
             ``sandbox`` – sandbox profile (``isolated``, ``restricted``, ``trusted``).
+            ``git_diff_session`` – ``off``, ``batch``, or ``fsmonitor`` diff capture.
         ``[limits]``
             ``share_limit`` – default context-sharing cap for reference sharing widgets.
             ``event_rate_per_minute`` – soft cap for remote event fan-out.
@@ -2496,8 +3358,10 @@ class RuntimeSettings:
 
     status_variant: str = "detailed"
     status_refresh_seconds: int = 15
+    bus_telemetry: bool = False
     offline: bool = False
     sandbox: str = "restricted"
+    git_diff_session: str = "off"
     share_limit: int = 5
     event_rate_per_minute: int = 120
     sentinel_policy: str = "strict"
@@ -2680,6 +3544,7 @@ DEFAULT_POLICY_BUNDLE: Mapping[str, Any] = {
             ),
             "limits": {
                 "max_duration_seconds": 900,
+                "max_output_bytes": 4 * 1024 * 1024,
                 "max_parallel_tasks": 2,
                 "network": "deny",
                 "network_blocklist": list(DEFAULT_POLICY_NETWORK_BLOCKLIST),
@@ -2707,6 +3572,7 @@ DEFAULT_POLICY_BUNDLE: Mapping[str, Any] = {
             "notes": "Tests should stay non-destructive; blocked commands remain explicit.",
             "limits": {
                 "max_duration_seconds": 1800,
+                "max_output_bytes": 16 * 1024 * 1024,
                 "max_parallel_tasks": 3,
                 "network": "deny",
                 "network_blocklist": list(DEFAULT_POLICY_NETWORK_BLOCKLIST),
@@ -2720,6 +3586,7 @@ DEFAULT_POLICY_BUNDLE: Mapping[str, Any] = {
             "notes": "Command palette macros publish through the event bus with sentinel oversight.",
             "limits": {
                 "max_duration_seconds": 120,
+                "max_output_bytes": 1024 * 1024,
                 "max_parallel_tasks": 1,
                 "network": "deny",
                 "network_blocklist": list(DEFAULT_POLICY_NETWORK_BLOCKLIST),
@@ -2744,6 +3611,7 @@ class OperationPolicy:
     max_parallel_tasks: Optional[int] = None
     network_mode: str = "allow"
     network_blocklist: frozenset[str] = field(default_factory=frozenset)
+    max_output_bytes: Optional[int] = None
 
     @classmethod
     def from_mapping(cls, name: str, payload: Mapping[str, Any]) -> "OperationPolicy":
@@ -2771,6 +3639,7 @@ class OperationPolicy:
         limits_payload = payload.get("limits") if isinstance(payload, Mapping) else None
         max_duration = None
         max_parallel = None
+        max_output = None
         network_mode = "allow"
         network_blocklist = frozenset(DEFAULT_POLICY_NETWORK_BLOCKLIST)
         if isinstance(limits_payload, Mapping):
@@ -2780,6 +3649,7 @@ class OperationPolicy:
             max_parallel = _coerce_positive_int(
                 limits_payload.get("max_parallel_tasks")
             )
+            max_output = _coerce_positive_int(limits_payload.get("max_output_bytes"))
             network_raw = str(limits_payload.get("network", "allow")).strip().lower()
             if network_raw in {"deny", "blocked", "ban"}:
                 network_mode = "deny"
@@ -2803,6 +3673,7 @@ class OperationPolicy:
             max_parallel_tasks=max_parallel,
             network_mode=network_mode,
             network_blocklist=network_blocklist,
+            max_output_bytes=max_output,
         )
 
     # ------------------------------------------------------------------
@@ -2823,6 +3694,8 @@ class OperationPolicy:
             limits["max_duration_seconds"] = int(self.max_duration_seconds)
         if self.max_parallel_tasks is not None:
             limits["max_parallel_tasks"] = int(self.max_parallel_tasks)
+        if self.max_output_bytes is not None:
+            limits["max_output_bytes"] = int(self.max_output_bytes)
         limits["network"] = self.network_mode
         limits["network_blocklist"] = sorted(self.network_blocklist)
         payload["limits"] = limits
@@ -2971,8 +3844,10 @@ class SettingsLoader:
         payload.read_dict(DEFAULT_RUNTIME_CONFIG)
         payload["ui"]["status_variant"] = settings.status_variant
         payload["ui"]["status_refresh_seconds"] = str(settings.status_refresh_seconds)
+        payload["ui"]["bus_telemetry"] = str(settings.bus_telemetry).lower()
         payload["mode"]["offline"] = str(settings.offline).lower()
         payload["mode"]["sandbox"] = settings.sandbox
+        payload["mode"]["git_diff_session"] = settings.git_diff_session
         payload["limits"]["share_limit"] = str(settings.share_limit)
         payload["limits"]["event_rate_per_minute"] = str(settings.event_rate_per_minute)
         payload["policy"]["sentinel"] = settings.sentinel_policy
@@ -3046,14 +3921,20 @@ class SettingsLoader:
         if sentinel_policy not in {"strict", "monitor"}:
             sentinel_policy = "strict"
 
+        git_diff_session = get("mode", "git_diff_session", "off").strip().lower()
+        if git_diff_session not in {"off", "batch", "fsmonitor"}:
+            git_diff_session = "off"
+
         remote_event_bus = get("remote", "event_bus", "").strip()
         remote_sentinel = get("remote", "sentinel", "").strip()
 
         return RuntimeSettings(
             status_variant=status_variant,
             status_refresh_seconds=max(1, get_int("ui", "status_refresh_seconds", 15)),
+            bus_telemetry=get_bool("ui", "bus_telemetry", False),
             offline=get_bool("mode", "offline", False),
             sandbox=sandbox,
+            git_diff_session=git_diff_session,
             share_limit=max(1, get_int("limits", "share_limit", 5)),
             event_rate_per_minute=max(1, get_int("limits", "event_rate_per_minute", 120)),
             sentinel_policy=sentinel_policy,
@@ -4206,9 +5087,16 @@ class RemoteAccessController:
         self._logger = logging.getLogger(f"{VD_LOGGER_NAME}.remote")
         self._tooling = detect_remote_tooling()
         self._enabled = dispatcher.remote_enabled()
+        self._version = 0
         initial_snapshot = self.snapshot()
         self._safety.set_remote_state(initial_snapshot.effective)
 
+    @property
+    def version(self) -> int:
+        """Counter bumped whenever the values behind :meth:`snapshot` change."""
+
+        return self._version
+
     def snapshot(self) -> RemoteAccessSnapshot:
         """Return the current remote access snapshot."""
 
@@ -4233,6 +5121,8 @@ class RemoteAccessController:
         with self._lock:
             previous = self._enabled
             self._enabled = normalized
+            if previous != normalized:
+                self._version += 1
 
         if previous == normalized:
             snapshot = self.snapshot()
@@ -4254,6 +5144,7 @@ class RemoteAccessController:
 
         with self._lock:
             self._runtime = runtime
+            self._version += 1
         snapshot = self.snapshot()
         self._safety.set_remote_state(snapshot.effective)
 
@@ -4263,6 +5154,7 @@ class RemoteAccessController:
         snapshot = detect_remote_tooling()
         with self._lock:
             self._tooling = snapshot
+            self._version += 1
         return snapshot
 
     def _emit_scriptspeak(
@@ -4312,35 +5204,217 @@ def resolve_run_log_path(task: Task, dataset_root: Optional[Path] = None) -> Tup
     return absolute, relative
 
 
-def append_run_log(
-    task: Task,
-    lines: Iterable[str] | str,
-    dataset_root: Optional[Path] = None,
-    *,
-    channel: Optional[str] = None,
-) -> Tuple[Path, str, bool]:
-    """Append ``lines`` to the task run log, creating directories as needed."""
+RUN_LOG_FLUSH_BYTES = 64 * 1024
+RUN_LOG_FLUSH_INTERVAL = 1.0
+RUN_LOG_IDLE_CLOSE = 60.0
+# Rotate ``run.log`` into ``run.log.N.gz`` once it exceeds this size (0 = never).
+RUN_LOG_ROTATE_BYTES = 0
+RUN_LOG_ROTATE_BACKUPS = 3
 
-    absolute, relative = resolve_run_log_path(task, dataset_root)
-    absolute.parent.mkdir(parents=True, exist_ok=True)
 
+class RunLogWriter:
+    """Buffered append handle for one task run log.
+
+    The handle stays open between calls.  Outside :meth:`batch` every write is
+    flushed immediately; inside a batch data is flushed once
+    ``RUN_LOG_FLUSH_BYTES`` accumulate, ``RUN_LOG_FLUSH_INTERVAL`` elapses, or
+    the batch ends.  A shared background thread flushes stragglers and closes
+    handles that sit idle.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.RLock()
+        self._fh: Optional[Any] = None
+        self._pending = 0
+        self._batch_depth = 0
+        self._last_flush = time.monotonic()
+        self._last_used = self._last_flush
+
+    # ------------------------------------------------------------------
+    def write(self, lines: Iterable[str], *, channel: Optional[str] = None) -> None:
+        prefix = f"[{channel}]" if channel else ""
+        chunks: List[str] = []
+        for entry in lines:
+            text = str(entry).rstrip("\n")
+            if prefix:
+                text = f"{prefix} {text}" if text else prefix
+            chunks.append(text + "\n")
+        if not chunks:
+            return
+        data = "".join(chunks).encode("utf-8")
+        with self._lock:
+            self._handle().write(data)
+            self._pending += len(data)
+            now = time.monotonic()
+            self._last_used = now
+            if (
+                not self._batch_depth
+                or self._pending >= RUN_LOG_FLUSH_BYTES
+                or now - self._last_flush >= RUN_LOG_FLUSH_INTERVAL
+            ):
+                self._flush_locked()
+
+    # ------------------------------------------------------------------
+    def touch(self) -> None:
+        with self._lock:
+            self._handle()
+            self._last_used = time.monotonic()
+
+    # ------------------------------------------------------------------
+    @contextlib.contextmanager
+    def batch(self) -> Iterator["RunLogWriter"]:
+        """Defer flushing until the block exits (or size/time limits hit)."""
+
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if not self._batch_depth:
+                    self._flush_locked()
+
+    # ------------------------------------------------------------------
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+    # ------------------------------------------------------------------
+    def _maintain(self, now: float) -> None:
+        """Flush overdue data and release the handle when idle."""
+
+        with self._lock:
+            if self._pending and now - self._last_flush >= RUN_LOG_FLUSH_INTERVAL:
+                self._flush_locked()
+            if (
+                self._fh is not None
+                and not self._batch_depth
+                and now - self._last_used >= RUN_LOG_IDLE_CLOSE
+            ):
+                self._fh.close()
+                self._fh = None
+
+    # ------------------------------------------------------------------
+    def _handle(self) -> Any:
+        if self._fh is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = self.path.open("ab", buffering=RUN_LOG_FLUSH_BYTES)
+            self._pending = 0
+        return self._fh
+
+    # ------------------------------------------------------------------
+    def _flush_locked(self) -> None:
+        self._last_flush = time.monotonic()
+        if self._fh is None:
+            return
+        if self._pending:
+            self._fh.flush()
+            self._pending = 0
+        if RUN_LOG_ROTATE_BYTES and self._fh.tell() >= RUN_LOG_ROTATE_BYTES:
+            self._rotate_locked()
+
+    # ------------------------------------------------------------------
+    def _rotate_locked(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        base = self.path.name
+        for index in range(RUN_LOG_ROTATE_BACKUPS - 1, 0, -1):
+            older = self.path.with_name(f"{base}.{index}.gz")
+            if older.exists():
+                os.replace(older, self.path.with_name(f"{base}.{index + 1}.gz"))
+        staging = self.path.with_name(f"{base}.rotating")
+        os.replace(self.path, staging)
+        try:
+            with staging.open("rb") as src, gzip.open(
+                self.path.with_name(f"{base}.1.gz"), "wb"
+            ) as dst:
+                shutil.copyfileobj(src, dst)
+        finally:
+            staging.unlink(missing_ok=True)
+
+
+_RUN_LOG_WRITERS: Dict[Path, RunLogWriter] = {}
+_RUN_LOG_WRITERS_LOCK = threading.Lock()
+_RUN_LOG_MAINTAINER: Optional[threading.Thread] = None
+
+
+def run_log_writer(path: Path) -> RunLogWriter:
+    """Return the shared buffered writer for the run log at ``path``."""
+
+    global _RUN_LOG_MAINTAINER
+    with _RUN_LOG_WRITERS_LOCK:
+        writer = _RUN_LOG_WRITERS.get(path)
+        if writer is None:
+            writer = RunLogWriter(path)
+            _RUN_LOG_WRITERS[path] = writer
+        if _RUN_LOG_MAINTAINER is None:
+            _RUN_LOG_MAINTAINER = threading.Thread(
+                target=_maintain_run_logs, name="RunLogFlusher", daemon=True
+            )
+            _RUN_LOG_MAINTAINER.start()
+            atexit.register(close_run_logs)
+    return writer
+
+
+def close_run_logs() -> None:
+    """Flush and close every open run-log handle."""
+
+    with _RUN_LOG_WRITERS_LOCK:
+        writers = list(_RUN_LOG_WRITERS.values())
+    for writer in writers:
+        try:
+            writer.close()
+        except OSError:
+            logger.debug("Failed to close run log %s", writer.path, exc_info=True)
+
+
+def _maintain_run_logs() -> None:
+    while True:
+        time.sleep(RUN_LOG_FLUSH_INTERVAL)
+        now = time.monotonic()
+        with _RUN_LOG_WRITERS_LOCK:
+            writers = list(_RUN_LOG_WRITERS.values())
+        for writer in writers:
+            try:
+                writer._maintain(now)
+            except OSError:
+                logger.debug(
+                    "Run log maintenance failed for %s", writer.path, exc_info=True
+                )
+
+
+def append_run_log(
+    task: Task,
+    lines: Iterable[str] | str,
+    dataset_root: Optional[Path] = None,
+    *,
+    channel: Optional[str] = None,
+) -> Tuple[Path, str, bool]:
+    """Append ``lines`` to the task run log, creating directories as needed."""
+
+    absolute, relative = resolve_run_log_path(task, dataset_root)
     created = task.run_log_path is None
 
+    writer = run_log_writer(absolute)
     if isinstance(lines, str):
-        entries = [lines]
+        writer.write([lines], channel=channel)
     else:
         entries = [str(line) for line in lines]
-
-    if entries:
-        prefix = f"[{channel}]" if channel else ""
-        with absolute.open("a", encoding="utf-8") as fh:
-            for entry in entries:
-                text = entry.rstrip("\n")
-                if prefix:
-                    text = f"{prefix} {text}" if text else prefix
-                fh.write((text + "\n") if text else "\n")
-    else:
-        absolute.touch(exist_ok=True)
+        if entries:
+            writer.write(entries, channel=channel)
+        else:
+            writer.touch()
 
     if task.run_log_path is None:
         task.run_log_path = relative
@@ -4357,37 +5431,46 @@ def append_run_output(
 ) -> Tuple[Path, str, bool]:
     """Append captured stdout/stderr streams to the task run log."""
 
-    created = False
-    path: Optional[Path] = None
-    relative: Optional[str] = None
+    absolute, relative = resolve_run_log_path(task, dataset_root)
+    created = task.run_log_path is None
+
+    writer = run_log_writer(absolute)
+    with writer.batch():
+        if stdout:
+            writer.write(stdout.splitlines(), channel="stdout")
+        if stderr:
+            writer.write(stderr.splitlines(), channel="stderr")
+        if not stdout and not stderr:
+            writer.touch()
 
-    if stdout:
-        path, relative, created_stdout = append_run_log(
-            task,
-            stdout.splitlines(),
-            dataset_root,
-            channel="stdout",
-        )
-        created = created or created_stdout
+    if task.run_log_path is None:
+        task.run_log_path = relative
 
-    if stderr:
-        path, relative, created_stderr = append_run_log(
-            task,
-            stderr.splitlines(),
-            dataset_root,
-            channel="stderr",
-        )
-        created = created or created_stderr
+    return absolute, relative, created
 
-    if path is None or relative is None:
-        path, relative = resolve_run_log_path(task, dataset_root)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.touch(exist_ok=True)
-        if task.run_log_path is None:
-            task.run_log_path = relative
-            created = True
 
-    return path, relative, created
+def _read_tail_lines(path: Path, max_lines: int) -> List[str]:
+    """Return the last ``max_lines`` lines of ``path`` by reading backwards."""
+
+    with path.open("rb") as fh:
+        fh.seek(0, os.SEEK_END)
+        position = fh.tell()
+        data = b""
+        block = 8192
+        while position > 0 and data.count(b"\n") <= max_lines:
+            step = min(block, position)
+            position -= step
+            fh.seek(position)
+            data = fh.read(step) + data
+            block = min(block * 2, 1 << 20)
+    text = data.decode("utf-8", errors="replace")
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    if lines and lines[-1] == "":
+        lines.pop()
+    if position > 0 and lines:
+        # The first line was cut by the seek.
+        lines.pop(0)
+    return lines[-max_lines:]
 
 
 def load_run_log_tail(
@@ -4404,36 +5487,156 @@ def load_run_log_tail(
         return []
 
     absolute, _ = resolve_run_log_path(task, dataset_root)
+    writer = _RUN_LOG_WRITERS.get(absolute)
+    if writer is not None:
+        writer.flush()
     if not absolute.exists():
         return []
+    return _read_tail_lines(absolute, int(max_lines))
 
-    tail: Deque[str] = deque(maxlen=int(max_lines))
-    with absolute.open("r", encoding="utf-8", errors="replace") as fh:
-        for line in fh:
-            tail.append(line.rstrip("\n"))
-    return list(tail)
+
+# ``tasks.jsonl`` is an append-only change log: ``update_task`` appends the
+# merged record and the last line per id wins.  Superseded lines are dropped by
+# rewriting the log once they outnumber the live tasks.
+TASK_LOG_COMPACT_MIN_DEAD = 256
+
+
+class _TaskLogIndex:
+    """Latest record per task id for one ``tasks.jsonl`` log.
+
+    Growth of the file is followed by parsing only the new tail; a shrunk or
+    replaced file (compaction, external edits) triggers a full rebuild.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._lines = 0
+        self._size = 0
+        self._identity: Optional[Tuple[int, int]] = None
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @property
+    def dead(self) -> int:
+        return self._lines - len(self._records)
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        return self._records.get(task_id)
+
+    def records(self) -> List[Dict[str, Any]]:
+        return list(self._records.values())
+
+    def reset(self) -> None:
+        self._records.clear()
+        self._lines = 0
+        self._size = 0
+        self._identity = None
+
+    def refresh(self) -> None:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            self.reset()
+            return
+        identity = (stat.st_dev, stat.st_ino)
+        if identity != self._identity or stat.st_size < self._size:
+            self.reset()
+            self._identity = identity
+        if stat.st_size == self._size:
+            return
+        with self.path.open("rb") as fh:
+            fh.seek(self._size)
+            chunk = fh.read(stat.st_size - self._size)
+        # A line without its newline is still being written; pick it up later.
+        end = chunk.rfind(b"\n") + 1
+        for raw in chunk[:end].splitlines():
+            raw = raw.strip()
+            if not raw:
+                continue
+            try:
+                record = json.loads(raw.decode("utf-8"))
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                continue
+            if not isinstance(record, dict) or "id" not in record:
+                continue
+            # Re-assigning an existing key keeps its first-seen position.
+            self._records[str(record["id"])] = record
+            self._lines += 1
+        self._size += end
+
+
+_TASK_LOG_INDEXES: Dict[Path, _TaskLogIndex] = {}
+_TASK_LOG_LOCK = threading.RLock()
+
+
+def _task_log_index(path: Path) -> _TaskLogIndex:
+    index = _TASK_LOG_INDEXES.get(path)
+    if index is None:
+        index = _TaskLogIndex(path)
+        _TASK_LOG_INDEXES[path] = index
+    index.refresh()
+    return index
 
 
 def append_task(task: Task) -> None:
     """Append a task entry to ``tasks.jsonl``."""
 
-    _append_jsonl(TASKS_FILE, task.to_dict())
+    with _TASK_LOG_LOCK:
+        _append_jsonl(TASKS_FILE, task.to_dict())
 
 
 def update_task(task_id: str, **changes: Any) -> Task:
-    """Apply updates to a task entry and rewrite the dataset atomically."""
-
-    records = _read_jsonl(TASKS_FILE)
-    updated_record: Optional[Dict[str, Any]] = None
+    """Merge ``changes`` into a task and append the result to the change log."""
+
+    with _TASK_LOG_LOCK:
+        index = _task_log_index(TASKS_FILE)
+        current = index.get(task_id)
+        if current is None:
+            raise ValueError(f"Task '{task_id}' does not exist")
+        record = dict(current)
+        record.update(changes)
+        _append_jsonl(TASKS_FILE, record)
+        index.refresh()
+        if index.dead >= TASK_LOG_COMPACT_MIN_DEAD and index.dead > len(index):
+            export_tasks()
+    return Task.from_dict(record)
+
+
+def load_tasks(path: Optional[Path] = None) -> List[Task]:
+    """Return the current state of every task, in creation order."""
+
+    with _TASK_LOG_LOCK:
+        records = _task_log_index(Path(path) if path else TASKS_FILE).records()
+    tasks: List[Task] = []
     for record in records:
-        if record.get("id") == task_id:
-            record.update(changes)
-            updated_record = record
-            break
-    if updated_record is None:
-        raise ValueError(f"Task '{task_id}' does not exist")
-    _write_jsonl_atomic(TASKS_FILE, records)
-    return Task.from_dict(updated_record)
+        try:
+            tasks.append(Task.from_dict(record))
+        except (KeyError, TypeError, ValueError):
+            logger.debug("Skipping malformed task payload: %r", record)
+    return tasks
+
+
+def export_tasks(
+    destination: Optional[Path] = None, *, path: Optional[Path] = None
+) -> Path:
+    """Write one line per live task to ``destination``.
+
+    Without ``destination`` the log at ``path`` (``tasks.jsonl`` by default) is
+    compacted in place, leaving the plain one-record-per-task layout.
+    """
+
+    source = Path(path) if path else TASKS_FILE
+    target = Path(destination) if destination else source
+    with _TASK_LOG_LOCK:
+        index = _task_log_index(source)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        _write_jsonl_atomic(target, index.records())
+        if target == source:
+            index.reset()
+            index.refresh()
+    return target
 
 
 def append_event(event: TaskEvent) -> None:
@@ -4470,6 +5673,7 @@ DEFAULT_EVENT_TOPICS: Set[str] = {
     "system.sentinel",
     "system.immune",
     "system.salience",
+    "system.bus",
     # Voice pipeline topics.
     "speech.request",
     "speech.tts",
@@ -4485,6 +5689,44 @@ DEFAULT_EVENT_TOPICS: Set[str] = {
 _WILDCARD_TOPIC = "task.*"
 
 
+class FrozenPayload(dict):
+    """Read-only ``dict`` handed to every subscriber of a published event.
+
+    One instance is shared by all listeners, so in-place mutation raises
+    ``TypeError``; take ``dict(payload)`` to get an editable copy.  Only the
+    top level and ``meta`` are frozen, nested values are shared as published.
+    """
+
+    __slots__ = ()
+
+    def _readonly(self, *args: Any, **kwargs: Any) -> NoReturn:
+        raise TypeError("event payloads are read-only; copy them with dict()")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (dict, (dict(self),))
+
+
+def _freeze_mapping(value: Mapping[str, Any]) -> FrozenPayload:
+    return FrozenPayload(
+        {
+            key: _freeze_mapping(item) if isinstance(item, Mapping) else item
+            for key, item in value.items()
+        }
+    )
+
+
+class DeliveryMode(str, Enum):
+    """Where an :class:`EventDispatcher` subscription runs its callback."""
+
+    INLINE = "inline"  # on the publishing thread
+    THREAD = "thread"  # on a worker thread owned by the subscription
+    POOL = "pool"  # on the dispatcher's shared worker pool
+    QT = "qt"  # on the Qt GUI thread, batched through one queued signal
+
+
 class _SubscriptionState:
     """Runtime state for a single subscriber including queue backpressure."""
 
@@ -4495,17 +5737,38 @@ class _SubscriptionState:
         "lock",
         "delivering",
         "dropped",
+        "delivery",
+        "executor",
+        "name",
     )
 
-    def __init__(self, callback: Subscriber, *, max_pending: int) -> None:
+    def __init__(
+        self,
+        callback: Subscriber,
+        *,
+        max_pending: int,
+        delivery: DeliveryMode = DeliveryMode.INLINE,
+    ) -> None:
         self.callback = callback
         self.max_pending = max_pending
-        self.queue: Deque[dict] = deque()
+        # Items are ``(topic, payload, enqueued_at)``; the stamp is 0.0 unless
+        # bus instrumentation is collecting delivery latencies.
+        self.queue: Deque[Tuple[str, dict, float]] = deque()
         self.lock = RLock()
         self.delivering = False
         self.dropped = 0
+        self.delivery = delivery
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.name = getattr(callback, "__qualname__", None) or repr(callback)
 
-    def enqueue(self, topic: str, payload: dict, *, logger: logging.Logger) -> bool:
+    def enqueue(
+        self,
+        topic: str,
+        payload: dict,
+        *,
+        logger: logging.Logger,
+        stamp: float = 0.0,
+    ) -> bool:
         """Add ``payload`` and return ``True`` when the queue should be drained."""
 
         with self.lock:
@@ -4518,15 +5781,15 @@ class _SubscriptionState:
                     self.dropped,
                 )
                 return False
-            self.queue.append(payload)
+            self.queue.append((topic, payload, stamp))
             should_start = not self.delivering
             # Mark as delivering so concurrent publishers avoid double drains.
             if should_start:
                 self.delivering = True
             return should_start
 
-    def start_delivery(self) -> Optional[dict]:
-        """Pop the next payload or release the delivery flag when empty."""
+    def start_delivery(self) -> Optional[Tuple[str, dict, float]]:
+        """Pop the next queued item or release the delivery flag when empty."""
 
         with self.lock:
             if not self.queue:
@@ -4577,8 +5840,191 @@ class Subscription:
         self.unsubscribe()
 
 
+class _QtDeliveryBridge(QObject):
+    """Runs queued subscriber drains on the GUI thread.
+
+    Publishers on any thread call :meth:`schedule`; a single queued ``wake``
+    signal is emitted per batch so bursts of events cost one event-loop hop.
+    """
+
+    wake = Signal()
+
+    def __init__(self, dispatcher: "EventDispatcher") -> None:
+        super().__init__()
+        self._dispatcher = dispatcher
+        self._pending: Deque[_SubscriptionState] = deque()
+        self._lock = threading.Lock()
+        self._scheduled = False
+        self.wake.connect(self._deliver, Qt.QueuedConnection)
+
+    def schedule(self, state: _SubscriptionState) -> None:
+        with self._lock:
+            self._pending.append(state)
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self.wake.emit()
+
+    @Slot()
+    def _deliver(self) -> None:
+        with self._lock:
+            batch = list(self._pending)
+            self._pending.clear()
+            self._scheduled = False
+        for state in batch:
+            self._dispatcher._drain(state)
+
+
+class _LatencyHistogram:
+    """Log-bucketed latency histogram (half-octave buckets from 1 µs to ~1 min)."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    _BASE = 1e-6
+    _BUCKETS = 54
+
+    def __init__(self) -> None:
+        self.counts = [0] * self._BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        if seconds <= self._BASE:
+            index = 0
+        else:
+            index = min(
+                self._BUCKETS - 1, math.ceil(2.0 * math.log2(seconds / self._BASE))
+            )
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction: float) -> float:
+        """Return the upper bound of the bucket holding ``fraction`` of samples."""
+
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= rank:
+                return min(self.max, self._BASE * 2.0 ** (index / 2.0))
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        mean = self.total / self.count if self.count else 0.0
+        return {
+            "count": self.count,
+            "mean_ms": round(1000.0 * mean, 3),
+            "p50_ms": round(1000.0 * self.percentile(0.50), 3),
+            "p95_ms": round(1000.0 * self.percentile(0.95), 3),
+            "p99_ms": round(1000.0 * self.percentile(0.99), 3),
+            "max_ms": round(1000.0 * self.max, 3),
+        }
+
+
+class _BusStats:
+    """Publish counters and delivery latencies gathered between snapshots."""
+
+    def __init__(self, *, top_n: int = 10) -> None:
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.top_n = top_n
+        self.publishes: Dict[str, int] = defaultdict(int)
+        self.callbacks: Dict[Tuple[str, str], _LatencyHistogram] = {}
+        self.delivery: Dict[str, _LatencyHistogram] = {}
+        # Min-heap of ``(seconds, topic, callback)`` for the slowest calls.
+        self.slowest: List[Tuple[float, str, str]] = []
+
+    def count_publish(self, topic: str) -> None:
+        with self.lock:
+            self.publishes[topic] += 1
+
+    def record(
+        self,
+        topic: str,
+        callback: str,
+        elapsed: float,
+        delivered: Optional[float],
+    ) -> None:
+        with self.lock:
+            histogram = self.callbacks.get((topic, callback))
+            if histogram is None:
+                histogram = self.callbacks[(topic, callback)] = _LatencyHistogram()
+            histogram.record(elapsed)
+            if delivered is not None:
+                end_to_end = self.delivery.get(topic)
+                if end_to_end is None:
+                    end_to_end = self.delivery[topic] = _LatencyHistogram()
+                end_to_end.record(delivered)
+            entry = (elapsed, topic, callback)
+            if len(self.slowest) < self.top_n:
+                heapq.heappush(self.slowest, entry)
+            elif elapsed > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, entry)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            window = max(1e-6, time.monotonic() - self.started)
+            topics: Dict[str, Dict[str, Any]] = {
+                topic: {"published": count, "rate_per_s": round(count / window, 3)}
+                for topic, count in self.publishes.items()
+            }
+            for topic, histogram in self.delivery.items():
+                topics.setdefault(topic, {"published": 0, "rate_per_s": 0.0})
+                topics[topic]["delivery"] = histogram.summary()
+            subscribers = [
+                {"topic": topic, "callback": callback, **histogram.summary()}
+                for (topic, callback), histogram in self.callbacks.items()
+            ]
+            slowest = [
+                {"topic": topic, "callback": callback, "ms": round(1000.0 * elapsed, 3)}
+                for elapsed, topic, callback in sorted(self.slowest, reverse=True)
+            ]
+        subscribers.sort(key=lambda item: item["p95_ms"], reverse=True)
+        return {
+            "window_s": round(window, 3),
+            "topics": topics,
+            "subscribers": subscribers,
+            "slowest": slowest,
+        }
+
+
+BUS_TELEMETRY_TOPIC = "system.bus"
+
+
+def summarise_bus_telemetry(payload: Mapping[str, Any]) -> str:
+    """Return a one-line summary of a ``system.bus`` payload for log views."""
+
+    if not payload.get("enabled"):
+        return "bus telemetry disabled"
+    topics = payload.get("topics") or {}
+    rate = sum(float(item.get("rate_per_s", 0.0)) for item in topics.values())
+    summary = f"bus {rate:.1f} events/s across {len(topics)} topics"
+    slowest = payload.get("slowest") or []
+    if slowest:
+        top = slowest[0]
+        summary += f"; slowest {top['callback']} on {top['topic']} ({top['ms']} ms)"
+    return summary
+
+
 class EventDispatcher:
-    """Centralized pub/sub dispatcher with bounded subscriber queues."""
+    """Centralized pub/sub dispatcher with bounded subscriber queues.
+
+    Each subscription picks a :class:`DeliveryMode`.  ``INLINE`` subscribers run
+    on the publishing thread as before; every other mode hands the drain to
+    another thread so ``publish`` returns without waiting on the callback.
+    Per-subscriber ordering and ``max_pending`` backpressure apply to all modes.
+
+    Optional instrumentation (:meth:`set_instrumentation`) counts publishes per
+    topic and times every callback; a background reporter publishes the
+    windowed figures on ``system.bus``.  When disabled the hot path only checks
+    one attribute.
+    """
 
     def __init__(
         self,
@@ -4598,6 +6044,79 @@ class EventDispatcher:
         self._remote_url = RUNTIME_SETTINGS.remote_event_bus
         self._rate_limit = max(1, RUNTIME_SETTINGS.event_rate_per_minute)
         self._remote_enabled = bool(self._remote_url) and not RUNTIME_SETTINGS.offline
+        self._meta_cache: Optional[Tuple[Any, Any, int, FrozenPayload]] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_workers = max(2, min(8, (os.cpu_count() or 2)))
+        self._qt_bridge: Optional[_QtDeliveryBridge] = None
+        self._stats: Optional[_BusStats] = None
+        self._telemetry_interval = 5.0
+        self._telemetry_stop: Optional[threading.Event] = None
+
+    # ------------------------------------------------------------------
+    def set_instrumentation(self, enabled: bool, *, interval: float = 5.0) -> None:
+        """Start or stop bus instrumentation and the ``system.bus`` reporter."""
+
+        with self._lock:
+            if enabled:
+                self._telemetry_interval = max(0.5, float(interval))
+                if self._stats is None:
+                    self._stats = _BusStats()
+                if self._telemetry_stop is None:
+                    stop = threading.Event()
+                    self._telemetry_stop = stop
+                    threading.Thread(
+                        target=self._telemetry_loop,
+                        args=(stop,),
+                        name="EventBusTelemetry",
+                        daemon=True,
+                    ).start()
+            else:
+                self._stats = None
+                if self._telemetry_stop is not None:
+                    self._telemetry_stop.set()
+                    self._telemetry_stop = None
+        self._logger.info(
+            "Bus instrumentation %s", "enabled" if enabled else "disabled"
+        )
+        if not enabled:
+            self.publish(BUS_TELEMETRY_TOPIC, {"enabled": False})
+
+    # ------------------------------------------------------------------
+    def instrumentation_enabled(self) -> bool:
+        return self._stats is not None
+
+    # ------------------------------------------------------------------
+    def bus_snapshot(self, *, reset: bool = True) -> Dict[str, Any]:
+        """Return publish rates and callback latencies for the current window.
+
+        With ``reset`` the next window starts empty, so each ``system.bus``
+        report covers only the interval since the previous one.
+        """
+
+        stats = self._stats
+        if stats is None:
+            return {"enabled": False}
+        if reset:
+            with self._lock:
+                if self._stats is stats:
+                    self._stats = _BusStats(top_n=stats.top_n)
+        payload = stats.snapshot()
+        pending = self.pending_snapshot()
+        payload["enabled"] = True
+        payload["queued"] = pending["total_queued"]
+        payload["drops"] = pending["total_drops"]
+        return payload
+
+    # ------------------------------------------------------------------
+    def _telemetry_loop(self, stop: threading.Event) -> None:
+        while not stop.wait(self._telemetry_interval):
+            snapshot = self.bus_snapshot(reset=True)
+            if not snapshot.get("enabled"):
+                continue
+            try:
+                self.publish(BUS_TELEMETRY_TOPIC, snapshot)
+            except Exception:
+                self._logger.debug("Failed to publish bus telemetry", exc_info=True)
 
     # ------------------------------------------------------------------
     def set_remote_enabled(self, enabled: bool) -> None:
@@ -4631,8 +6150,13 @@ class EventDispatcher:
         callback: Subscriber,
         *,
         max_pending: int = 32,
+        delivery: DeliveryMode | str = DeliveryMode.INLINE,
     ) -> Subscription:
-        """Register ``callback`` for ``topic`` with bounded queue backpressure."""
+        """Register ``callback`` for ``topic`` with bounded queue backpressure.
+
+        ``delivery`` selects the thread the callback runs on; see
+        :class:`DeliveryMode`.
+        """
 
         if not callable(callback):
             raise TypeError("callback must be callable")
@@ -4643,12 +6167,31 @@ class EventDispatcher:
         if max_pending < 1:
             raise ValueError("max_pending must be >= 1")
 
-        state = _SubscriptionState(callback, max_pending=max_pending)
+        mode = DeliveryMode(delivery)
+        if mode is DeliveryMode.QT and QCoreApplication.instance() is None:
+            # Without an event loop the queued signal would never fire.
+            self._logger.debug("No Qt application; delivering %s inline", topic)
+            mode = DeliveryMode.INLINE
+
+        state = _SubscriptionState(callback, max_pending=max_pending, delivery=mode)
+        if mode is DeliveryMode.THREAD:
+            state.executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix=f"EventSub-{topic}"
+            )
         with self._lock:
+            if mode is DeliveryMode.QT and self._qt_bridge is None:
+                self._qt_bridge = _QtDeliveryBridge(self)
+                app = QCoreApplication.instance()
+                if app is not None:
+                    self._qt_bridge.moveToThread(app.thread())
             self._subscribers[topic].append(state)
 
         self._logger.debug(
-            "Subscribed callback=%r topic=%s max_pending=%s", callback, topic, max_pending
+            "Subscribed callback=%r topic=%s max_pending=%s delivery=%s",
+            callback,
+            topic,
+            max_pending,
+            mode.value,
         )
         return Subscription(self, topic, state)
 
@@ -4662,68 +6205,163 @@ class EventDispatcher:
         if topic not in self._topics:
             raise ValueError(f"Unsupported topic: {topic!r}")
 
-        enriched_payload = dict(payload)
-        meta = dict(enriched_payload.get("meta", {}))
-        meta.setdefault("offline", RUNTIME_SETTINGS.offline)
-        meta.setdefault("sandbox", RUNTIME_SETTINGS.sandbox)
-        meta.setdefault("share_limit", RUNTIME_SETTINGS.share_limit)
-        meta.setdefault("sentinel_policy", RUNTIME_SETTINGS.sentinel_policy)
-        controller = REMOTE_ACCESS
-        if controller is not None:
-            snapshot = controller.snapshot()
-            meta.setdefault("remote_enabled", snapshot.effective)
-            meta.setdefault("remote_configured", snapshot.configured)
-            meta.setdefault("remote_tooling", snapshot.tooling.to_metadata())
-        enriched_payload["meta"] = meta
+        stats = self._stats
+        if stats is not None:
+            stats.count_publish(topic)
 
-        deliveries: List[_SubscriptionState] = []
         with self._lock:
-            listeners = list(self._subscribers.get(topic, ()))
-            wildcard_listeners = list(self._subscribers.get(self._wildcard, ()))
+            listeners = tuple(self._subscribers.get(topic, ()))
+            wildcard_listeners = tuple(self._subscribers.get(self._wildcard, ()))
+        if not listeners and not wildcard_listeners and not self._remote_active():
+            # Nobody is listening: skip enrichment, copying and logging.
+            return
 
+        enriched_payload = self._enrich(payload)
+        stamp = time.perf_counter() if stats is not None else 0.0
+        deliveries: List[_SubscriptionState] = []
         for state in (*listeners, *wildcard_listeners):
-            should_start = state.enqueue(topic, enriched_payload, logger=self._logger)
+            should_start = state.enqueue(
+                topic, enriched_payload, logger=self._logger, stamp=stamp
+            )
             if should_start:
                 deliveries.append(state)
 
-        subscriber_count = len(listeners) + len(wildcard_listeners)
-        self._logger.info(
-            "Event published topic=%s subscribers=%s keys=%s",
-            topic,
-            subscriber_count,
-            list(enriched_payload.keys()),
-        )
+        if self._logger.isEnabledFor(logging.INFO):
+            self._logger.info(
+                "Event published topic=%s subscribers=%s keys=%s",
+                topic,
+                len(listeners) + len(wildcard_listeners),
+                list(enriched_payload.keys()),
+            )
 
         for state in deliveries:
-            self._drain(state, topic)
+            self._dispatch(state)
 
         self._fan_out_remote(topic, enriched_payload)
 
     # ------------------------------------------------------------------
-    def _detach(self, topic: str, state: _SubscriptionState) -> None:
-        with self._lock:
-            listeners = self._subscribers.get(topic)
-            if not listeners:
-                return
-            try:
-                listeners.remove(state)
-            except ValueError:
-                return
-            if not listeners:
-                self._subscribers.pop(topic, None)
-        self._logger.debug("Unsubscribed callback=%r topic=%s", state.callback, topic)
+    def _enrich(self, payload: dict) -> FrozenPayload:
+        """Return ``payload`` frozen with the runtime ``meta`` defaults merged in."""
+
+        runtime_meta = self._runtime_meta()
+        own_meta = payload.get("meta")
+        if isinstance(payload, FrozenPayload) and own_meta is runtime_meta:
+            return payload
+        if own_meta:
+            # Publisher-supplied keys win over the runtime defaults.
+            meta = FrozenPayload({**runtime_meta, **own_meta})
+        else:
+            meta = runtime_meta
+        frozen = FrozenPayload(payload)
+        dict.__setitem__(frozen, "meta", meta)
+        return frozen
 
     # ------------------------------------------------------------------
-    def _drain(self, state: _SubscriptionState, topic: str) -> None:
+    def _runtime_meta(self) -> FrozenPayload:
+        """Return the shared runtime ``meta`` block, rebuilt only on change."""
+
+        runtime = RUNTIME_SETTINGS
+        controller = REMOTE_ACCESS
+        version = controller.version if controller is not None else -1
+        cached = self._meta_cache
+        if (
+            cached is not None
+            and cached[0] is runtime
+            and cached[1] is controller
+            and cached[2] == version
+        ):
+            return cached[3]
+        meta: Dict[str, Any] = {
+            "offline": runtime.offline,
+            "sandbox": runtime.sandbox,
+            "share_limit": runtime.share_limit,
+            "sentinel_policy": runtime.sentinel_policy,
+        }
+        if controller is not None:
+            snapshot = controller.snapshot()
+            meta["remote_enabled"] = snapshot.effective
+            meta["remote_configured"] = snapshot.configured
+            meta["remote_tooling"] = snapshot.tooling.to_metadata()
+        frozen = _freeze_mapping(meta)
+        self._meta_cache = (runtime, controller, version, frozen)
+        return frozen
+
+    # ------------------------------------------------------------------
+    def _remote_active(self) -> bool:
+        return (
+            bool(self._remote_url)
+            and self._remote_enabled
+            and not RUNTIME_SETTINGS.offline
+        )
+
+    # ------------------------------------------------------------------
+    def _detach(self, topic: str, state: _SubscriptionState) -> None:
+        with self._lock:
+            listeners = self._subscribers.get(topic)
+            if not listeners:
+                return
+            try:
+                listeners.remove(state)
+            except ValueError:
+                return
+            if not listeners:
+                self._subscribers.pop(topic, None)
+        if state.executor is not None:
+            state.executor.shutdown(wait=False)
+        self._logger.debug("Unsubscribed callback=%r topic=%s", state.callback, topic)
+
+    # ------------------------------------------------------------------
+    def _dispatch(self, state: _SubscriptionState) -> None:
+        mode = state.delivery
+        try:
+            if mode is DeliveryMode.THREAD and state.executor is not None:
+                state.executor.submit(self._drain, state)
+                return
+            if mode is DeliveryMode.POOL:
+                self._shared_pool().submit(self._drain, state)
+                return
+            if mode is DeliveryMode.QT and self._qt_bridge is not None:
+                self._qt_bridge.schedule(state)
+                return
+        except RuntimeError:
+            # Executor already shut down (unsubscribe or interpreter exit).
+            with state.lock:
+                state.queue.clear()
+                state.delivering = False
+            return
+        self._drain(state)
+
+    # ------------------------------------------------------------------
+    def _shared_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self._pool_workers, thread_name_prefix="EventPool"
+                )
+            return self._pool
+
+    # ------------------------------------------------------------------
+    def _drain(self, state: _SubscriptionState) -> None:
         while True:
-            payload = state.start_delivery()
-            if payload is None:
+            item = state.start_delivery()
+            if item is None:
                 return
+            topic, payload, enqueued_at = item
+            stats = self._stats
+            started = time.perf_counter() if stats is not None else 0.0
             try:
                 state.callback(payload)
             except Exception:  # pragma: no cover - defensive logging
                 self._logger.exception("Error dispatching %s to %r", topic, state.callback)
             finally:
+                if stats is not None:
+                    finished = time.perf_counter()
+                    stats.record(
+                        topic,
+                        state.name,
+                        finished - started,
+                        finished - enqueued_at if enqueued_at else None,
+                    )
                 if not state.finish_delivery():
                     return
 
@@ -4807,13 +6445,18 @@ class EventDispatcher:
                     for state in states
                 ]
 
-            for topic, state in snapshot:
+            on_gui_thread = threading.current_thread() is threading.main_thread()
+            for _topic, state in snapshot:
+                threaded = state.delivery in (DeliveryMode.THREAD, DeliveryMode.POOL)
                 with state.lock:
                     if not state.queue:
                         continue
+                    drained_any = True
+                    if threaded or (state.delivery is DeliveryMode.QT and not on_gui_thread):
+                        # Owned by a worker (or the GUI loop); just wait for it.
+                        continue
                     state.delivering = True
-                drained_any = True
-                self._drain(state, topic)
+                self._drain(state)
 
             if not drained_any or time.monotonic() >= deadline:
                 break
@@ -4830,6 +6473,8 @@ EVENT_DISPATCHER = EventDispatcher(
     wildcard_topic=_WILDCARD_TOPIC,
     logger=logging.getLogger(f"{VD_LOGGER_NAME}.events"),
 )
+if RUNTIME_SETTINGS.bus_telemetry:
+    EVENT_DISPATCHER.set_instrumentation(True)
 
 
 if REMOTE_ACCESS is None:
@@ -4849,10 +6494,18 @@ def register_topic(topic: str) -> None:
     EVENT_DISPATCHER.register_topic(topic)
 
 
-def subscribe(topic: str, callback: Subscriber, *, max_pending: int = 32) -> Subscription:
+def subscribe(
+    topic: str,
+    callback: Subscriber,
+    *,
+    max_pending: int = 32,
+    delivery: DeliveryMode | str = DeliveryMode.INLINE,
+) -> Subscription:
     """Register ``callback`` for ``topic`` and return an unsubscribe handle."""
 
-    return EVENT_DISPATCHER.subscribe(topic, callback, max_pending=max_pending)
+    return EVENT_DISPATCHER.subscribe(
+        topic, callback, max_pending=max_pending, delivery=delivery
+    )
 
 
 def publish(topic: str, payload: dict) -> None:
@@ -6835,8 +8488,178 @@ class LocalTTSAdapter:
             self._notify_state(state, request.metadata)
 
 
+class PCMRingBuffer:
+    """Preallocated int16 ring holding the most recent ``capacity`` samples.
+
+    Positions are absolute sample counts, so readers address audio by where
+    it was captured.  :meth:`read` returns a zero-copy view when the span is
+    contiguous and copies only when it crosses the wrap point.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if np is None:
+            raise RuntimeError("numpy is required for PCMRingBuffer")
+        self.capacity = max(1, int(capacity))
+        self._data = np.zeros(self.capacity, dtype=np.int16)
+        self._end = 0
+        self._lock = threading.Lock()
+
+    @property
+    def end(self) -> int:
+        """Absolute position one past the newest sample."""
+
+        return self._end
+
+    @property
+    def oldest(self) -> int:
+        """Absolute position of the oldest sample still held."""
+
+        return max(0, self._end - self.capacity)
+
+    def write(self, samples: Any) -> int:
+        """Copy ``samples`` into the ring and return the new end position."""
+
+        block = np.asarray(samples, dtype=np.int16).reshape(-1)
+        total = block.size
+        if total > self.capacity:
+            # Only the tail survives, but positions still advance by ``total``.
+            block = block[-self.capacity:]
+        with self._lock:
+            start = (self._end + total - block.size) % self.capacity
+            first = min(block.size, self.capacity - start)
+            self._data[start:start + first] = block[:first]
+            if first < block.size:
+                self._data[: block.size - first] = block[first:]
+            self._end += total
+            return self._end
+
+    def read(self, start: int, end: Optional[int] = None) -> Any:
+        """Return samples ``[start, end)``, clamped to what is still held."""
+
+        with self._lock:
+            stop = self._end if end is None else min(int(end), self._end)
+            begin = max(int(start), self._end - self.capacity)
+            if stop <= begin:
+                return self._data[:0]
+            lo = begin % self.capacity
+            hi = lo + (stop - begin)
+            if hi <= self.capacity:
+                return self._data[lo:hi]
+            return np.concatenate(
+                (self._data[lo:], self._data[: hi - self.capacity])
+            )
+
+
+class WavReplayStream:
+    """``sounddevice.InputStream`` stand-in that replays a 16-bit WAV file.
+
+    Blocks are delivered to ``callback`` with the same ``(frames, 1)`` int16
+    shape the microphone produces, either in real time or as fast as the
+    consumer keeps up, followed by ``trailing_silence`` seconds of zeros so
+    the final utterance closes.  ``finished`` is set once playback ends.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        samplerate: int,
+        blocksize: int,
+        callback: Callable[..., None],
+        realtime: bool = True,
+        trailing_silence: float = 1.5,
+        **_ignored: Any,
+    ) -> None:
+        self.path = Path(path)
+        self.samplerate = int(samplerate)
+        self.blocksize = max(1, int(blocksize))
+        self.callback = callback
+        self.realtime = realtime
+        self.trailing_silence = max(0.0, float(trailing_silence))
+        self.finished = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        with wave.open(str(self.path), "rb") as reader:
+            if reader.getsampwidth() != 2:
+                raise ValueError(f"{self.path} is not 16-bit PCM")
+            if reader.getframerate() != self.samplerate:
+                raise ValueError(
+                    f"{self.path} is {reader.getframerate()} Hz, "
+                    f"expected {self.samplerate} Hz"
+                )
+
+    def start(self) -> None:
+        self._stop.clear()
+        self.finished.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="WavReplayStream", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=1.0)
+
+    def close(self) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        interval = self.blocksize / float(self.samplerate)
+        next_due = time.monotonic()
+        try:
+            with wave.open(str(self.path), "rb") as reader:
+                channels = reader.getnchannels()
+                while not self._stop.is_set():
+                    raw = reader.readframes(self.blocksize)
+                    if not raw:
+                        break
+                    block = np.frombuffer(raw, dtype="<i2").reshape(-1, channels)
+                    self.callback(block[:, :1], block.shape[0], None, None)
+                    if self.realtime:
+                        next_due += interval
+                        self._stop.wait(max(0.0, next_due - time.monotonic()))
+            silence = np.zeros((self.blocksize, 1), dtype=np.int16)
+            remaining = int(self.trailing_silence * self.samplerate)
+            while remaining > 0 and not self._stop.is_set():
+                self.callback(silence, self.blocksize, None, None)
+                remaining -= self.blocksize
+                if self.realtime:
+                    self._stop.wait(interval)
+        finally:
+            self.finished.set()
+
+
+@dataclass(slots=True)
+class _ASRUtterance:
+    """Sample positions and committed transcript for one in-flight utterance."""
+
+    utterance_id: str
+    started: float
+    speaker: str
+    priority: float
+    start_pos: int = 0
+    end_pos: int = 0
+    last_voice: float = 0.0
+    last_voice_pos: int = 0
+    committed_pos: int = 0
+    committed_text: List[str] = field(default_factory=list)
+    committed_logprobs: List[float] = field(default_factory=list)
+    last_partial_text: str = ""
+
+
 class LocalASRAdapter:
-    """Local microphone capture and Whisper-based transcription."""
+    """Local microphone capture and Whisper-based transcription.
+
+    The ``sounddevice`` callback writes straight into a preallocated
+    :class:`PCMRingBuffer`; a capture worker scores whole frames at once with
+    NumPy RMS energy and zero-crossing rate, and Whisper runs on a second
+    worker so audio never backs up behind a transcription.  Partials only
+    re-transcribe the uncommitted tail of an utterance: once that tail passes
+    ``commit_after`` seconds, Whisper segments that end ``commit_margin``
+    seconds before the tail end are committed and never revisited, and the
+    final pass covers just the audio left after the last commit.
+    """
 
     def __init__(
         self,
@@ -6852,19 +8675,22 @@ class LocalASRAdapter:
         self._on_final = on_final
         self._on_activity = on_activity
         self._logger = logger or logging.getLogger(f"{VD_LOGGER_NAME}.speech.asr")
-        self._audio_queue: "queue.Queue[Optional[bytes]]" = queue.Queue()
+        self._ring: Optional[PCMRingBuffer] = None
+        self._audio_ready = threading.Event()
+        self._vad_pos = 0
+        self._scratch: Any = None
         self._stop_event = threading.Event()
         self._stream = None
         self._worker: Optional[threading.Thread] = None
+        self._transcriber: Optional[threading.Thread] = None
         self._active = False
 
-        self._current_buffer = bytearray()
-        self._current_activity = False
-        self._utterance_id: Optional[str] = None
-        self._utterance_started = 0.0
-        self._last_voice_time = 0.0
-        self._last_partial_time = 0.0
-        self._last_partial_text = ""
+        self._utterance: Optional[_ASRUtterance] = None
+        self._last_partial_pos = 0
+        # Finals queue in order; only the newest pending partial is kept.
+        self._jobs = threading.Condition()
+        self._final_jobs: Deque[_ASRUtterance] = deque()
+        self._pending_partial: Optional[Tuple[_ASRUtterance, float]] = None
         self._model = None
         self._model_lock = threading.RLock()
 
@@ -6873,7 +8699,7 @@ class LocalASRAdapter:
     def available(self) -> bool:
         """Return whether the adapter can capture and transcribe audio."""
 
-        if sd is None:
+        if sd is None and not self._config.get("replay_wav"):
             return False
         if whisper is None or np is None:
             return False
@@ -6894,28 +8720,45 @@ class LocalASRAdapter:
             return False
         if self._active:
             return True
-        if sd is None:
+        replay_path = self._config.get("replay_wav")
+        if sd is None and not replay_path:
             self._logger.warning(
                 "sounddevice is unavailable; ASR cannot be started"
             )
             return False
-        if whisper is None or np is None:
+        if np is None:
+            self._logger.warning("numpy is unavailable; ASR cannot be started")
+            return False
+        if whisper is None:
             self._logger.warning(
-                "whisper or numpy missing; ASR transcripts will not be produced"
+                "whisper missing; ASR transcripts will not be produced"
             )
 
         sample_rate = int(self._config.get("sample_rate", 16_000))
         chunk_ms = int(self._config.get("chunk_ms", 30))
         blocksize = max(1, int(sample_rate * (chunk_ms / 1000.0)))
+        ring_seconds = float(self._config.get("ring_seconds", 60.0))
+        self._ring = PCMRingBuffer(int(sample_rate * ring_seconds))
+        self._vad_pos = 0
+        self._audio_ready.clear()
 
         try:
-            self._stream = sd.InputStream(
-                samplerate=sample_rate,
-                blocksize=blocksize,
-                channels=1,
-                dtype="int16",
-                callback=self._audio_callback,
-            )
+            if replay_path:
+                self._stream = WavReplayStream(
+                    Path(replay_path),
+                    samplerate=sample_rate,
+                    blocksize=blocksize,
+                    callback=self._audio_callback,
+                    realtime=bool(self._config.get("replay_realtime", True)),
+                )
+            else:
+                self._stream = sd.InputStream(
+                    samplerate=sample_rate,
+                    blocksize=blocksize,
+                    channels=1,
+                    dtype="int16",
+                    callback=self._audio_callback,
+                )
             self._stream.start()
         except Exception:
             self._logger.exception("Failed to start microphone capture")
@@ -6929,6 +8772,12 @@ class LocalASRAdapter:
             daemon=True,
         )
         self._worker.start()
+        self._transcriber = threading.Thread(
+            target=self._transcription_loop,
+            name="LocalASRTranscriber",
+            daemon=True,
+        )
+        self._transcriber.start()
         self._active = True
         self._logger.info(
             "Local ASR adapter started (sample_rate=%s chunk_ms=%s)",
@@ -6942,7 +8791,10 @@ class LocalASRAdapter:
         """Terminate capture threads and release audio resources."""
 
         self._stop_event.set()
-        self._audio_queue.put(None)
+        self._audio_ready.set()
+        with self._jobs:
+            self._pending_partial = None
+            self._jobs.notify_all()
         if self._stream is not None:
             try:
                 self._stream.stop()
@@ -6950,86 +8802,115 @@ class LocalASRAdapter:
             except Exception:
                 self._logger.debug("Failed to close microphone stream", exc_info=True)
             self._stream = None
-        if self._worker and self._worker.is_alive():
-            self._worker.join(timeout=1.0)
+        for thread in (self._worker, self._transcriber):
+            if thread and thread.is_alive():
+                thread.join(timeout=1.0)
         self._active = False
 
     # ------------------------------------------------------------------
     def _audio_callback(self, indata, frames, time_info, status) -> None:  # type: ignore[override]
         if status:
             self._logger.debug("ASR stream status: %s", status)
+        ring = self._ring
+        if ring is None:
+            return
         try:
-            chunk = bytes(indata.tobytes())
+            ring.write(indata[:, 0] if getattr(indata, "ndim", 1) > 1 else indata)
         except Exception:
-            self._logger.debug("Failed to convert audio chunk", exc_info=True)
+            self._logger.debug("Failed to buffer audio chunk", exc_info=True)
             return
-        self._audio_queue.put(chunk)
+        self._audio_ready.set()
 
     # ------------------------------------------------------------------
     def _process_audio(self) -> None:
+        sample_rate = int(self._config.get("sample_rate", 16_000))
+        chunk_ms = int(self._config.get("chunk_ms", 30))
+        frame_len = max(1, int(sample_rate * (chunk_ms / 1000.0)))
         silence_duration = float(self._config.get("silence_duration", 0.8))
         partial_interval = float(self._config.get("partial_interval", 0.9))
         vad_threshold = float(self._config.get("vad_threshold", 550))
+        zcr_max = float(self._config.get("vad_zcr_max", 0.45))
         speaker_priority = float(self._config.get("default_priority", 0.7))
         speaker_label = str(self._config.get("speaker_label", "user"))
+        silence_samples = int(silence_duration * sample_rate)
+        partial_samples = int(partial_interval * sample_rate)
+        ring = self._ring
+        if ring is None:
+            return
 
         while not self._stop_event.is_set():
-            try:
-                chunk = self._audio_queue.get(timeout=0.25)
-            except queue.Empty:
-                chunk = None
-            if chunk is None:
-                if self._current_activity and (
-                    time.time() - self._last_voice_time
+            ready = self._audio_ready.wait(timeout=0.25)
+            self._audio_ready.clear()
+            utterance = self._utterance
+            end = ring.end
+            if not ready or end - self._vad_pos < frame_len:
+                if not ready and utterance is not None and (
+                    time.time() - utterance.last_voice
                 ) >= silence_duration:
-                    self._finalise_utterance(
-                        speaker_label=speaker_label,
-                        speaker_priority=speaker_priority,
-                    )
+                    self._finalise_utterance()
                 continue
 
+            # Score every complete frame received since the last pass at once.
+            start = max(self._vad_pos, ring.oldest)
+            count = (end - start) // frame_len
+            frames = ring.read(start, start + count * frame_len)
+            frames = frames[: (frames.size // frame_len) * frame_len].reshape(
+                -1, frame_len
+            )
+            self._vad_pos = start + frames.shape[0] * frame_len
+            samples = frames.astype(np.float32)
+            energy = np.sqrt(np.mean(samples * samples, axis=1))
+            crossings = np.count_nonzero(
+                np.diff(np.signbit(frames), axis=1), axis=1
+            ) / float(frame_len)
+            voiced = (energy >= vad_threshold) & (crossings <= zcr_max)
+
             now = time.time()
-            energy = audioop.rms(chunk, 2) if chunk else 0
-            if energy >= vad_threshold:
-                if not self._current_activity:
-                    self._begin_utterance(
-                        now,
-                        speaker_label=speaker_label,
-                        speaker_priority=speaker_priority,
-                    )
-                self._current_buffer.extend(chunk)
-                self._last_voice_time = now
-                if (now - self._last_partial_time) >= partial_interval:
-                    self._emit_partial(
-                        now,
-                        speaker_label=speaker_label,
-                        speaker_priority=speaker_priority,
-                    )
-            elif self._current_activity:
-                self._current_buffer.extend(chunk)
-                if (now - self._last_voice_time) >= silence_duration:
-                    self._finalise_utterance(
-                        speaker_label=speaker_label,
-                        speaker_priority=speaker_priority,
-                    )
+            for index, is_voiced in enumerate(voiced.tolist()):
+                frame_end = start + (index + 1) * frame_len
+                if is_voiced:
+                    if utterance is None:
+                        utterance = self._begin_utterance(
+                            now,
+                            frame_end - frame_len,
+                            speaker_label=speaker_label,
+                            speaker_priority=speaker_priority,
+                        )
+                    utterance.end_pos = frame_end
+                    utterance.last_voice = now
+                    utterance.last_voice_pos = frame_end
+                    if frame_end - self._last_partial_pos >= partial_samples:
+                        self._schedule_partial(now, frame_end)
+                elif utterance is not None:
+                    utterance.end_pos = frame_end
+                    if frame_end - utterance.last_voice_pos >= silence_samples:
+                        self._finalise_utterance()
+                        utterance = None
 
     # ------------------------------------------------------------------
     def _begin_utterance(
         self,
         timestamp: float,
+        position: int,
         *,
         speaker_label: str,
         speaker_priority: float,
-    ) -> None:
-        self._current_activity = True
-        self._current_buffer = bytearray()
-        self._utterance_id = uuid.uuid4().hex
-        self._utterance_started = timestamp
-        self._last_voice_time = timestamp
-        self._last_partial_time = timestamp
-        self._last_partial_text = ""
+    ) -> _ASRUtterance:
+        utterance = _ASRUtterance(
+            utterance_id=uuid.uuid4().hex,
+            started=timestamp,
+            speaker=speaker_label,
+            priority=speaker_priority,
+            start_pos=position,
+            end_pos=position,
+            last_voice=timestamp,
+            last_voice_pos=position,
+            committed_pos=position,
+        )
+        self._utterance = utterance
+        self._last_partial_pos = position
         activity = SpeechActivity(
-            utterance_id=self._utterance_id,
+            utterance_id=utterance.utterance_id,
             active=True,
             timestamp=timestamp,
             metadata={
@@ -7038,70 +8919,173 @@ class LocalASRAdapter:
             },
         )
         self._on_activity(activity)
+        return utterance
 
     # ------------------------------------------------------------------
-    def _emit_partial(
-        self,
-        timestamp: float,
-        *,
-        speaker_label: str,
-        speaker_priority: float,
-    ) -> None:
-        if not self._current_buffer or self._utterance_id is None:
+    def _schedule_partial(self, timestamp: float, position: int) -> None:
+        utterance = self._utterance
+        if utterance is None:
             return
-        text, confidence = self._transcribe(bytes(self._current_buffer))
-        if not text or text == self._last_partial_text:
+        self._last_partial_pos = position
+        with self._jobs:
+            # A newer partial supersedes one Whisper has not started yet.
+            self._pending_partial = (utterance, timestamp)
+            self._jobs.notify()
+
+    # ------------------------------------------------------------------
+    def _finalise_utterance(self) -> None:
+        utterance = self._utterance
+        if utterance is None:
+            return
+        self._utterance = None
+        with self._jobs:
+            if self._pending_partial and self._pending_partial[0] is utterance:
+                self._pending_partial = None
+            self._final_jobs.append(utterance)
+            self._jobs.notify()
+        # Speech has ended now; resuming TTS need not wait for the final pass.
+        activity = SpeechActivity(
+            utterance_id=utterance.utterance_id,
+            active=False,
+            timestamp=time.time(),
+            metadata={
+                "speaker": utterance.speaker,
+                "speaker_priority": utterance.priority,
+            },
+        )
+        self._on_activity(activity)
+
+    # ------------------------------------------------------------------
+    def _transcription_loop(self) -> None:
+        while True:
+            with self._jobs:
+                while (
+                    not self._final_jobs
+                    and self._pending_partial is None
+                    and not self._stop_event.is_set()
+                ):
+                    self._jobs.wait(0.25)
+                if self._final_jobs:
+                    final_job: Optional[_ASRUtterance] = self._final_jobs.popleft()
+                    partial_job = None
+                elif self._pending_partial is not None:
+                    final_job = None
+                    partial_job = self._pending_partial
+                    self._pending_partial = None
+                else:
+                    return
+            try:
+                if final_job is not None:
+                    self._emit_final(final_job)
+                elif partial_job is not None:
+                    self._emit_partial(*partial_job)
+            except Exception:
+                self._logger.exception("ASR transcription job failed")
+
+    # ------------------------------------------------------------------
+    def _emit_partial(self, utterance: _ASRUtterance, timestamp: float) -> None:
+        sample_rate = int(self._config.get("sample_rate", 16_000))
+        commit_after = float(self._config.get("commit_after", 6.0))
+        commit_margin = float(self._config.get("commit_margin", 1.0))
+        partial_window = float(self._config.get("partial_window", 15.0))
+
+        offset = utterance.committed_pos
+        tail = self._utterance_audio(offset, utterance.end_pos)
+        if tail is None or not tail.size:
+            return
+        duration = tail.size / float(sample_rate)
+        text, confidence, segments = self._transcribe(
+            tail, prompt=" ".join(utterance.committed_text)
+        )
+
+        if duration >= commit_after and segments:
+            # Commit segments Whisper is unlikely to revise; past the window
+            # everything but the newest segment goes so the tail stays short.
+            stable = [
+                segment
+                for segment in segments
+                if float(segment.get("end", 0.0)) <= duration - commit_margin
+            ]
+            if not stable and duration >= partial_window:
+                stable = segments[:-1] or segments
+            if stable:
+                end_seconds = float(stable[-1].get("end", 0.0))
+                committed = " ".join(
+                    str(segment.get("text") or "").strip() for segment in stable
+                ).strip()
+                utterance.committed_pos = offset + min(
+                    tail.size, int(end_seconds * sample_rate)
+                )
+                if committed:
+                    utterance.committed_text.append(committed)
+                utterance.committed_logprobs.extend(
+                    float(segment.get("avg_logprob", -5.0)) for segment in stable
+                )
+                text = " ".join(
+                    str(segment.get("text") or "").strip()
+                    for segment in segments[len(stable):]
+                ).strip()
+
+        full_text = " ".join(part for part in (*utterance.committed_text, text) if part)
+        if not full_text or full_text == utterance.last_partial_text:
             return
-        self._last_partial_text = text
-        self._last_partial_time = timestamp
+        utterance.last_partial_text = full_text
         hypothesis = SpeechHypothesis(
-            utterance_id=self._utterance_id,
-            text=text,
+            utterance_id=utterance.utterance_id,
+            text=full_text,
             confidence=confidence,
-            start_ts=self._utterance_started,
+            start_ts=utterance.started,
             end_ts=timestamp,
-            speaker=speaker_label,
-            speaker_priority=speaker_priority,
+            speaker=utterance.speaker,
+            speaker_priority=utterance.priority,
             is_final=False,
             metadata={},
         )
         self._on_partial(hypothesis)
 
     # ------------------------------------------------------------------
-    def _finalise_utterance(
-        self,
-        *,
-        speaker_label: str,
-        speaker_priority: float,
-    ) -> None:
-        if not self._current_activity or self._utterance_id is None:
-            return
-        text, confidence = self._transcribe(bytes(self._current_buffer))
+    def _emit_final(self, utterance: _ASRUtterance) -> None:
+        tail = self._utterance_audio(utterance.committed_pos, utterance.end_pos)
+        text, confidence, segments = self._transcribe(
+            tail, prompt=" ".join(utterance.committed_text)
+        )
+        logprobs = list(utterance.committed_logprobs)
+        logprobs.extend(float(segment.get("avg_logprob", -5.0)) for segment in segments)
+        if utterance.committed_logprobs and logprobs:
+            avg = float(sum(logprobs) / len(logprobs))
+            confidence = 1.0 / (1.0 + math.exp(-avg))
+        full_text = " ".join(part for part in (*utterance.committed_text, text) if part)
         hypothesis = SpeechHypothesis(
-            utterance_id=self._utterance_id,
-            text=text,
+            utterance_id=utterance.utterance_id,
+            text=full_text,
             confidence=confidence,
-            start_ts=self._utterance_started,
-            end_ts=self._last_voice_time,
-            speaker=speaker_label,
-            speaker_priority=speaker_priority,
+            start_ts=utterance.started,
+            end_ts=utterance.last_voice,
+            speaker=utterance.speaker,
+            speaker_priority=utterance.priority,
             is_final=True,
             metadata={},
         )
-        activity = SpeechActivity(
-            utterance_id=self._utterance_id,
-            active=False,
-            timestamp=time.time(),
-            metadata={
-                "speaker": speaker_label,
-                "speaker_priority": speaker_priority,
-            },
-        )
-        self._current_activity = False
-        self._current_buffer = bytearray()
-        self._utterance_id = None
         self._on_final(hypothesis)
-        self._on_activity(activity)
+
+    # ------------------------------------------------------------------
+    def _utterance_audio(self, start: int, end: int) -> Any:
+        """Return ring samples ``[start, end)`` as a float32 view.
+
+        Samples are scaled into a reusable scratch buffer owned by the
+        transcription worker, so Whisper receives a view without a fresh
+        allocation per pass.
+        """
+
+        ring = self._ring
+        if ring is None or np is None or end <= start:
+            return None
+        pcm = ring.read(start, end)
+        if self._scratch is None or self._scratch.size < pcm.size:
+            self._scratch = np.empty(max(pcm.size, ring.capacity), dtype=np.float32)
+        audio = self._scratch[: pcm.size]
+        np.multiply(pcm, 1.0 / 32768.0, out=audio, casting="unsafe")
+        return audio
 
     # ------------------------------------------------------------------
     def _load_model(self):
@@ -7119,31 +9103,37 @@ class LocalASRAdapter:
         return self._model
 
     # ------------------------------------------------------------------
-    def _transcribe(self, data: bytes) -> Tuple[str, float]:
-        if not data:
-            return "", 0.0
+    def _transcribe(
+        self, audio: Any, *, prompt: str = ""
+    ) -> Tuple[str, float, List[Dict[str, Any]]]:
+        """Return ``(text, confidence, segments)`` for float32 ``audio``."""
+
+        if audio is None or not len(audio):
+            return "", 0.0, []
         if whisper is None or np is None:
-            return "", 0.0
+            return "", 0.0, []
         with self._model_lock:
             model = self._load_model()
         if model is None:
-            return "", 0.0
-        try:
-            audio = np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
-        except Exception:
-            self._logger.debug("Failed to normalise audio buffer", exc_info=True)
-            return "", 0.0
+            return "", 0.0, []
+        options: Dict[str, Any] = {
+            "language": str(self._config.get("language") or "en"),
+            "fp16": False,
+        }
+        if prompt:
+            # Committed text keeps wording consistent across window boundaries.
+            options["initial_prompt"] = prompt[-200:]
         try:
-            result = model.transcribe(
-                audio,
-                language=str(self._config.get("language") or "en"),
-                fp16=False,
-            )
+            result = model.transcribe(audio, **options)
         except Exception:
             self._logger.exception("Whisper transcription error")
-            return "", 0.0
+            return "", 0.0, []
         text = str(result.get("text") or "").strip()
-        segments = result.get("segments") or []
+        segments = [
+            segment
+            for segment in result.get("segments") or []
+            if isinstance(segment, dict)
+        ]
         if segments and np is not None:
             probs = [
                 float(segment.get("avg_logprob", -5.0)) for segment in segments
@@ -7152,7 +9142,7 @@ class LocalASRAdapter:
             confidence = 1.0 / (1.0 + math.exp(-avg))
         else:
             confidence = float(max(0.0, 1.0 - float(result.get("no_speech_prob", 0.0))))
-        return text, confidence
+        return text, confidence, segments
 
 
 class SpeechOrchestrator:
@@ -7887,9 +9877,15 @@ class SentinelMonitorHub:
 
     # ------------------------------------------------------------------
     def _install_subscriptions(self) -> None:
-        self._subscriptions.append(subscribe("task.status", self._on_task_status))
-        self._subscriptions.append(subscribe("task.diff", self._on_task_diff))
-        self._subscriptions.append(subscribe("task.updated", self._on_task_updated))
+        # Loop/regression detection must not hold up run_checked or record_diff.
+        for topic, callback in (
+            ("task.status", self._on_task_status),
+            ("task.diff", self._on_task_diff),
+            ("task.updated", self._on_task_updated),
+        ):
+            self._subscriptions.append(
+                subscribe(topic, callback, delivery=DeliveryMode.POOL)
+            )
 
     # ------------------------------------------------------------------
     def _on_task_status(self, payload: Mapping[str, Any]) -> None:
@@ -9039,7 +11035,37 @@ def _relative_to_workspace(path: Path, workspace: Path) -> str:
         return path.as_posix()
 
 
+GIT_ROOT_NEGATIVE_TTL = 30.0
+"""Seconds a "not a repository" answer is reused before probing again."""
+
+GIT_DIFF_SESSION_MODES = ("off", "batch", "fsmonitor")
+
+_GIT_ROOT_CACHE: Dict[Path, Tuple[Optional[Path], float]] = {}
+_GIT_ROOT_LOCK = threading.Lock()
+_GIT_SESSIONS: Dict[Path, "GitDiffSession"] = {}
+_GIT_SESSIONS_LOCK = threading.Lock()
+_GIT_SESSION_MODE = "off"
+
+
 def _detect_git_repo(start: Path) -> Optional[Path]:
+    """Return the repository root containing ``start``, memoized per path."""
+
+    now = time.monotonic()
+    with _GIT_ROOT_LOCK:
+        cached = _GIT_ROOT_CACHE.get(start)
+    if cached is not None:
+        root, stamp = cached
+        if root is not None and (root / ".git").exists():
+            return root
+        if root is None and now - stamp < GIT_ROOT_NEGATIVE_TTL:
+            return None
+    root = _probe_git_repo(start)
+    with _GIT_ROOT_LOCK:
+        _GIT_ROOT_CACHE[start] = (root, now)
+    return root
+
+
+def _probe_git_repo(start: Path) -> Optional[Path]:
     try:
         result = subprocess.run(
             ["git", "-C", str(start), "rev-parse", "--show-toplevel"],
@@ -9058,77 +11084,348 @@ def _detect_git_repo(start: Path) -> Optional[Path]:
     return Path(top).resolve()
 
 
-def _git_numstat(
-    repo_root: Path,
-    workspace: Path,
-    targets: Dict[Path, _Target],
-) -> Tuple[int, int, List[str], Set[Path]]:
-    paths = sorted({target.rel_repo for target in targets.values() if target.rel_repo})
+def configure_git_diff_session(mode: str) -> str:
+    """Select how :func:`record_diff` queries Git and return the active mode.
 
-    cmd: List[str] = [
-        "git",
-        "-C",
-        str(repo_root),
-        "--no-optional-locks",
-        "diff",
-        "--numstat",
-    ]
-    if paths:
-        cmd.append("--")
-        cmd.extend(paths)
+    ``"off"`` runs ``git diff --numstat`` plus ``git ls-files --others`` per
+    capture, so untracked files count as fully added.  ``"batch"`` keeps a
+    :class:`GitDiffSession` per repository: a single ``git status`` call finds
+    modified and untracked files and a long-running ``git cat-file --batch``
+    serves index blobs for in-process counting.  ``"fsmonitor"`` additionally
+    asks Git to use its filesystem monitor and untracked cache for the scan.
+    """
 
-    try:
-        result = subprocess.run(
-            cmd,
-            check=False,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
-    except FileNotFoundError:
-        return 0, 0, [], set()
-    if result.returncode != 0:
-        return 0, 0, [], set()
+    global _GIT_SESSION_MODE
+    normalized = str(mode or "off").strip().lower()
+    if normalized not in GIT_DIFF_SESSION_MODES:
+        raise ValueError(f"Unknown git diff session mode: {mode!r}")
+    with _GIT_SESSIONS_LOCK:
+        _GIT_SESSION_MODE = normalized
+        sessions = list(_GIT_SESSIONS.values())
+        _GIT_SESSIONS.clear()
+    for session in sessions:
+        session.close()
+    return normalized
 
-    added_total = removed_total = 0
-    files: List[str] = []
-    handled: Set[Path] = set()
 
-    for line in result.stdout.splitlines():
-        parsed = _parse_numstat_line(line)
-        if not parsed:
-            continue
-        added, removed, rel_path = parsed
-        abs_path = (repo_root / rel_path).resolve()
-        files.append(_relative_to_workspace(abs_path, workspace))
-        added_total += added
-        removed_total += removed
-        if abs_path in targets:
-            handled.add(abs_path)
-    return added_total, removed_total, _unique(files), handled
+def close_git_diff_sessions() -> None:
+    """Terminate every long-running ``git cat-file`` helper."""
 
+    with _GIT_SESSIONS_LOCK:
+        sessions = list(_GIT_SESSIONS.values())
+        _GIT_SESSIONS.clear()
+    for session in sessions:
+        session.close()
 
-def _parse_numstat_line(line: str) -> Optional[Tuple[int, int, str]]:
-    parts = line.strip().split("\t", 2)
-    if len(parts) != 3:
-        return None
-    added_str, removed_str, path_field = parts
-    added = _parse_int(added_str)
-    removed = _parse_int(removed_str)
-    normalized = _normalize_numstat_path(path_field)
-    if not normalized:
-        return None
-    return added, removed, normalized
 
+def _git_diff_session(repo_root: Path) -> Optional["GitDiffSession"]:
+    with _GIT_SESSIONS_LOCK:
+        if _GIT_SESSION_MODE == "off":
+            return None
+        session = _GIT_SESSIONS.get(repo_root)
+        if session is None:
+            if not _GIT_SESSIONS:
+                atexit.register(close_git_diff_sessions)
+            session = GitDiffSession(
+                repo_root, fsmonitor=_GIT_SESSION_MODE == "fsmonitor"
+            )
+            _GIT_SESSIONS[repo_root] = session
+        return session
 
-def _parse_int(value: str) -> int:
-    try:
-        return int(value)
-    except ValueError:
-        return 0
 
+class GitDiffSession:
+    """Per-repository helper that answers ``numstat`` without re-spawning Git.
 
-def _normalize_numstat_path(field: str) -> str:
+    Index blobs are read through one ``git cat-file --batch`` process that
+    stays alive between captures; counts are computed in-process with
+    :func:`line_change_counts`, matching ``git diff --numstat`` (worktree
+    against index) and counting untracked files as fully added.
+    """
+
+    def __init__(self, repo_root: Path, *, fsmonitor: bool = False) -> None:
+        self.repo_root = repo_root
+        self.fsmonitor = fsmonitor
+        self._lock = threading.Lock()
+        self._proc: Optional[subprocess.Popen] = None
+
+    # ------------------------------------------------------------------
+    def numstat(
+        self, paths: Sequence[str] = ()
+    ) -> Optional[List[Tuple[int, int, str]]]:
+        """Return ``(added, removed, path)`` rows, or ``None`` when Git fails."""
+
+        entries = self._status(paths)
+        if entries is None:
+            return None
+        rows: List[Tuple[int, int, str]] = []
+        with self._lock:
+            for rel_path, blob_id, worktree_deleted in entries:
+                current = b""
+                if not worktree_deleted:
+                    try:
+                        current = (self.repo_root / rel_path).read_bytes()
+                    except OSError:
+                        continue
+                previous = b""
+                if blob_id:
+                    blob = self._read_blob(blob_id)
+                    if blob is None:
+                        return None
+                    previous = blob
+                if b"\0" in previous[:8000] or b"\0" in current[:8000]:
+                    rows.append((0, 0, rel_path))
+                    continue
+                added, removed = line_change_counts(
+                    previous.decode("utf-8", errors="ignore").splitlines(),
+                    current.decode("utf-8", errors="ignore").splitlines(),
+                )
+                rows.append((added, removed, rel_path))
+        return rows
+
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        with self._lock:
+            proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        with contextlib.suppress(OSError, ValueError):
+            proc.stdin.close()
+        try:
+            proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+        with contextlib.suppress(OSError, ValueError):
+            proc.stdout.close()
+
+    # ------------------------------------------------------------------
+    def _status(self, paths: Sequence[str]) -> Optional[List[Tuple[str, str, bool]]]:
+        """Return ``(path, index_blob, deleted)`` for worktree changes."""
+
+        cmd: List[str] = ["git", "-C", str(self.repo_root), "--no-optional-locks"]
+        if self.fsmonitor:
+            cmd += ["-c", "core.fsmonitor=true", "-c", "core.untrackedCache=true"]
+        cmd += ["status", "--porcelain=v2", "-z", "--untracked-files=all"]
+        if paths:
+            cmd.append("--")
+            cmd.extend(paths)
+        try:
+            result = subprocess.run(
+                cmd,
+                check=False,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+        except FileNotFoundError:
+            return None
+        if result.returncode != 0:
+            return None
+
+        entries: List[Tuple[str, str, bool]] = []
+        records = result.stdout.decode("utf-8", errors="surrogateescape").split("\0")
+        index = 0
+        while index < len(records):
+            record = records[index]
+            index += 1
+            if not record:
+                continue
+            kind = record[0]
+            if kind == "?":
+                entries.append((record[2:], "", False))
+                continue
+            if kind not in "12":
+                continue
+            fields = record.split(" ", 9 if kind == "2" else 8)
+            if kind == "2":
+                # Renames carry the original path as the next NUL record.
+                index += 1
+            state, submodule, blob_id, rel_path = (
+                fields[1],
+                fields[2],
+                fields[7],
+                fields[-1],
+            )
+            if state[1] == "." or submodule.startswith("S"):
+                continue
+            entries.append((rel_path, blob_id, state[1] == "D"))
+        return entries
+
+    # ------------------------------------------------------------------
+    def _read_blob(self, blob_id: str) -> Optional[bytes]:
+        for _attempt in range(2):
+            proc = self._ensure_process()
+            if proc is None:
+                return None
+            try:
+                proc.stdin.write(blob_id.encode("ascii") + b"\n")
+                proc.stdin.flush()
+                header = proc.stdout.readline().split()
+                if not header:
+                    raise OSError("git cat-file exited")
+                if len(header) != 3:
+                    return b"" if header[-1:] == [b"missing"] else None
+                size = int(header[2])
+                data = proc.stdout.read(size)
+                proc.stdout.read(1)
+                return data
+            except (OSError, ValueError):
+                # The helper died (repository gc, git upgrade); restart once.
+                self._proc = None
+                with contextlib.suppress(OSError):
+                    proc.kill()
+        return None
+
+    # ------------------------------------------------------------------
+    def _ensure_process(self) -> Optional[subprocess.Popen]:
+        if self._proc is not None and self._proc.poll() is None:
+            return self._proc
+        try:
+            self._proc = subprocess.Popen(
+                ["git", "-C", str(self.repo_root), "cat-file", "--batch"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError:
+            self._proc = None
+        return self._proc
+
+
+if RUNTIME_SETTINGS.git_diff_session != "off":
+    configure_git_diff_session(RUNTIME_SETTINGS.git_diff_session)
+
+
+def _git_numstat(
+    repo_root: Path,
+    workspace: Path,
+    targets: Dict[Path, _Target],
+) -> Tuple[int, int, List[str], Set[Path]]:
+    paths = sorted({target.rel_repo for target in targets.values() if target.rel_repo})
+
+    session = _git_diff_session(repo_root)
+    rows = session.numstat(paths) if session is not None else None
+    if rows is None:
+        rows = _git_numstat_rows(repo_root, paths)
+
+    added_total = removed_total = 0
+    files: List[str] = []
+    handled: Set[Path] = set()
+
+    for added, removed, rel_path in rows:
+        abs_path = (repo_root / rel_path).resolve()
+        files.append(_relative_to_workspace(abs_path, workspace))
+        added_total += added
+        removed_total += removed
+        if abs_path in targets:
+            handled.add(abs_path)
+    return added_total, removed_total, _unique(files), handled
+
+
+def _git_numstat_rows(
+    repo_root: Path, paths: Sequence[str]
+) -> List[Tuple[int, int, str]]:
+    cmd: List[str] = [
+        "git",
+        "-C",
+        str(repo_root),
+        "--no-optional-locks",
+        "diff",
+        "--numstat",
+    ]
+    if paths:
+        cmd.append("--")
+        cmd.extend(paths)
+
+    try:
+        result = subprocess.run(
+            cmd,
+            check=False,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+    except FileNotFoundError:
+        return []
+    if result.returncode != 0:
+        return []
+
+    rows: List[Tuple[int, int, str]] = []
+    for line in result.stdout.splitlines():
+        parsed = _parse_numstat_line(line)
+        if parsed:
+            rows.append(parsed)
+    rows.extend(_git_untracked_rows(repo_root, paths))
+    return rows
+
+
+def _git_untracked_rows(
+    repo_root: Path, paths: Sequence[str]
+) -> List[Tuple[int, int, str]]:
+    """Count untracked files as fully added, as :class:`GitDiffSession` does."""
+
+    cmd: List[str] = [
+        "git",
+        "-C",
+        str(repo_root),
+        "--no-optional-locks",
+        "ls-files",
+        "--others",
+        "--exclude-standard",
+        "-z",
+    ]
+    if paths:
+        cmd.append("--")
+        cmd.extend(paths)
+    try:
+        result = subprocess.run(
+            cmd,
+            check=False,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+    except FileNotFoundError:
+        return []
+    if result.returncode != 0:
+        return []
+
+    rows: List[Tuple[int, int, str]] = []
+    listing = result.stdout.decode("utf-8", errors="surrogateescape")
+    for rel_path in listing.split("\0"):
+        if not rel_path:
+            continue
+        try:
+            current = (repo_root / rel_path).read_bytes()
+        except OSError:
+            continue
+        if b"\0" in current[:8000]:
+            rows.append((0, 0, rel_path))
+            continue
+        lines = current.decode("utf-8", errors="ignore").splitlines()
+        rows.append((len(lines), 0, rel_path))
+    return rows
+
+
+def _parse_numstat_line(line: str) -> Optional[Tuple[int, int, str]]:
+    parts = line.strip().split("\t", 2)
+    if len(parts) != 3:
+        return None
+    added_str, removed_str, path_field = parts
+    added = _parse_int(added_str)
+    removed = _parse_int(removed_str)
+    normalized = _normalize_numstat_path(path_field)
+    if not normalized:
+        return None
+    return added, removed, normalized
+
+
+def _parse_int(value: str) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        return 0
+
+
+def _normalize_numstat_path(field: str) -> str:
     field = field.strip()
     if not field:
         return ""
@@ -9154,6 +11451,85 @@ def _normalize_rename(field: str, token: str) -> str:
     return right
 
 
+DIFF_MAX_EDIT_COST = 2000
+"""Edit distance beyond which :func:`line_change_counts` falls back to counts."""
+
+_SNAPSHOT_INDEX_NAME = "snapshot.json"
+_SNAPSHOT_BLOB_DIR = "_blobs"
+_SNAPSHOT_GC_LOCK = threading.Lock()
+
+SNAPSHOT_GC_GRACE = 300.0
+"""Seconds a freshly written blob is protected from garbage collection."""
+
+
+def line_change_counts(
+    old: Sequence[str],
+    new: Sequence[str],
+    *,
+    max_cost: int = DIFF_MAX_EDIT_COST,
+) -> Tuple[int, int]:
+    """Return ``(added, removed)`` line counts turning ``old`` into ``new``.
+
+    Lines are interned to integers, the common prefix and suffix are trimmed,
+    and lines present on only one side are counted directly.  Myers' O(ND)
+    search then finds the minimal edit distance with a single frontier array,
+    so no edit script is built.  Past ``max_cost`` edits the multiset
+    difference of the remaining lines is used instead.
+    """
+
+    ids: Dict[str, int] = {}
+    a = [ids.setdefault(line, len(ids)) for line in old]
+    b = [ids.setdefault(line, len(ids)) for line in new]
+
+    start = 0
+    limit = min(len(a), len(b))
+    while start < limit and a[start] == b[start]:
+        start += 1
+    end_a, end_b = len(a), len(b)
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a = a[start:end_a]
+    b = b[start:end_b]
+
+    # A line with no counterpart can never be part of the common subsequence.
+    in_a, in_b = set(a), set(b)
+    removed = sum(1 for item in a if item not in in_b)
+    added = sum(1 for item in b if item not in in_a)
+    a = [item for item in a if item in in_b]
+    b = [item for item in b if item in in_a]
+
+    n, m = len(a), len(b)
+    if not n or not m:
+        return added + m, removed + n
+
+    bound = min(n + m, max(int(max_cost), 0))
+    offset = bound + 1
+    frontier = [0] * (2 * bound + 3)
+    for cost in range(bound + 1):
+        for k in range(-cost, cost + 1, 2):
+            if k == -cost or (
+                k != cost and frontier[offset + k - 1] < frontier[offset + k + 1]
+            ):
+                x = frontier[offset + k + 1]
+            else:
+                x = frontier[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            frontier[offset + k] = x
+            if x >= n and y >= m:
+                deleted = (cost + n - m) // 2
+                return added + cost - deleted, removed + deleted
+
+    counts_a, counts_b = Counter(a), Counter(b)
+    return (
+        added + sum((counts_b - counts_a).values()),
+        removed + sum((counts_a - counts_b).values()),
+    )
+
+
 def _snapshot_diff(
     task_id: str,
     targets: Dict[Path, _Target],
@@ -9161,49 +11537,220 @@ def _snapshot_diff(
 ) -> Tuple[int, int, List[str]]:
     added_total = removed_total = 0
     files: List[str] = []
+    index = _load_snapshot_index(task_id)
+    before = json.dumps(index, sort_keys=True)
     for abs_path, target in targets.items():
         if abs_path in skip:
             continue
-        added, removed = _compute_snapshot_counts(task_id, abs_path, target.rel_workspace)
+        added, removed = _compute_snapshot_counts(
+            task_id, abs_path, target.rel_workspace, index=index
+        )
         if added or removed:
             files.append(target.rel_workspace)
         added_total += added
         removed_total += removed
+    if json.dumps(index, sort_keys=True) != before:
+        _store_snapshot_index(task_id, index)
     return added_total, removed_total, _unique(files)
 
 
-def _compute_snapshot_counts(task_id: str, abs_path: Path, rel_path: str) -> Tuple[int, int]:
-    snapshot_file = _snapshot_file(task_id, rel_path)
+def _compute_snapshot_counts(
+    task_id: str,
+    abs_path: Path,
+    rel_path: str,
+    *,
+    index: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Tuple[int, int]:
+    """Diff ``abs_path`` against its stored baseline and refresh the baseline.
+
+    ``index`` is the task manifest mapping relative paths to the size, mtime
+    and blob id recorded with each baseline; files whose stat or content hash
+    still match are skipped without reading the previous blob.
+    """
+
+    index = index if index is not None else {}
+    entry = index.get(rel_path)
+    baseline = str(entry.get("blob") or "") if entry else ""
+
+    try:
+        stat = abs_path.stat()
+    except OSError:
+        stat = None
+
+    if stat is not None and baseline:
+        if (
+            entry.get("size") == stat.st_size
+            and entry.get("mtime_ns") == stat.st_mtime_ns
+        ):
+            return 0, 0
+
+    data = b""
+    if stat is not None:
+        try:
+            data = abs_path.read_bytes()
+        except OSError:
+            stat = None
+    digest = hashlib.sha1(data).hexdigest() if stat is not None else ""
+
+    if stat is not None and baseline and baseline == digest:
+        entry.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        return 0, 0
 
-    previous_lines: List[str] = []
-    if snapshot_file.exists():
-        previous_lines = snapshot_file.read_text(encoding="utf-8", errors="ignore").splitlines()
+    previous_lines = _load_snapshot_lines(task_id, rel_path, baseline)
 
     current_lines: List[str] = []
-    file_exists = abs_path.exists()
-    if file_exists:
-        current_lines = abs_path.read_text(encoding="utf-8", errors="ignore").splitlines()
-
-    added = removed = 0
-    for line in difflib.ndiff(previous_lines, current_lines):
-        if line.startswith("+ "):
-            added += 1
-        elif line.startswith("- "):
-            removed += 1
-
-    if file_exists:
-        snapshot_file.parent.mkdir(parents=True, exist_ok=True)
-        snapshot_file.write_text(
-            "\n".join(current_lines),
-            encoding="utf-8",
-        )
-    elif snapshot_file.exists():
-        snapshot_file.unlink()
+    if stat is not None:
+        current_lines = data.decode("utf-8", errors="ignore").splitlines()
+
+    added, removed = line_change_counts(previous_lines, current_lines)
+
+    if stat is not None:
+        _store_snapshot_blob(digest, data)
+        index[rel_path] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "blob": digest,
+        }
+    else:
+        index.pop(rel_path, None)
+
+    legacy_file = _snapshot_file(task_id, rel_path)
+    if legacy_file.exists():
+        legacy_file.unlink()
 
     return added, removed
 
 
+def _snapshot_blob_path(blob_id: str) -> Path:
+    return _SNAPSHOT_ROOT / _SNAPSHOT_BLOB_DIR / blob_id[:2] / blob_id[2:]
+
+
+def _store_snapshot_blob(blob_id: str, data: bytes) -> None:
+    """Write ``data`` zlib-compressed under ``blob_id`` unless already stored."""
+
+    path = _snapshot_blob_path(blob_id)
+    if path.exists():
+        # Refresh the mtime so a concurrent collection treats it as live.
+        os.utime(path)
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # A unique temp file per writer: threads storing the same blob must not
+    # share one path, or one ``os.replace`` would find the other's file gone.
+    fd, tmp_name = tempfile.mkstemp(
+        prefix=f".{path.name}.", suffix=".tmp", dir=path.parent
+    )
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(zlib.compress(data, 6))
+        os.replace(tmp_name, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_name)
+        raise
+
+
+def _load_snapshot_lines(task_id: str, rel_path: str, blob_id: str) -> List[str]:
+    """Return the baseline lines for ``rel_path`` from its blob or legacy copy."""
+
+    if blob_id:
+        try:
+            data = zlib.decompress(_snapshot_blob_path(blob_id).read_bytes())
+        except (OSError, zlib.error):
+            return []
+        return data.decode("utf-8", errors="ignore").splitlines()
+    legacy_file = _snapshot_file(task_id, rel_path)
+    if legacy_file.exists():
+        return legacy_file.read_text(encoding="utf-8", errors="ignore").splitlines()
+    return []
+
+
+def archive_task_snapshots(task_id: str) -> int:
+    """Drop the diff baselines of ``task_id`` and collect orphaned blobs.
+
+    Returns the number of blobs removed.
+    """
+
+    if not task_id:
+        raise ValueError("task_id is required")
+    task_root = _SNAPSHOT_ROOT / task_id
+    (task_root / _SNAPSHOT_INDEX_NAME).unlink(missing_ok=True)
+    shutil.rmtree(task_root / "snapshot", ignore_errors=True)
+    return collect_snapshot_garbage()
+
+
+def collect_snapshot_garbage(*, grace: float = SNAPSHOT_GC_GRACE) -> int:
+    """Delete blobs no task manifest references and return how many went.
+
+    Blobs touched within ``grace`` seconds are kept so a diff that stored a
+    blob but has not yet written its manifest is not raced.
+    """
+
+    blob_root = _SNAPSHOT_ROOT / _SNAPSHOT_BLOB_DIR
+    if not blob_root.exists():
+        return 0
+    with _SNAPSHOT_GC_LOCK:
+        referenced: Set[str] = set()
+        for manifest in _SNAPSHOT_ROOT.glob(f"*/{_SNAPSHOT_INDEX_NAME}"):
+            try:
+                payload = json.loads(manifest.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            if not isinstance(payload, dict):
+                continue
+            for entry in payload.values():
+                if isinstance(entry, dict) and entry.get("blob"):
+                    referenced.add(str(entry["blob"]))
+
+        cutoff = time.time() - grace
+        removed = 0
+        for bucket in blob_root.iterdir():
+            if not bucket.is_dir():
+                continue
+            for path in bucket.iterdir():
+                if bucket.name + path.name in referenced:
+                    continue
+                try:
+                    if path.stat().st_mtime > cutoff:
+                        continue
+                    path.unlink()
+                except OSError:
+                    continue
+                removed += 1
+            with contextlib.suppress(OSError):
+                bucket.rmdir()
+        return removed
+
+
+def _snapshot_index_path(task_id: str) -> Path:
+    return (_SNAPSHOT_ROOT / task_id / _SNAPSHOT_INDEX_NAME).resolve()
+
+
+def _load_snapshot_index(task_id: str) -> Dict[str, Dict[str, Any]]:
+    path = _snapshot_index_path(task_id)
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(payload, dict):
+        return {}
+    return {
+        str(key): dict(value)
+        for key, value in payload.items()
+        if isinstance(value, dict)
+    }
+
+
+def _store_snapshot_index(task_id: str, index: Dict[str, Dict[str, Any]]) -> None:
+    path = _snapshot_index_path(task_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps(index, sort_keys=True), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
 def _snapshot_file(task_id: str, rel_path: str) -> Path:
+    """Return the pre-blob-store plain copy of ``rel_path`` (migration only)."""
+
     safe_parts = [part for part in Path(rel_path).parts if part not in ("", ".", "..")] 
     snapshot_root = _SNAPSHOT_ROOT / task_id / "snapshot"
     return (snapshot_root / Path(*safe_parts)).resolve()
@@ -9514,22 +12061,7 @@ class TaskPanel(QDockWidget):
         apply_palette(self.search_edit)
 
     def refresh(self) -> None:
-        if not self.dataset_path.exists():
-            self._tasks = []
-            self._apply_filters()
-            return
-        records: List[Task] = []
-        with self.dataset_path.open("r", encoding="utf-8") as fh:
-            for line in fh:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    payload = json.loads(line)
-                    records.append(Task.from_dict(payload))
-                except json.JSONDecodeError:
-                    continue
-        self.set_tasks(records)
+        self.set_tasks(load_tasks(self.dataset_path))
 
     def set_tasks(self, tasks: Iterable[Task]) -> None:
         self._tasks = [_TaskRowData(task=task) for task in tasks]
@@ -9725,8 +12257,8 @@ class TaskDrawer(QFrame):
         self.panel.load_conversationRequested.connect(self._publish_conversation_request)
 
         self._subscriptions: List[Subscription] = [
-            subscribe("task.created", self._on_task_payload),
-            subscribe("task.updated", self._on_task_payload),
+            subscribe("task.created", self._on_task_payload, delivery=DeliveryMode.QT),
+            subscribe("task.updated", self._on_task_payload, delivery=DeliveryMode.QT),
         ]
         self.destroyed.connect(lambda *_: self._teardown())
 
@@ -9825,6 +12357,14 @@ class TaskDrawer(QFrame):
 
         publish("task.status", {"id": updated.id, "status": updated.status})
         publish("task.updated", updated.to_dict())
+        if status == "deleted":
+            publish("task.deleted", {"id": updated.id})
+            try:
+                archive_task_snapshots(updated.id)
+            except Exception:
+                logging.getLogger(__name__).exception(
+                    "Failed to clean snapshots for task %s", updated.id
+                )
         self.panel.update_task(updated)
 
     def _on_task_payload(self, payload: dict) -> None:
@@ -11248,16 +13788,24 @@ class BrainMapDock(QDockWidget):
         snapshot = self._brain_registry.snapshot()
         if not isinstance(snapshot, dict):
             snapshot = {"nodes": {}, "edges": []}
+        # Registry snapshots are copy-on-write, so identity plus version is a
+        # cheap change key; hashing the whole map is a fallback for others.
+        version = snapshot.get("version")
+        if isinstance(version, int):
+            digest = f"{id(self._brain_registry)}:{version}"
+            if not force and digest == self._last_render_key:
+                return
         nodes = snapshot.get("nodes")
         edges = snapshot.get("edges")
         if not isinstance(nodes, Mapping):
             nodes = {}
         if not isinstance(edges, list):
             edges = []
-        sanitized = {"nodes": dict(nodes), "edges": list(edges)}
-        digest = hashlib.sha1(
-            json.dumps(sanitized, sort_keys=True).encode("utf-8")
-        ).hexdigest()
+        sanitized = {"nodes": nodes, "edges": edges}
+        if not isinstance(version, int):
+            digest = hashlib.sha1(
+                json.dumps(sanitized, sort_keys=True).encode("utf-8")
+            ).hexdigest()
         if not force and digest == self._last_render_key:
             return
         self._current_snapshot = sanitized
@@ -11516,6 +14064,7 @@ class LogObservabilityDock(QDockWidget):
         "system.metrics",
         "system.process",
         "system.immune",
+        "system.bus",
     )
 
     def __init__(self, parent: Optional[QWidget] = None) -> None:
@@ -11626,6 +14175,18 @@ class LogObservabilityDock(QDockWidget):
         )
         controls.addWidget(next_btn)
 
+        self._bus_telemetry_toggle = QCheckBox("Bus telemetry", widget)
+        self._bus_telemetry_toggle.setToolTip(
+            "Report event-bus publish rates and callback latencies on system.bus."
+        )
+        self._bus_telemetry_toggle.setChecked(
+            EVENT_DISPATCHER.instrumentation_enabled()
+        )
+        self._bus_telemetry_toggle.toggled.connect(
+            lambda checked: EVENT_DISPATCHER.set_instrumentation(checked)
+        )
+        controls.addWidget(self._bus_telemetry_toggle)
+
         layout.addLayout(controls)
 
         self._system_view = QPlainTextEdit(widget)
@@ -11824,23 +14385,18 @@ class LogObservabilityDock(QDockWidget):
     def _install_bus_subscriptions(self) -> None:
         for topic in self._BUS_TOPICS:
             try:
-                handle = subscribe(topic, self._wrap_bus_callback(topic))
+                # Telemetry such as ``system.bus`` is published from worker
+                # threads, so let the dispatcher hop onto the GUI thread.
+                handle = subscribe(
+                    topic,
+                    partial(self._handle_bus_event, topic),
+                    delivery=DeliveryMode.QT,
+                )
             except Exception:
                 self._logger.exception("Failed to subscribe to %s", topic)
                 continue
             self._subscriptions.append(handle)
 
-    # ------------------------------------------------------------------
-    def _wrap_bus_callback(self, topic: str) -> Callable[[dict], None]:
-        def _callback(payload: dict) -> None:
-            snapshot = dict(payload)
-            QTimer.singleShot(
-                0,
-                lambda: self._handle_bus_event(topic, snapshot),
-            )
-
-        return _callback
-
     # ------------------------------------------------------------------
     def _handle_bus_event(self, topic: str, payload: Mapping[str, Any]) -> None:
         line = self._format_event_line(topic, payload)
@@ -11852,7 +14408,7 @@ class LogObservabilityDock(QDockWidget):
             session_id = str(payload.get("session_id") or "").strip()
             if session_id:
                 self._refresh_sessions(force=True)
-        elif topic.startswith("system."):
+        elif topic.startswith("system.") and topic != BUS_TELEMETRY_TOPIC:
             self._refresh_process_list()
 
     # ------------------------------------------------------------------
@@ -11879,6 +14435,8 @@ class LogObservabilityDock(QDockWidget):
         if topic == "system.metrics":
             keys = [key for key in payload.keys() if key != "meta"]
             return f"metrics fields={', '.join(keys) or 'none'}"
+        if topic == BUS_TELEMETRY_TOPIC:
+            return summarise_bus_telemetry(payload)
         if topic == "system.immune":
             response = payload.get("response")
             reason = payload.get("reason")
@@ -13039,6 +15597,7 @@ class RepoReferenceIndex:
         *,
         repository_index: Optional[RepositoryIndex] = None,
         extra_roots: Optional[Sequence[Path | str]] = None,
+        workers: int = 0,
     ) -> None:
         self.repo_root = Path(repo_root).resolve()
         self._extra_roots = _normalize_extra_roots(self.repo_root, extra_roots)
@@ -13046,6 +15605,7 @@ class RepoReferenceIndex:
         self.repository_index = repository_index or RepositoryIndex(
             repo_root=self.repo_root,
             extra_roots=self._extra_roots,
+            workers=workers,
         )
         self._references: List[RepoReference] = []
 
@@ -14626,6 +17186,244 @@ class ToggleSwitch(QCheckBox):
 # Helpers
 # --------------------------------------------------------------------------------------
 
+RUN_CHECKED_OUTPUT_CAP = 4 * 1024 * 1024
+"""Default per-stream capture cap when the operation policy sets none."""
+
+RUN_CHECKED_READ_SIZE = 64 * 1024
+RUN_CHECKED_PUBLISH_INTERVAL = 0.25
+
+
+class _StreamCapture:
+    """Incremental decoder for one subprocess pipe.
+
+    Raw bytes are kept in a tail-truncated buffer capped at ``limit`` so a
+    chatty process cannot grow memory without bound; complete lines are handed
+    back as they arrive for the run log and live telemetry.
+    """
+
+    def __init__(self, limit: int, encoding: str) -> None:
+        self.limit = max(1, int(limit))
+        self.encoding = encoding
+        self.dropped = 0
+        self._buffer = bytearray()
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        self._partial = ""
+
+    # ------------------------------------------------------------------
+    def feed(self, data: bytes, *, final: bool = False) -> List[str]:
+        if data:
+            self._buffer += data
+            overflow = len(self._buffer) - self.limit
+            if overflow > 0:
+                del self._buffer[:overflow]
+                self.dropped += overflow
+        text = self._partial + self._decoder.decode(data, final)
+        lines = text.splitlines(keepends=True)
+        self._partial = ""
+        if lines and not final:
+            last = lines[-1]
+            # Hold unterminated text, and a trailing CR that may precede LF.
+            if last.endswith("\r") or last == last.splitlines()[0]:
+                self._partial = lines.pop()
+        return [line.splitlines()[0] for line in lines]
+
+    # ------------------------------------------------------------------
+    def text(self) -> str:
+        body = bytes(self._buffer).decode(self.encoding, errors="replace")
+        body = body.replace("\r\n", "\n").replace("\r", "\n")
+        if self.dropped:
+            # Start the tail on a line boundary when one is available.
+            head, sep, rest = body.partition("\n")
+            if sep:
+                body = rest
+            return f"[... {self.dropped} bytes truncated ...]\n{body}"
+        return body
+
+
+def _pump_process_output(
+    proc: subprocess.Popen,
+    deadline: Optional[float],
+    on_data: Callable[[str, bytes, bool], None],
+) -> bool:
+    """Feed ``proc`` stdout/stderr to ``on_data`` until EOF or ``deadline``.
+
+    Returns ``True`` when the deadline passed first.  POSIX pipes are polled
+    with :mod:`selectors`; Windows cannot select on pipes, so reader threads
+    feed a queue instead.
+    """
+
+    pipes = {"stdout": proc.stdout, "stderr": proc.stderr}
+
+    def _remaining() -> float:
+        if deadline is None:
+            return RUN_CHECKED_PUBLISH_INTERVAL
+        return min(deadline - time.monotonic(), RUN_CHECKED_PUBLISH_INTERVAL)
+
+    if os.name != "nt":
+        with selectors.DefaultSelector() as selector:
+            for name, pipe in pipes.items():
+                if pipe is not None:
+                    selector.register(pipe, selectors.EVENT_READ, name)
+            while selector.get_map():
+                wait = _remaining()
+                if wait is not None and wait <= 0:
+                    return True
+                for key, _ in selector.select(wait):
+                    data = os.read(key.fd, RUN_CHECKED_READ_SIZE)
+                    if not data:
+                        selector.unregister(key.fileobj)
+                    on_data(key.data, data, not data)
+                on_data("", b"", False)
+        return False
+
+    chunks: "queue.Queue[Tuple[str, bytes]]" = queue.Queue()
+
+    def _reader(name: str, pipe: Any) -> None:
+        try:
+            while True:
+                data = pipe.read1(RUN_CHECKED_READ_SIZE)
+                chunks.put((name, data))
+                if not data:
+                    break
+        except (OSError, ValueError):
+            chunks.put((name, b""))
+
+    open_streams = 0
+    for name, pipe in pipes.items():
+        if pipe is None:
+            continue
+        open_streams += 1
+        threading.Thread(
+            target=_reader,
+            args=(name, pipe),
+            name=f"RunChecked-{name}",
+            daemon=True,
+        ).start()
+    while open_streams:
+        wait = _remaining()
+        if wait is not None and wait <= 0:
+            return True
+        try:
+            name, data = chunks.get(timeout=wait)
+        except queue.Empty:
+            on_data("", b"", False)
+            continue
+        if not data:
+            open_streams -= 1
+        on_data(name, data, not data)
+    return False
+
+
+def _run_streaming(
+    cmd: List[str],
+    *,
+    cwd: Optional[Path],
+    env: Optional[Dict[str, str]],
+    timeout: Optional[float],
+    output_limit: int,
+    log_path: Optional[Path] = None,
+    task_id: Optional[str] = None,
+) -> Tuple[Optional[int], str, str]:
+    """Run ``cmd`` while streaming output to the run log and ``system.process``.
+
+    Complete lines are written to ``log_path`` as they arrive and published as
+    throttled ``system.process`` deltas.  Captures are tail-truncated to
+    ``output_limit`` bytes per stream.  The return code is ``None`` when the
+    process was killed for exceeding ``timeout``.
+    """
+
+    encoding = locale.getpreferredencoding(False) or "utf-8"
+    captures = {
+        "stdout": _StreamCapture(output_limit, encoding),
+        "stderr": _StreamCapture(output_limit, encoding),
+    }
+    pending: Dict[str, List[str]] = {"stdout": [], "stderr": []}
+    writer = run_log_writer(log_path) if log_path is not None else None
+    proc = subprocess.Popen(
+        cmd,
+        cwd=str(cwd) if cwd else None,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    name = Path(cmd[0]).name if cmd else "process"
+    base = {"name": name, "pid": proc.pid, "task_id": task_id}
+    publish("system.process", {**base, "status": "started", "detail": "started"})
+    last_publish = time.monotonic()
+
+    def _publish_pending(force: bool = False) -> None:
+        nonlocal last_publish
+        now = time.monotonic()
+        if not force and now - last_publish < RUN_CHECKED_PUBLISH_INTERVAL:
+            return
+        last_publish = now
+        for stream, lines in pending.items():
+            if not lines:
+                continue
+            publish(
+                "system.process",
+                {
+                    **base,
+                    "status": "output",
+                    "stream": stream,
+                    "lines": list(lines),
+                    "detail": lines[-1][:200],
+                },
+            )
+            lines.clear()
+
+    def _on_data(stream: str, data: bytes, final: bool) -> None:
+        if stream:
+            lines = captures[stream].feed(data, final=final)
+            if lines:
+                if writer is not None:
+                    writer.write(lines, channel=stream)
+                pending[stream].extend(lines)
+        _publish_pending()
+
+    deadline = time.monotonic() + timeout if timeout else None
+    timed_out = False
+    with contextlib.ExitStack() as stack:
+        if writer is not None:
+            stack.enter_context(writer.batch())
+        try:
+            timed_out = _pump_process_output(proc, deadline, _on_data)
+            if not timed_out:
+                remaining = None
+                if deadline is not None:
+                    remaining = max(deadline - time.monotonic(), 0.0)
+                try:
+                    proc.wait(timeout=remaining)
+                except subprocess.TimeoutExpired:
+                    timed_out = True
+        finally:
+            if timed_out or proc.poll() is None:
+                proc.kill()
+            proc.wait()
+            for pipe in (proc.stdout, proc.stderr):
+                if pipe is not None:
+                    pipe.close()
+            for stream, capture in captures.items():
+                tail = capture.feed(b"", final=True)
+                if tail:
+                    if writer is not None:
+                        writer.write(tail, channel=stream)
+                    pending[stream].extend(tail)
+            _publish_pending(force=True)
+
+    return_code = None if timed_out else proc.returncode
+    publish(
+        "system.process",
+        {
+            **base,
+            "status": "timeout" if timed_out else "exited",
+            "exit_code": return_code,
+            "detail": "timed out" if timed_out else f"exit {return_code}",
+        },
+    )
+    return return_code, captures["stdout"].text(), captures["stderr"].text()
+
+
 def run_checked(
     cmd: List[str],
     cwd: Optional[Path] = None,
@@ -14643,6 +17441,9 @@ def run_checked(
     ``operation`` designates high-level flows such as ``"coder"`` or ``"test"`` so
     safety policies can enforce allowlists, denylists, sandbox expectations,
     runtime limits, and network bans while surfacing sentinel telemetry.
+    Output is streamed into the task run log and ``system.process`` while the
+    command runs; the returned captures are tail-truncated to the policy's
+    ``max_output_bytes``.
     """
 
     canonical_cmd = [str(part) for part in cmd]
@@ -14674,6 +17475,9 @@ def run_checked(
     blocked = False
     policy: Optional[OperationPolicy] = None
     enforced_limit: Optional[int] = None
+    stream_log_path: Optional[Path] = None
+    streamed = False
+    timeout_note = ""
     try:
         with safety_manager.operation_guard(operation) as active_policy:
             policy = active_policy
@@ -14718,27 +17522,41 @@ def run_checked(
                         )
                     policy_env = merged_env
 
+                output_limit = RUN_CHECKED_OUTPUT_CAP
+                if policy and policy.max_output_bytes is not None:
+                    output_limit = int(policy.max_output_bytes)
+
+                if task is not None:
+                    try:
+                        stream_log_path, _ = resolve_run_log_path(task, dataset_root)
+                    except Exception as exc:
+                        log_exception("Task run-log path failed", exc)
+
                 try:
-                    cp = subprocess.run(
+                    exit_code, stdout, stderr = _run_streaming(
                         canonical_cmd,
-                        cwd=str(cwd) if cwd else None,
+                        cwd=cwd,
                         env=policy_env,
-                        capture_output=True,
-                        text=True,
                         timeout=effective_timeout,
+                        output_limit=output_limit,
+                        log_path=stream_log_path,
+                        task_id=task.id if task is not None else None,
                     )
-                    return_code = cp.returncode
-                    stdout = cp.stdout or ""
-                    stderr = cp.stderr or ""
-                except subprocess.TimeoutExpired as exc:
-                    return_code = -1
-                    stdout = exc.stdout or stdout
-                    stderr = exc.stderr or stderr or str(exc)
-                    limit_for_record = enforced_limit or effective_timeout
-                    if limit_for_record:
-                        safety_manager.record_timeout(
-                            operation, canonical_cmd, int(limit_for_record)
+                    streamed = stream_log_path is not None
+                    if exit_code is None:
+                        return_code = -1
+                        timeout_note = (
+                            f"Command {canonical_cmd!r} timed out after "
+                            f"{effective_timeout} seconds"
                         )
+                        stderr = stderr or timeout_note
+                        limit_for_record = enforced_limit or effective_timeout
+                        if limit_for_record:
+                            safety_manager.record_timeout(
+                                operation, canonical_cmd, int(limit_for_record)
+                            )
+                    else:
+                        return_code = exit_code
                 except Exception as exc:
                     stderr = str(exc)
                     log_exception("run_checked execution failed", exc)
@@ -14748,20 +17566,29 @@ def run_checked(
     finally:
         if task is not None:
             try:
-                if stdout or stderr:
-                    append_run_output(
-                        task,
-                        stdout=stdout,
-                        stderr=stderr,
-                        dataset_root=dataset_root,
-                    )
                 if header_logged or stdout or stderr:
-                    append_run_log(
-                        task,
-                        f"{_utc_iso()} exit {return_code}",
-                        dataset_root,
-                        channel="action",
-                    )
+                    # Streamed output is already in the log; only the timeout
+                    # note, the exit line (or output from a failed launch)
+                    # remain.
+                    log_path, _ = resolve_run_log_path(task, dataset_root)
+                    with run_log_writer(log_path).batch():
+                        if (stdout or stderr) and not streamed:
+                            append_run_output(
+                                task,
+                                stdout=stdout,
+                                stderr=stderr,
+                                dataset_root=dataset_root,
+                            )
+                        elif timeout_note:
+                            append_run_output(
+                                task, stderr=timeout_note, dataset_root=dataset_root
+                            )
+                        append_run_log(
+                            task,
+                            f"{_utc_iso()} exit {return_code}",
+                            dataset_root,
+                            channel="action",
+                        )
             except Exception as log_exc:
                 log_exception("Task run-log update failed", log_exc)
 
@@ -14881,16 +17708,185 @@ def slug(s: str) -> str:
 # Ollama client (local only)
 # --------------------------------------------------------------------------------------
 
+class EmbeddingCache:
+    """Content-addressed embedding cache: an in-memory LRU over SQLite.
+
+    Keys hash the model name together with the text, so the same text embedded
+    by the dataset, the conversation log or the repository index is only sent
+    to Ollama once.  Without a ``path`` only the in-memory layer is used.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        *,
+        capacity: int = 4096,
+        max_rows: int = 200_000,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self.path = path
+        self.capacity = max(0, int(capacity))
+        self.max_rows = max(0, int(max_rows))
+        self._logger = logger or logging.getLogger(f"{VD_LOGGER_NAME}.embed_cache")
+        self._lock = threading.RLock()
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._conn: sqlite3.Connection | None = None
+        self._writes = 0
+
+    @staticmethod
+    def key(model: str, text: str) -> str:
+        return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+    def get(self, model: str, text: str) -> Optional[List[float]]:
+        key = self.key(model, text)
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                return list(vector)
+            conn = self._store()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute(
+                    "SELECT vector FROM embeddings WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error:
+                self._logger.debug("Embedding cache lookup failed", exc_info=True)
+                return None
+            if row is None:
+                return None
+            values = array.array("f")
+            values.frombytes(row[0])
+            if sys.byteorder != "little":
+                values.byteswap()
+            vector = values.tolist()
+            self._remember(key, vector)
+            return list(vector)
+
+    def put(self, model: str, text: str, vector: Sequence[float]) -> None:
+        if not vector:
+            return
+        key = self.key(model, text)
+        with self._lock:
+            self._remember(key, list(vector))
+            conn = self._store()
+            if conn is None:
+                return
+            values = array.array("f", vector)
+            if sys.byteorder != "little":
+                values.byteswap()
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO embeddings (key, model, vector) "
+                    "VALUES (?, ?, ?)",
+                    (key, model, values.tobytes()),
+                )
+                conn.commit()
+            except sqlite3.Error:
+                self._logger.debug("Embedding cache write failed", exc_info=True)
+                return
+            self._writes += 1
+            if self.max_rows and self._writes % 1024 == 0:
+                self._prune(conn)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ------------------------------------------------------------------
+    def _remember(self, key: str, vector: List[float]) -> None:
+        if not self.capacity:
+            return
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.capacity:
+            self._memory.popitem(last=False)
+
+    def _store(self) -> sqlite3.Connection | None:
+        if self._conn is not None or self.path is None:
+            return self._conn
+        try:
+            ensure_dir(self.path.parent)
+            conn = sqlite3.connect(
+                str(self.path), timeout=30.0, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, model TEXT, vector BLOB)"
+            )
+            conn.commit()
+        except (OSError, sqlite3.Error):
+            self._logger.warning(
+                "Embedding cache unavailable at %s", self.path, exc_info=True
+            )
+            self.path = None
+            return None
+        self._conn = conn
+        return conn
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        try:
+            (count,) = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+            excess = count - self.max_rows
+            if excess > 0:
+                conn.execute(
+                    "DELETE FROM embeddings WHERE rowid IN "
+                    "(SELECT rowid FROM embeddings ORDER BY rowid LIMIT ?)",
+                    (excess,),
+                )
+                conn.commit()
+        except sqlite3.Error:
+            self._logger.debug("Embedding cache prune failed", exc_info=True)
+
+
 class OllamaClient:
-    def __init__(self, host: str = OLLAMA_HOST):
+    _EMBED_BATCH_SIZE = 64
+
+    def __init__(
+        self,
+        host: str = OLLAMA_HOST,
+        *,
+        cache: Optional[EmbeddingCache] = None,
+    ):
         self.host = host.rstrip("/")
+        self.cache = cache if cache is not None else EmbeddingCache()
+        self._session: Any = None
+        self._session_lock = threading.Lock()
+        self._batch_endpoint = True
 
     def _http(self) -> bool:
         return requests_available()
 
+    def _client(self, feature: str) -> Any:
+        """Return a keep-alive ``requests.Session`` shared by every call."""
+
+        http = ensure_requests(feature)
+        with self._session_lock:
+            if self._session is None:
+                session = http.Session()
+                adapter = http.adapters.HTTPAdapter(
+                    pool_connections=4, pool_maxsize=16
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
+
+    def close(self) -> None:
+        with self._session_lock:
+            session, self._session = self._session, None
+        if session is not None:
+            session.close()
+        self.cache.close()
+
     def health(self) -> Tuple[bool, str]:
         try:
-            http = ensure_requests("Ollama HTTP health check")
+            http = self._client("Ollama HTTP health check")
         except OptionalDependencyError as exc:
             notify_dependency_missing(exc)
             return False, exc.user_message
@@ -14902,7 +17898,7 @@ class OllamaClient:
 
     def list_models(self) -> Tuple[bool, List[str], str]:
         try:
-            http = ensure_requests("Ollama model listing")
+            http = self._client("Ollama model listing")
         except OptionalDependencyError as exc:
             notify_dependency_missing(exc)
         else:
@@ -14928,8 +17924,11 @@ class OllamaClient:
             return True, [], ""
 
     def embeddings(self, model: str, text: str) -> Tuple[bool, List[float], str]:
+        cached = self.cache.get(model, text)
+        if cached is not None:
+            return True, cached, ""
         try:
-            http = ensure_requests("Ollama embeddings API")
+            http = self._client("Ollama embeddings API")
         except OptionalDependencyError as exc:
             notify_dependency_missing(exc)
             return False, [], exc.user_message
@@ -14944,23 +17943,78 @@ class OllamaClient:
             vec = obj.get("embedding") or (obj.get("data") or [{}])[0].get("embedding")
             if not isinstance(vec, list):
                 return False, [], "bad embedding response"
+            self.cache.put(model, text, vec)
             return True, vec, ""
         except Exception as e:
             return False, [], str(e)
 
+    def embed_many(
+        self, model: str, texts: Sequence[str]
+    ) -> Tuple[bool, List[List[float]], str]:
+        """Embed ``texts`` in order, batching cache misses into ``/api/embed``.
+
+        Failed entries come back as empty lists and ``ok`` is ``False`` when any
+        entry failed.  Servers without the batch endpoint fall back to one
+        ``embeddings`` call per text.
+        """
+
+        results: List[List[float]] = [[] for _ in texts]
+        missing: Dict[str, List[int]] = {}
+        for index, text in enumerate(texts):
+            cached = self.cache.get(model, text)
+            if cached is not None:
+                results[index] = cached
+            else:
+                missing.setdefault(text, []).append(index)
+        if not missing:
+            return True, results, ""
+        try:
+            http = self._client("Ollama embeddings API")
+        except OptionalDependencyError as exc:
+            notify_dependency_missing(exc)
+            return False, results, exc.user_message
+        pending = list(missing)
+        error = ""
+        for start in range(0, len(pending), self._EMBED_BATCH_SIZE):
+            chunk = pending[start : start + self._EMBED_BATCH_SIZE]
+            vectors: List[Any] = []
+            if self._batch_endpoint:
+                try:
+                    r = http.post(
+                        f"{self.host}/api/embed",
+                        json={"model": model, "input": chunk},
+                        timeout=120,
+                    )
+                    if r.ok:
+                        vectors = r.json().get("embeddings") or []
+                    elif r.status_code == 404:
+                        self._batch_endpoint = False
+                    else:
+                        error = f"{r.status_code} {r.text[:200]}"
+                except Exception as e:
+                    error = str(e)
+            if len(vectors) != len(chunk):
+                vectors = [self.embeddings(model, text) for text in chunk]
+                vectors = [vec if ok else None for ok, vec, _ in vectors]
+            for text, vec in zip(chunk, vectors):
+                if not isinstance(vec, list) or not vec:
+                    continue
+                self.cache.put(model, text, vec)
+                for index in missing[text]:
+                    results[index] = list(vec)
+        ok = all(results[i] for indices in missing.values() for i in indices)
+        if ok:
+            error = ""
+        return ok, results, error or ("" if ok else "embedding failed")
+
     def chat(self, model: str, messages: List[Dict[str, Any]], images: Optional[List[str]] = None) -> Tuple[bool, str, str]:
         try:
-            http = ensure_requests("Ollama chat API")
+            http = self._client("Ollama chat API")
         except OptionalDependencyError as exc:
             notify_dependency_missing(exc)
             return False, "", exc.user_message
         try:
-            body: Dict[str, Any] = {"model": model, "messages": messages, "stream": False}
-            if images:
-                for msg in reversed(messages):
-                    if msg.get("role") == "user":
-                        msg["images"] = images
-                        break
+            body = self._chat_body(model, messages, images, stream=False)
             r = http.post(
                 f"{self.host}/api/chat",
                 json=body,
@@ -14980,6 +18034,81 @@ class OllamaClient:
         except Exception as e:
             return False, "", str(e)
 
+    def chat_stream(
+        self,
+        model: str,
+        messages: List[Dict[str, Any]],
+        images: Optional[List[str]] = None,
+        *,
+        on_delta: Optional[Callable[[str], None]] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> Tuple[bool, str, str]:
+        """Stream ``/api/chat`` and hand each content delta to ``on_delta``.
+
+        Returns the same ``(ok, content, error)`` triple as ``chat``.  Setting
+        ``cancel`` stops reading at the next NDJSON line; the text received so
+        far is returned with the error ``"cancelled"``.
+        """
+
+        try:
+            http = self._client("Ollama chat API")
+        except OptionalDependencyError as exc:
+            notify_dependency_missing(exc)
+            return False, "", exc.user_message
+        parts: List[str] = []
+        try:
+            body = self._chat_body(model, messages, images, stream=True)
+            r = http.post(
+                f"{self.host}/api/chat",
+                json=body,
+                timeout=(10, 600),
+                stream=True,
+                headers={"Content-Type": "application/json"},
+            )
+            try:
+                if not r.ok:
+                    return False, "", f"{r.status_code} {r.text[:200]}"
+                for raw in r.iter_lines():
+                    if cancel is not None and cancel.is_set():
+                        return False, "".join(parts), "cancelled"
+                    if not raw:
+                        continue
+                    data = json.loads(raw)
+                    if data.get("error"):
+                        return False, "".join(parts), str(data["error"])
+                    delta = (data.get("message") or {}).get("content", "") or data.get(
+                        "response", ""
+                    )
+                    if delta:
+                        parts.append(delta)
+                        if on_delta is not None:
+                            on_delta(delta)
+                    if data.get("done"):
+                        break
+            finally:
+                r.close()
+            if cancel is not None and cancel.is_set():
+                return False, "".join(parts), "cancelled"
+            return True, "".join(parts), ""
+        except Exception as e:
+            return False, "".join(parts), str(e)
+
+    @staticmethod
+    def _chat_body(
+        model: str,
+        messages: List[Dict[str, Any]],
+        images: Optional[List[str]],
+        *,
+        stream: bool,
+    ) -> Dict[str, Any]:
+        body: Dict[str, Any] = {"model": model, "messages": messages, "stream": stream}
+        if images:
+            for msg in reversed(messages):
+                if msg.get("role") == "user":
+                    msg["images"] = images
+                    break
+        return body
+
 # --------------------------------------------------------------------------------------
 # Lexicons (minimal)
 # --------------------------------------------------------------------------------------
@@ -15049,6 +18178,536 @@ def cosine(a: List[float], b: List[float]) -> float:
     return num / (da * db)
 
 
+def _dataset_index_prefix(embedder: str) -> str:
+    slug = re.sub(r"[^A-Za-z0-9._-]+", "_", embedder).strip("._-") or "default"
+    digest = hashlib.blake2b(embedder.encode("utf-8"), digest_size=4).hexdigest()
+    return f"{slug}-{digest}"
+
+
+class DatasetVectorIndex:
+    """Persistent flat float32 index over dataset node vectors of one width.
+
+    Every ``(embedder, dim)`` pair owns a directory below ``dataset_index/``,
+    so managers on different embedders never reset each other's vectors.
+    Vectors are appended to ``vectors.<gen>.f32`` and their owners to
+    ``rows.<gen>.jsonl``.  An update appends a fresh row and a delete appends
+    a tombstone, so writes never rewrite the store.  Compaction writes the
+    next generation and switches to it with a single manifest replace once
+    dead rows outnumber the live ones.  A query scores the whole block in one
+    matrix product.
+    """
+
+    DIRNAME = "dataset_index"
+    MANIFEST_FILENAME = "manifest.json"
+    VERSION = 2
+    COMPACT_MIN_DEAD = 1024
+
+    def __init__(
+        self,
+        data_root: Path,
+        embedder: str,
+        dim: int,
+        *,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        if dim <= 0:
+            raise ValueError(f"Dataset vector index needs a positive width, got {dim}")
+        self.data_root = Path(data_root)
+        self.embedder = embedder
+        base = ensure_dir(self.data_root / self.DIRNAME)
+        self.root = ensure_dir(base / f"{_dataset_index_prefix(embedder)}-{dim}")
+        self.manifest_path = self.root / self.MANIFEST_FILENAME
+        self.logger = logger or logging.getLogger(f"{VD_LOGGER_NAME}.dataset_index")
+        self._lock = threading.RLock()
+        gitignore = base / ".gitignore"
+        if not gitignore.exists():
+            gitignore.write_text("*\n!.gitignore\n", encoding="utf-8")
+        self._dim = dim
+        self._generation = 0
+        self._manifest_mtime = 0
+        self._clear_memory()
+        with self._lock:
+            self._load_locked()
+
+    @property
+    def dim(self) -> int:
+        return self._dim
+
+    @property
+    def vectors_path(self) -> Path:
+        return self.root / f"vectors.{self._generation}.f32"
+
+    @property
+    def rows_path(self) -> Path:
+        return self.root / f"rows.{self._generation}.jsonl"
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._rows)
+
+    def has_dataset(self, dataset_path: Path) -> bool:
+        """Return ``True`` once ``dataset_path`` has been scanned into the index."""
+
+        with self._lock:
+            self._refresh_locked()
+            return self._dataset_key(dataset_path) in self._datasets
+
+    def upsert(
+        self, dataset_path: Path, anchor: str, vector: Sequence[float]
+    ) -> None:
+        if not vector:
+            self.remove(dataset_path, anchor)
+            return
+        if len(vector) != self._dim:
+            self.logger.debug(
+                "Skipping %d-dim vector for %s in the %d-dim dataset index",
+                len(vector),
+                anchor,
+                self._dim,
+            )
+            return
+        key = (self._dataset_key(dataset_path), anchor)
+        with self._lock:
+            self._refresh_locked()
+            previous = self._rows.get(key)
+            if previous is not None:
+                self._kill_row_locked(previous)
+            row = self._append_vector_locked(vector, key)
+            self._append_log_locked(
+                [{"op": "put", "dataset": key[0], "anchor": anchor, "row": row}]
+            )
+            self._maybe_compact_locked()
+
+    def remove(self, dataset_path: Path, anchor: str) -> None:
+        key = (self._dataset_key(dataset_path), anchor)
+        with self._lock:
+            self._refresh_locked()
+            row = self._rows.get(key)
+            if row is None:
+                return
+            self._kill_row_locked(row)
+            self._append_log_locked(
+                [{"op": "del", "dataset": key[0], "anchor": anchor}]
+            )
+            self._maybe_compact_locked()
+
+    def add_dataset(
+        self,
+        dataset_path: Path,
+        vectors: Iterable[Tuple[str, Sequence[float]]],
+    ) -> int:
+        """Index every ``(anchor, vector)`` of a dataset and mark it as scanned.
+
+        Vectors whose width differs from the index dimension are skipped.
+        """
+
+        dataset_key = self._dataset_key(dataset_path)
+        with self._lock:
+            self._refresh_locked()
+            lines: List[Dict[str, Any]] = []
+            added = 0
+            for anchor, vector in vectors:
+                if len(vector) != self._dim:
+                    continue
+                key = (dataset_key, anchor)
+                previous = self._rows.get(key)
+                if previous is not None:
+                    self._kill_row_locked(previous)
+                row = self._append_vector_locked(vector, key)
+                lines.append(
+                    {"op": "put", "dataset": dataset_key, "anchor": anchor, "row": row}
+                )
+                added += 1
+            lines.append({"op": "scan", "dataset": dataset_key})
+            self._datasets.add(dataset_key)
+            self._append_log_locked(lines)
+            self._maybe_compact_locked()
+            return added
+
+    def search(
+        self, vector: Sequence[float], k: int
+    ) -> List[Tuple[float, Path, str]]:
+        """Return ``(similarity, dataset_path, anchor)`` for the ``k`` best rows."""
+
+        with self._lock:
+            self._refresh_locked()
+            live = len(self._rows)
+            if k <= 0 or not live or len(vector) != self._dim:
+                return []
+            take = min(k, live)
+            size = self._size
+            if np is not None:
+                query = np.asarray(vector, dtype=np.float32)
+                query_norm = np.float32(np.linalg.norm(query))
+                denom = self._norms[:size] * query_norm
+                valid = denom > 0
+                dots = self._matrix[:size] @ query
+                scores = np.where(valid, dots / np.where(valid, denom, 1.0), 0.0)
+                scores = np.where(self._live[:size], scores, -np.inf)
+                best = np.argpartition(-scores, take - 1)[:take]
+                order = best[np.argsort(-scores[best], kind="stable")]
+                ranked = [(float(scores[row]), int(row)) for row in order]
+            else:
+                query_norm = math.sqrt(sum(x * x for x in vector))
+                dim = self._dim
+                view = memoryview(self._matrix)
+                candidates: List[Tuple[float, int]] = []
+                for row, owner in enumerate(self._owners):
+                    if owner is None:
+                        continue
+                    norm = self._norms[row]
+                    if norm == 0 or query_norm == 0:
+                        candidates.append((0.0, row))
+                        continue
+                    start = row * dim
+                    dot = sum(
+                        x * y for x, y in zip(vector, view[start : start + dim])
+                    )
+                    candidates.append((dot / (norm * query_norm), row))
+                ranked = heapq.nlargest(take, candidates, key=lambda item: item[0])
+            results: List[Tuple[float, Path, str]] = []
+            for score, row in ranked:
+                owner = self._owners[row]
+                if owner is None:
+                    continue
+                results.append((score, self._dataset_path(owner[0]), owner[1]))
+            return results
+
+    # ------------------------------------------------------------------
+    def _dataset_key(self, dataset_path: Path) -> str:
+        path = Path(dataset_path)
+        try:
+            return path.resolve().relative_to(self.data_root.resolve()).as_posix()
+        except ValueError:
+            return path.resolve().as_posix()
+
+    def _dataset_path(self, key: str) -> Path:
+        path = Path(key)
+        return path if path.is_absolute() else self.data_root / path
+
+    def _clear_memory(self) -> None:
+        dim = self._dim
+        self._size = 0
+        self._owners: List[Optional[Tuple[str, str]]] = []
+        self._rows: Dict[Tuple[str, str], int] = {}
+        self._datasets: Set[str] = set()
+        self._dead = 0
+        self._log_size = 0
+        if np is not None:
+            self._matrix = np.zeros((0, dim), dtype=np.float32)
+            self._norms = np.zeros(0, dtype=np.float32)
+            self._live = np.zeros(0, dtype=bool)
+        else:
+            self._matrix = array.array("f")
+            self._norms = []
+
+    def _reserve_locked(self, rows: int) -> None:
+        if np is None or rows <= self._matrix.shape[0]:
+            return
+        capacity = max(64, rows, self._matrix.shape[0] * 2)
+        size = self._size
+        matrix = np.zeros((capacity, self._dim), dtype=np.float32)
+        matrix[:size] = self._matrix[:size]
+        norms = np.zeros(capacity, dtype=np.float32)
+        norms[:size] = self._norms[:size]
+        live = np.zeros(capacity, dtype=bool)
+        live[:size] = self._live[:size]
+        self._matrix, self._norms, self._live = matrix, norms, live
+
+    def _append_vector_locked(
+        self, vector: Sequence[float], key: Tuple[str, str]
+    ) -> int:
+        row = self._size
+        if np is not None:
+            self._reserve_locked(row + 1)
+            self._matrix[row] = vector
+            self._norms[row] = np.linalg.norm(self._matrix[row])
+            self._live[row] = True
+            data = self._matrix[row].astype("<f4").tobytes()
+        else:
+            values = array.array("f", vector)
+            self._matrix.extend(values)
+            self._norms.append(math.sqrt(sum(x * x for x in values)))
+            if sys.byteorder != "little":
+                values.byteswap()
+            data = values.tobytes()
+        with self.vectors_path.open("ab") as handle:
+            handle.write(data)
+        self._owners.append(key)
+        self._rows[key] = row
+        self._size += 1
+        return row
+
+    def _kill_row_locked(self, row: int) -> None:
+        owner = self._owners[row]
+        if owner is None:
+            return
+        self._owners[row] = None
+        if self._rows.get(owner) == row:
+            del self._rows[owner]
+        if np is not None:
+            self._live[row] = False
+        self._dead += 1
+
+    def _append_log_locked(self, entries: Sequence[Mapping[str, Any]]) -> None:
+        if not entries:
+            return
+        data = "".join(
+            json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries
+        ).encode("utf-8")
+        with self.rows_path.open("ab") as handle:
+            handle.write(data)
+        self._log_size += len(data)
+
+    def _manifest_stamp(self) -> int:
+        try:
+            return self.manifest_path.stat().st_mtime_ns
+        except OSError:
+            return 0
+
+    def _write_manifest_locked(self) -> None:
+        payload = {
+            "version": self.VERSION,
+            "embedder": self.embedder,
+            "dim": self._dim,
+            "generation": self._generation,
+        }
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(tmp_path, self.manifest_path)
+        self._manifest_mtime = self._manifest_stamp()
+
+    def _drop_stale_generations_locked(self) -> None:
+        keep = {self.vectors_path.name, self.rows_path.name}
+        for path in self.root.iterdir():
+            if path.name in keep or path.suffix not in {".f32", ".jsonl"}:
+                continue
+            try:
+                path.unlink()
+            except OSError:
+                continue
+
+    def _reset_locked(self) -> None:
+        self._generation = 0
+        self._clear_memory()
+        self.vectors_path.write_bytes(b"")
+        self.rows_path.write_bytes(b"")
+        self._write_manifest_locked()
+        self._drop_stale_generations_locked()
+
+    def _refresh_locked(self) -> None:
+        """Reload when another writer touched the log or compacted since we looked."""
+
+        try:
+            size = self.rows_path.stat().st_size
+        except OSError:
+            size = -1
+        if size != self._log_size or self._manifest_stamp() != self._manifest_mtime:
+            self._load_locked()
+
+    def _load_locked(self) -> None:
+        stamp = self._manifest_stamp()
+        try:
+            manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            manifest = {}
+        generation = manifest.get("generation") if isinstance(manifest, dict) else None
+        if (
+            not isinstance(manifest, dict)
+            or manifest.get("version") != self.VERSION
+            or manifest.get("embedder") != self.embedder
+            or manifest.get("dim") != self._dim
+            or not isinstance(generation, int)
+            or generation < 0
+        ):
+            self._reset_locked()
+            return
+        self._generation = generation
+        self._manifest_mtime = stamp
+        self._clear_memory()
+        dim = self._dim
+        try:
+            raw = self.rows_path.read_bytes()
+        except OSError:
+            raw = b""
+        self._log_size = len(raw)
+        try:
+            if np is not None:
+                data = np.fromfile(self.vectors_path, dtype="<f4")
+            else:
+                data = array.array("f")
+                data.frombytes(self.vectors_path.read_bytes())
+                if sys.byteorder != "little":
+                    data.byteswap()
+        except (OSError, ValueError):
+            data = None
+        rows = len(data) // dim if data is not None else 0
+        if rows:
+            if np is not None:
+                self._reserve_locked(rows)
+                block = data[: rows * dim].reshape(rows, dim)
+                self._matrix[:rows] = block
+                self._norms[:rows] = np.linalg.norm(block, axis=1)
+            else:
+                del data[rows * dim :]
+                self._matrix = data
+                view = memoryview(data)
+                self._norms = [
+                    math.sqrt(sum(x * x for x in view[start : start + dim]))
+                    for start in range(0, rows * dim, dim)
+                ]
+        self._size = rows
+        self._owners = [None] * rows
+        for line in raw.decode("utf-8", errors="replace").splitlines():
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(entry, dict):
+                continue
+            dataset_key = entry.get("dataset")
+            if not isinstance(dataset_key, str):
+                continue
+            op = entry.get("op")
+            if op == "scan":
+                self._datasets.add(dataset_key)
+                continue
+            key = (dataset_key, str(entry.get("anchor") or ""))
+            previous = self._rows.pop(key, None)
+            if previous is not None:
+                self._owners[previous] = None
+            row = entry.get("row")
+            if op == "put" and isinstance(row, int) and 0 <= row < rows:
+                if self._owners[row] is not None:
+                    self._rows.pop(self._owners[row], None)
+                self._owners[row] = key
+                self._rows[key] = row
+        if np is not None:
+            self._live[:rows] = [owner is not None for owner in self._owners]
+        self._dead = rows - len(self._rows)
+
+    def _maybe_compact_locked(self) -> None:
+        if self._dead < self.COMPACT_MIN_DEAD or self._dead <= len(self._rows):
+            return
+        live_rows = [row for row, owner in enumerate(self._owners) if owner is not None]
+        entries: List[Dict[str, Any]] = [
+            {"op": "scan", "dataset": key} for key in sorted(self._datasets)
+        ]
+        dim = self._dim
+        if np is not None:
+            packed = self._matrix[live_rows]
+        else:
+            view = memoryview(self._matrix)
+            packed = array.array("f")
+            for row in live_rows:
+                packed.extend(view[row * dim : (row + 1) * dim])
+        for new_row, row in enumerate(live_rows):
+            dataset_key, anchor = self._owners[row]  # type: ignore[misc]
+            entries.append(
+                {"op": "put", "dataset": dataset_key, "anchor": anchor, "row": new_row}
+            )
+        generation = self._generation + 1
+        _write_vectors(self.root / f"vectors.{generation}.f32", packed)
+        (self.root / f"rows.{generation}.jsonl").write_text(
+            "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries),
+            encoding="utf-8",
+        )
+        # The manifest replace is the commit point: readers see either the old
+        # generation or the complete new one, never a mix of the two files.
+        self._generation = generation
+        self._write_manifest_locked()
+        self._drop_stale_generations_locked()
+        self.logger.debug(
+            "Compacted dataset vector index: %d live rows, %d dropped",
+            len(live_rows),
+            self._dead,
+        )
+        self._load_locked()
+
+
+_DATASET_VECTOR_INDEXES: Dict[Tuple[Path, str, int], DatasetVectorIndex] = {}
+_DATASET_VECTOR_INDEXES_LOCK = RLock()
+
+
+def get_dataset_vector_index(
+    data_root: Path, embedder: str, dim: int
+) -> DatasetVectorIndex:
+    """Return (and cache) the shared ``(embedder, dim)`` index for ``data_root``."""
+
+    key = (Path(data_root).resolve(), embedder, dim)
+    with _DATASET_VECTOR_INDEXES_LOCK:
+        index = _DATASET_VECTOR_INDEXES.get(key)
+        if index is None:
+            index = DatasetVectorIndex(key[0], embedder, dim)
+            _DATASET_VECTOR_INDEXES[key] = index
+        return index
+
+
+class DatasetVectorIndexes:
+    """Route one embedder's vectors to the ``DatasetVectorIndex`` of their width.
+
+    A vector of a new width opens a sibling index instead of resetting the
+    existing one, and the anchor is dropped from the other widths so a query
+    never sees a stale row for it.
+    """
+
+    _LEGACY_FILENAMES = ("vectors.f32", "rows.jsonl", "manifest.json")
+
+    def __init__(self, data_root: Path, embedder: str) -> None:
+        self.data_root = Path(data_root).resolve()
+        self.embedder = embedder
+        self._lock = threading.Lock()
+        self._dims: Set[int] = set()
+        base = self.data_root / DatasetVectorIndex.DIRNAME
+        prefix = f"{_dataset_index_prefix(embedder)}-"
+        if base.is_dir():
+            for entry in base.iterdir():
+                if entry.name in self._LEGACY_FILENAMES:
+                    with contextlib.suppress(OSError):
+                        entry.unlink()
+                    continue
+                suffix = entry.name[len(prefix) :]
+                if entry.is_dir() and entry.name.startswith(prefix) and suffix.isdigit():
+                    self._dims.add(int(suffix))
+
+    def for_dim(self, dim: int) -> DatasetVectorIndex:
+        with self._lock:
+            self._dims.add(dim)
+        return get_dataset_vector_index(self.data_root, self.embedder, dim)
+
+    def upsert(
+        self, dataset_path: Path, anchor: str, vector: Sequence[float]
+    ) -> None:
+        width = len(vector)
+        with self._lock:
+            others = sorted(dim for dim in self._dims if dim != width)
+        for dim in others:
+            self.for_dim(dim).remove(dataset_path, anchor)
+        if width:
+            self.for_dim(width).upsert(dataset_path, anchor, vector)
+
+
+_DATASET_LOG_LOCKS: Dict[Path, Tuple[threading.RLock, threading.Lock]] = {}
+_DATASET_LOG_LOCKS_LOCK = RLock()
+
+
+def _dataset_log_locks(dataset_path: Path) -> Tuple[threading.RLock, threading.Lock]:
+    """Return the ``(log, compaction)`` locks shared by every handle on a file.
+
+    Several ``DatasetNodePersistence`` instances may point at one
+    ``dataset.jsonl``; compaction only stays safe when their appends and the
+    final tail copy + ``os.replace`` serialise on the same lock.
+    """
+
+    key = Path(dataset_path).resolve()
+    with _DATASET_LOG_LOCKS_LOCK:
+        locks = _DATASET_LOG_LOCKS.get(key)
+        if locks is None:
+            locks = (threading.RLock(), threading.Lock())
+            _DATASET_LOG_LOCKS[key] = locks
+        return locks
+
+
 @dataclass(slots=True)
 class DatasetNode:
     """Representation of a persisted dataset node and its sidecars."""
@@ -15063,26 +18722,53 @@ class DatasetNode:
 
 
 class DatasetNodePersistence:
-    """Manage dataset JSONL cores with sidecar metadata and vectors."""
+    """Manage dataset JSONL cores with sidecar metadata and vectors.
+
+    ``dataset.jsonl`` is an append-only log: an update appends the merged
+    record and a delete appends a tombstone.  An in-memory anchor→byte-offset
+    index, built on first use and extended from the tail as the file grows,
+    serves point lookups with a single seek.  Once dead lines dominate, the
+    log is compacted on a background thread.
+
+    Vectors, metadata and thumbnail listings live in one SQLite store,
+    ``dataset_nodes/sidecars.sqlite3``; per-anchor ``.vec.json``/``.meta.json``
+    files from older layouts are imported (and removed) the first time the
+    store is opened.
+    """
 
     SIDECAR_DIRNAME = "dataset_nodes"
+    STORE_FILENAME = "sidecars.sqlite3"
+    STORE_VERSION = 1
     VECTOR_SUFFIX = ".vec.json"
     META_SUFFIX = ".meta.json"
     THUMBNAIL_DIRNAME = "thumbnails"
+    TOMBSTONE_KEY = "_deleted"
+    COMPACT_MIN_DEAD = 64
+    COMPACT_DEAD_RATIO = 0.5
 
     def __init__(
         self,
         dataset_path: Path,
         *,
         logger: logging.Logger | None = None,
+        vector_indexes: DatasetVectorIndexes | None = None,
     ) -> None:
         self.dataset_path = dataset_path
         self.logger = logger or logging.getLogger(VD_LOGGER_NAME)
+        self.vector_indexes = vector_indexes
         base_dir = ensure_dir(self.dataset_path.parent)
         self.sidecar_root = ensure_dir(base_dir / self.SIDECAR_DIRNAME)
         self.thumbnail_root = ensure_dir(self.sidecar_root / self.THUMBNAIL_DIRNAME)
         self._ensure_gitignore(self.sidecar_root)
         self._ensure_gitignore(self.thumbnail_root)
+        self.store_path = self.sidecar_root / self.STORE_FILENAME
+        self._conn: sqlite3.Connection | None = None
+        self._lock, self._compact_lock = _dataset_log_locks(self.dataset_path)
+        self._compacting = False
+        self._offsets: Dict[str, Tuple[int, int]] = {}
+        self._log_lines = 0
+        self._log_size = -1
+        self._log_inode = 0
 
     def append(
         self,
@@ -15094,11 +18780,11 @@ class DatasetNodePersistence:
     ) -> DatasetNode:
         anchor = str(core.get("anchor") or core.get("id") or uuid.uuid4().hex)
         sanitized = self._sanitize_core(core, anchor)
-        self.dataset_path.parent.mkdir(parents=True, exist_ok=True)
-        with self.dataset_path.open("a", encoding="utf-8") as fh:
-            fh.write(json.dumps(sanitized, ensure_ascii=False) + "\n")
+        with self._lock:
+            self._append_records_locked([sanitized])
 
         vector_path = self._write_embedding(anchor, embedding)
+        self._sync_vector_index(anchor, embedding)
         meta_path = self._write_metadata(anchor, metadata)
         thumb_paths = self._register_thumbnails(anchor, thumbnails)
         metadata_payload = self._read_metadata(anchor)
@@ -15118,28 +18804,36 @@ class DatasetNodePersistence:
             anchor = str(record.get("anchor") or record.get("id") or "").strip()
             if not anchor:
                 continue
-            raw_embedding = record.get("embedding")
-            sanitized = self._sanitize_core(record, anchor)
-            embedding = self._read_embedding(anchor)
-            if not embedding and isinstance(raw_embedding, list):
-                embedding = self._coerce_vector(raw_embedding)
-            metadata_payload = self._read_metadata(anchor)
-            thumbs = self._list_thumbnails(anchor)
-            yield DatasetNode(
-                anchor=anchor,
-                core=sanitized,
-                embedding=embedding,
-                metadata=metadata_payload,
-                vector_path=self._embedding_path(anchor) if embedding else None,
-                thumbnail_paths=thumbs,
-                meta_path=self._metadata_path(anchor) if metadata_payload else None,
-            )
+            yield self._node_from_record(record, anchor)
 
     def load(self, anchor: str) -> DatasetNode | None:
-        for node in self.iter_nodes():
-            if node.anchor == anchor:
-                return node
-        return None
+        with self._lock:
+            record = self._record_locked(anchor)
+        if record is None:
+            return None
+        return self._node_from_record(record, anchor)
+
+    def load_many(self, anchors: Iterable[str]) -> Dict[str, DatasetNode]:
+        """Load several nodes by anchor, skipping anchors that are missing."""
+
+        found: Dict[str, DatasetNode] = {}
+        for anchor in anchors:
+            if anchor in found:
+                continue
+            node = self.load(anchor)
+            if node is not None:
+                found[anchor] = node
+        return found
+
+    def __contains__(self, anchor: object) -> bool:
+        with self._lock:
+            self._refresh_locked()
+            return anchor in self._offsets
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh_locked()
+            return len(self._offsets)
 
     def update(
         self,
@@ -15150,30 +18844,28 @@ class DatasetNodePersistence:
         metadata: Optional[Mapping[str, Any]] = None,
         thumbnails: Optional[Iterable[Path]] = None,
     ) -> DatasetNode | None:
-        records = self._core_records()
-        updated = None
-        rewritten: List[Dict[str, Any]] = []
-        for record in records:
-            record_anchor = str(record.get("anchor") or record.get("id") or "").strip()
-            if not record_anchor:
-                continue
-            if record_anchor == anchor:
-                merged = dict(record)
-                for key, value in (core_updates or {}).items():
-                    if key in {"embedding", "metadata", "thumbnails"}:
-                        continue
-                    merged[key] = value
-                sanitized = self._sanitize_core(merged, anchor)
-                rewritten.append(sanitized)
-                updated = sanitized
-            else:
-                rewritten.append(self._sanitize_core(record, record_anchor))
+        """Merge ``core_updates`` into ``anchor`` and refresh its sidecars.
 
-        if updated is None:
-            return None
+        Only a non-empty ``core_updates`` appends a core line.  Sidecar-only
+        updates (embedding, metadata, thumbnails) leave ``dataset.jsonl``
+        alone, so back-filling deferred embeddings adds no dead log lines.
+        """
+
+        with self._lock:
+            record = self._record_locked(anchor)
+            if record is None:
+                return None
+            merged = dict(record)
+            for key, value in (core_updates or {}).items():
+                if key in {"embedding", "metadata", "thumbnails"}:
+                    continue
+                merged[key] = value
+            updated = self._sanitize_core(merged, anchor)
+            if core_updates:
+                self._append_records_locked([updated])
 
-        self._write_core_records(rewritten)
         vector_path = self._write_embedding(anchor, embedding)
+        self._sync_vector_index(anchor, embedding)
         meta_path = self._write_metadata(anchor, metadata)
         thumb_paths = self._register_thumbnails(anchor, thumbnails)
         metadata_payload = self._read_metadata(anchor)
@@ -15191,29 +18883,236 @@ class DatasetNodePersistence:
         )
 
     def delete(self, anchor: str) -> bool:
-        records = self._core_records()
-        changed = False
-        rewritten: List[Dict[str, Any]] = []
-        for record in records:
-            record_anchor = str(record.get("anchor") or record.get("id") or "").strip()
-            if record_anchor == anchor:
-                changed = True
-                continue
-            rewritten.append(self._sanitize_core(record, record_anchor))
-        if not changed:
-            return False
-        self._write_core_records(rewritten)
+        with self._lock:
+            self._refresh_locked()
+            if anchor not in self._offsets:
+                return False
+            self._append_records_locked(
+                [{"anchor": anchor, self.TOMBSTONE_KEY: True}]
+            )
         self._cleanup_sidecars(anchor)
+        self._sync_vector_index(anchor, [])
         return True
 
-    def thumbnail_dir(self, anchor: str, *, ensure: bool = True) -> Path:
-        directory = self.thumbnail_root / anchor
-        if ensure:
-            directory.mkdir(parents=True, exist_ok=True)
-            self._ensure_gitignore(directory)
-        return directory
+    def thumbnail_dir(self, anchor: str, *, ensure: bool = True) -> Path:
+        directory = self.thumbnail_root / anchor
+        if ensure:
+            directory.mkdir(parents=True, exist_ok=True)
+            self._ensure_gitignore(directory)
+        return directory
+
+    def close(self) -> None:
+        """Close the sidecar store; it is reopened on the next access."""
+
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def compact(self) -> bool:
+        """Rewrite the log with only its live records, preserving their order.
+
+        Live lines are copied without holding the log lock, which every handle
+        on this file shares; anything appended meanwhile is carried over
+        verbatim before the file is swapped in.
+        """
+
+        with self._compact_lock:
+            with self._lock:
+                self._refresh_locked()
+                if self._log_lines == len(self._offsets):
+                    return False
+                snapshot = list(self._offsets.items())
+                snapshot_size = self._log_size
+                inode = self._log_inode
+            fd, tmp_name = tempfile.mkstemp(
+                prefix=".dataset-", suffix=".tmp", dir=self.dataset_path.parent
+            )
+            tmp_path = Path(tmp_name)
+            try:
+                with os.fdopen(fd, "wb") as tmp:
+                    offsets: Dict[str, Tuple[int, int]] = {}
+                    position = 0
+                    with self.dataset_path.open("rb") as src:
+                        for anchor, (offset, length) in snapshot:
+                            src.seek(offset)
+                            line = src.read(length).rstrip(b"\r")
+                            tmp.write(line + b"\n")
+                            offsets[anchor] = (position, len(line))
+                            position += len(line) + 1
+                    with self._lock:
+                        stat = self.dataset_path.stat()
+                        if stat.st_ino != inode or stat.st_size < snapshot_size:
+                            return False
+                        with self.dataset_path.open("rb") as src:
+                            src.seek(snapshot_size)
+                            tail = src.read()
+                        tmp.write(tail)
+                        tmp.flush()
+                        os.fsync(tmp.fileno())
+                        tmp.close()
+                        os.replace(tmp_path, self.dataset_path)
+                        self._offsets = offsets
+                        self._log_lines = len(offsets)
+                        self._log_inode = self.dataset_path.stat().st_ino
+                        self._index_lines_locked(tail, position)
+            except OSError:
+                self.logger.warning(
+                    "Failed to compact %s", self.dataset_path, exc_info=True
+                )
+                return False
+            finally:
+                tmp_path.unlink(missing_ok=True)
+        self.logger.debug(
+            "Compacted %s to %d live records", self.dataset_path, len(offsets)
+        )
+        return True
+
+    # ------------------------------------------------------------------
+    def _refresh_locked(self) -> None:
+        """Bring the offset index up to date with the file on disk."""
+
+        try:
+            stat = self.dataset_path.stat()
+        except FileNotFoundError:
+            self._offsets.clear()
+            self._log_lines = 0
+            self._log_size = 0
+            self._log_inode = 0
+            return
+        if stat.st_ino == self._log_inode and stat.st_size == self._log_size:
+            return
+        if stat.st_ino == self._log_inode and 0 <= self._log_size < stat.st_size:
+            start = self._log_size
+        else:
+            self._offsets.clear()
+            self._log_lines = 0
+            start = 0
+        with self.dataset_path.open("rb") as fh:
+            fh.seek(start)
+            data = fh.read()
+        self._log_inode = stat.st_ino
+        self._index_lines_locked(data, start)
+
+    def _index_lines_locked(self, data: bytes, base: int) -> None:
+        position = 0
+        while True:
+            newline = data.find(b"\n", position)
+            if newline < 0:
+                # A partial trailing line is picked up once it is completed.
+                break
+            raw = data[position:newline]
+            if raw.strip():
+                self._log_lines += 1
+                self._index_line_locked(raw, base + position)
+            position = newline + 1
+        self._log_size = base + position
+
+    def _index_line_locked(self, raw: bytes, offset: int) -> None:
+        try:
+            payload = json.loads(raw)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return
+        if not isinstance(payload, dict):
+            return
+        anchor = str(payload.get("anchor") or payload.get("id") or "").strip()
+        if not anchor:
+            return
+        if payload.get(self.TOMBSTONE_KEY):
+            self._offsets.pop(anchor, None)
+        else:
+            self._offsets[anchor] = (offset, len(raw))
+
+    def _record_locked(self, anchor: str) -> Optional[Dict[str, Any]]:
+        for attempt in range(2):
+            self._refresh_locked()
+            entry = self._offsets.get(anchor)
+            if entry is None:
+                return None
+            offset, length = entry
+            try:
+                with self.dataset_path.open("rb") as fh:
+                    fh.seek(offset)
+                    payload = json.loads(fh.read(length))
+            except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+                payload = None
+            if isinstance(payload, dict) and anchor == str(
+                payload.get("anchor") or payload.get("id") or ""
+            ).strip():
+                return payload
+            # The file was rewritten underneath us; rebuild from scratch.
+            self._log_size = -1
+        return None
+
+    def _append_records_locked(self, records: Sequence[Mapping[str, Any]]) -> None:
+        data = b"".join(
+            json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+            for record in records
+        )
+        self._refresh_locked()
+        self.dataset_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.dataset_path.open("ab") as fh:
+            fh.write(data)
+        self._refresh_locked()
+        self._maybe_compact_locked()
+
+    def _maybe_compact_locked(self) -> None:
+        dead = self._log_lines - len(self._offsets)
+        if (
+            self._compacting
+            or dead < self.COMPACT_MIN_DEAD
+            or dead < self._log_lines * self.COMPACT_DEAD_RATIO
+        ):
+            return
+        self._compacting = True
+        threading.Thread(
+            target=self._compact_in_background,
+            name="DatasetCompaction",
+            daemon=True,
+        ).start()
+
+    def _compact_in_background(self) -> None:
+        try:
+            self.compact()
+        except Exception:
+            self.logger.exception("Dataset compaction failed for %s", self.dataset_path)
+        finally:
+            with self._lock:
+                self._compacting = False
+
+    def _node_from_record(self, record: Mapping[str, Any], anchor: str) -> DatasetNode:
+        raw_embedding = record.get("embedding")
+        sanitized = self._sanitize_core(record, anchor)
+        row = self._sidecar_row(anchor)
+        embedding = self._embedding_from_row(row)
+        if not embedding and isinstance(raw_embedding, list):
+            embedding = self._coerce_vector(raw_embedding)
+        metadata_payload = self._metadata_from_row(row)
+        thumbs = self._thumbnails_from_row(anchor, row)
+        return DatasetNode(
+            anchor=anchor,
+            core=sanitized,
+            embedding=embedding,
+            metadata=metadata_payload,
+            vector_path=self.store_path if embedding else None,
+            thumbnail_paths=thumbs,
+            meta_path=self.store_path if metadata_payload else None,
+        )
+
+    def _sync_vector_index(
+        self, anchor: str, embedding: Optional[List[float]]
+    ) -> None:
+        if self.vector_indexes is None or embedding is None:
+            return
+        try:
+            self.vector_indexes.upsert(
+                self.dataset_path, anchor, self._coerce_vector(embedding)
+            )
+        except OSError:
+            self.logger.warning(
+                "Failed to update dataset vector index for %s", anchor, exc_info=True
+            )
 
-    # ------------------------------------------------------------------
     def _sanitize_core(self, core: Mapping[str, Any], anchor: str) -> Dict[str, Any]:
         record = dict(core)
         record["anchor"] = anchor
@@ -15223,89 +19122,207 @@ class DatasetNodePersistence:
         return record
 
     def _core_records(self) -> List[Dict[str, Any]]:
-        if not self.dataset_path.exists():
-            return []
+        """Return the live records in index order with one sequential read."""
+
+        with self._lock:
+            self._refresh_locked()
+            if not self._offsets:
+                return []
+            entries = list(self._offsets.items())
+            try:
+                data = self.dataset_path.read_bytes()
+            except OSError:
+                return []
         records: List[Dict[str, Any]] = []
-        with self.dataset_path.open("r", encoding="utf-8") as fh:
-            for raw in fh:
-                line = raw.strip()
-                if not line:
+        for anchor, (offset, length) in entries:
+            try:
+                payload = json.loads(data[offset : offset + length])
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue
+            if isinstance(payload, dict):
+                records.append(payload)
+        return records
+
+    def _store(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._conn is not None:
+                return self._conn
+            conn = sqlite3.connect(
+                str(self.store_path), timeout=30.0, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sidecars ("
+                "anchor TEXT PRIMARY KEY, "
+                "embedding BLOB, "
+                "metadata TEXT, "
+                "stored_at TEXT, "
+                "thumbnails TEXT)"
+            )
+            conn.commit()
+            (version,) = conn.execute("PRAGMA user_version").fetchone()
+            if version < self.STORE_VERSION:
+                self._migrate_legacy_sidecars(conn)
+                conn.execute(f"PRAGMA user_version = {self.STORE_VERSION}")
+                conn.commit()
+            self._conn = conn
+            return conn
+
+    def _migrate_legacy_sidecars(self, conn: sqlite3.Connection) -> None:
+        """Import per-anchor ``.vec.json``/``.meta.json`` files into the store."""
+
+        rows: Dict[str, Dict[str, Any]] = {}
+        legacy: List[Path] = []
+        with os.scandir(self.sidecar_root) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.endswith(self.VECTOR_SUFFIX):
+                    anchor = name[: -len(self.VECTOR_SUFFIX)]
+                    column = "embedding"
+                elif name.endswith(self.META_SUFFIX):
+                    anchor = name[: -len(self.META_SUFFIX)]
+                    column = "metadata"
+                else:
                     continue
+                path = Path(entry.path)
                 try:
-                    payload = json.loads(line)
-                except json.JSONDecodeError:
+                    payload = json.loads(path.read_text(encoding="utf-8"))
+                except Exception:
+                    self.logger.debug(
+                        "Skipping unreadable sidecar %s", path, exc_info=True
+                    )
                     continue
-                if isinstance(payload, dict):
-                    records.append(payload)
-        return records
+                legacy.append(path)
+                row = rows.setdefault(anchor, {})
+                if column == "embedding":
+                    if isinstance(payload, dict):
+                        payload = payload.get("embedding")
+                    if isinstance(payload, list):
+                        vector = self._coerce_vector(payload)
+                    else:
+                        vector = []
+                    if vector:
+                        row["embedding"] = self._pack_embedding(vector)
+                elif isinstance(payload, dict):
+                    data = payload.get("metadata")
+                    row["metadata"] = json.dumps(
+                        dict(data) if isinstance(data, Mapping) else {},
+                        ensure_ascii=False,
+                    )
+                    stored_at = payload.get("stored_at")
+                    if isinstance(stored_at, str):
+                        row["stored_at"] = stored_at
+        if self.thumbnail_root.exists():
+            with os.scandir(self.thumbnail_root) as entries:
+                for entry in entries:
+                    if not entry.is_dir():
+                        continue
+                    with os.scandir(entry.path) as files:
+                        names = sorted(
+                            item.name
+                            for item in files
+                            if item.is_file() and item.name != ".gitignore"
+                        )
+                    rows.setdefault(entry.name, {})["thumbnails"] = json.dumps(names)
+        if rows:
+            conn.executemany(
+                "INSERT OR REPLACE INTO sidecars "
+                "(anchor, embedding, metadata, stored_at, thumbnails) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        anchor,
+                        row.get("embedding"),
+                        row.get("metadata"),
+                        row.get("stored_at"),
+                        row.get("thumbnails"),
+                    )
+                    for anchor, row in rows.items()
+                ],
+            )
+        conn.commit()
+        for path in legacy:
+            path.unlink(missing_ok=True)
+        if rows:
+            self.logger.info(
+                "Migrated %d dataset sidecars into %s", len(rows), self.store_path
+            )
 
-    def _write_core_records(self, records: Iterable[Mapping[str, Any]]) -> None:
-        self.dataset_path.parent.mkdir(parents=True, exist_ok=True)
-        with tempfile.NamedTemporaryFile("w", encoding="utf-8", delete=False) as tmp:
-            for record in records:
-                tmp.write(json.dumps(record, ensure_ascii=False) + "\n")
-            tmp.flush()
-            os.fsync(tmp.fileno())
-            tmp_path = Path(tmp.name)
-        os.replace(tmp_path, self.dataset_path)
+    def _sidecar_row(self, anchor: str) -> Optional[Tuple[Any, ...]]:
+        with self._lock:
+            return self._store().execute(
+                "SELECT embedding, metadata, stored_at, thumbnails "
+                "FROM sidecars WHERE anchor = ?",
+                (anchor,),
+            ).fetchone()
+
+    def _upsert_sidecar(self, anchor: str, **columns: Any) -> None:
+        names = ", ".join(columns)
+        placeholders = ", ".join("?" for _ in columns)
+        updates = ", ".join(f"{name} = excluded.{name}" for name in columns)
+        with self._lock:
+            conn = self._store()
+            conn.execute(
+                f"INSERT INTO sidecars (anchor, {names}) VALUES (?, {placeholders}) "
+                f"ON CONFLICT(anchor) DO UPDATE SET {updates}",
+                (anchor, *columns.values()),
+            )
+            conn.commit()
 
     def _write_embedding(
         self, anchor: str, embedding: Optional[List[float]]
     ) -> Optional[Path]:
-        path = self._embedding_path(anchor)
         if embedding is None:
-            return path if path.exists() else None
+            return self.store_path if self._read_embedding(anchor) else None
         vector = self._coerce_vector(embedding)
-        if not vector:
-            if path.exists():
-                path.unlink(missing_ok=True)
-            return None
-        with path.open("w", encoding="utf-8") as fh:
-            json.dump({"embedding": vector}, fh, ensure_ascii=False)
-        return path
+        self._upsert_sidecar(
+            anchor, embedding=self._pack_embedding(vector) if vector else None
+        )
+        return self.store_path if vector else None
 
     def _read_embedding(self, anchor: str) -> List[float]:
-        path = self._embedding_path(anchor)
-        if not path.exists():
+        return self._embedding_from_row(self._sidecar_row(anchor))
+
+    def _embedding_from_row(self, row: Optional[Tuple[Any, ...]]) -> List[float]:
+        if row is None or not row[0]:
             return []
         try:
-            payload = json.loads(path.read_text(encoding="utf-8"))
-            if isinstance(payload, dict):
-                payload = payload.get("embedding")
-            if isinstance(payload, list):
-                return self._coerce_vector(payload)
-        except Exception:
-            self.logger.debug("Failed to read embedding for %s", anchor, exc_info=True)
-        return []
+            return self._unpack_embedding(row[0])
+        except (TypeError, ValueError):
+            self.logger.debug("Failed to decode stored embedding", exc_info=True)
+            return []
 
     def _write_metadata(
         self, anchor: str, metadata: Optional[Mapping[str, Any]]
     ) -> Path:
-        path = self._metadata_path(anchor)
-        if metadata is None and path.exists():
-            return path
-        payload = {
-            "anchor": anchor,
-            "stored_at": datetime.now(UTC).isoformat(),
-            "metadata": dict(metadata or self._read_metadata(anchor)),
-        }
-        with path.open("w", encoding="utf-8") as fh:
-            json.dump(payload, fh, ensure_ascii=False, indent=2)
-        return path
+        row = self._sidecar_row(anchor)
+        if metadata is None and row is not None and row[1] is not None:
+            return self.store_path
+        payload = dict(metadata or self._metadata_from_row(row, stamp=False))
+        self._upsert_sidecar(
+            anchor,
+            metadata=json.dumps(payload, ensure_ascii=False),
+            stored_at=datetime.now(UTC).isoformat(),
+        )
+        return self.store_path
 
     def _read_metadata(self, anchor: str) -> Dict[str, Any]:
-        path = self._metadata_path(anchor)
-        if not path.exists():
+        return self._metadata_from_row(self._sidecar_row(anchor))
+
+    def _metadata_from_row(
+        self, row: Optional[Tuple[Any, ...]], *, stamp: bool = True
+    ) -> Dict[str, Any]:
+        if row is None or row[1] is None:
             return {}
         try:
-            payload = json.loads(path.read_text(encoding="utf-8"))
-        except Exception:
-            self.logger.debug("Failed to read metadata for %s", anchor, exc_info=True)
+            data = json.loads(row[1])
+        except (TypeError, json.JSONDecodeError):
+            self.logger.debug("Failed to decode stored metadata", exc_info=True)
             return {}
-        data = payload.get("metadata") if isinstance(payload, dict) else {}
         result = dict(data) if isinstance(data, Mapping) else {}
-        stored_at = payload.get("stored_at") if isinstance(payload, dict) else None
-        if isinstance(stored_at, str) and stored_at.strip():
+        stored_at = row[2]
+        if stamp and isinstance(stored_at, str) and stored_at.strip():
             result.setdefault("stored_at", stored_at)
         return result
 
@@ -15335,27 +19352,36 @@ class DatasetNodePersistence:
             else:
                 target = source
             results.append(target)
+        if results:
+            names = {path.name for path in self._list_thumbnails(anchor)}
+            names.update(path.name for path in results)
+            self._upsert_sidecar(anchor, thumbnails=json.dumps(sorted(names)))
         return results or self._list_thumbnails(anchor)
 
     def _list_thumbnails(self, anchor: str) -> List[Path]:
-        directory = self.thumbnail_dir(anchor, ensure=False)
-        if not directory.exists():
+        return self._thumbnails_from_row(anchor, self._sidecar_row(anchor))
+
+    def _thumbnails_from_row(
+        self, anchor: str, row: Optional[Tuple[Any, ...]]
+    ) -> List[Path]:
+        if row is None or not row[3]:
+            return []
+        try:
+            names = json.loads(row[3])
+        except (TypeError, json.JSONDecodeError):
             return []
-        return sorted(p for p in directory.iterdir() if p.is_file())
+        directory = self.thumbnail_dir(anchor, ensure=False)
+        return [directory / str(name) for name in names]
 
     def _cleanup_sidecars(self, anchor: str) -> None:
-        self._embedding_path(anchor).unlink(missing_ok=True)
-        self._metadata_path(anchor).unlink(missing_ok=True)
+        with self._lock:
+            conn = self._store()
+            conn.execute("DELETE FROM sidecars WHERE anchor = ?", (anchor,))
+            conn.commit()
         directory = self.thumbnail_dir(anchor, ensure=False)
         if directory.exists():
             shutil.rmtree(directory, ignore_errors=True)
 
-    def _embedding_path(self, anchor: str) -> Path:
-        return self.sidecar_root / f"{anchor}{self.VECTOR_SUFFIX}"
-
-    def _metadata_path(self, anchor: str) -> Path:
-        return self.sidecar_root / f"{anchor}{self.META_SUFFIX}"
-
     def _ensure_gitignore(self, root: Path) -> None:
         gitignore = root / ".gitignore"
         if not gitignore.exists():
@@ -15369,6 +19395,21 @@ class DatasetNodePersistence:
                 vector.append(float(value))
         return vector
 
+    @staticmethod
+    def _pack_embedding(vector: Sequence[float]) -> bytes:
+        values = array.array("f", vector)
+        if sys.byteorder != "little":
+            values.byteswap()
+        return values.tobytes()
+
+    @staticmethod
+    def _unpack_embedding(blob: bytes) -> List[float]:
+        values = array.array("f")
+        values.frombytes(blob)
+        if sys.byteorder != "little":
+            values.byteswap()
+        return values.tolist()
+
 class DatasetManager:
     """Persist dataset entries with Git-friendly cores and sidecars."""
 
@@ -15387,10 +19428,28 @@ class DatasetManager:
         self.lock = threading.Lock()
         self.enable_semantic = enable_semantic
         self.data_root = ensure_dir(data_root) if data_root else self.session_dir.parent
+        self.vector_indexes: DatasetVectorIndexes | None = (
+            DatasetVectorIndexes(self.data_root, embedder) if enable_semantic else None
+        )
+        self._dataset_files: Optional[List[Path]] = None
+        self._deferred = threading.local()
         self.persistence = DatasetNodePersistence(
             self.dataset_path,
             logger=logging.getLogger(VD_LOGGER_NAME),
+            vector_indexes=self.vector_indexes,
         )
+        self._persistences: Dict[Path, DatasetNodePersistence] = {
+            self.dataset_path.resolve(): self.persistence
+        }
+        self._persistences_lock = threading.Lock()
+
+    def close(self) -> None:
+        """Close the sidecar stores of every dataset this manager has opened."""
+
+        with self._persistences_lock:
+            handles = list(self._persistences.values())
+        for persistence in handles:
+            persistence.close()
 
     def add_entry(
         self,
@@ -15399,6 +19458,8 @@ class DatasetManager:
         images: List[Path],
         tags: Optional[List[str]] = None,
         extra: Optional[Dict[str, Any]] = None,
+        *,
+        embedding: Optional[Sequence[float]] = None,
     ) -> Dict[str, Any]:
         anchor = uuid.uuid4().hex
         core: Dict[str, Any] = {
@@ -15417,10 +19478,16 @@ class DatasetManager:
                 core[key] = value
 
         embedding_vec: List[float] = []
+        deferred = getattr(self._deferred, "pending", None)
         if self.enable_semantic and text.strip():
-            ok, vec, _ = self.ollama.embeddings(self.embedder, text)
-            if ok and isinstance(vec, list):
-                embedding_vec = DatasetNodePersistence._coerce_vector(vec)
+            if embedding:
+                embedding_vec = DatasetNodePersistence._coerce_vector(embedding)
+            elif deferred is not None:
+                deferred.append((anchor, text))
+            else:
+                ok, vec, _ = self.ollama.embeddings(self.embedder, text)
+                if ok and isinstance(vec, list):
+                    embedding_vec = DatasetNodePersistence._coerce_vector(vec)
 
         metadata: Dict[str, Any] = {
             "images": [str(path) for path in images],
@@ -15452,6 +19519,39 @@ class DatasetManager:
             payload["thumbnails"] = [p.as_posix() for p in node.thumbnail_paths]
         return payload
 
+    @contextlib.contextmanager
+    def deferred_embeddings(self) -> Iterator[Dict[str, List[float]]]:
+        """Batch the embeddings of entries added on this thread inside the block.
+
+        ``add_entry`` stores entries without a vector and the texts are sent
+        through ``OllamaClient.embed_many`` when the block exits.  The yielded
+        mapping is filled with ``anchor -> vector`` at that point.
+        """
+
+        vectors: Dict[str, List[float]] = {}
+        if getattr(self._deferred, "pending", None) is not None:
+            yield getattr(self._deferred, "vectors")
+            return
+        pending: List[Tuple[str, str]] = []
+        self._deferred.pending = pending
+        self._deferred.vectors = vectors
+        try:
+            yield vectors
+        finally:
+            self._deferred.pending = None
+            self._deferred.vectors = None
+            if pending:
+                _, batch, _ = self.ollama.embed_many(
+                    self.embedder, [text for _, text in pending]
+                )
+                for (anchor, _), vec in zip(pending, batch):
+                    vector = DatasetNodePersistence._coerce_vector(vec)
+                    if not vector:
+                        continue
+                    with self.lock:
+                        self.persistence.update(anchor, embedding=vector)
+                    vectors[anchor] = vector
+
     def _generate_thumbnails(self, anchor: str, images: List[Path]) -> List[Path]:
         if not images or Image is None:
             return []
@@ -15493,29 +19593,28 @@ class DatasetManager:
         if not ok or not isinstance(vector, list):
             return []
         query_vec = DatasetNodePersistence._coerce_vector(vector)
-        if not query_vec:
+        if not query_vec or self.vector_indexes is None:
             return []
 
-        scored: List[Tuple[float, DatasetNode]] = []
-        for dataset_file in self._all_dataset_files():
-            persistence = DatasetNodePersistence(
-                dataset_file,
-                logger=logging.getLogger(VD_LOGGER_NAME),
-            )
-            for node in persistence.iter_nodes():
-                embedding = node.embedding
-                if not embedding and isinstance(node.core.get("embedding"), list):
-                    embedding = DatasetNodePersistence._coerce_vector(
-                        node.core.get("embedding")  # type: ignore[arg-type]
-                    )
-                if not embedding:
-                    continue
-                score = cosine(query_vec, embedding)
-                scored.append((score, node))
+        index = self.vector_indexes.for_dim(len(query_vec))
+        self._sync_vector_index(index)
+        hits = index.search(query_vec, k)
+        wanted: Dict[Path, List[str]] = {}
+        for _, dataset_file, anchor in hits:
+            wanted.setdefault(dataset_file, []).append(anchor)
+        nodes: Dict[Tuple[Path, str], DatasetNode] = {}
+        for dataset_file, anchors in wanted.items():
+            if not dataset_file.exists():
+                continue
+            persistence = self._persistence_for(dataset_file)
+            for anchor, node in persistence.load_many(anchors).items():
+                nodes[(dataset_file, anchor)] = node
 
-        scored.sort(key=lambda item: item[0], reverse=True)
         results: List[Dict[str, Any]] = []
-        for score, node in scored[:k]:
+        for score, dataset_file, anchor in hits:
+            node = nodes.get((dataset_file, anchor))
+            if node is None:
+                continue
             payload = dict(node.core)
             payload["embedding"] = node.embedding
             if node.metadata:
@@ -15526,6 +19625,48 @@ class DatasetManager:
             results.append(payload)
         return results
 
+    def _persistence_for(self, dataset_file: Path) -> DatasetNodePersistence:
+        """Return the cached handle for ``dataset_file``, opening it on first use."""
+
+        key = dataset_file.resolve()
+        with self._persistences_lock:
+            persistence = self._persistences.get(key)
+            if persistence is None:
+                persistence = DatasetNodePersistence(
+                    dataset_file,
+                    logger=logging.getLogger(VD_LOGGER_NAME),
+                    vector_indexes=self.vector_indexes,
+                )
+                self._persistences[key] = persistence
+            return persistence
+
+    def _sync_vector_index(self, index: DatasetVectorIndex) -> None:
+        """Scan dataset files the ``index`` has not seen yet.
+
+        The directory walk runs once per manager; datasets written afterwards
+        reach the index through their own ``DatasetNodePersistence``.
+        """
+
+        if self._dataset_files is None:
+            self._dataset_files = self._all_dataset_files()
+        elif self.dataset_path not in self._dataset_files:
+            self._dataset_files.append(self.dataset_path)
+        for dataset_file in self._dataset_files:
+            if index.has_dataset(dataset_file) or not dataset_file.exists():
+                continue
+            persistence = self._persistence_for(dataset_file)
+            added = index.add_dataset(
+                dataset_file,
+                (
+                    (node.anchor, node.embedding)
+                    for node in persistence.iter_nodes()
+                    if node.embedding
+                ),
+            )
+            logging.getLogger(VD_LOGGER_NAME).debug(
+                "Indexed %d dataset vectors from %s", added, dataset_file
+            )
+
 
 @dataclass(slots=True)
 class HippocampusNodeRecord:
@@ -15553,64 +19694,179 @@ class HippocampusNodeRecord:
         }
 
 
+BRAIN_MAP_COMPACT_EVERY = 512
+"""Minimum journal records accumulated before the base file is rewritten."""
+
+
 class BrainMapRegistry:
-    """Durable store backing the 3D brain map visualisation."""
+    """Durable store backing the 3D brain map visualisation.
+
+    ``storage_path`` holds the compacted base document; every change is
+    appended to a sibling ``*.journal.jsonl`` file and folded back into the
+    base once the journal outgrows both ``BRAIN_MAP_COMPACT_EVERY`` records and
+    the map itself.  Edges are
+    unique per ``(source, target, relation)`` and :meth:`snapshot` hands out a
+    copy-on-write view tagged with a ``version`` counter.
+    """
 
     def __init__(
         self,
         storage_path: Path,
         *,
         logger: Optional[logging.Logger] = None,
+        compact_every: int = BRAIN_MAP_COMPACT_EVERY,
     ) -> None:
         self.storage_path = storage_path
+        self.journal_path = storage_path.with_name(
+            f"{storage_path.stem}.journal.jsonl"
+        )
         self.logger = logger or logging.getLogger(VD_LOGGER_NAME)
+        self.compact_every = max(1, int(compact_every))
         self._lock = threading.RLock()
-        self._state: Dict[str, Any] = {"nodes": {}, "edges": []}
+        self._nodes: Dict[str, Any] = {}
+        self._edges: Dict[Tuple[str, str, str], Dict[str, str]] = {}
+        self._journal_records = 0
+        self._version = 0
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._nodes_shared = False
         self._load()
 
+    @property
+    def version(self) -> int:
+        """Monotonic counter bumped on every effective change."""
+
+        with self._lock:
+            return self._version
+
     def _load(self) -> None:
-        if not self.storage_path.exists():
+        if self.storage_path.exists():
+            try:
+                data = json.loads(self.storage_path.read_text(encoding="utf-8"))
+            except Exception as exc:
+                self.logger.warning(
+                    "Failed to load brain map registry: %s", exc, exc_info=True
+                )
+                data = None
+            if isinstance(data, dict):
+                nodes = data.get("nodes")
+                edges = data.get("edges")
+                if isinstance(nodes, dict) and isinstance(edges, list):
+                    with self._lock:
+                        self._nodes = dict(nodes)
+                        for edge in edges:
+                            if isinstance(edge, Mapping):
+                                self._add_edge(
+                                    str(edge.get("source", "")),
+                                    str(edge.get("target", "")),
+                                    str(edge.get("relation", "")),
+                                )
+        self._replay_journal()
+
+    def _replay_journal(self) -> None:
+        if not self.journal_path.exists():
             return
         try:
-            data = json.loads(self.storage_path.read_text(encoding="utf-8"))
+            lines = self.journal_path.read_text(encoding="utf-8").splitlines()
         except Exception as exc:
             self.logger.warning(
-                "Failed to load brain map registry: %s", exc, exc_info=True
+                "Failed to read brain map journal: %s", exc, exc_info=True
             )
             return
-        if not isinstance(data, dict):
-            return
-        nodes = data.get("nodes")
-        edges = data.get("edges")
-        if isinstance(nodes, dict) and isinstance(edges, list):
-            with self._lock:
-                self._state["nodes"] = nodes
-                self._state["edges"] = edges
+        with self._lock:
+            for line in lines:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A torn final line from a crash mid-append is skipped.
+                    continue
+                if not isinstance(record, dict):
+                    continue
+                op = record.get("op")
+                if op == "node" and isinstance(record.get("id"), str):
+                    self._nodes[record["id"]] = record.get("payload")
+                elif op == "edge":
+                    self._add_edge(
+                        str(record.get("source", "")),
+                        str(record.get("target", "")),
+                        str(record.get("relation", "")),
+                    )
+                self._journal_records += 1
+            if self._compaction_due():
+                self.compact()
+
+    def _compaction_due(self) -> bool:
+        # Scaling the threshold with the map keeps compaction cost amortised
+        # linear in the number of journal appends.
+        threshold = max(self.compact_every, len(self._nodes) + len(self._edges))
+        return self._journal_records >= threshold
+
+    def _add_edge(self, source: str, target: str, relation: str) -> bool:
+        key = (source, target, relation)
+        if key in self._edges:
+            return False
+        self._edges[key] = {"source": source, "target": target, "relation": relation}
+        return True
 
-    def _persist(self) -> None:
-        ensure_dir(self.storage_path.parent)
+    def _changed(self) -> None:
+        self._version += 1
+        self._snapshot = None
+
+    def _append_journal(self, record: Dict[str, Any]) -> None:
         try:
-            self.storage_path.write_text(
-                json.dumps(self._state, indent=2, sort_keys=True),
-                encoding="utf-8",
-            )
+            ensure_dir(self.journal_path.parent)
+            with self.journal_path.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(record, ensure_ascii=False) + "\n")
         except Exception as exc:
             self.logger.warning(
-                "Failed to persist brain map registry: %s", exc, exc_info=True
+                "Failed to append brain map journal: %s", exc, exc_info=True
             )
+            return
+        self._journal_records += 1
+        if self._compaction_due():
+            self.compact()
+
+    def compact(self) -> None:
+        """Rewrite the base document and truncate the journal."""
+
+        with self._lock:
+            state = {"nodes": self._nodes, "edges": list(self._edges.values())}
+            ensure_dir(self.storage_path.parent)
+            tmp_path = self.storage_path.with_name(f"{self.storage_path.name}.tmp")
+            try:
+                tmp_path.write_text(
+                    json.dumps(state, indent=2, sort_keys=True),
+                    encoding="utf-8",
+                )
+                os.replace(tmp_path, self.storage_path)
+                self.journal_path.unlink(missing_ok=True)
+            except Exception as exc:
+                self.logger.warning(
+                    "Failed to persist brain map registry: %s", exc, exc_info=True
+                )
+                return
+            self._journal_records = 0
 
     def register_node(self, node_id: str, payload: Dict[str, Any]) -> None:
         with self._lock:
-            self._state.setdefault("nodes", {})[node_id] = payload
-            self._persist()
+            if self._nodes.get(node_id) == payload:
+                return
+            if self._nodes_shared:
+                self._nodes = dict(self._nodes)
+                self._nodes_shared = False
+            # Stored privately so later caller mutations cannot leak in.
+            self._nodes[node_id] = copy.deepcopy(payload)
+            self._changed()
+            self._append_journal({"op": "node", "id": node_id, "payload": payload})
         self.logger.debug("Brain map node registered: %s", node_id)
 
     def register_edge(self, source: str, target: str, relation: str) -> None:
-        edge = {"source": source, "target": target, "relation": relation}
         with self._lock:
-            edges: List[Dict[str, str]] = self._state.setdefault("edges", [])
-            edges.append(edge)
-            self._persist()
+            if not self._add_edge(source, target, relation):
+                return
+            self._changed()
+            self._append_journal(
+                {"op": "edge", "source": source, "target": target, "relation": relation}
+            )
         self.logger.debug(
             "Brain map edge registered: %s -> %s (%s)",
             source,
@@ -15619,8 +19875,21 @@ class BrainMapRegistry:
         )
 
     def snapshot(self) -> Dict[str, Any]:
+        """Return ``{"nodes", "edges", "version"}`` without deep copying.
+
+        The containers are shared until the next change copies them, so the
+        result is cheap to take repeatedly and must be treated as read-only.
+        """
+
         with self._lock:
-            return json.loads(json.dumps(self._state))
+            if self._snapshot is None:
+                self._snapshot = {
+                    "nodes": self._nodes,
+                    "edges": list(self._edges.values()),
+                    "version": self._version,
+                }
+                self._nodes_shared = True
+            return self._snapshot
 
 
 class HippocampusClient:
@@ -15644,6 +19913,7 @@ class HippocampusClient:
         self.brain_map = brain_map
         self.ollama = ollama
         self.settings = settings
+        self._brain_payloads: Optional[Dict[str, Dict[str, Any]]] = None
         self.logger = logger or logging.getLogger(VD_LOGGER_NAME)
         self.enable_vision = bool(settings.get("enable_vision", True))
         self.summary_model = str(
@@ -15662,16 +19932,33 @@ class HippocampusClient:
         progress: Optional[Callable[[str], None]] = None,
     ) -> List[HippocampusNodeRecord]:
         records: List[HippocampusNodeRecord] = []
-        for path in paths:
-            if progress:
-                progress(f"Ingesting {path}")
-            try:
-                resolved = path.expanduser().resolve()
-            except Exception:
-                resolved = path
-            records.extend(
-                self._ingest_path(resolved, list(tags), note, 0, progress)
-            )
+        self._brain_payloads = {}
+        try:
+            # Node embeddings are requested in batches once the walk is done.
+            with self.dataset.deferred_embeddings() as vectors:
+                for path in paths:
+                    if progress:
+                        progress(f"Ingesting {path}")
+                    try:
+                        resolved = path.expanduser().resolve()
+                    except Exception:
+                        resolved = path
+                    records.extend(
+                        self._ingest_path(resolved, list(tags), note, 0, progress)
+                    )
+            for record in records:
+                vector = vectors.get(record.anchor)
+                brain_payload = self._brain_payloads.get(record.anchor)
+                if not vector or brain_payload is None:
+                    continue
+                record.embedding = list(vector)
+                brain_payload["embedding"] = list(vector)
+                core = brain_payload.get("core")
+                if isinstance(core, dict):
+                    core["embedding"] = list(vector)
+                self.brain_map.register_node(record.anchor, brain_payload)
+        finally:
+            self._brain_payloads = None
         return records
 
     def _ingest_path(
@@ -15939,6 +20226,8 @@ class HippocampusClient:
         brain_payload = record.as_payload()
         brain_payload["core"] = payload
         self.brain_map.register_node(anchor, brain_payload)
+        if self._brain_payloads is not None:
+            self._brain_payloads[anchor] = brain_payload
         return record
 
     @staticmethod
@@ -15969,34 +20258,188 @@ class HippocampusClient:
         if not trimmed:
             raise ValueError("Transcript tap requires non-empty text")
 
-        role_label = (role or "unknown").strip().lower() or "unknown"
-        tags = ["transcript_tap", f"tap_role:{role_label}"]
-        extra = {
-            "event": "transcript_tap",
-            "session_id": session_id,
-            "tap_role": role_label,
-            "captured_at": datetime.now(UTC).isoformat(),
-        }
+        role_label = (role or "unknown").strip().lower() or "unknown"
+        tags = ["transcript_tap", f"tap_role:{role_label}"]
+        extra = {
+            "event": "transcript_tap",
+            "session_id": session_id,
+            "tap_role": role_label,
+            "captured_at": datetime.now(UTC).isoformat(),
+        }
+
+        payload = self.dataset.add_entry("system", trimmed, [], tags=tags, extra=extra)
+        anchor = str(payload.get("anchor") or payload.get("id") or "")
+        snippet = self._shorten_snippet(trimmed)
+
+        self.logger.info(
+            "Transcript tap stored",
+            extra={
+                "event": "transcript_tap",
+                "anchor": anchor,
+                "session_id": session_id,
+                "role": role_label,
+            },
+        )
+
+        return {
+            "anchor": anchor,
+            "snippet": snippet,
+            "payload": payload,
+        }
+
+@dataclass(slots=True)
+class _EmbeddingJob:
+    text: str
+    callback: Callable[[List[float]], None]
+    attempts: int = 0
+
+
+class BackgroundEmbedder:
+    """Embed texts on a worker thread so writers never wait on Ollama.
+
+    Jobs sit in a bounded queue and are drained in batches.  A failed job is
+    retried with exponential backoff up to ``max_attempts`` times before it
+    is dropped; a successful one hands its vector to the job's callback on
+    the worker thread.
+    """
+
+    def __init__(
+        self,
+        ollama: OllamaClient,
+        model: str,
+        *,
+        max_pending: int = 256,
+        batch_size: int = 16,
+        max_attempts: int = 3,
+        retry_delay: float = 0.5,
+        name: str = "BackgroundEmbedder",
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self.ollama = ollama
+        self.model = model
+        self.batch_size = max(1, int(batch_size))
+        self.max_attempts = max(1, int(max_attempts))
+        self.retry_delay = max(0.0, float(retry_delay))
+        self._logger = logger or logging.getLogger(f"{VD_LOGGER_NAME}.embedder")
+        self._queue: "queue.Queue[_EmbeddingJob]" = queue.Queue(
+            maxsize=max(1, int(max_pending))
+        )
+        self._stop = threading.Event()
+        self._idle = threading.Condition()
+        self._pending = 0
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        atexit.register(self.shutdown)
+
+    # ------------------------------------------------------------------
+    @property
+    def pending(self) -> int:
+        with self._idle:
+            return self._pending
+
+    # ------------------------------------------------------------------
+    def submit(self, text: str, callback: Callable[[List[float]], None]) -> bool:
+        """Queue ``text``; return ``False`` when the queue is full or stopped."""
+
+        if self._stop.is_set():
+            return False
+        with self._idle:
+            self._pending += 1
+        try:
+            self._queue.put_nowait(_EmbeddingJob(text, callback))
+        except queue.Full:
+            self._finish(1)
+            self._logger.warning(
+                "Embedding queue full (%d pending); dropping job",
+                self._queue.maxsize,
+            )
+            return False
+        return True
+
+    # ------------------------------------------------------------------
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every queued job has finished; ``False`` on timeout."""
+
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    # ------------------------------------------------------------------
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Give queued jobs ``timeout`` seconds to finish, then stop the worker."""
+
+        if self._stop.is_set():
+            return
+        atexit.unregister(self.shutdown)
+        self.flush(timeout)
+        self._stop.set()
+        thread = self._thread
+        if thread.is_alive() and threading.current_thread() is not thread:
+            thread.join(timeout=1.0)
+
+    # ------------------------------------------------------------------
+    def _finish(self, count: int) -> None:
+        with self._idle:
+            self._pending -= count
+            if self._pending <= 0:
+                self._pending = 0
+                self._idle.notify_all()
 
-        payload = self.dataset.add_entry("system", trimmed, [], tags=tags, extra=extra)
-        anchor = str(payload.get("anchor") or payload.get("id") or "")
-        snippet = self._shorten_snippet(trimmed)
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                first = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            batch = [first]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._process(batch)
 
-        self.logger.info(
-            "Transcript tap stored",
-            extra={
-                "event": "transcript_tap",
-                "anchor": anchor,
-                "session_id": session_id,
-                "role": role_label,
-            },
-        )
+    def _embed_batch(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        try:
+            _, vectors, _ = self.ollama.embed_many(self.model, texts)
+        except Exception:
+            self._logger.debug("Embedding request raised", exc_info=True)
+            return [None] * len(texts)
+        return [vec if isinstance(vec, list) and vec else None for vec in vectors]
+
+    def _process(self, batch: List[_EmbeddingJob]) -> None:
+        vectors = self._embed_batch([job.text for job in batch])
+        retry: List[_EmbeddingJob] = []
+        done = 0
+        for job, vector in zip(batch, vectors):
+            if vector is None:
+                job.attempts += 1
+                if job.attempts < self.max_attempts:
+                    retry.append(job)
+                    continue
+                self._logger.warning(
+                    "Dropping embedding after %d failed attempts", job.attempts
+                )
+            else:
+                try:
+                    job.callback(vector)
+                except Exception:
+                    self._logger.exception("Embedding callback failed")
+            done += 1
+        if done:
+            self._finish(done)
+        if not retry:
+            return
+        delay = self.retry_delay * (2 ** (max(job.attempts for job in retry) - 1))
+        if self._stop.wait(delay):
+            self._finish(len(retry))
+            return
+        for job in retry:
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                self._logger.warning("Embedding queue full; dropping retry")
+                self._finish(1)
 
-        return {
-            "anchor": anchor,
-            "snippet": snippet,
-            "payload": payload,
-        }
 
 @dataclass(slots=True)
 class ConversationPaths:
@@ -16040,6 +20483,7 @@ class ConversationIO:
         self.max_entries = max(0, int(max_entries))
         self.max_bytes = max(0, int(max_bytes))
         self._entry_count = 0
+        self._embedder: Optional[BackgroundEmbedder] = None
 
         self._ensure_archive_placeholder(self.archive_root)
         self._ensure_archive_placeholder(self.repo_archive_root)
@@ -16193,9 +20637,11 @@ class ConversationIO:
         images: List[Path],
         *,
         references: Optional[List[Dict[str, str]]] = None,
+        embedding: Optional[Sequence[float]] = None,
     ):
         ts = _utc_iso()
-        rec: Dict[str, Any] = {"timestamp": ts, "role": role, "text": text}
+        entry_id = uuid.uuid4().hex
+        rec: Dict[str, Any] = {"id": entry_id, "timestamp": ts, "role": role, "text": text}
         if references:
             rec["references"] = references
         with self.lock:
@@ -16211,12 +20657,49 @@ class ConversationIO:
             with self.jsonl_path.open("a", encoding="utf-8") as jf:
                 jf.write(json.dumps(rec, ensure_ascii=False) + "\n")
             self._entry_count += 1
+            embedder = None
+            if text.strip() and not embedding:
+                embedder = self._background_embedder_locked()
 
-            if self.enable_embeddings and text.strip():
-                ok, vec, _ = self.ollama.embeddings(self.embedder, text)
-                if ok and isinstance(vec, list):
-                    with self.vec_path.open("a", encoding="utf-8") as vf:
-                        vf.write(json.dumps(vec) + "\n")
+        if embedding and self.enable_embeddings and text.strip():
+            self._store_vector(entry_id, list(embedding))
+        elif embedder is not None:
+            embedder.submit(text, partial(self._store_vector, entry_id))
+
+    def _background_embedder_locked(self) -> Optional[BackgroundEmbedder]:
+        if not self.enable_embeddings:
+            return None
+        if self._embedder is None:
+            self._embedder = BackgroundEmbedder(
+                self.ollama,
+                self.embedder,
+                name="ConversationEmbedder",
+                logger=logging.getLogger(f"{VD_LOGGER_NAME}.conversation"),
+            )
+        return self._embedder
+
+    def _store_vector(self, entry_id: str, vector: List[float]) -> None:
+        line = json.dumps({"id": entry_id, "embedding": vector})
+        with self.lock:
+            with self.vec_path.open("a", encoding="utf-8") as vf:
+                vf.write(line + "\n")
+
+    def flush_embeddings(self, timeout: Optional[float] = None) -> bool:
+        """Wait for queued turn embeddings to land in ``conversation.vec``."""
+
+        embedder = self._embedder
+        return embedder.flush(timeout) if embedder is not None else True
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Let queued turn embeddings land, then stop the embedding worker.
+
+        A later :meth:`append` starts a fresh worker.
+        """
+
+        with self.lock:
+            embedder, self._embedder = self._embedder, None
+        if embedder is not None:
+            embedder.shutdown(timeout)
 
     def retrieve(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
         if not self.enable_embeddings or not self.jsonl_path.exists() or not self.vec_path.exists():
@@ -16224,20 +20707,46 @@ class ConversationIO:
         ok, qvec, _ = self.ollama.embeddings(self.embedder, query)
         if not ok:
             return []
+        with self.lock:
+            records = self._read_jsonl_lines_locked(self.jsonl_path)
+            vectors = self._read_jsonl_lines_locked(self.vec_path)
+        # Vectors are keyed by entry id; bare lists come from the older layout,
+        # which paired the two files line by line.
+        by_id: Dict[str, List[float]] = {}
+        by_line: Dict[int, List[float]] = {}
+        for line_no, payload in vectors:
+            if isinstance(payload, dict) and isinstance(payload.get("embedding"), list):
+                by_id[str(payload.get("id"))] = payload["embedding"]
+            elif isinstance(payload, list):
+                by_line[line_no] = payload
         entries: List[Tuple[Dict[str, Any], List[float]]] = []
-        with self.jsonl_path.open("r", encoding="utf-8") as jf, self.vec_path.open("r", encoding="utf-8") as vf:
-            for jline, vline in zip(jf, vf):
-                try:
-                    rec = json.loads(jline)
-                    vec = json.loads(vline)
-                    if isinstance(vec, list):
-                        entries.append((rec, vec))
-                except Exception:
-                    continue
+        for line_no, rec in records:
+            if not isinstance(rec, dict):
+                continue
+            entry_id = rec.get("id")
+            vec = by_id.get(entry_id) if isinstance(entry_id, str) else None
+            if vec is None:
+                vec = by_line.get(line_no)
+            if vec is not None:
+                entries.append((rec, vec))
         scored = [(cosine(qvec, vec), rec) for rec, vec in entries]
         scored.sort(key=lambda t: t[0], reverse=True)
         return [rec for _, rec in scored[:k]]
 
+    @staticmethod
+    def _read_jsonl_lines_locked(path: Path) -> List[Tuple[int, Any]]:
+        lines: List[Tuple[int, Any]] = []
+        try:
+            with path.open("r", encoding="utf-8") as fh:
+                for line_no, line in enumerate(fh):
+                    try:
+                        lines.append((line_no, json.loads(line)))
+                    except Exception:
+                        continue
+        except FileNotFoundError:
+            pass
+        return lines
+
     def resolve_conversation(self, identifier: str) -> Optional[ConversationPaths]:
         conv_id = (identifier or "").strip()
         if not conv_id:
@@ -16298,6 +20807,162 @@ class ConversationIO:
                 continue
         return recs
 
+
+CHAT_TURN_FLUSH_TIMEOUT = 10.0
+"""Seconds inference waits for the user's turn to be written before retrieval."""
+
+
+@dataclass(slots=True)
+class ChatTurnRecord:
+    """One message of a chat turn and the sinks it is written to."""
+
+    role: str
+    text: str
+    images: List[Path] = field(default_factory=list)
+    references: Optional[List[Dict[str, str]]] = None
+    tags: Optional[List[str]] = None
+    extra: Optional[Dict[str, Any]] = None
+    conversation: bool = True
+    dataset: bool = True
+
+
+class ChatTurnWriter:
+    """Write chat turns to the conversation log and dataset off the UI thread.
+
+    Every text in a turn is embedded with one ``embed_many`` call and the
+    vector is handed to each sink, so a message costs a single embedding no
+    matter how many stores keep it.  ``on_written`` runs on the worker once a
+    turn has landed; text-only sinks such as the rationalizer hook in there.
+    Texts whose embedding fails fall back to the conversation's
+    ``BackgroundEmbedder``, which retries them.
+    """
+
+    def __init__(
+        self,
+        conversation: ConversationIO,
+        dataset: DatasetManager,
+        *,
+        on_written: Optional[Callable[[List[ChatTurnRecord]], None]] = None,
+        name: str = "ChatTurnWriter",
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self.conversation = conversation
+        self.dataset = dataset
+        self.on_written = on_written
+        self._logger = logger or logging.getLogger(f"{VD_LOGGER_NAME}.conversation")
+        self._queue: "queue.Queue[List[ChatTurnRecord]]" = queue.Queue()
+        self._stop = threading.Event()
+        self._idle = threading.Condition()
+        self._pending = 0
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        atexit.register(self.shutdown)
+
+    # ------------------------------------------------------------------
+    def submit(self, records: Sequence[ChatTurnRecord]) -> bool:
+        """Queue one turn; return ``False`` once the writer has stopped."""
+
+        turn = list(records)
+        if not turn:
+            return True
+        if self._stop.is_set():
+            return False
+        with self._idle:
+            self._pending += 1
+        self._queue.put(turn)
+        return True
+
+    # ------------------------------------------------------------------
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every queued turn is written; ``False`` on timeout."""
+
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    # ------------------------------------------------------------------
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Give queued turns ``timeout`` seconds to land, then stop the worker."""
+
+        if self._stop.is_set():
+            return
+        atexit.unregister(self.shutdown)
+        self.flush(timeout)
+        self._stop.set()
+        thread = self._thread
+        if thread.is_alive() and threading.current_thread() is not thread:
+            thread.join(timeout=1.0)
+
+    # ------------------------------------------------------------------
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                turn = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            try:
+                self._write_turn(turn)
+            except Exception:
+                self._logger.exception("Failed to write chat turn")
+            finally:
+                with self._idle:
+                    self._pending = max(0, self._pending - 1)
+                    if self._pending == 0:
+                        self._idle.notify_all()
+
+    def _dataset_shares_model(self) -> bool:
+        dataset = self.dataset
+        return bool(dataset.enable_semantic) and (
+            dataset.embedder == self.conversation.embedder
+        )
+
+    def _embed_turn(self, turn: Sequence[ChatTurnRecord]) -> Dict[str, List[float]]:
+        conversation = self.conversation
+        share = self._dataset_shares_model()
+        texts: List[str] = []
+        seen: Set[str] = set()
+        for record in turn:
+            text = record.text
+            if not text.strip() or text in seen:
+                continue
+            if (record.conversation and conversation.enable_embeddings) or (
+                record.dataset and share
+            ):
+                seen.add(text)
+                texts.append(text)
+        if not texts:
+            return {}
+        try:
+            _, vectors, _ = conversation.ollama.embed_many(conversation.embedder, texts)
+        except Exception:
+            self._logger.debug("Turn embedding request raised", exc_info=True)
+            return {}
+        return {text: vec for text, vec in zip(texts, vectors) if vec}
+
+    def _write_turn(self, turn: List[ChatTurnRecord]) -> None:
+        vectors = self._embed_turn(turn)
+        share = self._dataset_shares_model()
+        for record in turn:
+            vector = vectors.get(record.text)
+            if record.conversation:
+                self.conversation.append(
+                    record.role,
+                    record.text,
+                    record.images,
+                    references=record.references,
+                    embedding=vector,
+                )
+            if record.dataset:
+                self.dataset.add_entry(
+                    record.role,
+                    record.text,
+                    record.images,
+                    tags=record.tags,
+                    extra=record.extra,
+                    embedding=vector if share else None,
+                )
+        if self.on_written is not None:
+            self.on_written(turn)
+
 # --------------------------------------------------------------------------------------
 # Codex Bootstrap + Bridge (Windows)
 # --------------------------------------------------------------------------------------
@@ -16318,7 +20983,12 @@ DEFAULT_VOICE_CONFIG: Dict[str, Any] = {
     "chunk_ms": 30,
     "silence_duration": 0.8,
     "partial_interval": 0.9,
+    "commit_after": 6.0,
+    "commit_margin": 1.0,
+    "partial_window": 15.0,
     "vad_threshold": 550,
+    "vad_zcr_max": 0.45,
+    "ring_seconds": 60.0,
     "default_priority": 0.7,
     "speaker_label": "user",
     "speaker_bias": {
@@ -17949,6 +22619,7 @@ class ChatBubbleWidget(QFrame):
 
         body_text = _normalize_display_text(text)
         body_label = QLabel(body_text if body_text else "", bubble)
+        self._body_label = body_label
         body_label.setObjectName("MessageText")
         body_label.setProperty("role", role)
         body_label.setTextFormat(Qt.PlainText)
@@ -17982,6 +22653,12 @@ class ChatBubbleWidget(QFrame):
         layout.addWidget(bubble)
         self.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Maximum)
 
+    def set_text(self, text: str) -> None:
+        """Replace the body text, e.g. while a reply is still streaming in."""
+
+        self._raw_text = text
+        self._body_label.setText(_normalize_display_text(text))
+
     def mousePressEvent(self, event):  # pragma: no cover - UI interaction
         if event.button() == Qt.LeftButton:
             self._press_pos = event.pos()
@@ -18066,6 +22743,23 @@ class ConversationView(QFrame):
         self._append_row(role, widget, alignment)
         QTimer.singleShot(0, self._scroll_to_bottom)
 
+    def update_message(self, bubble: ChatBubbleWidget, text: str) -> None:
+        """Refresh a bubble in place and keep the view pinned to the bottom."""
+
+        bar = self.scroll.verticalScrollBar()
+        pinned = bar is None or bar.value() >= bar.maximum() - 4
+        bubble.set_text(text)
+        if pinned:
+            QTimer.singleShot(0, self._scroll_to_bottom)
+
+    def remove_widget(self, widget: QWidget) -> None:
+        for index in range(self.container_layout.count() - 1):
+            row = self.container_layout.itemAt(index).widget()
+            if row is not None and (row is widget or row.isAncestorOf(widget)):
+                self.container_layout.takeAt(index)
+                row.deleteLater()
+                return
+
     def _append_row(
         self,
         role: str,
@@ -18473,6 +23167,9 @@ class ChatCard(QFrame):
     codex_led_signal = Signal(str)        # "red"/"yellow"/"green"
     codex_output_signal = Signal(str)     # new Codex output
     error_signal = Signal(str)
+    stream_started_signal = Signal(str)   # model name of a streamed reply
+    stream_delta_signal = Signal(str)     # streamed content delta
+    stream_finished_signal = Signal()
 
     _TASK_STATUSES = {"open", "merged", "closed", "cancelled", "failed", "deleted"}
 
@@ -18539,6 +23236,12 @@ class ChatCard(QFrame):
             archive_root=agent_archives_dir(),
         )
         self.dataset = DatasetManager(self.session_dir, embed_model, self.ollama, data_root=self.data_root, enable_semantic=enable_embed)
+        self._turn_writer = ChatTurnWriter(
+            self.conv,
+            self.dataset,
+            on_written=self._after_turn_written,
+            name=f"ChatTurnWriter-{self.session_id}",
+        )
         hippocampus_root = ensure_dir(self.session_dir / "hippocampus")
         self.brain_map = BrainMapRegistry(
             hippocampus_root / "brain_map.json",
@@ -18561,6 +23264,11 @@ class ChatCard(QFrame):
         self._logger = logging.getLogger(f"{VD_LOGGER_NAME}.chat")
         self._health_state = TerminalHealthState.OFFLINE
         self._ready_banner_seen = False
+        self._stream_cancel = threading.Event()
+        self._stream_bubble: Optional[ChatBubbleWidget] = None
+        self._stream_text = ""
+        self._stream_pending: List[str] = []
+        self._stream_flush_scheduled = False
         self._manual_bridge_stop = False
         self._seen_sentinel_events: Set[str] = set()
 
@@ -18678,6 +23386,11 @@ class ChatCard(QFrame):
         self.send_btn.setObjectName("AccentBtn")
         self.send_btn.clicked.connect(self._on_send_local)
         ibox.addWidget(self.send_btn)
+        self.stop_btn = QPushButton("Stop", ibar)
+        self.stop_btn.setToolTip("Stop the local reply that is streaming in")
+        self.stop_btn.clicked.connect(self._on_stop_local)
+        self.stop_btn.setEnabled(False)
+        ibox.addWidget(self.stop_btn)
         root.addWidget(ibar)
 
         outer.addWidget(main_frame, 1)
@@ -18698,14 +23411,23 @@ class ChatCard(QFrame):
         self.codex_status_signal.connect(self._on_codex_status)
         self.codex_led_signal.connect(self._handle_led_state)
         self.codex_output_signal.connect(self._on_codex_output)
+        self.stream_started_signal.connect(self._begin_stream)
+        self.stream_delta_signal.connect(self._on_stream_delta)
+        self.stream_finished_signal.connect(self._end_stream)
 
         try:
-            self._task_bus_handles.append(subscribe("task.conversation", self._handle_task_conversation))
+            self._task_bus_handles.append(
+                subscribe(
+                    "task.conversation",
+                    self._handle_task_conversation,
+                    delivery=DeliveryMode.QT,
+                )
+            )
         except Exception:
             logger.exception("Failed to subscribe to task conversation events")
         try:
             sentinel_handle = subscribe(
-                "system.sentinel", self._handle_sentinel_event
+                "system.sentinel", self._handle_sentinel_event, delivery=DeliveryMode.QT
             )
         except Exception:
             logger.exception("Failed to subscribe to sentinel events")
@@ -18713,7 +23435,7 @@ class ChatCard(QFrame):
             self._task_bus_handles.append(sentinel_handle)
             for event_payload in sentinel_history_payloads():
                 self._handle_sentinel_event(event_payload, replay=True)
-        self.destroyed.connect(lambda *_: self._teardown_task_bus())
+        self.destroyed.connect(lambda *_: self.shutdown())
 
         # Shortcuts
         self._add_shortcut("Ctrl+Return", self._send_to_codex)  # primary to Codex
@@ -19377,8 +24099,8 @@ class ChatCard(QFrame):
             for a in attached:
                 self.input.append(f'view_image "{a.as_posix()}"')
 
-    def _convert_to_png(self, p: Path) -> Path:
-        out = agent_images_dir() / (slug(p.stem) + ".png")
+    def _convert_to_png(self, p: Path, *, name: Optional[str] = None) -> Path:
+        out = agent_images_dir() / ((name or slug(p.stem)) + ".png")
         ensure_dir(out.parent)
         try:
             image_module = ensure_pillow("image conversion")
@@ -19415,8 +24137,47 @@ class ChatCard(QFrame):
         self._record_message("user", text or "(image)", images, references=references)
         self.append_signal.emit(ChatMessage("user", text or "(image)", images))
         self.input.clear()
+        self._stream_cancel.clear()
         threading.Thread(target=self._infer_thread, args=(text, images), daemon=True).start()
 
+    @Slot()
+    def _on_stop_local(self) -> None:
+        self._stream_cancel.set()
+
+    @Slot(str)
+    def _begin_stream(self, model_name: str) -> None:
+        self._stream_text = ""
+        self._stream_pending.clear()
+        self._stream_bubble = self.view.append_message(
+            "assistant", "", model_name=model_name
+        )
+
+    @Slot(str)
+    def _on_stream_delta(self, delta: str) -> None:
+        if self._stream_bubble is None:
+            return
+        self._stream_pending.append(delta)
+        if not self._stream_flush_scheduled:
+            # Coalesce bursts of tokens into one relayout per frame or so.
+            self._stream_flush_scheduled = True
+            QTimer.singleShot(50, self._flush_stream)
+
+    def _flush_stream(self) -> None:
+        self._stream_flush_scheduled = False
+        if self._stream_bubble is None or not self._stream_pending:
+            return
+        self._stream_text += "".join(self._stream_pending)
+        self._stream_pending.clear()
+        self.view.update_message(self._stream_bubble, self._stream_text)
+
+    @Slot()
+    def _end_stream(self) -> None:
+        bubble, self._stream_bubble = self._stream_bubble, None
+        self._stream_pending.clear()
+        self._stream_text = ""
+        if bubble is not None:
+            self.view.remove_widget(bubble)
+
     def _handle_command(self, text: str, references: List[Dict[str, str]]) -> bool:
         try:
             tokens = shlex.split(text)
@@ -19528,6 +24289,10 @@ class ChatCard(QFrame):
         publish("task.updated", updated.to_dict())
         if status_key == "deleted":
             publish("task.deleted", {"id": updated.id})
+            try:
+                archive_task_snapshots(updated.id)
+            except Exception as exc:
+                log_exception("Task snapshot cleanup failed", exc)
         self._emit_system_notice(f"Task {task_id} status → {status_key}")
 
     def _command_task_note(self, task_id: str, note_text: str) -> None:
@@ -19726,6 +24491,17 @@ class ChatCard(QFrame):
             safety_manager.remove_notifier(self._safety_notifier_id)
             self._safety_notifier_id = ""
 
+    def shutdown(self) -> None:
+        """Flush pending turns and embeddings, then release bus and dataset handles.
+
+        Safe to call twice.
+        """
+
+        self._turn_writer.shutdown(CHAT_TURN_FLUSH_TIMEOUT)
+        self.conv.close()
+        self._teardown_task_bus()
+        self.dataset.close()
+
     # ----- send to Codex -----
     @Slot()
     def _send_to_codex(self):
@@ -19810,53 +24586,49 @@ class ChatCard(QFrame):
         )
         budget = prompt_token_budget(model, headroom_pct) if guard_enabled else 0
         message_tokens = count_tokens(text, model)
-
-        context_entries: List[Tuple[str, int]] = []
-        for line in context_lines:
-            context_entries.append((line, count_tokens(line, model)))
-
-        base_tokens = message_tokens + sum(tokens for _, tokens in context_entries)
         notices: List[str] = []
+        payloads, payload_notices = self._reference_payloads(references)
 
         if guard_enabled and budget > 0:
-            dropped = 0
-            while context_entries and base_tokens > budget:
-                _, tokens = context_entries.pop(0)
-                base_tokens -= tokens
-                dropped += 1
+            # Newest context first, then references, packed in a single pass
+            # against whatever the message itself leaves of the budget.
+            candidates = [("context", line) for line in reversed(context_lines)]
+            candidates.extend(("reference", payload) for payload in payloads)
+            flags, _ = pack_by_priority(
+                candidates,
+                budget - message_tokens,
+                model,
+                contiguous=("context",),
+            )
+            kept_context = flags[: len(context_lines)]
+            dropped = len(context_lines) - sum(kept_context)
             if dropped:
                 plural = "s" if dropped != 1 else ""
                 notices.append(
                     f"[Codex] Dropped {dropped} context item{plural} to fit the token budget."
                 )
-            if base_tokens > budget:
+            if message_tokens > budget:
                 notices.append(
                     "[Codex] Message exceeds the available token budget; reference contents skipped."
                 )
-                base_tokens = message_tokens
-                context_entries.clear()
-
-        context_lines = [line for line, _ in context_entries]
-        payloads, payload_notices = self._reference_payloads(references)
-        notices.extend(payload_notices)
-
-        if guard_enabled and budget > 0:
-            available = max(0, budget - base_tokens)
-            included: List[str] = []
-            skipped = 0
-            for payload in payloads:
-                tokens = count_tokens(payload, model)
-                if tokens <= available:
-                    included.append(payload)
-                    available -= tokens
-                else:
-                    skipped += 1
+            context_lines = [
+                line
+                for line, keep in zip(reversed(context_lines), kept_context)
+                if keep
+            ][::-1]
+            notices.extend(payload_notices)
+            kept_payloads = flags[len(kept_context) :]
+            skipped = kept_payloads.count(False)
             if skipped:
                 plural = "s" if skipped != 1 else ""
                 notices.append(
                     f"[Codex] Skipped {skipped} reference payload{plural} due to token limits."
                 )
-            payloads = included
+            payloads = [
+                payload for payload, keep in zip(payloads, kept_payloads) if keep
+            ]
+        else:
+            notices.extend(payload_notices)
 
         base_section = "\n".join(context_lines + [text]) if context_lines else text
         parts: List[str] = []
@@ -20079,65 +24851,87 @@ class ChatCard(QFrame):
         if not images:
             return [], [], ""
 
-        ocr_list: List[str] = []
-        vis_list: List[str] = []
-        combined_parts: List[str] = []
+        # Converted copies share one images directory, so keep names unique
+        # within the batch now that images are processed concurrently.
+        png_names: List[str] = []
+        for index, original in enumerate(images):
+            name = slug(original.stem)
+            png_names.append(name if name not in png_names else f"{name}-{index + 1}")
+        model = self.settings.get("vision_model", DEFAULT_VISION_MODEL)
+        # One pipeline per image: OCR for later images overlaps vision calls
+        # for earlier ones; the shared pool and semaphore bound each stage.
+        workers = min(len(images), OCR_MAX_WORKERS + VISION_MAX_CONCURRENCY)
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="ImageSummary"
+        ) as pool:
+            results = list(
+                pool.map(
+                    partial(self._summarize_image, user_text=user_text, model=model),
+                    images,
+                    png_names,
+                )
+            )
 
-        for original in images:
-            path = original
-            if path.suffix.lower() != ".png":
-                try:
-                    path = self._convert_to_png(path)
-                except Exception as exc:
-                    err = f"Image conversion failed for {original.name}: {exc}"
-                    self.error_signal.emit(err)
-                    ocr_list.append(f"[ocr-error] {err}")
-                    vis_list.append("[vision-error] skipped — conversion failed")
-                    continue
+        ocr_list = [ocr_md for ocr_md, _, _ in results]
+        vis_list = [vis_txt for _, vis_txt, _ in results]
+        combined = "\n\n".join(part for _, _, part in results if part)
+        return ocr_list, vis_list, combined
 
-            ocr_res = perform_ocr(path)
-            if not ocr_res.ok:
-                err = f"OCR failed for {path.name}: {ocr_res.error}"
-                self.error_signal.emit(err)
-                ocr_md = f"[ocr-error] {ocr_res.error}"
-            else:
-                ocr_md = ocr_res.markdown
+    def _summarize_image(
+        self, original: Path, png_name: str, *, user_text: str, model: str
+    ) -> Tuple[str, str, str]:
+        """OCR and describe one image; returns ``(ocr_md, vis_txt, combined_part)``."""
 
+        digest = image_digest(original)
+        path = original
+        if path.suffix.lower() != ".png":
             try:
-                ocr_path = path.with_suffix(path.suffix + ".ocr.md")
-                ensure_dir(ocr_path.parent)
-                ocr_path.write_text(ocr_md, encoding="utf-8")
+                path = self._convert_to_png(path, name=png_name)
             except Exception as exc:
-                self.error_signal.emit(f"Failed to write OCR markdown for {path.name}: {exc}")
-
-            ocr_list.append(ocr_md)
-
-            vision_res = analyze_image(
-                path,
-                ocr_res.markdown if ocr_res.ok else "",
-                client=self.ollama,
-                model=self.settings.get("vision_model", DEFAULT_VISION_MODEL),
-                user_text=user_text,
-            )
-            if not vision_res.ok:
-                err = f"Vision summary failed for {path.name}: {vision_res.error}"
+                err = f"Image conversion failed for {original.name}: {exc}"
                 self.error_signal.emit(err)
-                vis_txt = f"[vision-error] {vision_res.error}"
-            else:
-                vis_txt = vision_res.summary
+                skipped = "[vision-error] skipped — conversion failed"
+                return f"[ocr-error] {err}", skipped, ""
+
+        ocr_res = perform_ocr_cached(path, digest=digest)
+        if not ocr_res.ok:
+            err = f"OCR failed for {path.name}: {ocr_res.error}"
+            self.error_signal.emit(err)
+            ocr_md = f"[ocr-error] {ocr_res.error}"
+        else:
+            ocr_md = ocr_res.markdown
 
-            try:
-                vis_path = path.with_suffix(path.suffix + ".vision.md")
-                ensure_dir(vis_path.parent)
-                vis_path.write_text(vis_txt, encoding="utf-8")
-            except Exception as exc:
-                self.error_signal.emit(f"Failed to write vision markdown for {path.name}: {exc}")
+        try:
+            ocr_path = path.with_suffix(path.suffix + ".ocr.md")
+            ensure_dir(ocr_path.parent)
+            ocr_path.write_text(ocr_md, encoding="utf-8")
+        except Exception as exc:
+            self.error_signal.emit(f"Failed to write OCR markdown for {path.name}: {exc}")
+
+        vision_res = analyze_image_cached(
+            path,
+            ocr_res.markdown if ocr_res.ok else "",
+            client=self.ollama,
+            model=model,
+            user_text=user_text,
+            digest=digest,
+        )
+        if not vision_res.ok:
+            err = f"Vision summary failed for {path.name}: {vision_res.error}"
+            self.error_signal.emit(err)
+            vis_txt = f"[vision-error] {vision_res.error}"
+        else:
+            vis_txt = vision_res.summary
 
-            vis_list.append(vis_txt)
-            combined_parts.append(f"## OCR (Markdown)\n{ocr_md}\n\n## Vision Interpretation\n{vis_txt}")
+        try:
+            vis_path = path.with_suffix(path.suffix + ".vision.md")
+            ensure_dir(vis_path.parent)
+            vis_path.write_text(vis_txt, encoding="utf-8")
+        except Exception as exc:
+            self.error_signal.emit(f"Failed to write vision markdown for {path.name}: {exc}")
 
-        combined = "\n\n".join(combined_parts)
-        return ocr_list, vis_list, combined
+        combined = f"## OCR (Markdown)\n{ocr_md}\n\n## Vision Interpretation\n{vis_txt}"
+        return ocr_md, vis_txt, combined
 
     def _conversation_context(self, query: str) -> List[Dict[str, str]]:
         if not self.share_context:
@@ -20155,14 +24949,17 @@ class ChatCard(QFrame):
         window = [{"role": m.role, "content": m.text} for m in self.messages[-2 * self.context_pairs:]]
         return memory_msgs + ctx + window
 
-    def _record_message(
+    def _turn_record(
         self,
         role: str,
         text: str,
         images: List[Path],
         *,
         references: Optional[List[Dict[str, str]]] = None,
-    ) -> None:
+        tags: Optional[List[str]] = None,
+        conversation: bool = True,
+        dataset: bool = True,
+    ) -> ChatTurnRecord:
         refs: List[Dict[str, str]] = []
         if references:
             for item in references:
@@ -20173,62 +24970,117 @@ class ChatCard(QFrame):
                     continue
                 kind = str(item.get("type") or "file")
                 refs.append({"path": path, "type": kind})
+        return ChatTurnRecord(
+            role,
+            text,
+            list(images),
+            references=refs or None,
+            tags=list(tags) if tags is not None else self.lex.auto_tags(text),
+            extra={"references": refs} if refs else None,
+            conversation=conversation,
+            dataset=dataset,
+        )
 
-        self.conv.append(role, text, images, references=refs or None)
-        tags = self.lex.auto_tags(text)
-        extra = {"references": refs} if refs else None
-        self.dataset.add_entry(role, text, images, tags=tags, extra=extra)
+    def _record_message(
+        self,
+        role: str,
+        text: str,
+        images: List[Path],
+        *,
+        references: Optional[List[Dict[str, str]]] = None,
+        tags: Optional[List[str]] = None,
+    ) -> None:
+        record = self._turn_record(
+            role, text, images, references=references, tags=tags
+        )
+        self._turn_writer.submit([record])
         if role == "user":
             self._store_session_note(text, images)
-            manager = rationalizer_manager()
-            if manager and text.strip():
-                meta = {
-                    "session_id": self.session_id,
-                    "source": "chat_card",
-                }
-                manager.queue_intent_segmentation(
-                    text,
+
+    def _after_turn_written(self, turn: List[ChatTurnRecord]) -> None:
+        manager = rationalizer_manager()
+        if manager is None:
+            return
+        for record in turn:
+            if record.role != "user" or not record.text.strip():
+                continue
+            meta = {
+                "session_id": self.session_id,
+                "source": "chat_card",
+            }
+            manager.queue_intent_segmentation(
+                record.text,
+                conversation_id=self.session_id,
+                metadata=meta,
+            )
+            if record.references:
+                manager.queue_reference_resolution(
+                    record.text,
+                    record.references,
                     conversation_id=self.session_id,
                     metadata=meta,
                 )
-                if refs:
-                    manager.queue_reference_resolution(
-                        text,
-                        refs,
-                        conversation_id=self.session_id,
-                        metadata=meta,
-                    )
 
     def _infer_thread(self, text: str, images: List[Path]):
         self.state_signal.emit(True)
+        # Everything this reply produces is written (and embedded) as one turn.
+        turn: List[ChatTurnRecord] = []
         try:
             chat_model = self.settings.get("chat_model", DEFAULT_CHAT_MODEL)
             msgs: List[Dict[str, Any]] = [{"role": "system", "content": self._system_prompt()}]
+            # Let the user's turn land first so retrieval reuses its embedding.
+            self._turn_writer.flush(CHAT_TURN_FLUSH_TIMEOUT)
             msgs += self._gather_context(text)
             if images and self.settings.get("enable_vision", True):
                 ocr_list, vis_list, combo = self._summarize_images_dual(images, text)
                 for ocr_md in ocr_list:
-                    self.dataset.add_entry("assistant", ocr_md, images, tags=["vision_ocr"])
+                    turn.append(
+                        self._turn_record(
+                            "assistant", ocr_md, images, tags=["vision_ocr"], conversation=False
+                        )
+                    )
                     self.append_signal.emit(ChatMessage("assistant", f"## OCR (Markdown)\n{ocr_md}", []))
                 for vis_txt in vis_list:
-                    self.dataset.add_entry("assistant", vis_txt, images, tags=["vision_interpret"])
+                    turn.append(
+                        self._turn_record(
+                            "assistant", vis_txt, images, tags=["vision_interpret"], conversation=False
+                        )
+                    )
                     self.append_signal.emit(ChatMessage("assistant", f"## Vision Interpretation\n{vis_txt}", []))
                 if combo:
-                    self.dataset.add_entry("assistant", combo, images, tags=["vision_summary"])
-                    self.conv.append("system", "_Image(s) summarized via OCR + Vision. Injected into context._", [])
+                    turn.append(
+                        self._turn_record(
+                            "assistant", combo, images, tags=["vision_summary"], conversation=False
+                        )
+                    )
+                    note = "_Image(s) summarized via OCR + Vision. Injected into context._"
+                    turn.append(self._turn_record("system", note, [], dataset=False))
                     msgs.append({"role": "system", "content": f"Image context:\n{combo}"})
             user_msg = {"role": "user", "content": text or "(image)"}
-            ok, content, err = self.ollama.chat(model=chat_model, messages=msgs + [user_msg])
-            if not ok: content = f"[Error] Ollama: {err or 'Unknown error'}"
-            self.dataset.add_entry("assistant", content, [], tags=self.lex.auto_tags(content))
-            self._record_message("assistant", content, [])
+            self.stream_started_signal.emit(chat_model)
+            try:
+                ok, content, err = self.ollama.chat_stream(
+                    chat_model,
+                    msgs + [user_msg],
+                    on_delta=self.stream_delta_signal.emit,
+                    cancel=self._stream_cancel,
+                )
+            finally:
+                self.stream_finished_signal.emit()
+            if not ok and err == "cancelled":
+                note = "_[stopped]_"
+                content = f"{content}\n\n{note}" if content.strip() else note
+            elif not ok:
+                note = f"[Error] Ollama: {err or 'Unknown error'}"
+                content = f"{content}\n\n{note}" if content.strip() else note
+            turn.append(self._turn_record("assistant", content, []))
             self.append_signal.emit(ChatMessage("assistant", content, [], chat_model))
         except Exception as e:
             err = f"[Error] {e}"
-            self.dataset.add_entry("assistant", err, [], tags=["error"])
-            self._record_message("assistant", err, [])
+            turn.append(self._turn_record("assistant", err, [], tags=["error"]))
             self.append_signal.emit(ChatMessage("assistant", err, []))
         finally:
+            self._turn_writer.submit(turn)
             self.state_signal.emit(False)
 
     @Slot(ChatMessage)
@@ -20261,6 +25113,7 @@ class ChatCard(QFrame):
         self.busy = state
         enabled = not state
         self.send_btn.setEnabled(enabled)
+        self.stop_btn.setEnabled(state)
         self.attach_btn.setEnabled(enabled)
         self.send_codex_btn.setEnabled(True if self.bridge.running() else True)
 
@@ -21624,6 +26477,12 @@ class StatusBarTelemetryPanel(QFrame):
         self._ocr_bar = self._build_meter("OCR")
         layout.addWidget(self._ocr_bar)
 
+        self._bus_label = QLabel("Bus –", self)
+        self._bus_label.setObjectName("StatusBusLabel")
+        self._bus_label.setMinimumWidth(130)
+        self._bus_label.setToolTip("Event-bus telemetry is disabled.")
+        layout.addWidget(self._bus_label)
+
         layout.addStretch(1)
 
         self._self_impl_reason = (
@@ -21708,6 +26567,53 @@ class StatusBarTelemetryPanel(QFrame):
         )
         self._update_attention(attention)
 
+    # ------------------------------------------------------------------
+    def update_bus(self, payload: Mapping[str, Any]) -> None:
+        """Render ``system.bus`` rates and the slowest callbacks."""
+
+        if not payload.get("enabled"):
+            self._bus_label.setText("Bus –")
+            self._bus_label.setToolTip("Event-bus telemetry is disabled.")
+            return
+        topics = payload.get("topics") or {}
+        rate = sum(float(item.get("rate_per_s", 0.0)) for item in topics.values())
+        subscribers = payload.get("subscribers") or []
+        worst = max(
+            (float(item.get("p95_ms", 0.0)) for item in subscribers), default=0.0
+        )
+        self._bus_label.setText(f"Bus {rate:.0f}/s · p95 {worst:.1f} ms")
+
+        hottest = sorted(
+            topics.items(),
+            key=lambda item: item[1].get("rate_per_s", 0.0),
+            reverse=True,
+        )[:5]
+        lines = [
+            f"Window: {payload.get('window_s', 0)} s",
+            f"Queued: {payload.get('queued', 0)}  Drops: {payload.get('drops', 0)}",
+        ]
+        if hottest:
+            lines.append("Hot topics:")
+            lines.extend(
+                f"  {topic}: {item.get('rate_per_s', 0.0):.1f}/s"
+                for topic, item in hottest
+            )
+        if subscribers:
+            lines.append("Callback latency (p50/p95/p99 ms):")
+            lines.extend(
+                f"  {item['callback']} [{item['topic']}]: "
+                f"{item['p50_ms']}/{item['p95_ms']}/{item['p99_ms']}"
+                for item in subscribers[:5]
+            )
+        slowest = payload.get("slowest") or []
+        if slowest:
+            lines.append("Slowest calls:")
+            lines.extend(
+                f"  {item['ms']} ms {item['callback']} [{item['topic']}]"
+                for item in slowest[:5]
+            )
+        self._bus_label.setToolTip("\n".join(lines))
+
     # ------------------------------------------------------------------
     def _build_meter(self, label: str) -> QProgressBar:
         """Return a progress bar configured for compact status display."""
@@ -21997,7 +26903,9 @@ class MainWindow(QMainWindow):
         pal.setColor(QPalette.WindowText, QColor("#e6f0ff"))
         self.setPalette(pal)
 
-        self.ollama = OllamaClient()
+        self.ollama = OllamaClient(
+            cache=EmbeddingCache(agent_data_dir() / "embedding_cache.sqlite3")
+        )
         self.lex_mgr = LexiconManager(lexicons_dir())
         self.feature_flags = RUNTIME_SETTINGS
         configure_safety_sentinel(self.feature_flags)
@@ -22135,6 +27043,18 @@ class MainWindow(QMainWindow):
             )
         else:
             self._status_subscriptions.append(metrics_handle)
+        try:
+            bus_handle = subscribe(
+                BUS_TELEMETRY_TOPIC,
+                self._status_panel.update_bus,
+                delivery=DeliveryMode.QT,
+            )
+        except Exception:
+            logging.getLogger(__name__).exception(
+                "Failed to subscribe status bar to system.bus",
+            )
+        else:
+            self._status_subscriptions.append(bus_handle)
         self._refresh_status_bar()
 
         self._autonomy_controller = SelfImplementationController(
@@ -22161,8 +27081,12 @@ class MainWindow(QMainWindow):
 
         self._register_palette_commands()
 
-        self._palette_subscriptions.append(subscribe("system.command", self._on_command_event))
-        self._palette_subscriptions.append(subscribe("system.macro", self._on_macro_event))
+        self._palette_subscriptions.append(
+            subscribe("system.command", self._on_command_event, delivery=DeliveryMode.QT)
+        )
+        self._palette_subscriptions.append(
+            subscribe("system.macro", self._on_macro_event, delivery=DeliveryMode.QT)
+        )
 
         self._init_menu()
         self._init_shortcuts()
@@ -22653,6 +27577,7 @@ class MainWindow(QMainWindow):
         self.setCentralWidget(None)
         if hasattr(old_chat, "detach_safety_notifier"):
             old_chat.detach_safety_notifier()
+            old_chat.shutdown()
         self.chat = ChatCard(self.theme, self.ollama, self.settings, self.lex_mgr, self)
         if self._embedded:
             self.desktop = None
@@ -22793,6 +27718,7 @@ class MainWindow(QMainWindow):
             self.setCentralWidget(None)
             if hasattr(old_chat, "detach_safety_notifier"):
                 old_chat.detach_safety_notifier()
+                old_chat.shutdown()
             self.chat = ChatCard(self.theme, self.ollama, self.settings, self.lex_mgr, self)
             self.desktop = None
             self.setCentralWidget(self.chat)
@@ -22826,6 +27752,7 @@ class MainWindow(QMainWindow):
 
         if hasattr(self, "chat") and hasattr(self.chat, "detach_safety_notifier"):
             self.chat.detach_safety_notifier()
+            self.chat.shutdown()
         if self._orig_stderr is not None:
             sys.stderr = self._orig_stderr
             self._orig_stderr = None
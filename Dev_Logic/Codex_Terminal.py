@@ -58,8 +58,10 @@ import traceback
 import uuid
 import zipfile
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import UTC, datetime
+from functools import partial
 from pathlib import Path
 from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Set, Tuple
 import token_budget
@@ -103,7 +105,7 @@ from PySide6.QtWidgets import (
     QMenu, QStyle, QListWidget, QListWidgetItem, QAbstractItemView,
 )
 
-from tasks import record_diff
+from tasks import archive_task_snapshots, record_diff
 from tasks.bus import publish, subscribe, Subscription
 from tasks.drawer import TaskDrawer
 from tasks.models import (
@@ -117,7 +119,13 @@ from tasks.models import (
 )
 from error_console import ErrorConsole, StderrRedirector, log_exception
 from safety import SafetyViolation, manager as safety_manager
-from image_pipeline import analyze_image, perform_ocr
+from image_pipeline import (
+    OCR_MAX_WORKERS,
+    VISION_MAX_CONCURRENCY,
+    analyze_image_cached,
+    image_digest,
+    perform_ocr_cached,
+)
 from prompt_loader import get_prompt_watcher, iter_prompt_definitions, prompt_text
 from background import (
     BackgroundConfig,
@@ -4001,8 +4009,8 @@ class ChatCard(QFrame):
             for a in attached:
                 self.input.append(f'view_image "{a.as_posix()}"')
 
-    def _convert_to_png(self, p: Path) -> Path:
-        out = agent_images_dir() / (slug(p.stem) + ".png")
+    def _convert_to_png(self, p: Path, *, name: Optional[str] = None) -> Path:
+        out = agent_images_dir() / ((name or slug(p.stem)) + ".png")
         ensure_dir(out.parent)
         if PIL_AVAILABLE:
             with Image.open(p) as im:
@@ -4148,6 +4156,10 @@ class ChatCard(QFrame):
         publish("task.updated", updated.to_dict())
         if status_key == "deleted":
             publish("task.deleted", {"id": updated.id})
+            try:
+                archive_task_snapshots(updated.id)
+            except Exception as exc:
+                log_exception("Task snapshot cleanup failed", exc)
         self._emit_system_notice(f"Task {task_id} status → {status_key}")
 
     def _command_task_note(self, task_id: str, note_text: str) -> None:
@@ -4356,53 +4368,49 @@ class ChatCard(QFrame):
         )
         budget = token_budget.prompt_token_budget(model, headroom_pct) if guard_enabled else 0
         message_tokens = token_budget.count_tokens(text, model)
-
-        context_entries: List[Tuple[str, int]] = []
-        for line in context_lines:
-            context_entries.append((line, token_budget.count_tokens(line, model)))
-
-        base_tokens = message_tokens + sum(tokens for _, tokens in context_entries)
         notices: List[str] = []
+        payloads, payload_notices = self._reference_payloads(references)
 
         if guard_enabled and budget > 0:
-            dropped = 0
-            while context_entries and base_tokens > budget:
-                _, tokens = context_entries.pop(0)
-                base_tokens -= tokens
-                dropped += 1
+            # Newest context first, then references, packed in a single pass
+            # against whatever the message itself leaves of the budget.
+            candidates = [("context", line) for line in reversed(context_lines)]
+            candidates.extend(("reference", payload) for payload in payloads)
+            flags, _ = token_budget.pack_by_priority(
+                candidates,
+                budget - message_tokens,
+                model,
+                contiguous=("context",),
+            )
+            kept_context = flags[: len(context_lines)]
+            dropped = len(context_lines) - sum(kept_context)
             if dropped:
                 plural = "s" if dropped != 1 else ""
                 notices.append(
                     f"[Codex] Dropped {dropped} context item{plural} to fit the token budget."
                 )
-            if base_tokens > budget:
+            if message_tokens > budget:
                 notices.append(
                     "[Codex] Message exceeds the available token budget; reference contents skipped."
                 )
-                base_tokens = message_tokens
-                context_entries.clear()
-
-        context_lines = [line for line, _ in context_entries]
-        payloads, payload_notices = self._reference_payloads(references)
-        notices.extend(payload_notices)
-
-        if guard_enabled and budget > 0:
-            available = max(0, budget - base_tokens)
-            included: List[str] = []
-            skipped = 0
-            for payload in payloads:
-                tokens = token_budget.count_tokens(payload, model)
-                if tokens <= available:
-                    included.append(payload)
-                    available -= tokens
-                else:
-                    skipped += 1
+            context_lines = [
+                line
+                for line, keep in zip(reversed(context_lines), kept_context)
+                if keep
+            ][::-1]
+            notices.extend(payload_notices)
+            kept_payloads = flags[len(kept_context) :]
+            skipped = kept_payloads.count(False)
             if skipped:
                 plural = "s" if skipped != 1 else ""
                 notices.append(
                     f"[Codex] Skipped {skipped} reference payload{plural} due to token limits."
                 )
-            payloads = included
+            payloads = [
+                payload for payload, keep in zip(payloads, kept_payloads) if keep
+            ]
+        else:
+            notices.extend(payload_notices)
 
         base_section = "\n".join(context_lines + [text]) if context_lines else text
         parts: List[str] = []
@@ -4618,65 +4626,87 @@ class ChatCard(QFrame):
         if not images:
             return [], [], ""
 
-        ocr_list: List[str] = []
-        vis_list: List[str] = []
-        combined_parts: List[str] = []
+        # Converted copies share one images directory, so keep names unique
+        # within the batch now that images are processed concurrently.
+        png_names: List[str] = []
+        for index, original in enumerate(images):
+            name = slug(original.stem)
+            png_names.append(name if name not in png_names else f"{name}-{index + 1}")
+        model = self.settings.get("vision_model", DEFAULT_VISION_MODEL)
+        # One pipeline per image: OCR for later images overlaps vision calls
+        # for earlier ones; the shared pool and semaphore bound each stage.
+        workers = min(len(images), OCR_MAX_WORKERS + VISION_MAX_CONCURRENCY)
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="ImageSummary"
+        ) as pool:
+            results = list(
+                pool.map(
+                    partial(self._summarize_image, user_text=user_text, model=model),
+                    images,
+                    png_names,
+                )
+            )
 
-        for original in images:
-            path = original
-            if path.suffix.lower() != ".png":
-                try:
-                    path = self._convert_to_png(path)
-                except Exception as exc:
-                    err = f"Image conversion failed for {original.name}: {exc}"
-                    self.error_signal.emit(err)
-                    ocr_list.append(f"[ocr-error] {err}")
-                    vis_list.append("[vision-error] skipped — conversion failed")
-                    continue
+        ocr_list = [ocr_md for ocr_md, _, _ in results]
+        vis_list = [vis_txt for _, vis_txt, _ in results]
+        combined = "\n\n".join(part for _, _, part in results if part)
+        return ocr_list, vis_list, combined
 
-            ocr_res = perform_ocr(path)
-            if not ocr_res.ok:
-                err = f"OCR failed for {path.name}: {ocr_res.error}"
-                self.error_signal.emit(err)
-                ocr_md = f"[ocr-error] {ocr_res.error}"
-            else:
-                ocr_md = ocr_res.markdown
+    def _summarize_image(
+        self, original: Path, png_name: str, *, user_text: str, model: str
+    ) -> Tuple[str, str, str]:
+        """OCR and describe one image; returns ``(ocr_md, vis_txt, combined_part)``."""
 
+        digest = image_digest(original)
+        path = original
+        if path.suffix.lower() != ".png":
             try:
-                ocr_path = path.with_suffix(path.suffix + ".ocr.md")
-                ensure_dir(ocr_path.parent)
-                ocr_path.write_text(ocr_md, encoding="utf-8")
+                path = self._convert_to_png(path, name=png_name)
             except Exception as exc:
-                self.error_signal.emit(f"Failed to write OCR markdown for {path.name}: {exc}")
-
-            ocr_list.append(ocr_md)
-
-            vision_res = analyze_image(
-                path,
-                ocr_res.markdown if ocr_res.ok else "",
-                client=self.ollama,
-                model=self.settings.get("vision_model", DEFAULT_VISION_MODEL),
-                user_text=user_text,
-            )
-            if not vision_res.ok:
-                err = f"Vision summary failed for {path.name}: {vision_res.error}"
+                err = f"Image conversion failed for {original.name}: {exc}"
                 self.error_signal.emit(err)
-                vis_txt = f"[vision-error] {vision_res.error}"
-            else:
-                vis_txt = vision_res.summary
+                skipped = "[vision-error] skipped — conversion failed"
+                return f"[ocr-error] {err}", skipped, ""
+
+        ocr_res = perform_ocr_cached(path, digest=digest)
+        if not ocr_res.ok:
+            err = f"OCR failed for {path.name}: {ocr_res.error}"
+            self.error_signal.emit(err)
+            ocr_md = f"[ocr-error] {ocr_res.error}"
+        else:
+            ocr_md = ocr_res.markdown
 
-            try:
-                vis_path = path.with_suffix(path.suffix + ".vision.md")
-                ensure_dir(vis_path.parent)
-                vis_path.write_text(vis_txt, encoding="utf-8")
-            except Exception as exc:
-                self.error_signal.emit(f"Failed to write vision markdown for {path.name}: {exc}")
+        try:
+            ocr_path = path.with_suffix(path.suffix + ".ocr.md")
+            ensure_dir(ocr_path.parent)
+            ocr_path.write_text(ocr_md, encoding="utf-8")
+        except Exception as exc:
+            self.error_signal.emit(f"Failed to write OCR markdown for {path.name}: {exc}")
+
+        vision_res = analyze_image_cached(
+            path,
+            ocr_res.markdown if ocr_res.ok else "",
+            client=self.ollama,
+            model=model,
+            user_text=user_text,
+            digest=digest,
+        )
+        if not vision_res.ok:
+            err = f"Vision summary failed for {path.name}: {vision_res.error}"
+            self.error_signal.emit(err)
+            vis_txt = f"[vision-error] {vision_res.error}"
+        else:
+            vis_txt = vision_res.summary
 
-            vis_list.append(vis_txt)
-            combined_parts.append(f"## OCR (Markdown)\n{ocr_md}\n\n## Vision Interpretation\n{vis_txt}")
+        try:
+            vis_path = path.with_suffix(path.suffix + ".vision.md")
+            ensure_dir(vis_path.parent)
+            vis_path.write_text(vis_txt, encoding="utf-8")
+        except Exception as exc:
+            self.error_signal.emit(f"Failed to write vision markdown for {path.name}: {exc}")
 
-        combined = "\n\n".join(combined_parts)
-        return ocr_list, vis_list, combined
+        combined = f"## OCR (Markdown)\n{ocr_md}\n\n## Vision Interpretation\n{vis_txt}"
+        return ocr_md, vis_txt, combined
 
     def _conversation_context(self, query: str) -> List[Dict[str, str]]:
         if not self.share_context:
@@ -9,11 +9,15 @@ and VLM pipelines may be unavailable on some machines.
 from __future__ import annotations
 
 import base64
+import hashlib
 import io
+import os
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 import re
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Protocol
+from typing import Any, Dict, List, Optional, Protocol, Tuple
 
 try:  # Optional dependency – we can still provide structured errors.
     from PIL import Image  # type: ignore
@@ -385,11 +389,120 @@ def analyze_image(
     return VisionResult(summary=summary)
 
 
+OCR_MAX_WORKERS = max(1, min(4, os.cpu_count() or 1))
+"""Tesseract calls allowed in flight at once; each runs in its own subprocess."""
+
+VISION_MAX_CONCURRENCY = 2
+"""Vision-model requests allowed in flight at once, across all chat turns."""
+
+IMAGE_RESULT_CACHE_SIZE = 128
+"""OCR and vision results remembered by image content hash (LRU)."""
+
+_IMAGE_RESULT_CACHE: "OrderedDict[Tuple[str, ...], Any]" = OrderedDict()
+_IMAGE_RESULT_LOCK = threading.Lock()
+_VISION_SLOTS = threading.BoundedSemaphore(VISION_MAX_CONCURRENCY)
+_OCR_SLOTS = threading.BoundedSemaphore(OCR_MAX_WORKERS)
+
+
+def image_digest(image_path: Path | str) -> str:
+    """Return a content hash for *image_path*, or ``""`` when it is unreadable."""
+
+    digest = hashlib.blake2b(digest_size=20)
+    try:
+        with Path(image_path).open("rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b""):
+                digest.update(chunk)
+    except OSError:
+        return ""
+    return digest.hexdigest()
+
+
+def _cached_image_result(key: Tuple[str, ...]) -> Any:
+    with _IMAGE_RESULT_LOCK:
+        value = _IMAGE_RESULT_CACHE.get(key)
+        if value is not None:
+            _IMAGE_RESULT_CACHE.move_to_end(key)
+        return value
+
+
+def _remember_image_result(key: Tuple[str, ...], value: Any) -> None:
+    with _IMAGE_RESULT_LOCK:
+        _IMAGE_RESULT_CACHE[key] = value
+        _IMAGE_RESULT_CACHE.move_to_end(key)
+        while len(_IMAGE_RESULT_CACHE) > IMAGE_RESULT_CACHE_SIZE:
+            _IMAGE_RESULT_CACHE.popitem(last=False)
+
+
+def perform_ocr_cached(
+    image_path: Path | str,
+    *,
+    digest: Optional[str] = None,
+    engine: Optional[Any] = None,
+    language: str = "eng",
+) -> OCRResult:
+    """Run :func:`perform_ocr` under the shared Tesseract cap, caching by content.
+
+    Results from the default engine are keyed by the image's content hash and
+    language, so a re-sent screenshot skips Tesseract.  A custom *engine* is
+    never cached because its output need not match Tesseract's.
+    """
+
+    if engine is not None:
+        with _OCR_SLOTS:
+            return perform_ocr(image_path, engine=engine, language=language)
+    if digest is None:
+        digest = image_digest(image_path)
+    key = ("ocr", digest, language)
+    cached = _cached_image_result(key) if digest else None
+    if cached is not None:
+        return cached
+    with _OCR_SLOTS:
+        result = perform_ocr(image_path, language=language)
+    if result.ok and digest:
+        _remember_image_result(key, result)
+    return result
+
+
+def analyze_image_cached(
+    image_path: Path | str,
+    ocr_text: str,
+    *,
+    client: Optional[VisionClient],
+    model: str,
+    user_text: str = "",
+    digest: Optional[str] = None,
+) -> VisionResult:
+    """Run :func:`analyze_image` under the shared concurrency cap, caching by content.
+
+    The cache key covers the image hash, model, OCR text and user request, so
+    re-sending a screenshot with the same request skips the vision model.
+    """
+
+    if digest is None:
+        digest = image_digest(image_path)
+    key = ("vision", digest, model, ocr_text, user_text)
+    cached = _cached_image_result(key) if digest else None
+    if cached is not None:
+        return cached
+    with _VISION_SLOTS:
+        result = analyze_image(
+            image_path, ocr_text, client=client, model=model, user_text=user_text
+        )
+    if result.ok and digest:
+        _remember_image_result(key, result)
+    return result
+
+
 __all__ = [
     "OCRResult",
     "VisionResult",
     "perform_ocr",
     "analyze_image",
+    "image_digest",
+    "perform_ocr_cached",
+    "analyze_image_cached",
+    "OCR_MAX_WORKERS",
+    "VISION_MAX_CONCURRENCY",
     "ThumbnailUpdate",
     "generate_thumbnail",
     "thumbnailize_conversation_markdown",
@@ -1,24 +1,42 @@
 from __future__ import annotations
 
+import array
 import ast
 import hashlib
+import heapq
+import importlib.util
 import json
+import logging
 import math
+import multiprocessing
 import os
+import pickle
 import re
+import sys
 import tempfile
 import time
 import uuid
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
 from pathlib import Path
 from threading import RLock
 from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
 
+if importlib.util.find_spec("numpy"):
+    import numpy as np  # type: ignore  # noqa: F401
+else:
+    np = None  # type: ignore[assignment]
+
 Vector = List[float]
 TextEmbedder = Callable[[str], Sequence[float]]
+TextBatchEmbedder = Callable[[Sequence[str]], Sequence[Sequence[float]]]
 ImageEmbedder = Callable[[Path], Sequence[float]]
 
-__all__ = ["MemoryManager", "RepositoryIndex", "TextEmbedder", "ImageEmbedder"]
+__all__ = ["MemoryManager", "RepositoryIndex", "TextEmbedder", "TextBatchEmbedder", "ImageEmbedder"]
+
+logger = logging.getLogger(__name__)
 
 
 _FALLBACK_EMBED_DIM = 16
@@ -33,6 +51,10 @@ _REPO_DEFAULT_EXCLUDE = {
 _MAX_INDEX_FILE_SIZE = 256_000
 _WINDOW_SIZE = 60
 _WINDOW_OVERLAP = 10
+_FILE_MANIFEST_VERSION = 1
+_EMBEDDINGS_FILENAME = "embeddings.f32"
+_PARALLEL_MIN_FILES = 32
+_EMBED_BATCH_SIZE = 64
 
 
 def _hash_embedding(data: bytes, dims: int = _FALLBACK_EMBED_DIM) -> Vector:
@@ -101,6 +123,188 @@ def _cosine(a: Vector, b: Vector) -> float:
     return dot / (da * db)
 
 
+class _VectorMatrix:
+    """Contiguous float32 embedding matrix with precomputed row norms.
+
+    Rows are grouped by dimension so a query only scores against vectors of the
+    same width, mirroring ``_cosine`` which treats length mismatches as zero
+    similarity.  Without NumPy the same interface is served by plain lists.
+    """
+
+    __slots__ = ("size", "_groups")
+
+    def __init__(self, vectors: Sequence[Vector]) -> None:
+        self.size = len(vectors)
+        by_dim: Dict[int, List[int]] = {}
+        for row, vec in enumerate(vectors):
+            if vec:
+                by_dim.setdefault(len(vec), []).append(row)
+        self._groups: Dict[int, Tuple[Any, Any, Any]] = {}
+        for dim, rows in by_dim.items():
+            if np is not None:
+                matrix = np.asarray([vectors[row] for row in rows], dtype=np.float32)
+                norms = np.linalg.norm(matrix, axis=1)
+                self._groups[dim] = (np.asarray(rows, dtype=np.intp), matrix, norms)
+            else:
+                members = [vectors[row] for row in rows]
+                norms = [math.sqrt(sum(x * x for x in vec)) for vec in members]
+                self._groups[dim] = (rows, members, norms)
+
+    @classmethod
+    def from_packed(cls, size: int, owners: Sequence[int], packed: Any, dim: int) -> "_VectorMatrix":
+        """Wrap an already packed embedding block without copying it.
+
+        ``packed`` is the value returned by ``_pack_vectors``/``_read_vectors``
+        and ``owners`` maps each of its rows to a position in the scored list.
+        """
+
+        matrix = cls([])
+        matrix.size = size
+        if owners and dim:
+            if np is not None:
+                norms = np.linalg.norm(packed, axis=1)
+                matrix._groups[dim] = (np.asarray(owners, dtype=np.intp), packed, norms)
+            else:
+                members = _vector_rows(packed, dim)
+                norms = [math.sqrt(sum(x * x for x in vec)) for vec in members]
+                matrix._groups[dim] = (list(owners), members, norms)
+        return matrix
+
+    def scores(self, query_vec: Vector) -> Any:
+        """Return the cosine similarity of ``query_vec`` against every row."""
+
+        group = self._groups.get(len(query_vec)) if query_vec else None
+        if np is not None:
+            result = np.zeros(self.size, dtype=np.float32)
+            if group is None:
+                return result
+            rows, matrix, norms = group
+            query = np.asarray(query_vec, dtype=np.float32)
+            denom = norms * np.float32(np.linalg.norm(query))
+            valid = denom > 0
+            dots = matrix @ query
+            result[rows] = np.where(valid, dots / np.where(valid, denom, 1.0), 0.0)
+            return result
+        result_list = [0.0] * self.size
+        if group is None:
+            return result_list
+        rows, members, norms = group
+        query_norm = math.sqrt(sum(x * x for x in query_vec))
+        if query_norm == 0:
+            return result_list
+        for row, vec, norm in zip(rows, members, norms):
+            if norm == 0:
+                continue
+            result_list[row] = sum(x * y for x, y in zip(query_vec, vec)) / (norm * query_norm)
+        return result_list
+
+
+def _dominant_width(vectors: Iterable[Sequence[float]]) -> int:
+    """Return the most common non-zero width among ``vectors`` (0 when none)."""
+
+    counts = Counter(len(vec) for vec in vectors if len(vec))
+    return counts.most_common(1)[0][0] if counts else 0
+
+
+def _pack_vectors(vectors: Sequence[Sequence[float]], dim: int) -> Tuple[Any, List[int]]:
+    """Pack every ``dim``-wide vector into one float32 block.
+
+    Returns the packed block (an ``(n, dim)`` NumPy array, or a flat
+    ``array('f')`` without NumPy) and the input positions that were kept.
+    Vectors of any other width are skipped.
+    """
+
+    owners = [index for index, vec in enumerate(vectors) if dim and len(vec) == dim]
+    if np is not None:
+        packed = np.empty((len(owners), dim), dtype=np.float32)
+        for row, index in enumerate(owners):
+            packed[row] = vectors[index]
+        return packed, owners
+    flat = array.array("f")
+    for index in owners:
+        flat.extend(vectors[index])
+    return flat, owners
+
+
+def _vector_rows(packed: Any, dim: int) -> List[Sequence[float]]:
+    """Return zero-copy per-row views over a packed block."""
+
+    if not dim:
+        return []
+    if np is not None:
+        return list(packed)
+    view = memoryview(packed)
+    return [view[start : start + dim] for start in range(0, len(packed), dim)]
+
+
+def _write_vectors(path: Path, packed: Any) -> None:
+    """Write ``packed`` as raw little-endian float32 rows."""
+
+    with path.open("wb") as fh:
+        if np is not None:
+            np.ascontiguousarray(packed, dtype="<f4").tofile(fh)
+            return
+        data = packed
+        if sys.byteorder != "little":
+            data = array.array("f", packed)
+            data.byteswap()
+        fh.write(data.tobytes())
+
+
+def _read_vectors(path: Path, dim: int, rows: int) -> Optional[Any]:
+    """Load a sidecar written by ``_write_vectors``; ``None`` if it does not fit."""
+
+    if not dim or rows <= 0:
+        return None
+    try:
+        if np is not None:
+            data = np.fromfile(path, dtype="<f4")
+        else:
+            data = array.array("f")
+            data.frombytes(path.read_bytes())
+            if sys.byteorder != "little":
+                data.byteswap()
+    except (OSError, ValueError):
+        return None
+    if len(data) != rows * dim:
+        return None
+    if np is not None:
+        return data.reshape(rows, dim).astype(np.float32, copy=False)
+    return data
+
+
+def _combine_scores(parts: Sequence[Any]) -> Any:
+    """Element-wise maximum across score arrays produced by ``_VectorMatrix``."""
+
+    if np is not None:
+        return np.maximum.reduce(parts) if len(parts) > 1 else parts[0]
+    return [max(values) for values in zip(*parts)]
+
+
+def _top_k(scores: Any, k: int) -> List[Tuple[int, float]]:
+    """Return ``(row, score)`` pairs for the ``k`` best positive scores."""
+
+    if k <= 0:
+        return []
+    if np is not None:
+        positive = np.flatnonzero(scores > 0)
+        if positive.size > k:
+            positive = np.sort(positive[np.argpartition(scores[positive], -k)[-k:]])
+        order = positive[np.argsort(-scores[positive], kind="stable")]
+        return [(int(row), float(scores[row])) for row in order]
+    candidates = ((score, row) for row, score in enumerate(scores) if score > 0)
+    best = heapq.nlargest(k, candidates, key=lambda item: item[0])
+    return [(row, score) for score, row in best]
+
+
+def _filter_rows(scores: Any, labels: Any, wanted: str) -> Any:
+    """Zero out scores whose row label differs from ``wanted``."""
+
+    if np is not None:
+        return np.where(labels == wanted, scores, 0.0)
+    return [score if label == wanted else 0.0 for score, label in zip(scores, labels)]
+
+
 @dataclass(slots=True)
 class _ImageRecord:
     session: str
@@ -142,12 +346,12 @@ class _RepoIndexRecord:
     start_line: int
     end_line: int
     text: str
-    embedding: Vector
+    embedding: Sequence[float]
     metadata: Dict[str, Any]
     timestamp: float
 
     def score(self, query_vec: Vector) -> float:
-        if not self.embedding or not query_vec:
+        if not len(self.embedding) or not query_vec:
             return 0.0
         return _cosine(query_vec, self.embedding)
 
@@ -157,6 +361,90 @@ def _segment_identifier(path: str, start_line: int, end_line: int) -> str:
     return hashlib.blake2b(payload, digest_size=16).hexdigest()
 
 
+@dataclass(slots=True)
+class _RepoFileState:
+    """Per-file fingerprint used to skip unchanged files during rebuilds."""
+
+    size: int
+    mtime_ns: int
+    digest: str
+    indexed: bool
+    embedded: bool
+    segments: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "mtime_ns": self.mtime_ns,
+            "blake2b": self.digest,
+            "indexed": self.indexed,
+            "embedded": self.embedded,
+            "segments": self.segments,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Mapping[str, Any]) -> Optional["_RepoFileState"]:
+        try:
+            return cls(
+                size=int(payload["size"]),
+                mtime_ns=int(payload["mtime_ns"]),
+                digest=str(payload.get("blake2b") or ""),
+                indexed=bool(payload.get("indexed", True)),
+                embedded=bool(payload.get("embedded", False)),
+                segments=int(payload.get("segments") or 0),
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+
+def _file_key(base_root: Path | str, rel_path: str) -> str:
+    return (Path(base_root) / rel_path).as_posix()
+
+
+def _decode_text(data: Optional[bytes]) -> Optional[str]:
+    if data is None:
+        return None
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+
+
+def _forked_workers() -> bool:
+    """Return ``True`` when pool workers fork rather than re-import ``__main__``.
+
+    Spawned workers re-run the launching script's top level, so repository scans stay serial there.
+    """
+
+    method = multiprocessing.get_start_method(allow_none=True)
+    return (method or multiprocessing.get_all_start_methods()[0]) == "fork"
+
+
+def _scan_in_worker(
+    index_cls: type, path: str, size: int, known_digest: str
+) -> Tuple[str, bool, Optional[List["_RepoSegment"]]]:
+    """Process-pool entry point mirroring ``RepositoryIndex._scan_file``.
+
+    The segmentation helpers only depend on their arguments, so a bare
+    instance (no roots, lock or cache) is enough inside the worker process.
+    """
+
+    return index_cls.__new__(index_cls)._scan_file(Path(path), size, known_digest)
+
+
+def _record_entry(record: _RepoIndexRecord, row: int) -> Dict[str, Any]:
+    return {
+        "id": record.identifier,
+        "path": record.path,
+        "start_line": record.start_line,
+        "end_line": record.end_line,
+        "text": record.text,
+        "row": row,
+        "metadata": record.metadata,
+        "ts": record.timestamp,
+    }
+
+
 class MemoryManager:
     """Append-only conversation memory with text and image embeddings."""
 
@@ -177,6 +465,8 @@ class MemoryManager:
         self._image_embedder = image_embedder or _fallback_image_embedding
         self._lock = RLock()
         self._image_cache: List[_ImageRecord] = []
+        self._image_matrices: Optional[Tuple[_VectorMatrix, ...]] = None
+        self._image_sessions: Any = None
         self._cache_loaded = False
 
     def log_interaction(
@@ -266,6 +556,7 @@ class MemoryManager:
             with dataset_path.open("a", encoding="utf-8") as fh:
                 fh.write(serialised + "\n")
             if self._cache_loaded:
+                self._image_matrices = None
                 for path_str, img_vec, ocr_vec, ocr_text in record_source:
                     if not (img_vec or ocr_vec or text_embedding):
                         continue
@@ -309,21 +600,17 @@ class MemoryManager:
 
         with self._lock:
             self._ensure_cache_locked()
-            records = list(self._image_cache)
+            records = self._image_cache
+            matrices = self._ensure_image_matrices_locked()
+            sessions = self._image_sessions
 
-        hits: List[tuple[float, _ImageRecord]] = []
-        for record in records:
-            if session_filter and record.session != session_filter:
-                continue
-            score = record.score(query_vec)
-            if score <= 0:
-                continue
-            hits.append((score, record))
-
-        hits.sort(key=lambda item: item[0], reverse=True)
+        scores = _combine_scores([matrix.scores(query_vec) for matrix in matrices])
+        if session_filter:
+            scores = _filter_rows(scores, sessions, session_filter)
 
         results: List[Dict[str, Any]] = []
-        for score, record in hits[:k]:
+        for row, score in _top_k(scores, k):
+            record = records[row]
             results.append(
                 {
                     "score": score,
@@ -394,8 +681,28 @@ class MemoryManager:
                             )
                         )
         self._image_cache = cache
+        self._image_matrices = None
         self._cache_loaded = True
 
+    def _ensure_image_matrices_locked(self) -> Tuple[_VectorMatrix, ...]:
+        """Build (or reuse) the per-modality embedding matrices for the image cache.
+
+        ``log_interaction`` only appends to the cache, so row numbers stay valid
+        for callers holding an older matrix; new entries simply invalidate the
+        matrices and they are rebuilt on the next search.
+        """
+
+        if self._image_matrices is None:
+            records = self._image_cache
+            self._image_matrices = (
+                _VectorMatrix([record.image_embedding for record in records]),
+                _VectorMatrix([record.ocr_embedding for record in records]),
+                _VectorMatrix([record.text_embedding for record in records]),
+            )
+            sessions = [record.session for record in records]
+            self._image_sessions = np.asarray(sessions, dtype=object) if np is not None else sessions
+        return self._image_matrices
+
     def _embed_text(self, text: str) -> Vector:
         if not text:
             return []
@@ -416,10 +723,12 @@ class RepositoryIndex:
         data_root: Optional[Path | str] = None,
         *,
         text_embedder: Optional[TextEmbedder] = None,
+        text_batch_embedder: Optional[TextBatchEmbedder] = None,
         enable_embeddings: bool = True,
         include_extensions: Optional[Sequence[str]] = None,
         exclude_dirs: Optional[Sequence[str]] = None,
         extra_roots: Optional[Sequence[Path | str]] = None,
+        workers: int = 1,
     ) -> None:
         base_repo = Path(repo_root) if repo_root is not None else Path(__file__).resolve().parent
         self.repo_root = base_repo.resolve()
@@ -428,8 +737,12 @@ class RepositoryIndex:
         self.index_dir = self.data_root / "repo_index"
         self.index_path = self.index_dir / "index.jsonl"
         self.manifest_path = self.index_dir / "manifest.json"
+        self.files_manifest_path = self.index_dir / "files.json"
+        self.embeddings_path = self.index_dir / _EMBEDDINGS_FILENAME
         self.enable_embeddings = enable_embeddings
         self._text_embedder = text_embedder or _fallback_repo_embedding
+        self._batch_embedder = text_batch_embedder
+        self.workers = workers
         self._include_extensions = tuple(include_extensions) if include_extensions else None
         self._exclude_dirs = set(exclude_dirs) if exclude_dirs else set(_REPO_DEFAULT_EXCLUDE)
         extras: List[Path] = []
@@ -447,86 +760,176 @@ class RepositoryIndex:
         self._extra_roots: Tuple[Path, ...] = tuple(extras)
         self._roots: Tuple[Path, ...] = (self.repo_root, *self._extra_roots)
         self._records: List[_RepoIndexRecord] = []
+        self._matrix: Optional[_VectorMatrix] = None
+        self._packed: Any = None
+        self._packed_owners: List[int] = []
+        self._embed_dim = 0
+        self._embeddings_intact = True
         self._loaded = False
         self._lock = RLock()
 
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
-    def rebuild(self) -> Dict[str, Any]:
-        """Rebuild the repository index and return a summary."""
+    def rebuild(self, *, incremental: bool = True, workers: Optional[int] = None) -> Dict[str, Any]:
+        """Rebuild the repository index and return a summary.
+
+        When ``incremental`` is enabled the per-file manifest stored beside
+        ``manifest.json`` is consulted first: files whose size and mtime (or,
+        failing that, BLAKE2b content digest) are unchanged keep their existing
+        segments and embeddings, so only new or modified files are re-parsed
+        and re-embedded.  Segments for files that disappeared are dropped.
+        Passing ``incremental=False`` forces a full rebuild.
+
+        ``workers`` overrides the constructor setting for this call.  With more
+        than one worker, reading and segmenting changed files fans out to a
+        process pool and embeddings are computed in batches (or on a thread
+        pool for single-text embedders); records are still emitted in walk
+        order so the index is byte-for-byte deterministic.
+        """
 
-        segments: List[Tuple[Path, _RepoSegment]] = []
-        files_indexed = 0
         timestamp = time.time()
+        worker_count = self._resolve_workers(workers)
+        previous_files: Dict[str, _RepoFileState] = {}
+        previous_records: Dict[str, List[_RepoIndexRecord]] = {}
+        if incremental:
+            self.load()
+            if self._embeddings_intact:
+                previous_files = self._load_file_manifest()
+            if previous_files:
+                with self._lock:
+                    for record in self._records:
+                        key = self._record_file_key(record)
+                        previous_records.setdefault(key, []).append(record)
+
+        # Pass 1: walk and stat.  Files whose size and mtime match the manifest
+        # are reused outright; everything else is queued for scanning.
+        slots: List[List[_RepoIndexRecord]] = []
+        pending: List[Tuple[int, Path, Path, str, os.stat_result, Optional[_RepoFileState]]] = []
+        file_states: Dict[str, _RepoFileState] = {}
+        files_indexed = 0
+        files_changed = 0
+        files_reused = 0
 
         for base_root, path in self._iter_repo_files():
-            text = self._read_file_text(path)
-            if text is None:
+            rel_path = self._relative_path(path, base_root)
+            key = _file_key(base_root, rel_path)
+            try:
+                stat = path.stat()
+            except OSError:
                 continue
-            files_indexed += 1
-            for segment in self._segment_file(path, text):
-                segments.append((base_root, segment))
-
-        entries = []
-        for base_root, segment in segments:
-            rel_path = self._relative_path(segment.path, base_root)
-            embedding: Vector = []
-            if self.enable_embeddings and segment.text.strip():
-                embedding = self._embed_text(segment.text)
-            record_id = _segment_identifier(rel_path, segment.start_line, segment.end_line)
-            metadata = dict(segment.metadata)
-            metadata.setdefault("scan_root", str(base_root))
-            entry = {
-                "id": record_id,
-                "path": rel_path,
-                "start_line": segment.start_line,
-                "end_line": segment.end_line,
-                "text": segment.text,
-                "embedding": embedding,
-                "metadata": metadata,
-                "ts": timestamp,
-            }
-            entries.append(entry)
+            previous = previous_files.get(key)
+            reused: Optional[List[_RepoIndexRecord]] = None
+            if previous is not None and previous.embedded == self.enable_embeddings:
+                reused = self._reuse_file_records(previous, previous_records.get(key))
+            if (
+                reused is not None
+                and previous is not None
+                and previous.size == stat.st_size
+                and previous.mtime_ns == stat.st_mtime_ns
+            ):
+                file_states[key] = previous
+                slots.append(reused)
+                files_reused += 1
+                if previous.indexed:
+                    files_indexed += 1
+                continue
+            slots.append([])
+            pending.append((len(slots) - 1, base_root, path, key, stat, previous if reused is not None else None))
 
-        self.index_dir.mkdir(parents=True, exist_ok=True)
-        tmp_path = self._write_index(entries)
-        tmp_path.replace(self.index_path)
+        # Pass 2: read, hash and segment the queued files.
+        scans = self._scan_files(
+            [(path, stat.st_size, previous.digest if previous else "") for _, _, path, _, stat, previous in pending],
+            worker_count,
+        )
+        new_segments: List[Tuple[int, Path, _RepoSegment]] = []
+        for (slot, base_root, path, key, stat, previous), (digest, indexed, segments) in zip(pending, scans):
+            if segments is None and previous is not None:
+                previous.size = stat.st_size
+                previous.mtime_ns = stat.st_mtime_ns
+                file_states[key] = previous
+                slots[slot] = previous_records.get(key) or []
+                files_reused += 1
+                if previous.indexed:
+                    files_indexed += 1
+                continue
+            segments = segments or []
+            files_changed += 1
+            if indexed:
+                files_indexed += 1
+            new_segments.extend((slot, base_root, segment) for segment in segments)
+            file_states[key] = _RepoFileState(
+                size=stat.st_size,
+                mtime_ns=stat.st_mtime_ns,
+                digest=digest,
+                indexed=indexed,
+                embedded=self.enable_embeddings,
+                segments=len(segments),
+            )
+
+        # Pass 3: embed every new segment, then stitch records back in order.
+        embeddings: List[Vector] = [[] for _ in new_segments]
+        if self.enable_embeddings:
+            embeddings = self._embed_many([segment.text for _, _, segment in new_segments], worker_count)
+        for (slot, base_root, segment), embedding in zip(new_segments, embeddings):
+            slots[slot].append(self._make_record(base_root, segment, embedding, timestamp))
+        records: List[_RepoIndexRecord] = [record for slot in slots for record in slot]
 
-        embed_dim = 0
-        if entries and entries[0]["embedding"]:
-            embed_dim = len(entries[0]["embedding"])
+        files_removed = len(set(previous_files) - set(file_states))
+        unchanged = bool(previous_files) and not files_changed and not files_removed
+
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        if unchanged and self.index_path.exists():
+            packed, owners, embed_dim = self._packed, self._packed_owners, self._embed_dim
+        else:
+            # Prefer the width the embedder produces now, so stale reused
+            # vectors are the ones flagged for re-embedding.
+            embed_dim = _dominant_width(embeddings) or _dominant_width(record.embedding for record in records)
+            packed, owners = _pack_vectors([record.embedding for record in records], embed_dim)
+            rows = [-1] * len(records)
+            for row, index in enumerate(owners):
+                rows[index] = row
+            self._flag_dropped_embeddings(records, rows, embed_dim, file_states)
+            tmp_vectors = self.embeddings_path.with_suffix(".tmp")
+            _write_vectors(tmp_vectors, packed)
+            tmp_vectors.replace(self.embeddings_path)
+            tmp_path = self._write_index([_record_entry(record, row) for record, row in zip(records, rows)])
+            tmp_path.replace(self.index_path)
+            # Point records at the freshly packed block so the previous one
+            # (and any sidecar data it was read from) can be released.
+            views = _vector_rows(packed, embed_dim)
+            for record, row in zip(records, rows):
+                record.embedding = views[row] if row >= 0 else []
 
         manifest = {
             "timestamp": timestamp,
-            "segments": len(entries),
+            "segments": len(records),
             "files_indexed": files_indexed,
+            "files_changed": files_changed,
+            "files_removed": files_removed,
             "embedding_dim": embed_dim,
+            "embedding_rows": len(owners),
+            "embeddings_file": _EMBEDDINGS_FILENAME,
         }
         with self.manifest_path.open("w", encoding="utf-8") as fh:
             json.dump(manifest, fh, ensure_ascii=False, indent=2)
-
-        records = [
-            _RepoIndexRecord(
-                identifier=entry["id"],
-                path=str(entry["path"]),
-                start_line=int(entry["start_line"]),
-                end_line=int(entry["end_line"]),
-                text=str(entry["text"]),
-                embedding=_ensure_vector(entry.get("embedding")),
-                metadata=dict(entry.get("metadata") or {}),
-                timestamp=float(entry.get("ts") or timestamp),
-            )
-            for entry in entries
-        ]
+        self._write_file_manifest(file_states)
 
         with self._lock:
             self._records = records
+            self._matrix = None
+            self._packed = packed
+            self._packed_owners = owners
+            self._embed_dim = embed_dim
+            self._embeddings_intact = True
             self._loaded = True
 
         return {
             "files_indexed": files_indexed,
-            "segments": len(entries),
+            "files_changed": files_changed,
+            "files_reused": files_reused,
+            "files_removed": files_removed,
+            "segments": len(records),
             "timestamp": timestamp,
             "index_path": self.index_path,
         }
@@ -569,19 +972,17 @@ class RepositoryIndex:
         self.load()
 
         with self._lock:
-            records = list(self._records)
-
-        scored: List[Tuple[float, _RepoIndexRecord]] = []
-        for record in records:
-            score = record.score(query_vec)
-            if score <= 0:
-                continue
-            scored.append((score, record))
-
-        scored.sort(key=lambda item: item[0], reverse=True)
+            records = self._records
+            matrix = self._matrix
+            if matrix is None:
+                matrix = _VectorMatrix.from_packed(
+                    len(records), self._packed_owners, self._packed, self._embed_dim
+                )
+                self._matrix = matrix
 
         results: List[Dict[str, Any]] = []
-        for score, record in scored[:k]:
+        for row, score in _top_k(matrix.scores(query_vec), k):
+            record = records[row]
             results.append(
                 {
                     "id": record.identifier,
@@ -635,17 +1036,187 @@ class RepositoryIndex:
 
     def _read_file_text(self, path: Path) -> Optional[str]:
         try:
-            if path.stat().st_size > _MAX_INDEX_FILE_SIZE:
-                return None
+            size = path.stat().st_size
         except OSError:
             return None
-        try:
-            return path.read_text(encoding="utf-8")
-        except UnicodeDecodeError:
+        return _decode_text(self._read_file_bytes(path, size))
+
+    def _read_file_bytes(self, path: Path, size: int) -> Optional[bytes]:
+        if size > _MAX_INDEX_FILE_SIZE:
             return None
+        try:
+            return path.read_bytes()
         except OSError:
             return None
 
+    def _resolve_workers(self, workers: Optional[int]) -> int:
+        count = self.workers if workers is None else workers
+        if count <= 0:
+            return os.cpu_count() or 1
+        return count
+
+    def _scan_file(
+        self, path: Path, size: int, known_digest: str = ""
+    ) -> Tuple[str, bool, Optional[List[_RepoSegment]]]:
+        """Read, hash and segment ``path``.
+
+        Returns ``(digest, indexed, segments)``; ``segments`` is ``None`` when
+        the content digest equals ``known_digest`` and parsing was skipped.
+        """
+
+        data = self._read_file_bytes(path, size)
+        digest = hashlib.blake2b(data).hexdigest() if data is not None else ""
+        if known_digest and digest == known_digest:
+            return digest, True, None
+        text = _decode_text(data)
+        if text is None:
+            return digest, False, []
+        return digest, True, self._segment_file(path, text)
+
+    def _scan_files(
+        self, jobs: Sequence[Tuple[Path, int, str]], workers: int
+    ) -> List[Tuple[str, bool, Optional[List[_RepoSegment]]]]:
+        if workers > 1 and len(jobs) >= _PARALLEL_MIN_FILES and _forked_workers():
+            chunksize = max(1, len(jobs) // (workers * 4))
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    return list(
+                        pool.map(
+                            _scan_in_worker,
+                            [type(self)] * len(jobs),
+                            [path.as_posix() for path, _, _ in jobs],
+                            [size for _, size, _ in jobs],
+                            [digest for _, _, digest in jobs],
+                            chunksize=chunksize,
+                        )
+                    )
+            except (OSError, BrokenProcessPool, pickle.PicklingError) as exc:
+                logger.warning("Parallel repository scan failed, continuing serially: %s", exc)
+        return [self._scan_file(path, size, digest) for path, size, digest in jobs]
+
+    def _embed_many(self, texts: Sequence[str], workers: int) -> List[Vector]:
+        """Embed ``texts`` in order, leaving whitespace-only entries with an empty vector."""
+
+        vectors: List[Vector] = [[] for _ in texts]
+        live = [index for index, text in enumerate(texts) if text.strip()]
+        if not live:
+            return vectors
+        embedded = self._embed_texts([texts[index] for index in live], workers)
+        for index, vector in zip(live, embedded):
+            vectors[index] = vector
+        return vectors
+
+    def _embed_texts(self, texts: Sequence[str], workers: int) -> List[Vector]:
+        """Embed ``texts`` in order, batching when a batch embedder is configured."""
+
+        if self._batch_embedder is not None:
+            vectors: List[Vector] = []
+            for start in range(0, len(texts), _EMBED_BATCH_SIZE):
+                batch = list(texts[start : start + _EMBED_BATCH_SIZE])
+                result = list(self._batch_embedder(batch))
+                if len(result) != len(batch):
+                    raise ValueError(f"Batch embedder returned {len(result)} vectors for {len(batch)} texts")
+                vectors.extend([float(value) for value in vec] for vec in result)
+            return vectors
+        if workers > 1 and len(texts) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(self._embed_text, texts))
+        return [self._embed_text(text) for text in texts]
+
+    def _make_record(
+        self, base_root: Path, segment: _RepoSegment, embedding: Vector, timestamp: float
+    ) -> _RepoIndexRecord:
+        rel_path = self._relative_path(segment.path, base_root)
+        metadata = dict(segment.metadata)
+        metadata.setdefault("scan_root", str(base_root))
+        return _RepoIndexRecord(
+            identifier=_segment_identifier(rel_path, segment.start_line, segment.end_line),
+            path=rel_path,
+            start_line=segment.start_line,
+            end_line=segment.end_line,
+            text=segment.text,
+            embedding=embedding,
+            metadata=metadata,
+            timestamp=timestamp,
+        )
+
+    def _flag_dropped_embeddings(
+        self,
+        records: Sequence[_RepoIndexRecord],
+        rows: Sequence[int],
+        embed_dim: int,
+        file_states: Mapping[str, _RepoFileState],
+    ) -> None:
+        """Mark files whose vectors did not fit ``embed_dim`` for re-embedding.
+
+        Mixed widths happen when the hashed fallback and a real embedder both
+        contributed to one build; the odd ones out cannot share the block, so
+        their files are recorded as unembedded and redone on the next build.
+        """
+
+        dropped = [index for index, record in enumerate(records) if len(record.embedding) and rows[index] < 0]
+        if not dropped:
+            return
+        keys = {self._record_file_key(records[index]) for index in dropped}
+        logger.warning(
+            "Dropped %d repository embeddings not %d wide; re-embedding %d file(s) on the next build",
+            len(dropped),
+            embed_dim,
+            len(keys),
+        )
+        for key in keys:
+            state = file_states.get(key)
+            if state is not None:
+                state.embedded = False
+
+    def _record_file_key(self, record: _RepoIndexRecord) -> str:
+        scan_root = record.metadata.get("scan_root") or str(self.repo_root)
+        return _file_key(scan_root, record.path)
+
+    def _reuse_file_records(
+        self, state: _RepoFileState, previous: Optional[List[_RepoIndexRecord]]
+    ) -> Optional[List[_RepoIndexRecord]]:
+        """Return cached records for a file, or ``None`` when the cache is incomplete."""
+
+        cached = previous or []
+        if len(cached) != state.segments:
+            return None
+        return cached
+
+    def _load_file_manifest(self) -> Dict[str, _RepoFileState]:
+        if not self.files_manifest_path.exists() or not self.index_path.exists():
+            return {}
+        try:
+            with self.files_manifest_path.open("r", encoding="utf-8") as fh:
+                payload = json.load(fh)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        if not isinstance(payload, Mapping) or payload.get("version") != _FILE_MANIFEST_VERSION:
+            return {}
+        files = payload.get("files")
+        if not isinstance(files, Mapping):
+            return {}
+        states: Dict[str, _RepoFileState] = {}
+        for key, entry in files.items():
+            if not isinstance(entry, Mapping):
+                continue
+            state = _RepoFileState.from_dict(entry)
+            if state is not None:
+                states[str(key)] = state
+        return states
+
+    def _write_file_manifest(self, states: Mapping[str, _RepoFileState]) -> None:
+        payload = {
+            "version": _FILE_MANIFEST_VERSION,
+            "files": {key: state.to_dict() for key, state in states.items()},
+        }
+        tmp_file = tempfile.NamedTemporaryFile("w", encoding="utf-8", delete=False, dir=self.index_dir)
+        try:
+            json.dump(payload, tmp_file, ensure_ascii=False)
+        finally:
+            tmp_file.close()
+        Path(tmp_file.name).replace(self.files_manifest_path)
+
     def _segment_file(self, path: Path, text: str) -> List[_RepoSegment]:
         suffix = path.suffix.lower()
         lines = text.splitlines()
@@ -839,12 +1410,40 @@ class RepositoryIndex:
             tmp_file.close()
         return Path(tmp_file.name)
 
+    def _read_manifest(self) -> Dict[str, Any]:
+        try:
+            with self.manifest_path.open("r", encoding="utf-8") as fh:
+                payload = json.load(fh)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        return payload if isinstance(payload, dict) else {}
+
     def _load_locked(self) -> None:
+        """Load slim JSONL metadata plus the float32 embedding sidecar.
+
+        Entries written before the sidecar existed carry an inline
+        ``embedding`` list; those are still honoured and get packed on load.
+        """
+
         records: List[_RepoIndexRecord] = []
+        self._matrix = None
+        self._packed = None
+        self._packed_owners = []
+        self._embed_dim = 0
+        self._embeddings_intact = True
         if not self.index_path.exists():
             self._records = []
             self._loaded = True
             return
+
+        manifest = self._read_manifest()
+        dim = int(manifest.get("embedding_dim") or 0)
+        stored = _read_vectors(self.embeddings_path, dim, int(manifest.get("embedding_rows") or 0))
+        stored_rows = _vector_rows(stored, dim) if stored is not None else []
+
+        vectors: List[Sequence[float]] = []
+        embedded = 0
+        in_order = True
         with self.index_path.open("r", encoding="utf-8") as fh:
             for line in fh:
                 payload = line.strip()
@@ -854,17 +1453,47 @@ class RepositoryIndex:
                     entry = json.loads(payload)
                 except json.JSONDecodeError:
                     continue
+                embedding: Sequence[float] = []
+                row = entry.get("row")
+                if isinstance(row, int) and row >= 0:
+                    if row < len(stored_rows):
+                        embedding = stored_rows[row]
+                        in_order = in_order and row == embedded
+                        embedded += 1
+                    else:
+                        self._embeddings_intact = False
+                elif "embedding" in entry:
+                    embedding = _ensure_vector(entry.get("embedding"))
+                    in_order = False
                 record = _RepoIndexRecord(
                     identifier=str(entry.get("id") or ""),
                     path=str(entry.get("path") or ""),
                     start_line=int(entry.get("start_line") or 1),
                     end_line=int(entry.get("end_line") or 1),
                     text=str(entry.get("text") or ""),
-                    embedding=_ensure_vector(entry.get("embedding")),
+                    embedding=embedding,
                     metadata=dict(entry.get("metadata") or {}),
                     timestamp=float(entry.get("ts") or 0.0),
                 )
                 records.append(record)
+                vectors.append(embedding)
+
+        if in_order and stored is not None and embedded == len(stored_rows):
+            self._packed = stored
+            self._packed_owners = [index for index, vec in enumerate(vectors) if len(vec)]
+            self._embed_dim = dim
+        else:
+            dim = next((len(vec) for vec in vectors if len(vec)), 0)
+            self._packed, self._packed_owners = _pack_vectors(vectors, dim)
+            self._embed_dim = dim
+            dropped = sum(1 for vec in vectors if len(vec)) - len(self._packed_owners)
+            if dropped:
+                logger.warning(
+                    "Ignoring %d stored repository embeddings not %d wide; the next build re-embeds every file",
+                    dropped,
+                    dim,
+                )
+                self._embeddings_intact = False
         self._records = records
         self._loaded = True
 
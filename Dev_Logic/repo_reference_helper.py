@@ -68,6 +68,7 @@ class RepoReferenceIndex:
         *,
         repository_index: Optional[RepositoryIndex] = None,
         extra_roots: Optional[Sequence[Path | str]] = None,
+        workers: int = 0,
     ) -> None:
         self.repo_root = Path(repo_root).resolve()
         self._extra_roots = _normalize_extra_roots(self.repo_root, extra_roots)
@@ -75,6 +76,7 @@ class RepoReferenceIndex:
         self.repository_index = repository_index or RepositoryIndex(
             repo_root=self.repo_root,
             extra_roots=self._extra_roots,
+            workers=workers,
         )
         self._references: List[RepoReference] = []
 
@@ -1,7 +1,7 @@
 """Task system public exports."""
 
 from .bus import Subscription, publish, subscribe
-from .diffs import record_diff
+from .diffs import archive_task_snapshots, record_diff
 from .models import (
     DiffSnapshot,
     Task,
@@ -19,6 +19,7 @@ __all__ = [
     "append_event",
     "update_task",
     "record_diff",
+    "archive_task_snapshots",
     "publish",
     "subscribe",
     "Subscription",
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 import logging
 from datetime import UTC, datetime
 from pathlib import Path
@@ -17,7 +16,8 @@ from PySide6.QtWidgets import (
 )
 
 from .bus import Subscription, publish, subscribe
-from .models import TASKS_FILE, Task, TaskEvent, append_event, update_task
+from .diffs import archive_task_snapshots
+from .models import TASKS_FILE, Task, TaskEvent, append_event, load_tasks, update_task
 from .panel import TaskPanel
 from tools.system_metrics import SystemMetricsJob
 
@@ -50,23 +50,7 @@ class TaskManager:
     def list_tasks(self) -> List[Task]:
         """Return all task entries from the dataset."""
 
-        if not self.dataset_path.exists():
-            return []
-        tasks: List[Task] = []
-        with self.dataset_path.open("r", encoding="utf-8") as fh:
-            for line in fh:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    payload = json.loads(line)
-                except json.JSONDecodeError:
-                    continue
-                try:
-                    tasks.append(Task.from_dict(payload))
-                except Exception:
-                    logger.debug("Skipping malformed task payload: %r", payload)
-        return tasks
+        return load_tasks(self.dataset_path)
 
     # ------------------------------------------------------------------
     def get_task(self, task_id: str) -> Optional[Task]:
@@ -424,6 +408,10 @@ class TaskCard(QWidget):
         publish("task.updated", updated.to_dict())
         if status == "deleted":
             publish("task.deleted", {"id": updated.id})
+            try:
+                archive_task_snapshots(updated.id)
+            except Exception:
+                logger.exception("Failed to clean snapshots for task %s", updated.id)
         self.panel.update_task(updated)
         if self._selected_task and self._selected_task.id == updated.id:
             self._selected_task = updated
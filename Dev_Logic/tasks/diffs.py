@@ -1,9 +1,11 @@
 """Helpers for capturing per-task diff statistics.
 
 The helpers prefer Git ``--numstat`` output whenever the workspace is a
-repository. If the workspace is not Git-controlled or a given file is
-untracked, the module falls back to maintaining lightweight text
-snapshots so we can still compute line-level additions/removals.
+repository, counting untracked files as fully added. If the workspace is not
+Git-controlled or a target lies outside the repository, the module falls back
+to per-task baselines so we can still compute line-level additions/removals. Baselines are zlib-compressed blobs
+in a content-addressed store shared by every task; each task keeps only a
+small manifest of blob ids, and archiving a task collects orphaned blobs.
 
 Each diff capture updates the corresponding :class:`~tasks.models.Task`
 record, appends a :class:`~tasks.models.DiffSnapshot` to
@@ -12,13 +14,21 @@ bus so UI surfaces stay synchronized.
 """
 from __future__ import annotations
 
-import difflib
+import atexit
+import contextlib
+import hashlib
 import json
+import os
+import shutil
 import subprocess
+import tempfile
+import threading
 import time
+import zlib
+from collections import Counter
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
 from .bus import publish
 from .models import (
@@ -29,7 +39,15 @@ from .models import (
     update_task,
 )
 
-__all__ = ["record_diff"]
+__all__ = [
+    "GitDiffSession",
+    "archive_task_snapshots",
+    "close_git_diff_sessions",
+    "collect_snapshot_garbage",
+    "configure_git_diff_session",
+    "line_change_counts",
+    "record_diff",
+]
 
 _SNAPSHOT_ROOT = DATASETS_DIR / "runs"
 
@@ -155,7 +173,37 @@ def _relative_to_workspace(path: Path, workspace: Path) -> str:
         return path.as_posix()
 
 
+GIT_ROOT_NEGATIVE_TTL = 30.0
+"""Seconds a "not a repository" answer is reused before probing again."""
+
+GIT_DIFF_SESSION_MODES = ("off", "batch", "fsmonitor")
+
+_GIT_ROOT_CACHE: Dict[Path, Tuple[Optional[Path], float]] = {}
+_GIT_ROOT_LOCK = threading.Lock()
+_GIT_SESSIONS: Dict[Path, "GitDiffSession"] = {}
+_GIT_SESSIONS_LOCK = threading.Lock()
+_GIT_SESSION_MODE = "off"
+
+
 def _detect_git_repo(start: Path) -> Optional[Path]:
+    """Return the repository root containing ``start``, memoized per path."""
+
+    now = time.monotonic()
+    with _GIT_ROOT_LOCK:
+        cached = _GIT_ROOT_CACHE.get(start)
+    if cached is not None:
+        root, stamp = cached
+        if root is not None and (root / ".git").exists():
+            return root
+        if root is None and now - stamp < GIT_ROOT_NEGATIVE_TTL:
+            return None
+    root = _probe_git_repo(start)
+    with _GIT_ROOT_LOCK:
+        _GIT_ROOT_CACHE[start] = (root, now)
+    return root
+
+
+def _probe_git_repo(start: Path) -> Optional[Path]:
     try:
         result = subprocess.run(
             ["git", "-C", str(start), "rev-parse", "--show-toplevel"],
@@ -174,6 +222,213 @@ def _detect_git_repo(start: Path) -> Optional[Path]:
     return Path(top).resolve()
 
 
+def configure_git_diff_session(mode: str) -> str:
+    """Select how :func:`record_diff` queries Git and return the active mode.
+
+    ``"off"`` runs ``git diff --numstat`` plus ``git ls-files --others`` per
+    capture, so untracked files count as fully added.  ``"batch"`` keeps a
+    :class:`GitDiffSession` per repository: a single ``git status`` call finds
+    modified and untracked files and a long-running ``git cat-file --batch``
+    serves index blobs for in-process counting.  ``"fsmonitor"`` additionally
+    asks Git to use its filesystem monitor and untracked cache for the scan.
+    """
+
+    global _GIT_SESSION_MODE
+    normalized = str(mode or "off").strip().lower()
+    if normalized not in GIT_DIFF_SESSION_MODES:
+        raise ValueError(f"Unknown git diff session mode: {mode!r}")
+    with _GIT_SESSIONS_LOCK:
+        _GIT_SESSION_MODE = normalized
+        sessions = list(_GIT_SESSIONS.values())
+        _GIT_SESSIONS.clear()
+    for session in sessions:
+        session.close()
+    return normalized
+
+
+def close_git_diff_sessions() -> None:
+    """Terminate every long-running ``git cat-file`` helper."""
+
+    with _GIT_SESSIONS_LOCK:
+        sessions = list(_GIT_SESSIONS.values())
+        _GIT_SESSIONS.clear()
+    for session in sessions:
+        session.close()
+
+
+def _git_diff_session(repo_root: Path) -> Optional["GitDiffSession"]:
+    with _GIT_SESSIONS_LOCK:
+        if _GIT_SESSION_MODE == "off":
+            return None
+        session = _GIT_SESSIONS.get(repo_root)
+        if session is None:
+            if not _GIT_SESSIONS:
+                atexit.register(close_git_diff_sessions)
+            session = GitDiffSession(
+                repo_root, fsmonitor=_GIT_SESSION_MODE == "fsmonitor"
+            )
+            _GIT_SESSIONS[repo_root] = session
+        return session
+
+
+class GitDiffSession:
+    """Per-repository helper that answers ``numstat`` without re-spawning Git.
+
+    Index blobs are read through one ``git cat-file --batch`` process that
+    stays alive between captures; counts are computed in-process with
+    :func:`line_change_counts`, matching ``git diff --numstat`` (worktree
+    against index) and counting untracked files as fully added.
+    """
+
+    def __init__(self, repo_root: Path, *, fsmonitor: bool = False) -> None:
+        self.repo_root = repo_root
+        self.fsmonitor = fsmonitor
+        self._lock = threading.Lock()
+        self._proc: Optional[subprocess.Popen] = None
+
+    # ------------------------------------------------------------------
+    def numstat(
+        self, paths: Sequence[str] = ()
+    ) -> Optional[List[Tuple[int, int, str]]]:
+        """Return ``(added, removed, path)`` rows, or ``None`` when Git fails."""
+
+        entries = self._status(paths)
+        if entries is None:
+            return None
+        rows: List[Tuple[int, int, str]] = []
+        with self._lock:
+            for rel_path, blob_id, worktree_deleted in entries:
+                current = b""
+                if not worktree_deleted:
+                    try:
+                        current = (self.repo_root / rel_path).read_bytes()
+                    except OSError:
+                        continue
+                previous = b""
+                if blob_id:
+                    blob = self._read_blob(blob_id)
+                    if blob is None:
+                        return None
+                    previous = blob
+                if b"\0" in previous[:8000] or b"\0" in current[:8000]:
+                    rows.append((0, 0, rel_path))
+                    continue
+                added, removed = line_change_counts(
+                    previous.decode("utf-8", errors="ignore").splitlines(),
+                    current.decode("utf-8", errors="ignore").splitlines(),
+                )
+                rows.append((added, removed, rel_path))
+        return rows
+
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        with self._lock:
+            proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        with contextlib.suppress(OSError, ValueError):
+            proc.stdin.close()
+        try:
+            proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+        with contextlib.suppress(OSError, ValueError):
+            proc.stdout.close()
+
+    # ------------------------------------------------------------------
+    def _status(self, paths: Sequence[str]) -> Optional[List[Tuple[str, str, bool]]]:
+        """Return ``(path, index_blob, deleted)`` for worktree changes."""
+
+        cmd: List[str] = ["git", "-C", str(self.repo_root), "--no-optional-locks"]
+        if self.fsmonitor:
+            cmd += ["-c", "core.fsmonitor=true", "-c", "core.untrackedCache=true"]
+        cmd += ["status", "--porcelain=v2", "-z", "--untracked-files=all"]
+        if paths:
+            cmd.append("--")
+            cmd.extend(paths)
+        try:
+            result = subprocess.run(
+                cmd,
+                check=False,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+        except FileNotFoundError:
+            return None
+        if result.returncode != 0:
+            return None
+
+        entries: List[Tuple[str, str, bool]] = []
+        records = result.stdout.decode("utf-8", errors="surrogateescape").split("\0")
+        index = 0
+        while index < len(records):
+            record = records[index]
+            index += 1
+            if not record:
+                continue
+            kind = record[0]
+            if kind == "?":
+                entries.append((record[2:], "", False))
+                continue
+            if kind not in "12":
+                continue
+            fields = record.split(" ", 9 if kind == "2" else 8)
+            if kind == "2":
+                # Renames carry the original path as the next NUL record.
+                index += 1
+            state, submodule, blob_id, rel_path = (
+                fields[1],
+                fields[2],
+                fields[7],
+                fields[-1],
+            )
+            if state[1] == "." or submodule.startswith("S"):
+                continue
+            entries.append((rel_path, blob_id, state[1] == "D"))
+        return entries
+
+    # ------------------------------------------------------------------
+    def _read_blob(self, blob_id: str) -> Optional[bytes]:
+        for _attempt in range(2):
+            proc = self._ensure_process()
+            if proc is None:
+                return None
+            try:
+                proc.stdin.write(blob_id.encode("ascii") + b"\n")
+                proc.stdin.flush()
+                header = proc.stdout.readline().split()
+                if not header:
+                    raise OSError("git cat-file exited")
+                if len(header) != 3:
+                    return b"" if header[-1:] == [b"missing"] else None
+                size = int(header[2])
+                data = proc.stdout.read(size)
+                proc.stdout.read(1)
+                return data
+            except (OSError, ValueError):
+                # The helper died (repository gc, git upgrade); restart once.
+                self._proc = None
+                with contextlib.suppress(OSError):
+                    proc.kill()
+        return None
+
+    # ------------------------------------------------------------------
+    def _ensure_process(self) -> Optional[subprocess.Popen]:
+        if self._proc is not None and self._proc.poll() is None:
+            return self._proc
+        try:
+            self._proc = subprocess.Popen(
+                ["git", "-C", str(self.repo_root), "cat-file", "--batch"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError:
+            self._proc = None
+        return self._proc
+
+
 def _git_numstat(
     repo_root: Path,
     workspace: Path,
@@ -181,6 +436,28 @@ def _git_numstat(
 ) -> Tuple[int, int, List[str], Set[Path]]:
     paths = sorted({target.rel_repo for target in targets.values() if target.rel_repo})
 
+    session = _git_diff_session(repo_root)
+    rows = session.numstat(paths) if session is not None else None
+    if rows is None:
+        rows = _git_numstat_rows(repo_root, paths)
+
+    added_total = removed_total = 0
+    files: List[str] = []
+    handled: Set[Path] = set()
+
+    for added, removed, rel_path in rows:
+        abs_path = (repo_root / rel_path).resolve()
+        files.append(_relative_to_workspace(abs_path, workspace))
+        added_total += added
+        removed_total += removed
+        if abs_path in targets:
+            handled.add(abs_path)
+    return added_total, removed_total, _unique(files), handled
+
+
+def _git_numstat_rows(
+    repo_root: Path, paths: Sequence[str]
+) -> List[Tuple[int, int, str]]:
     cmd: List[str] = [
         "git",
         "-C",
@@ -202,26 +479,64 @@ def _git_numstat(
             text=True,
         )
     except FileNotFoundError:
-        return 0, 0, [], set()
+        return []
     if result.returncode != 0:
-        return 0, 0, [], set()
-
-    added_total = removed_total = 0
-    files: List[str] = []
-    handled: Set[Path] = set()
+        return []
 
+    rows: List[Tuple[int, int, str]] = []
     for line in result.stdout.splitlines():
         parsed = _parse_numstat_line(line)
-        if not parsed:
+        if parsed:
+            rows.append(parsed)
+    rows.extend(_git_untracked_rows(repo_root, paths))
+    return rows
+
+
+def _git_untracked_rows(
+    repo_root: Path, paths: Sequence[str]
+) -> List[Tuple[int, int, str]]:
+    """Count untracked files as fully added, as :class:`GitDiffSession` does."""
+
+    cmd: List[str] = [
+        "git",
+        "-C",
+        str(repo_root),
+        "--no-optional-locks",
+        "ls-files",
+        "--others",
+        "--exclude-standard",
+        "-z",
+    ]
+    if paths:
+        cmd.append("--")
+        cmd.extend(paths)
+    try:
+        result = subprocess.run(
+            cmd,
+            check=False,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+    except FileNotFoundError:
+        return []
+    if result.returncode != 0:
+        return []
+
+    rows: List[Tuple[int, int, str]] = []
+    listing = result.stdout.decode("utf-8", errors="surrogateescape")
+    for rel_path in listing.split("\0"):
+        if not rel_path:
             continue
-        added, removed, rel_path = parsed
-        abs_path = (repo_root / rel_path).resolve()
-        files.append(_relative_to_workspace(abs_path, workspace))
-        added_total += added
-        removed_total += removed
-        if abs_path in targets:
-            handled.add(abs_path)
-    return added_total, removed_total, _unique(files), handled
+        try:
+            current = (repo_root / rel_path).read_bytes()
+        except OSError:
+            continue
+        if b"\0" in current[:8000]:
+            rows.append((0, 0, rel_path))
+            continue
+        lines = current.decode("utf-8", errors="ignore").splitlines()
+        rows.append((len(lines), 0, rel_path))
+    return rows
 
 
 def _parse_numstat_line(line: str) -> Optional[Tuple[int, int, str]]:
@@ -270,6 +585,85 @@ def _normalize_rename(field: str, token: str) -> str:
     return right
 
 
+DIFF_MAX_EDIT_COST = 2000
+"""Edit distance beyond which :func:`line_change_counts` falls back to counts."""
+
+_SNAPSHOT_INDEX_NAME = "snapshot.json"
+_SNAPSHOT_BLOB_DIR = "_blobs"
+_SNAPSHOT_GC_LOCK = threading.Lock()
+
+SNAPSHOT_GC_GRACE = 300.0
+"""Seconds a freshly written blob is protected from garbage collection."""
+
+
+def line_change_counts(
+    old: Sequence[str],
+    new: Sequence[str],
+    *,
+    max_cost: int = DIFF_MAX_EDIT_COST,
+) -> Tuple[int, int]:
+    """Return ``(added, removed)`` line counts turning ``old`` into ``new``.
+
+    Lines are interned to integers, the common prefix and suffix are trimmed,
+    and lines present on only one side are counted directly.  Myers' O(ND)
+    search then finds the minimal edit distance with a single frontier array,
+    so no edit script is built.  Past ``max_cost`` edits the multiset
+    difference of the remaining lines is used instead.
+    """
+
+    ids: Dict[str, int] = {}
+    a = [ids.setdefault(line, len(ids)) for line in old]
+    b = [ids.setdefault(line, len(ids)) for line in new]
+
+    start = 0
+    limit = min(len(a), len(b))
+    while start < limit and a[start] == b[start]:
+        start += 1
+    end_a, end_b = len(a), len(b)
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a = a[start:end_a]
+    b = b[start:end_b]
+
+    # A line with no counterpart can never be part of the common subsequence.
+    in_a, in_b = set(a), set(b)
+    removed = sum(1 for item in a if item not in in_b)
+    added = sum(1 for item in b if item not in in_a)
+    a = [item for item in a if item in in_b]
+    b = [item for item in b if item in in_a]
+
+    n, m = len(a), len(b)
+    if not n or not m:
+        return added + m, removed + n
+
+    bound = min(n + m, max(int(max_cost), 0))
+    offset = bound + 1
+    frontier = [0] * (2 * bound + 3)
+    for cost in range(bound + 1):
+        for k in range(-cost, cost + 1, 2):
+            if k == -cost or (
+                k != cost and frontier[offset + k - 1] < frontier[offset + k + 1]
+            ):
+                x = frontier[offset + k + 1]
+            else:
+                x = frontier[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            frontier[offset + k] = x
+            if x >= n and y >= m:
+                deleted = (cost + n - m) // 2
+                return added + cost - deleted, removed + deleted
+
+    counts_a, counts_b = Counter(a), Counter(b)
+    return (
+        added + sum((counts_b - counts_a).values()),
+        removed + sum((counts_a - counts_b).values()),
+    )
+
+
 def _snapshot_diff(
     task_id: str,
     targets: Dict[Path, _Target],
@@ -277,49 +671,220 @@ def _snapshot_diff(
 ) -> Tuple[int, int, List[str]]:
     added_total = removed_total = 0
     files: List[str] = []
+    index = _load_snapshot_index(task_id)
+    before = json.dumps(index, sort_keys=True)
     for abs_path, target in targets.items():
         if abs_path in skip:
             continue
-        added, removed = _compute_snapshot_counts(task_id, abs_path, target.rel_workspace)
+        added, removed = _compute_snapshot_counts(
+            task_id, abs_path, target.rel_workspace, index=index
+        )
         if added or removed:
             files.append(target.rel_workspace)
         added_total += added
         removed_total += removed
+    if json.dumps(index, sort_keys=True) != before:
+        _store_snapshot_index(task_id, index)
     return added_total, removed_total, _unique(files)
 
 
-def _compute_snapshot_counts(task_id: str, abs_path: Path, rel_path: str) -> Tuple[int, int]:
-    snapshot_file = _snapshot_file(task_id, rel_path)
+def _compute_snapshot_counts(
+    task_id: str,
+    abs_path: Path,
+    rel_path: str,
+    *,
+    index: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Tuple[int, int]:
+    """Diff ``abs_path`` against its stored baseline and refresh the baseline.
+
+    ``index`` is the task manifest mapping relative paths to the size, mtime
+    and blob id recorded with each baseline; files whose stat or content hash
+    still match are skipped without reading the previous blob.
+    """
 
-    previous_lines: List[str] = []
-    if snapshot_file.exists():
-        previous_lines = snapshot_file.read_text(encoding="utf-8", errors="ignore").splitlines()
+    index = index if index is not None else {}
+    entry = index.get(rel_path)
+    baseline = str(entry.get("blob") or "") if entry else ""
+
+    try:
+        stat = abs_path.stat()
+    except OSError:
+        stat = None
+
+    if stat is not None and baseline:
+        if (
+            entry.get("size") == stat.st_size
+            and entry.get("mtime_ns") == stat.st_mtime_ns
+        ):
+            return 0, 0
+
+    data = b""
+    if stat is not None:
+        try:
+            data = abs_path.read_bytes()
+        except OSError:
+            stat = None
+    digest = hashlib.sha1(data).hexdigest() if stat is not None else ""
+
+    if stat is not None and baseline and baseline == digest:
+        entry.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        return 0, 0
+
+    previous_lines = _load_snapshot_lines(task_id, rel_path, baseline)
 
     current_lines: List[str] = []
-    file_exists = abs_path.exists()
-    if file_exists:
-        current_lines = abs_path.read_text(encoding="utf-8", errors="ignore").splitlines()
-
-    added = removed = 0
-    for line in difflib.ndiff(previous_lines, current_lines):
-        if line.startswith("+ "):
-            added += 1
-        elif line.startswith("- "):
-            removed += 1
-
-    if file_exists:
-        snapshot_file.parent.mkdir(parents=True, exist_ok=True)
-        snapshot_file.write_text(
-            "\n".join(current_lines),
-            encoding="utf-8",
-        )
-    elif snapshot_file.exists():
-        snapshot_file.unlink()
+    if stat is not None:
+        current_lines = data.decode("utf-8", errors="ignore").splitlines()
+
+    added, removed = line_change_counts(previous_lines, current_lines)
+
+    if stat is not None:
+        _store_snapshot_blob(digest, data)
+        index[rel_path] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "blob": digest,
+        }
+    else:
+        index.pop(rel_path, None)
+
+    legacy_file = _snapshot_file(task_id, rel_path)
+    if legacy_file.exists():
+        legacy_file.unlink()
 
     return added, removed
 
 
+def _snapshot_blob_path(blob_id: str) -> Path:
+    return _SNAPSHOT_ROOT / _SNAPSHOT_BLOB_DIR / blob_id[:2] / blob_id[2:]
+
+
+def _store_snapshot_blob(blob_id: str, data: bytes) -> None:
+    """Write ``data`` zlib-compressed under ``blob_id`` unless already stored."""
+
+    path = _snapshot_blob_path(blob_id)
+    if path.exists():
+        # Refresh the mtime so a concurrent collection treats it as live.
+        os.utime(path)
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # A unique temp file per writer: threads storing the same blob must not
+    # share one path, or one ``os.replace`` would find the other's file gone.
+    fd, tmp_name = tempfile.mkstemp(
+        prefix=f".{path.name}.", suffix=".tmp", dir=path.parent
+    )
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(zlib.compress(data, 6))
+        os.replace(tmp_name, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_name)
+        raise
+
+
+def _load_snapshot_lines(task_id: str, rel_path: str, blob_id: str) -> List[str]:
+    """Return the baseline lines for ``rel_path`` from its blob or legacy copy."""
+
+    if blob_id:
+        try:
+            data = zlib.decompress(_snapshot_blob_path(blob_id).read_bytes())
+        except (OSError, zlib.error):
+            return []
+        return data.decode("utf-8", errors="ignore").splitlines()
+    legacy_file = _snapshot_file(task_id, rel_path)
+    if legacy_file.exists():
+        return legacy_file.read_text(encoding="utf-8", errors="ignore").splitlines()
+    return []
+
+
+def archive_task_snapshots(task_id: str) -> int:
+    """Drop the diff baselines of ``task_id`` and collect orphaned blobs.
+
+    Returns the number of blobs removed.
+    """
+
+    if not task_id:
+        raise ValueError("task_id is required")
+    task_root = _SNAPSHOT_ROOT / task_id
+    (task_root / _SNAPSHOT_INDEX_NAME).unlink(missing_ok=True)
+    shutil.rmtree(task_root / "snapshot", ignore_errors=True)
+    return collect_snapshot_garbage()
+
+
+def collect_snapshot_garbage(*, grace: float = SNAPSHOT_GC_GRACE) -> int:
+    """Delete blobs no task manifest references and return how many went.
+
+    Blobs touched within ``grace`` seconds are kept so a diff that stored a
+    blob but has not yet written its manifest is not raced.
+    """
+
+    blob_root = _SNAPSHOT_ROOT / _SNAPSHOT_BLOB_DIR
+    if not blob_root.exists():
+        return 0
+    with _SNAPSHOT_GC_LOCK:
+        referenced: Set[str] = set()
+        for manifest in _SNAPSHOT_ROOT.glob(f"*/{_SNAPSHOT_INDEX_NAME}"):
+            try:
+                payload = json.loads(manifest.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            if not isinstance(payload, dict):
+                continue
+            for entry in payload.values():
+                if isinstance(entry, dict) and entry.get("blob"):
+                    referenced.add(str(entry["blob"]))
+
+        cutoff = time.time() - grace
+        removed = 0
+        for bucket in blob_root.iterdir():
+            if not bucket.is_dir():
+                continue
+            for path in bucket.iterdir():
+                if bucket.name + path.name in referenced:
+                    continue
+                try:
+                    if path.stat().st_mtime > cutoff:
+                        continue
+                    path.unlink()
+                except OSError:
+                    continue
+                removed += 1
+            with contextlib.suppress(OSError):
+                bucket.rmdir()
+        return removed
+
+
+def _snapshot_index_path(task_id: str) -> Path:
+    return (_SNAPSHOT_ROOT / task_id / _SNAPSHOT_INDEX_NAME).resolve()
+
+
+def _load_snapshot_index(task_id: str) -> Dict[str, Dict[str, Any]]:
+    path = _snapshot_index_path(task_id)
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(payload, dict):
+        return {}
+    return {
+        str(key): dict(value)
+        for key, value in payload.items()
+        if isinstance(value, dict)
+    }
+
+
+def _store_snapshot_index(task_id: str, index: Dict[str, Dict[str, Any]]) -> None:
+    path = _snapshot_index_path(task_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps(index, sort_keys=True), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
 def _snapshot_file(task_id: str, rel_path: str) -> Path:
+    """Return the pre-blob-store plain copy of ``rel_path`` (migration only)."""
+
     safe_parts = [part for part in Path(rel_path).parts if part not in ("", ".", "..")]
     snapshot_root = _SNAPSHOT_ROOT / task_id / "snapshot"
     return (snapshot_root / Path(*safe_parts)).resolve()
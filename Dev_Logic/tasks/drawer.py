@@ -11,6 +11,7 @@ from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QDockWidget, QFrame, QSizePolicy, QVBoxLayout, QWidget
 
 from .bus import Subscription, publish, subscribe
+from .diffs import archive_task_snapshots
 from .models import TASKS_FILE, Task, TaskEvent, append_event, append_task, update_task
 from .task_panel import TaskPanel
 
@@ -148,6 +149,12 @@ class TaskDrawer(QFrame):
 
         publish("task.status", {"id": updated.id, "status": updated.status})
         publish("task.updated", updated.to_dict())
+        if status == "deleted":
+            publish("task.deleted", {"id": updated.id})
+            try:
+                archive_task_snapshots(updated.id)
+            except Exception:
+                logger.exception("Failed to clean snapshots for task %s", updated.id)
         self.panel.update_task(updated)
 
     # ------------------------------------------------------------------
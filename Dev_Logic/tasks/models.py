@@ -7,12 +7,18 @@ specification documented in ``concepts/dev_logic/Task System.md``.
 """
 from __future__ import annotations
 
-from collections import deque
+import atexit
+import contextlib
 from dataclasses import dataclass, field
+import gzip
 import json
+import logging
 import os
+import shutil
+import threading
+import time
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 __all__ = [
     "Task",
@@ -21,11 +27,16 @@ __all__ = [
     "ErrorRecord",
     "append_task",
     "update_task",
+    "load_tasks",
+    "export_tasks",
     "append_event",
     "append_run_log",
     "append_run_output",
     "load_run_log_tail",
     "resolve_run_log_path",
+    "RunLogWriter",
+    "run_log_writer",
+    "close_run_logs",
     "append_error_record",
 ]
 
@@ -37,6 +48,8 @@ ERRORS_FILE = DATASETS_DIR / "errors.jsonl"
 _RUNS_SUBDIR = "runs"
 _RUN_LOG_FILENAME = "run.log"
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass(slots=True)
 class TaskDiffSummary:
@@ -245,6 +258,196 @@ def resolve_run_log_path(task: Task, dataset_root: Optional[Path] = None) -> Tup
     return absolute, relative
 
 
+RUN_LOG_FLUSH_BYTES = 64 * 1024
+RUN_LOG_FLUSH_INTERVAL = 1.0
+RUN_LOG_IDLE_CLOSE = 60.0
+# Rotate ``run.log`` into ``run.log.N.gz`` once it exceeds this size (0 = never).
+RUN_LOG_ROTATE_BYTES = 0
+RUN_LOG_ROTATE_BACKUPS = 3
+
+
+class RunLogWriter:
+    """Buffered append handle for one task run log.
+
+    The handle stays open between calls.  Outside :meth:`batch` every write is
+    flushed immediately; inside a batch data is flushed once
+    ``RUN_LOG_FLUSH_BYTES`` accumulate, ``RUN_LOG_FLUSH_INTERVAL`` elapses, or
+    the batch ends.  A shared background thread flushes stragglers and closes
+    handles that sit idle.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.RLock()
+        self._fh: Optional[Any] = None
+        self._pending = 0
+        self._batch_depth = 0
+        self._last_flush = time.monotonic()
+        self._last_used = self._last_flush
+
+    # ------------------------------------------------------------------
+    def write(self, lines: Iterable[str], *, channel: Optional[str] = None) -> None:
+        prefix = f"[{channel}]" if channel else ""
+        chunks: List[str] = []
+        for entry in lines:
+            text = str(entry).rstrip("\n")
+            if prefix:
+                text = f"{prefix} {text}" if text else prefix
+            chunks.append(text + "\n")
+        if not chunks:
+            return
+        data = "".join(chunks).encode("utf-8")
+        with self._lock:
+            self._handle().write(data)
+            self._pending += len(data)
+            now = time.monotonic()
+            self._last_used = now
+            if (
+                not self._batch_depth
+                or self._pending >= RUN_LOG_FLUSH_BYTES
+                or now - self._last_flush >= RUN_LOG_FLUSH_INTERVAL
+            ):
+                self._flush_locked()
+
+    # ------------------------------------------------------------------
+    def touch(self) -> None:
+        with self._lock:
+            self._handle()
+            self._last_used = time.monotonic()
+
+    # ------------------------------------------------------------------
+    @contextlib.contextmanager
+    def batch(self) -> Iterator["RunLogWriter"]:
+        """Defer flushing until the block exits (or size/time limits hit)."""
+
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if not self._batch_depth:
+                    self._flush_locked()
+
+    # ------------------------------------------------------------------
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+    # ------------------------------------------------------------------
+    def _maintain(self, now: float) -> None:
+        """Flush overdue data and release the handle when idle."""
+
+        with self._lock:
+            if self._pending and now - self._last_flush >= RUN_LOG_FLUSH_INTERVAL:
+                self._flush_locked()
+            if (
+                self._fh is not None
+                and not self._batch_depth
+                and now - self._last_used >= RUN_LOG_IDLE_CLOSE
+            ):
+                self._fh.close()
+                self._fh = None
+
+    # ------------------------------------------------------------------
+    def _handle(self) -> Any:
+        if self._fh is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = self.path.open("ab", buffering=RUN_LOG_FLUSH_BYTES)
+            self._pending = 0
+        return self._fh
+
+    # ------------------------------------------------------------------
+    def _flush_locked(self) -> None:
+        self._last_flush = time.monotonic()
+        if self._fh is None:
+            return
+        if self._pending:
+            self._fh.flush()
+            self._pending = 0
+        if RUN_LOG_ROTATE_BYTES and self._fh.tell() >= RUN_LOG_ROTATE_BYTES:
+            self._rotate_locked()
+
+    # ------------------------------------------------------------------
+    def _rotate_locked(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        base = self.path.name
+        for index in range(RUN_LOG_ROTATE_BACKUPS - 1, 0, -1):
+            older = self.path.with_name(f"{base}.{index}.gz")
+            if older.exists():
+                os.replace(older, self.path.with_name(f"{base}.{index + 1}.gz"))
+        staging = self.path.with_name(f"{base}.rotating")
+        os.replace(self.path, staging)
+        try:
+            with staging.open("rb") as src, gzip.open(
+                self.path.with_name(f"{base}.1.gz"), "wb"
+            ) as dst:
+                shutil.copyfileobj(src, dst)
+        finally:
+            staging.unlink(missing_ok=True)
+
+
+_RUN_LOG_WRITERS: Dict[Path, RunLogWriter] = {}
+_RUN_LOG_WRITERS_LOCK = threading.Lock()
+_RUN_LOG_MAINTAINER: Optional[threading.Thread] = None
+
+
+def run_log_writer(path: Path) -> RunLogWriter:
+    """Return the shared buffered writer for the run log at ``path``."""
+
+    global _RUN_LOG_MAINTAINER
+    with _RUN_LOG_WRITERS_LOCK:
+        writer = _RUN_LOG_WRITERS.get(path)
+        if writer is None:
+            writer = RunLogWriter(path)
+            _RUN_LOG_WRITERS[path] = writer
+        if _RUN_LOG_MAINTAINER is None:
+            _RUN_LOG_MAINTAINER = threading.Thread(
+                target=_maintain_run_logs, name="RunLogFlusher", daemon=True
+            )
+            _RUN_LOG_MAINTAINER.start()
+            atexit.register(close_run_logs)
+    return writer
+
+
+def close_run_logs() -> None:
+    """Flush and close every open run-log handle."""
+
+    with _RUN_LOG_WRITERS_LOCK:
+        writers = list(_RUN_LOG_WRITERS.values())
+    for writer in writers:
+        try:
+            writer.close()
+        except OSError:
+            logger.debug("Failed to close run log %s", writer.path, exc_info=True)
+
+
+def _maintain_run_logs() -> None:
+    while True:
+        time.sleep(RUN_LOG_FLUSH_INTERVAL)
+        now = time.monotonic()
+        with _RUN_LOG_WRITERS_LOCK:
+            writers = list(_RUN_LOG_WRITERS.values())
+        for writer in writers:
+            try:
+                writer._maintain(now)
+            except OSError:
+                logger.debug(
+                    "Run log maintenance failed for %s", writer.path, exc_info=True
+                )
+
+
 def append_run_log(
     task: Task,
     lines: Iterable[str] | str,
@@ -268,29 +471,17 @@ def append_run_log(
     """
 
     absolute, relative = resolve_run_log_path(task, dataset_root)
-    absolute.parent.mkdir(parents=True, exist_ok=True)
-
     created = task.run_log_path is None
 
-    entries: List[str]
+    writer = run_log_writer(absolute)
     if isinstance(lines, str):
-        entries = [lines]
+        writer.write([lines], channel=channel)
     else:
         entries = [str(line) for line in lines]
-
-    if entries:
-        prefix = f"[{channel}]" if channel else ""
-        with absolute.open("a", encoding="utf-8") as fh:
-            for entry in entries:
-                text = entry.rstrip("\n")
-                if prefix:
-                    text = f"{prefix} {text}" if text else prefix
-                if text:
-                    fh.write(text + "\n")
-                else:
-                    fh.write("\n")
-    else:
-        absolute.touch(exist_ok=True)
+        if entries:
+            writer.write(entries, channel=channel)
+        else:
+            writer.touch()
 
     if task.run_log_path is None:
         task.run_log_path = relative
@@ -307,37 +498,46 @@ def append_run_output(
 ) -> Tuple[Path, str, bool]:
     """Append captured stdout/stderr streams to the task run log."""
 
-    created = False
-    path: Optional[Path] = None
-    relative: Optional[str] = None
+    absolute, relative = resolve_run_log_path(task, dataset_root)
+    created = task.run_log_path is None
 
-    if stdout:
-        path, relative, created_stdout = append_run_log(
-            task,
-            stdout.splitlines(),
-            dataset_root,
-            channel="stdout",
-        )
-        created = created or created_stdout
-
-    if stderr:
-        path, relative, created_stderr = append_run_log(
-            task,
-            stderr.splitlines(),
-            dataset_root,
-            channel="stderr",
-        )
-        created = created or created_stderr
+    writer = run_log_writer(absolute)
+    with writer.batch():
+        if stdout:
+            writer.write(stdout.splitlines(), channel="stdout")
+        if stderr:
+            writer.write(stderr.splitlines(), channel="stderr")
+        if not stdout and not stderr:
+            writer.touch()
 
-    if path is None or relative is None:
-        path, relative = resolve_run_log_path(task, dataset_root)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.touch(exist_ok=True)
-        if task.run_log_path is None:
-            task.run_log_path = relative
-            created = True
+    if task.run_log_path is None:
+        task.run_log_path = relative
 
-    return path, relative, created
+    return absolute, relative, created
+
+
+def _read_tail_lines(path: Path, max_lines: int) -> List[str]:
+    """Return the last ``max_lines`` lines of ``path`` by reading backwards."""
+
+    with path.open("rb") as fh:
+        fh.seek(0, os.SEEK_END)
+        position = fh.tell()
+        data = b""
+        block = 8192
+        while position > 0 and data.count(b"\n") <= max_lines:
+            step = min(block, position)
+            position -= step
+            fh.seek(position)
+            data = fh.read(step) + data
+            block = min(block * 2, 1 << 20)
+    text = data.decode("utf-8", errors="replace")
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    if lines and lines[-1] == "":
+        lines.pop()
+    if position > 0 and lines:
+        # The first line was cut by the seek.
+        lines.pop(0)
+    return lines[-max_lines:]
 
 
 def load_run_log_tail(
@@ -354,24 +554,108 @@ def load_run_log_tail(
         return []
 
     absolute, _ = resolve_run_log_path(task, dataset_root)
+    writer = _RUN_LOG_WRITERS.get(absolute)
+    if writer is not None:
+        writer.flush()
     if not absolute.exists():
         return []
+    return _read_tail_lines(absolute, int(max_lines))
 
-    tail: deque[str] = deque(maxlen=int(max_lines))
-    with absolute.open("r", encoding="utf-8", errors="replace") as fh:
-        for line in fh:
-            tail.append(line.rstrip("\n"))
-    return list(tail)
+
+# ``tasks.jsonl`` is an append-only change log: ``update_task`` appends the
+# merged record and the last line per id wins.  Superseded lines are dropped by
+# rewriting the log once they outnumber the live tasks.
+TASK_LOG_COMPACT_MIN_DEAD = 256
+
+
+class _TaskLogIndex:
+    """Latest record per task id for one ``tasks.jsonl`` log.
+
+    Growth of the file is followed by parsing only the new tail; a shrunk or
+    replaced file (compaction, external edits) triggers a full rebuild.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._lines = 0
+        self._size = 0
+        self._identity: Optional[Tuple[int, int]] = None
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @property
+    def dead(self) -> int:
+        return self._lines - len(self._records)
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        return self._records.get(task_id)
+
+    def records(self) -> List[Dict[str, Any]]:
+        return list(self._records.values())
+
+    def reset(self) -> None:
+        self._records.clear()
+        self._lines = 0
+        self._size = 0
+        self._identity = None
+
+    def refresh(self) -> None:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            self.reset()
+            return
+        identity = (stat.st_dev, stat.st_ino)
+        if identity != self._identity or stat.st_size < self._size:
+            self.reset()
+            self._identity = identity
+        if stat.st_size == self._size:
+            return
+        with self.path.open("rb") as fh:
+            fh.seek(self._size)
+            chunk = fh.read(stat.st_size - self._size)
+        # A line without its newline is still being written; pick it up later.
+        end = chunk.rfind(b"\n") + 1
+        for raw in chunk[:end].splitlines():
+            raw = raw.strip()
+            if not raw:
+                continue
+            try:
+                record = json.loads(raw.decode("utf-8"))
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                continue
+            if not isinstance(record, dict) or "id" not in record:
+                continue
+            # Re-assigning an existing key keeps its first-seen position.
+            self._records[str(record["id"])] = record
+            self._lines += 1
+        self._size += end
+
+
+_TASK_LOG_INDEXES: Dict[Path, _TaskLogIndex] = {}
+_TASK_LOG_LOCK = threading.RLock()
+
+
+def _task_log_index(path: Path) -> _TaskLogIndex:
+    index = _TASK_LOG_INDEXES.get(path)
+    if index is None:
+        index = _TaskLogIndex(path)
+        _TASK_LOG_INDEXES[path] = index
+    index.refresh()
+    return index
 
 
 def append_task(task: Task) -> None:
     """Append a task entry to ``tasks.jsonl``."""
 
-    _append_jsonl(TASKS_FILE, task.to_dict())
+    with _TASK_LOG_LOCK:
+        _append_jsonl(TASKS_FILE, task.to_dict())
 
 
 def update_task(task_id: str, **changes: Any) -> Task:
-    """Apply updates to a task entry and rewrite the dataset atomically.
+    """Apply updates to a task entry by appending it to the change log.
 
     Args:
         task_id: Identifier of the task to update.
@@ -384,17 +668,65 @@ def update_task(task_id: str, **changes: Any) -> Task:
         ValueError: If the task identifier does not exist.
     """
 
-    records = _read_jsonl(TASKS_FILE)
-    updated_record: Optional[Dict[str, Any]] = None
+    with _TASK_LOG_LOCK:
+        index = _task_log_index(TASKS_FILE)
+        current = index.get(task_id)
+        if current is None:
+            raise ValueError(f"Task '{task_id}' does not exist")
+        record = dict(current)
+        record.update(changes)
+        _append_jsonl(TASKS_FILE, record)
+        index.refresh()
+        if index.dead >= TASK_LOG_COMPACT_MIN_DEAD and index.dead > len(index):
+            export_tasks()
+    return Task.from_dict(record)
+
+
+def load_tasks(path: Optional[Path] = None) -> List[Task]:
+    """Return the current state of every task, in creation order.
+
+    Args:
+        path: Task log to read. Defaults to ``tasks.jsonl``.
+
+    Returns:
+        One :class:`Task` per identifier, reflecting its latest update.
+    """
+
+    with _TASK_LOG_LOCK:
+        records = _task_log_index(Path(path) if path else TASKS_FILE).records()
+    tasks: List[Task] = []
     for record in records:
-        if record.get("id") == task_id:
-            record.update(changes)
-            updated_record = record
-            break
-    if updated_record is None:
-        raise ValueError(f"Task '{task_id}' does not exist")
-    _write_jsonl_atomic(TASKS_FILE, records)
-    return Task.from_dict(updated_record)
+        try:
+            tasks.append(Task.from_dict(record))
+        except (KeyError, TypeError, ValueError):
+            logger.debug("Skipping malformed task payload: %r", record)
+    return tasks
+
+
+def export_tasks(
+    destination: Optional[Path] = None, *, path: Optional[Path] = None
+) -> Path:
+    """Write one line per live task to ``destination``.
+
+    Args:
+        destination: Output file. Defaults to ``path`` itself, which compacts
+            the log in place.
+        path: Task log to export. Defaults to ``tasks.jsonl``.
+
+    Returns:
+        The path that was written.
+    """
+
+    source = Path(path) if path else TASKS_FILE
+    target = Path(destination) if destination else source
+    with _TASK_LOG_LOCK:
+        index = _task_log_index(source)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        _write_jsonl_atomic(target, index.records())
+        if target == source:
+            index.reset()
+            index.refresh()
+    return target
 
 
 def append_event(event: TaskEvent) -> None:
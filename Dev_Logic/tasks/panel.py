@@ -2,7 +2,6 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
-import json
 from pathlib import Path
 from typing import Iterable, List, Optional
 
@@ -26,7 +25,7 @@ from PySide6.QtWidgets import (
     QPlainTextEdit,
 )
 
-from .models import TASKS_FILE, Task, load_run_log_tail
+from .models import TASKS_FILE, Task, load_run_log_tail, load_tasks
 
 
 STATUS_ORDER = [
@@ -313,22 +312,7 @@ class TaskPanel(QDockWidget):
     # ------------------------------------------------------------------
     def refresh(self) -> None:
         """Reload tasks from the dataset path."""
-        if not self.dataset_path.exists():
-            self._tasks = []
-            self._apply_filters()
-            return
-        records: List[Task] = []
-        with self.dataset_path.open("r", encoding="utf-8") as fh:
-            for line in fh:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    payload = json.loads(line)
-                    records.append(Task.from_dict(payload))
-                except json.JSONDecodeError:
-                    continue
-        self.set_tasks(records)
+        self.set_tasks(load_tasks(self.dataset_path))
 
     # ------------------------------------------------------------------
     def set_tasks(self, tasks: Iterable[Task]) -> None:
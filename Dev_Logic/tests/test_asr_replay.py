@@ -0,0 +1,183 @@
+"""Replay a synthetic WAV through the local ASR ring buffer and VAD."""
+
+from __future__ import annotations
+
+import ast
+import logging
+import math
+import queue
+import threading
+import time
+import typing
+import uuid
+import wave
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+ACAGI_SOURCE = (REPO_ROOT / "ACAGi.py").read_text(encoding="utf-8")
+
+_WANTED = {
+    "SpeechHypothesis",
+    "SpeechActivity",
+    "PCMRingBuffer",
+    "WavReplayStream",
+    "_ASRUtterance",
+    "LocalASRAdapter",
+}
+
+SAMPLE_RATE = 16_000
+FRAME = 480  # 30 ms chunks at 16 kHz
+
+
+class _FakeWhisperModel:
+    def __init__(self) -> None:
+        self.lengths: List[int] = []
+
+    def transcribe(self, audio: Any, **_options: Any) -> Dict[str, Any]:
+        self.lengths.append(int(audio.size))
+        return {"text": f"utterance {len(self.lengths)}", "segments": []}
+
+
+class _FakeWhisper:
+    def __init__(self) -> None:
+        self.model = _FakeWhisperModel()
+
+    def load_model(self, _name: str) -> _FakeWhisperModel:
+        return self.model
+
+
+def _load_speech(whisper: Any = None) -> Dict[str, Any]:
+    """Compile the ring buffer, WAV replay and ASR adapter from ACAGi in isolation."""
+
+    module_ast = ast.parse(ACAGI_SOURCE)
+    body = [
+        node
+        for node in module_ast.body
+        if isinstance(node, ast.ClassDef) and node.name in _WANTED
+    ]
+    namespace: Dict[str, Any] = {
+        "__name__": __name__,
+        "np": np,
+        "sd": None,
+        "whisper": whisper,
+        "logging": logging,
+        "math": math,
+        "queue": queue,
+        "threading": threading,
+        "time": time,
+        "uuid": uuid,
+        "wave": wave,
+        "deque": deque,
+        "dataclass": dataclass,
+        "field": field,
+        "Path": Path,
+        "VD_LOGGER_NAME": "test",
+    }
+    namespace.update({name: getattr(typing, name) for name in typing.__all__})
+    isolated_module = ast.Module(body=body, type_ignores=[])
+    exec(compile(isolated_module, filename=str(REPO_ROOT / "ACAGi.py"), mode="exec"), namespace)
+    return namespace
+
+
+def _tone(samples: int, amplitude: float = 3000.0, freq: float = 200.0) -> np.ndarray:
+    t = np.arange(samples) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.int16)
+
+
+def _write_wav(path: Path, *parts: np.ndarray) -> int:
+    pcm = np.concatenate(parts).astype("<i2")
+    with wave.open(str(path), "wb") as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(SAMPLE_RATE)
+        writer.writeframes(pcm.tobytes())
+    return int(pcm.size)
+
+
+def test_pcm_ring_buffer_reads_across_the_wrap_point() -> None:
+    ring = _load_speech()["PCMRingBuffer"](8)
+
+    assert ring.write(np.arange(5)) == 5
+    first = ring.read(1, 4)
+    assert first.tolist() == [1, 2, 3]
+    assert np.shares_memory(first, ring._data)
+
+    assert ring.write(np.arange(5, 11)) == 11
+    assert ring.oldest == 3
+    wrapped = ring.read(0)
+    assert wrapped.tolist() == list(range(3, 11))
+    assert not np.shares_memory(wrapped, ring._data)
+    assert ring.read(9, 20).tolist() == [9, 10]
+    assert ring.read(2, 3).size == 0
+
+    ring.write(np.arange(100, 120))
+    assert ring.end == 31
+    assert ring.read(0).tolist() == list(range(112, 120))
+    assert ring.read(27, 29).tolist() == [116, 117]
+
+
+def test_wav_replay_detects_utterances_on_frame_boundaries(tmp_path: Path) -> None:
+    whisper = _FakeWhisper()
+    namespace = _load_speech(whisper)
+    wav_path = tmp_path / "speech.wav"
+    # 16 silent frames, 32 voiced frames, 20 silent frames, then a tone that
+    # starts and stops half-way through a frame.
+    _write_wav(
+        wav_path,
+        np.zeros(16 * FRAME, dtype=np.int16),
+        _tone(32 * FRAME),
+        np.zeros(20 * FRAME + FRAME // 2, dtype=np.int16),
+        _tone(20 * FRAME),
+        np.zeros(20 * FRAME, dtype=np.int16),
+    )
+
+    activity: List[Tuple[str, bool]] = []
+    finals: List[str] = []
+    spans: List[Tuple[int, int, int]] = []
+    done = threading.Event()
+
+    class _ProbeAdapter(namespace["LocalASRAdapter"]):
+        def _finalise_utterance(self) -> None:
+            utterance = self._utterance
+            if utterance is not None:
+                spans.append((utterance.start_pos, utterance.last_voice_pos, utterance.end_pos))
+            super()._finalise_utterance()
+
+    def _on_final(hypothesis: Any) -> None:
+        finals.append(hypothesis.text)
+        if len(finals) == 2:
+            done.set()
+
+    adapter = _ProbeAdapter(
+        {
+            "replay_wav": str(wav_path),
+            "replay_realtime": False,
+            "sample_rate": SAMPLE_RATE,
+            "chunk_ms": 30,
+            "silence_duration": 0.3,
+            "partial_interval": 60.0,
+        },
+        on_partial=lambda hypothesis: None,
+        on_final=_on_final,
+        on_activity=lambda event: activity.append((event.utterance_id, event.active)),
+    )
+    assert adapter.start()
+    try:
+        assert done.wait(10.0), "expected two final transcripts"
+    finally:
+        adapter.stop()
+
+    silence_frames = int(0.3 * SAMPLE_RATE) // FRAME
+    assert spans == [
+        (16 * FRAME, 48 * FRAME, (48 + silence_frames) * FRAME),
+        (68 * FRAME, 89 * FRAME, (89 + silence_frames) * FRAME),
+    ]
+    assert [active for _, active in activity] == [True, False, True, False]
+    assert activity[0][0] == activity[1][0] != activity[2][0] == activity[3][0]
+    assert finals == ["utterance 1", "utterance 2"]
+    assert whisper.model.lengths == [end - start for start, _, end in spans]
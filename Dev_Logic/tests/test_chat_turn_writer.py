@@ -0,0 +1,142 @@
+"""Check that ``ChatTurnWriter`` embeds a turn once and shares the vectors."""
+
+from __future__ import annotations
+
+import ast
+import logging
+import queue
+import threading
+import typing
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+ACAGI_SOURCE = (REPO_ROOT / "ACAGi.py").read_text(encoding="utf-8")
+
+_WANTED = {"ChatTurnRecord", "ChatTurnWriter"}
+
+
+class _RecordingAtexit:
+    def __init__(self) -> None:
+        self.registered: List[Callable[..., Any]] = []
+
+    def register(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        self.registered.append(func)
+        return func
+
+    def unregister(self, func: Callable[..., Any]) -> None:
+        self.registered = [item for item in self.registered if item != func]
+
+
+class _FakeOllama:
+    def __init__(self) -> None:
+        self.calls: List[Tuple[str, List[str]]] = []
+
+    def embed_many(self, model: str, texts: List[str]) -> Tuple[bool, List[List[float]], str]:
+        self.calls.append((model, list(texts)))
+        return True, [[float(len(text)), float(index)] for index, text in enumerate(texts)], ""
+
+
+class _FakeConversation:
+    embedder = "embed-model"
+    enable_embeddings = True
+
+    def __init__(self) -> None:
+        self.ollama = _FakeOllama()
+        self.appended: List[Tuple[str, str, Any]] = []
+
+    def append(self, role: str, text: str, images: Any, *, references: Any = None, embedding: Any = None) -> None:
+        self.appended.append((role, text, embedding))
+
+
+class _FakeDataset:
+    embedder = "embed-model"
+    enable_semantic = True
+
+    def __init__(self) -> None:
+        self.entries: List[Tuple[str, str, Any]] = []
+
+    def add_entry(
+        self,
+        role: str,
+        text: str,
+        images: Any,
+        *,
+        tags: Any = None,
+        extra: Any = None,
+        embedding: Any = None,
+    ) -> None:
+        self.entries.append((role, text, embedding))
+
+
+def _load_writer(recorder: _RecordingAtexit) -> Dict[str, Any]:
+    """Compile the chat turn record and writer from ACAGi in isolation."""
+
+    module_ast = ast.parse(ACAGI_SOURCE)
+    body = [
+        node
+        for node in module_ast.body
+        if isinstance(node, ast.ClassDef) and node.name in _WANTED
+    ]
+    namespace: Dict[str, Any] = {
+        "__name__": __name__,
+        "atexit": recorder,
+        "logging": logging,
+        "queue": queue,
+        "threading": threading,
+        "dataclass": dataclass,
+        "field": field,
+        "Path": Path,
+        "ConversationIO": object,
+        "DatasetManager": object,
+        "VD_LOGGER_NAME": "test",
+    }
+    namespace.update({name: getattr(typing, name) for name in typing.__all__})
+    isolated_module = ast.Module(body=body, type_ignores=[])
+    exec(compile(isolated_module, filename=str(REPO_ROOT / "ACAGi.py"), mode="exec"), namespace)
+    return namespace
+
+
+def test_turn_is_embedded_once_and_shared_between_sinks() -> None:
+    recorder = _RecordingAtexit()
+    namespace = _load_writer(recorder)
+    record = namespace["ChatTurnRecord"]
+    conversation = _FakeConversation()
+    dataset = _FakeDataset()
+    written: List[Any] = []
+    writer = namespace["ChatTurnWriter"](conversation, dataset, on_written=written.append)
+    try:
+        assert writer.submit(
+            [
+                record("user", "how do I rotate logs?"),
+                record("assistant", "Use a size-based handler."),
+            ]
+        )
+        assert writer.flush(5.0)
+    finally:
+        writer.shutdown()
+
+    assert conversation.ollama.calls == [
+        ("embed-model", ["how do I rotate logs?", "Use a size-based handler."])
+    ]
+    assert conversation.appended == dataset.entries
+    assert [embedding for _, _, embedding in dataset.entries] == [
+        [21.0, 0.0],
+        [25.0, 1.0],
+    ]
+    assert len(written) == 1
+
+
+def test_shutdown_unregisters_the_atexit_hook() -> None:
+    recorder = _RecordingAtexit()
+    namespace = _load_writer(recorder)
+    writer = namespace["ChatTurnWriter"](_FakeConversation(), _FakeDataset())
+    assert recorder.registered == [writer.shutdown]
+
+    writer.shutdown()
+    writer.shutdown()
+
+    assert recorder.registered == []
+    assert not writer._thread.is_alive()
+    assert not writer.submit([namespace["ChatTurnRecord"]("user", "late")])
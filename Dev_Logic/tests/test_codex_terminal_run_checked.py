@@ -121,10 +121,9 @@ def test_run_checked_marks_task_merged_on_success(tmp_path: Path):
 
     assert rc == 0
 
-    records = _read_jsonl(task_models.TASKS_FILE)
-    stored = next(item for item in records if item["id"] == task.id)
-    assert stored["status"] == "merged"
-    assert stored["diffs"]["added"] >= 1
+    stored = {item.id: item for item in task_models.load_tasks()}[task.id]
+    assert stored.status == "merged"
+    assert stored.diffs.added >= 1
 
     status_events = [
         item
@@ -166,9 +165,8 @@ def test_run_checked_marks_task_failed_on_nonzero_exit(tmp_path: Path):
 
     assert rc == 5
 
-    records = _read_jsonl(task_models.TASKS_FILE)
-    stored = next(item for item in records if item["id"] == task.id)
-    assert stored["status"] == "failed"
+    stored = {item.id: item for item in task_models.load_tasks()}[task.id]
+    assert stored.status == "failed"
 
     status_events = [
         item
@@ -205,9 +203,8 @@ def test_run_checked_marks_task_cancelled_when_flagged(tmp_path: Path):
 
     assert rc == 0
 
-    records = _read_jsonl(task_models.TASKS_FILE)
-    stored = next(item for item in records if item["id"] == task.id)
-    assert stored["status"] == "cancelled"
+    stored = {item.id: item for item in task_models.load_tasks()}[task.id]
+    assert stored.status == "cancelled"
 
     status_events = [
         item
@@ -244,9 +241,8 @@ def test_run_checked_keeps_task_open_without_changes(tmp_path: Path):
 
     assert rc == 0
 
-    records = _read_jsonl(task_models.TASKS_FILE)
-    stored = next(item for item in records if item["id"] == task.id)
-    assert stored["status"] == "open"
+    stored = {item.id: item for item in task_models.load_tasks()}[task.id]
+    assert stored.status == "open"
 
     status_events = [
         item
@@ -1,7 +1,36 @@
+from __future__ import annotations
+
+import ast
+import atexit
 import json
+import logging
+import math
+import queue
+import re
+import shutil
+import threading
+import time
+import typing
+import uuid
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from functools import partial
+from pathlib import Path
+
+import pytest
 
+import Codex_Terminal
 from Codex_Terminal import ConversationIO
 
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture(autouse=True)
+def _isolated_archive_mirror(tmp_path, monkeypatch):
+    """Keep ConversationIO's repo archive mirror out of the source tree."""
+
+    monkeypatch.setattr(Codex_Terminal, "here", lambda: tmp_path / "repo")
+
 
 class DummyOllama:
     def embeddings(self, model, text):
@@ -136,3 +165,103 @@ def test_resolve_conversation_handles_live_and_archived(tmp_path):
     assert record_archived.source == "archive"
     assert record_archived.jsonl_path.exists()
     assert record_archived.root.parent == archive_root
+
+
+_ACAGI_CONVERSATION = {
+    "ensure_dir",
+    "_utc_iso",
+    "slug",
+    "cosine",
+    "_EmbeddingJob",
+    "BackgroundEmbedder",
+    "ConversationPaths",
+    "ConversationIO",
+}
+
+
+def _load_acagi_conversation(repo_root):
+    """Compile ACAGi's ConversationIO and its background embedder in isolation."""
+
+    source = (REPO_ROOT / "ACAGi.py").read_text(encoding="utf-8")
+    module_ast = ast.parse(source)
+    body = [
+        node
+        for node in module_ast.body
+        if isinstance(node, (ast.FunctionDef, ast.ClassDef))
+        and node.name in _ACAGI_CONVERSATION
+    ]
+    namespace = {
+        "__name__": __name__,
+        "atexit": atexit,
+        "json": json,
+        "logging": logging,
+        "math": math,
+        "queue": queue,
+        "re": re,
+        "shutil": shutil,
+        "threading": threading,
+        "uuid": uuid,
+        "dataclass": dataclass,
+        "datetime": datetime,
+        "partial": partial,
+        "Path": Path,
+        "UTC": UTC,
+        "logger": logging.getLogger(__name__),
+        "here": lambda: repo_root,
+        "agent_archives_dir": lambda: repo_root / "archives",
+        "VD_LOGGER_NAME": "test",
+    }
+    namespace.update({name: getattr(typing, name) for name in typing.__all__})
+    isolated_module = ast.Module(body=body, type_ignores=[])
+    exec(compile(isolated_module, filename=str(REPO_ROOT / "ACAGi.py"), mode="exec"), namespace)
+    return namespace
+
+
+class SlowBatchOllama(DummyOllama):
+    def __init__(self):
+        self.batches = []
+
+    def embed_many(self, model, texts):
+        time.sleep(0.05)
+        self.batches.append(list(texts))
+        return True, [self.embeddings(model, text)[1] for text in texts], ""
+
+
+def test_background_embeddings_are_keyed_by_turn_id_and_drain_on_close(tmp_path):
+    namespace = _load_acagi_conversation(tmp_path / "repo")
+    ollama = SlowBatchOllama()
+    conv = namespace["ConversationIO"](
+        tmp_path / "session",
+        "dummy",
+        ollama,
+        True,
+        session_token="session-bg",
+        archive_root=tmp_path / "archive",
+    )
+    texts = [f"hello {i}" if i % 2 == 0 else f"foo {i}" for i in range(6)]
+
+    def _write_turns():
+        for text in texts:
+            conv.append("user", text, [])
+
+    worker = threading.Thread(target=_write_turns)
+    worker.start()
+    worker.join()
+    conv.close()
+
+    assert sorted(text for batch in ollama.batches for text in batch) == sorted(texts)
+    embedder_threads = [t for t in threading.enumerate() if t.name == "ConversationEmbedder"]
+    assert not any(thread.is_alive() for thread in embedder_threads)
+    records = [
+        json.loads(line)
+        for line in conv.jsonl_path.read_text(encoding="utf-8").splitlines()
+    ]
+    vectors = {
+        payload["id"]: payload["embedding"]
+        for payload in map(json.loads, conv.vec_path.read_text(encoding="utf-8").splitlines())
+    }
+    assert set(vectors) == {record["id"] for record in records}
+    for record in records:
+        expected = [1.0, 0.0] if "hello" in record["text"] else [0.0, 1.0]
+        assert vectors[record["id"]] == expected
+    assert conv.retrieve("hello", k=1)[0]["text"].startswith("hello")
@@ -0,0 +1,242 @@
+"""Exercise the append-only dataset log and sidecar store inlined in ACAGi."""
+
+from __future__ import annotations
+
+import array
+import ast
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import types
+import typing
+import uuid
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from threading import RLock
+from typing import Any, Callable, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+ACAGI_SOURCE = (REPO_ROOT / "ACAGi.py").read_text(encoding="utf-8")
+
+_WANTED = {
+    "ensure_dir",
+    "_DATASET_LOG_LOCKS",
+    "_DATASET_LOG_LOCKS_LOCK",
+    "_dataset_log_locks",
+    "DatasetNode",
+    "DatasetNodePersistence",
+}
+
+
+def _load_persistence(
+    on_compact_copy: Optional[Callable[[], None]] = None,
+) -> Dict[str, Any]:
+    """Compile the dataset persistence layer from ACAGi in isolation.
+
+    ``on_compact_copy`` runs right after ``compact()`` creates its temp file,
+    i.e. while live lines are copied without the log lock held.
+    """
+
+    module_ast = ast.parse(ACAGI_SOURCE)
+    body = []
+    for node in module_ast.body:
+        if isinstance(node, (ast.FunctionDef, ast.ClassDef)) and node.name in _WANTED:
+            body.append(node)
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            if any(isinstance(target, ast.Name) and target.id in _WANTED for target in targets):
+                body.append(node)
+
+    def _mkstemp(*args: Any, **kwargs: Any) -> Any:
+        handle = tempfile.mkstemp(*args, **kwargs)
+        if on_compact_copy is not None:
+            on_compact_copy()
+        return handle
+
+    namespace: Dict[str, Any] = {
+        "__name__": __name__,
+        "array": array,
+        "json": json,
+        "logging": logging,
+        "os": os,
+        "shutil": shutil,
+        "sqlite3": sqlite3,
+        "sys": sys,
+        "tempfile": types.SimpleNamespace(mkstemp=_mkstemp),
+        "threading": threading,
+        "uuid": uuid,
+        "dataclass": dataclass,
+        "field": field,
+        "datetime": datetime,
+        "UTC": UTC,
+        "Path": Path,
+        "RLock": RLock,
+        "VD_LOGGER_NAME": "test",
+    }
+    namespace.update({name: getattr(typing, name) for name in typing.__all__})
+    isolated_module = ast.Module(body=body, type_ignores=[])
+    exec(compile(isolated_module, filename=str(REPO_ROOT / "ACAGi.py"), mode="exec"), namespace)
+    return namespace
+
+
+def _log_lines(path: Path) -> List[Dict[str, Any]]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_update_and_delete_survive_a_fresh_handle(tmp_path: Path) -> None:
+    persistence = _load_persistence()["DatasetNodePersistence"]
+    dataset_path = tmp_path / "dataset.jsonl"
+    store = persistence(dataset_path)
+    for name in ("a", "b", "c"):
+        store.append({"anchor": name, "text": f"text {name}"}, metadata={"n": name})
+    store.update("b", core_updates={"text": "edited b"})
+    store.update("a", metadata={"n": "meta only"})
+    assert store.delete("c")
+    assert not store.delete("c")
+    store.close()
+
+    assert [record.get("_deleted", False) for record in _log_lines(dataset_path)] == [
+        False,
+        False,
+        False,
+        False,
+        True,
+    ]
+    reopened = persistence(dataset_path)
+    assert len(reopened) == 2
+    assert "c" not in reopened and reopened.load("c") is None
+    assert reopened.load("b").core["text"] == "edited b"
+    assert reopened.load("a").metadata["n"] == "meta only"
+    assert [node.anchor for node in reopened.iter_nodes()] == ["a", "b"]
+    reopened.close()
+
+
+def test_compaction_carries_over_appends_from_another_handle(tmp_path: Path) -> None:
+    dataset_path = tmp_path / "dataset.jsonl"
+    appended = threading.Event()
+    other: List[Any] = []
+
+    def _append_from_other_handle() -> None:
+        def _write() -> None:
+            other[0].append({"anchor": "late", "text": "late"})
+            other[0].update("r0", core_updates={"text": "during compaction"})
+            appended.set()
+
+        # Another thread, so the append must not need the log lock the copy
+        # phase is running without.
+        worker = threading.Thread(target=_write)
+        worker.start()
+        worker.join(5.0)
+
+    namespace = _load_persistence(on_compact_copy=_append_from_other_handle)
+    persistence = namespace["DatasetNodePersistence"]
+    compacting = persistence(dataset_path)
+    other.append(persistence(dataset_path))
+    for index in range(10):
+        compacting.append({"anchor": f"r{index}", "text": "v1"})
+    for index in range(10):
+        compacting.update(f"r{index}", core_updates={"text": "v2"})
+
+    assert compacting.compact()
+    assert appended.is_set()
+
+    lines = _log_lines(dataset_path)
+    assert len(lines) == 12
+    assert [line["anchor"] for line in lines[-2:]] == ["late", "r0"]
+    for handle in (compacting, other[0], persistence(dataset_path)):
+        assert len(handle) == 11
+        assert handle.load("late").core["text"] == "late"
+        assert handle.load("r0").core["text"] == "during compaction"
+        assert handle.load("r9").core["text"] == "v2"
+
+
+def test_refresh_reindexes_a_file_replaced_with_a_new_inode(tmp_path: Path) -> None:
+    persistence = _load_persistence()["DatasetNodePersistence"]
+    dataset_path = tmp_path / "dataset.jsonl"
+    store = persistence(dataset_path)
+    store.append({"anchor": "a", "text": "a"})
+    store.append({"anchor": "b", "text": "b"})
+    assert len(store) == 2
+
+    replacement = tmp_path / "replacement.jsonl"
+    replacement.write_text(
+        "".join(
+            json.dumps({"anchor": name, "text": f"new {name}"}) + "\n"
+            for name in ("x", "y", "z")
+        ),
+        encoding="utf-8",
+    )
+    os.replace(replacement, dataset_path)
+
+    assert len(store) == 3
+    assert "a" not in store
+    assert store.load("z").core["text"] == "new z"
+
+
+def test_stale_offsets_are_rebuilt_when_a_record_moved(tmp_path: Path) -> None:
+    persistence = _load_persistence()["DatasetNodePersistence"]
+    dataset_path = tmp_path / "dataset.jsonl"
+    store = persistence(dataset_path)
+    store.append({"anchor": "aa", "text": "one"})
+    store.append({"anchor": "bb", "text": "two"})
+    assert store.load("aa").core["text"] == "one"
+    inode = dataset_path.stat().st_ino
+
+    # Same inode and size, different layout: only the anchor check notices.
+    first, second = dataset_path.read_bytes().splitlines(keepends=True)
+    with dataset_path.open("r+b") as fh:
+        fh.write(second + first)
+    assert dataset_path.stat().st_ino == inode
+
+    assert store.load("aa").core["text"] == "one"
+    assert store.load("bb").core["text"] == "two"
+    assert store._offsets["bb"][0] == 0
+
+
+def test_legacy_sidecars_are_imported_once_and_removed(tmp_path: Path) -> None:
+    persistence = _load_persistence()["DatasetNodePersistence"]
+    dataset_path = tmp_path / "dataset.jsonl"
+    dataset_path.write_text(
+        json.dumps({"anchor": "a", "text": "legacy"}) + "\n", encoding="utf-8"
+    )
+    sidecars = tmp_path / "dataset_nodes"
+    (sidecars / "thumbnails" / "a").mkdir(parents=True)
+    (sidecars / "thumbnails" / "a" / "shot.png").write_bytes(b"png")
+    vec_file = sidecars / "a.vec.json"
+    meta_file = sidecars / "a.meta.json"
+    vec_file.write_text(json.dumps({"embedding": [1, 2.5, -3]}), encoding="utf-8")
+    meta_file.write_text(
+        json.dumps({"metadata": {"role": "user"}, "stored_at": "2024-01-01T00:00:00"}),
+        encoding="utf-8",
+    )
+
+    store = persistence(dataset_path)
+    node = store.load("a")
+    store.close()
+
+    assert node.embedding == [1.0, 2.5, -3.0]
+    assert node.metadata == {"role": "user", "stored_at": "2024-01-01T00:00:00"}
+    assert node.thumbnail_paths == [sidecars / "thumbnails" / "a" / "shot.png"]
+    assert not vec_file.exists() and not meta_file.exists()
+
+    # A sidecar that shows up after the import is left alone on reopen.
+    late_file = sidecars / "b.vec.json"
+    late_file.write_text(json.dumps([9.0]), encoding="utf-8")
+    reopened = persistence(dataset_path)
+    assert reopened.load("a").embedding == [1.0, 2.5, -3.0]
+    assert reopened._read_embedding("b") == []
+    assert late_file.exists()
+    reopened.close()
+
+    conn = sqlite3.connect(str(sidecars / "sidecars.sqlite3"))
+    try:
+        assert conn.execute("PRAGMA user_version").fetchone() == (1,)
+        assert conn.execute("SELECT COUNT(*) FROM sidecars").fetchone() == (1,)
+    finally:
+        conn.close()
@@ -0,0 +1,170 @@
+"""Exercise the per-width dataset vector indexes inlined in ACAGi."""
+
+from __future__ import annotations
+
+import array
+import ast
+import contextlib
+import hashlib
+import heapq
+import json
+import logging
+import math
+import os
+import random
+import re
+import sys
+import threading
+import typing
+from pathlib import Path
+from threading import RLock
+from typing import Any, Dict, List
+
+import numpy
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+ACAGI_SOURCE = (REPO_ROOT / "ACAGi.py").read_text(encoding="utf-8")
+
+_WANTED = {
+    "ensure_dir",
+    "_write_vectors",
+    "cosine",
+    "_dataset_index_prefix",
+    "DatasetVectorIndex",
+    "_DATASET_VECTOR_INDEXES",
+    "_DATASET_VECTOR_INDEXES_LOCK",
+    "get_dataset_vector_index",
+    "DatasetVectorIndexes",
+}
+
+
+def _load_index(np: Any) -> Dict[str, Any]:
+    """Compile the dataset vector index from ACAGi with or without NumPy."""
+
+    module_ast = ast.parse(ACAGI_SOURCE)
+    body = []
+    for node in module_ast.body:
+        if isinstance(node, (ast.FunctionDef, ast.ClassDef)) and node.name in _WANTED:
+            body.append(node)
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            if any(isinstance(target, ast.Name) and target.id in _WANTED for target in targets):
+                body.append(node)
+    namespace: Dict[str, Any] = {
+        "__name__": __name__,
+        "np": np,
+        "array": array,
+        "contextlib": contextlib,
+        "hashlib": hashlib,
+        "heapq": heapq,
+        "json": json,
+        "logging": logging,
+        "math": math,
+        "os": os,
+        "re": re,
+        "sys": sys,
+        "threading": threading,
+        "Path": Path,
+        "RLock": RLock,
+        "VD_LOGGER_NAME": "test",
+    }
+    namespace.update({name: getattr(typing, name) for name in typing.__all__})
+    isolated_module = ast.Module(body=body, type_ignores=[])
+    exec(compile(isolated_module, filename=str(REPO_ROOT / "ACAGi.py"), mode="exec"), namespace)
+    return namespace
+
+
+@pytest.fixture(params=["numpy", "python"])
+def index_ns(request: pytest.FixtureRequest) -> Dict[str, Any]:
+    return _load_index(numpy if request.param == "numpy" else None)
+
+
+def _anchors(results: List[Any]) -> List[str]:
+    return [anchor for _, _, anchor in results]
+
+
+def test_upsert_delete_and_compaction_survive_a_reload(
+    index_ns: Dict[str, Any], tmp_path: Path
+) -> None:
+    index_cls = index_ns["DatasetVectorIndex"]
+    index_cls.COMPACT_MIN_DEAD = 4
+    dataset = tmp_path / "dataset.jsonl"
+    index = index_cls(tmp_path, "embed", 2)
+    assert index.add_dataset(dataset, [("a", [1.0, 0.0]), ("b", [0.0, 1.0]), ("x", [1.0])]) == 2
+    index.upsert(dataset, "c", [1.0, 1.0])
+    index.remove(dataset, "b")
+    for step in range(5):
+        index.upsert(dataset, "a", [1.0, 0.1 * step])
+    assert index._generation >= 1
+    assert sorted(path.name for path in index.root.iterdir()) == [
+        "manifest.json",
+        f"rows.{index._generation}.jsonl",
+        f"vectors.{index._generation}.f32",
+    ]
+    index.upsert(dataset, "d", [-1.0, 0.0])
+    expected = index.search([1.0, 0.0], 10)
+
+    reloaded = index_cls(tmp_path, "embed", 2)
+    assert len(reloaded) == 3
+    assert reloaded.has_dataset(dataset)
+    assert reloaded.search([1.0, 0.0], 10) == expected
+    assert _anchors(expected) == ["a", "c", "d"]
+    assert expected[0][1] == dataset
+
+    # Opening the same width for another embedder must not touch this one.
+    index_cls(tmp_path, "other", 2).upsert(dataset, "z", [0.0, 1.0])
+    assert len(index_cls(tmp_path, "embed", 2)) == 3
+
+
+def test_vector_that_changes_width_leaves_the_other_index(
+    index_ns: Dict[str, Any], tmp_path: Path
+) -> None:
+    dataset = tmp_path / "dataset.jsonl"
+    base = tmp_path / "dataset_index"
+    base.mkdir()
+    (base / "vectors.f32").write_bytes(b"\0" * 8)
+    (base / "rows.jsonl").write_text("{}\n", encoding="utf-8")
+    indexes = index_ns["DatasetVectorIndexes"](tmp_path, "embed")
+    assert not (base / "vectors.f32").exists() and not (base / "rows.jsonl").exists()
+
+    indexes.upsert(dataset, "n", [1.0, 0.0, 0.0])
+    indexes.upsert(dataset, "keep", [0.0, 1.0, 0.0])
+    indexes.upsert(dataset, "n", [1.0, 0.0, 0.0, 0.0])
+    assert _anchors(indexes.for_dim(3).search([1.0, 0.0, 0.0], 5)) == ["keep"]
+    assert _anchors(indexes.for_dim(4).search([1.0, 0.0, 0.0, 0.0], 5)) == ["n"]
+
+    # A fresh process rediscovers both widths from disk before routing.
+    restarted = _load_index(index_ns["np"])["DatasetVectorIndexes"](tmp_path, "embed")
+    restarted.upsert(dataset, "keep", [0.0, 0.0, 0.0, 1.0])
+    assert len(restarted.for_dim(3)) == 0
+    assert sorted(_anchors(restarted.for_dim(4).search([0.0, 0.0, 0.0, 1.0], 5))) == [
+        "keep",
+        "n",
+    ]
+
+
+def test_search_ranks_like_brute_force_cosine(
+    index_ns: Dict[str, Any], tmp_path: Path
+) -> None:
+    rng = random.Random(7)
+    dataset = tmp_path / "dataset.jsonl"
+    index = index_ns["DatasetVectorIndex"](tmp_path, "embed", 8)
+    vectors = {f"n{i}": [rng.uniform(-1.0, 1.0) for _ in range(8)] for i in range(60)}
+    vectors["zero"] = [0.0] * 8
+    for anchor, vector in vectors.items():
+        index.upsert(dataset, anchor, vector)
+    for anchor in ("n3", "n17", "n42"):
+        index.remove(dataset, anchor)
+        del vectors[anchor]
+    query = [rng.uniform(-1.0, 1.0) for _ in range(8)]
+
+    cosine = index_ns["cosine"]
+    brute = sorted(vectors, key=lambda anchor: cosine(vectors[anchor], query), reverse=True)
+    results = index.search(query, 10)
+
+    assert _anchors(results) == brute[:10]
+    for score, _, anchor in results:
+        assert score == pytest.approx(cosine(vectors[anchor], query), abs=1e-5)
+    assert len(index.search(query, 500)) == len(vectors)
+    assert index.search(query[:4], 5) == []
@@ -0,0 +1,284 @@
+"""Exercise the event dispatcher and its Qt consumers inlined in ACAGi."""
+
+from __future__ import annotations
+
+import ast
+import heapq
+import logging
+import math
+import os
+import pickle
+import threading
+import time
+import typing
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from datetime import datetime
+from enum import Enum
+from functools import partial
+from pathlib import Path
+from threading import RLock
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+import pytest
+from PySide6.QtCore import QCoreApplication, QObject, Qt, Signal, Slot
+from PySide6.QtWidgets import QApplication, QDockWidget
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+ACAGI_SOURCE = (REPO_ROOT / "ACAGi.py").read_text(encoding="utf-8")
+
+_WANTED = {
+    "RuntimeSettings",
+    "FrozenPayload",
+    "_freeze_mapping",
+    "DeliveryMode",
+    "_SubscriptionState",
+    "Subscription",
+    "_QtDeliveryBridge",
+    "_LatencyHistogram",
+    "_BusStats",
+    "BUS_TELEMETRY_TOPIC",
+    "summarise_bus_telemetry",
+    "EventDispatcher",
+    "LogObservabilityDock",
+}
+
+
+def _ensure_app():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    return app
+
+
+def _load_bus() -> Dict[str, Any]:
+    """Compile the dispatcher and its consumers from ACAGi in isolation."""
+
+    module_ast = ast.parse(ACAGI_SOURCE)
+    body = []
+    for node in module_ast.body:
+        if isinstance(node, (ast.FunctionDef, ast.ClassDef)) and node.name in _WANTED:
+            body.append(node)
+        elif isinstance(node, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id in _WANTED for target in node.targets
+        ):
+            body.append(node)
+    namespace: Dict[str, Any] = {
+        "__name__": __name__,
+        "heapq": heapq,
+        "logging": logging,
+        "math": math,
+        "os": os,
+        "threading": threading,
+        "time": time,
+        "defaultdict": defaultdict,
+        "deque": deque,
+        "ThreadPoolExecutor": ThreadPoolExecutor,
+        "dataclass": dataclass,
+        "datetime": datetime,
+        "Enum": Enum,
+        "partial": partial,
+        "RLock": RLock,
+        "QCoreApplication": QCoreApplication,
+        "QDockWidget": QDockWidget,
+        "QObject": QObject,
+        "Qt": Qt,
+        "Signal": Signal,
+        "Slot": Slot,
+        "Subscriber": Callable[[dict], None],
+        "REMOTE_ACCESS": None,
+        "VD_LOGGER_NAME": "test",
+    }
+    namespace.update({name: getattr(typing, name) for name in typing.__all__})
+    isolated_module = ast.Module(body=body, type_ignores=[])
+    exec(compile(isolated_module, filename=str(REPO_ROOT / "ACAGi.py"), mode="exec"), namespace)
+    namespace["RUNTIME_SETTINGS"] = namespace["RuntimeSettings"]()
+    return namespace
+
+
+def _dispatcher(namespace: Dict[str, Any], *topics: str) -> Any:
+    return namespace["EventDispatcher"](topics=topics, wildcard_topic="task.*")
+
+
+def _wait_for(predicate: Callable[[], bool], timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        QCoreApplication.processEvents()
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_log_dock_shows_bus_telemetry_published_from_a_worker_thread() -> None:
+    _ensure_app()
+    namespace = _load_bus()
+    dispatcher = _dispatcher(namespace, namespace["BUS_TELEMETRY_TOPIC"])
+    namespace["subscribe"] = dispatcher.subscribe
+    dock = namespace["LogObservabilityDock"]
+    formatted: List[tuple] = []
+
+    class _DockProbe:
+        _BUS_TOPICS = (namespace["BUS_TELEMETRY_TOPIC"],)
+        _install_bus_subscriptions = dock._install_bus_subscriptions
+        _handle_bus_event = dock._handle_bus_event
+        _summarise_event = dock._summarise_event
+
+        def __init__(self) -> None:
+            self._logger = logging.getLogger("test.dock")
+            self._subscriptions: List[Any] = []
+            self._system_lines: List[str] = []
+
+        def _format_event_line(self, topic: str, payload: Any) -> str:
+            line = dock._format_event_line(self, topic, payload)
+            formatted.append((threading.current_thread(), line))
+            return line
+
+        def _render_system_lines(self) -> None:
+            pass
+
+        def _update_system_status(self, added: int) -> None:
+            pass
+
+    probe = _DockProbe()
+    probe._install_bus_subscriptions()
+    worker = threading.Thread(
+        target=dispatcher.publish,
+        args=(namespace["BUS_TELEMETRY_TOPIC"], {"enabled": False}),
+    )
+    worker.start()
+    worker.join()
+
+    assert _wait_for(lambda: bool(formatted))
+    thread, line = formatted[0]
+    assert thread is threading.main_thread()
+    assert line.endswith("system.bus: bus telemetry disabled")
+    assert probe._system_lines == [line]
+    for handle in probe._subscriptions:
+        handle.unsubscribe()
+
+
+@pytest.mark.parametrize(
+    ("mode", "thread_prefix"),
+    [("INLINE", None), ("THREAD", "EventSub-demo"), ("POOL", "EventPool"), ("QT", None)],
+)
+def test_each_delivery_mode_delivers_once_on_its_thread(
+    mode: str, thread_prefix: Optional[str]
+) -> None:
+    _ensure_app()
+    namespace = _load_bus()
+    dispatcher = _dispatcher(namespace, "demo")
+    received: List[tuple] = []
+    handle = dispatcher.subscribe(
+        "demo",
+        lambda payload: received.append((threading.current_thread(), payload["n"])),
+        delivery=namespace["DeliveryMode"][mode],
+    )
+
+    publisher = threading.Thread(target=dispatcher.publish, args=("demo", {"n": 1}))
+    publisher.start()
+    publisher.join()
+
+    assert _wait_for(lambda: bool(received))
+    time.sleep(0.05)
+    QCoreApplication.processEvents()
+    assert [n for _, n in received] == [1]
+    thread = received[0][0]
+    if mode == "INLINE":
+        assert thread is publisher
+    elif mode == "QT":
+        assert thread is threading.main_thread()
+    else:
+        assert thread.name.startswith(thread_prefix)
+    handle.unsubscribe()
+
+
+def test_subscribers_share_a_read_only_payload() -> None:
+    namespace = _load_bus()
+    dispatcher = _dispatcher(namespace, "demo")
+    received: List[Any] = []
+    dispatcher.subscribe("demo", received.append)
+    dispatcher.subscribe("demo", received.append)
+
+    dispatcher.publish("demo", {"n": 1, "meta": {"source": "test"}})
+
+    first, second = received
+    assert first is second
+    mutations = [
+        lambda payload: payload.__setitem__("n", 2),
+        lambda payload: payload.__delitem__("n"),
+        lambda payload: payload.update(n=2),
+        lambda payload: payload.pop("n"),
+        lambda payload: payload.setdefault("x", 1),
+        lambda payload: payload.clear(),
+        lambda payload: payload["meta"].__setitem__("source", "other"),
+    ]
+    for mutate in mutations:
+        with pytest.raises(TypeError):
+            mutate(first)
+    assert first["n"] == 1 and first["meta"]["source"] == "test"
+    assert first["meta"]["sandbox"] == "restricted"
+    editable = dict(first)
+    editable["n"] = 2
+    assert first["n"] == 1
+    assert type(pickle.loads(pickle.dumps(first))) is dict
+
+
+class _FakeRemoteAccess:
+    def __init__(self) -> None:
+        self.version = 0
+        self.effective = False
+
+    def snapshot(self) -> Any:
+        tooling = SimpleNamespace(to_metadata=lambda: {"gh_cli": False})
+        return SimpleNamespace(effective=self.effective, configured=True, tooling=tooling)
+
+
+def test_enrich_tracks_runtime_settings_and_remote_version() -> None:
+    namespace = _load_bus()
+    remote = _FakeRemoteAccess()
+    namespace["REMOTE_ACCESS"] = remote
+    dispatcher = _dispatcher(namespace, "demo")
+    received: List[Any] = []
+    dispatcher.subscribe("demo", received.append)
+
+    dispatcher.publish("demo", {})
+    dispatcher.publish("demo", {})
+    assert received[0]["meta"] is received[1]["meta"]
+    assert received[0]["meta"]["offline"] is False
+    assert received[0]["meta"]["remote_enabled"] is False
+
+    namespace["RUNTIME_SETTINGS"] = replace(namespace["RUNTIME_SETTINGS"], offline=True)
+    dispatcher.publish("demo", {})
+    assert received[2]["meta"]["offline"] is True
+
+    remote.effective = True
+    dispatcher.publish("demo", {})
+    assert received[3]["meta"]["remote_enabled"] is False
+    remote.version += 1
+    dispatcher.publish("demo", {})
+    assert received[4]["meta"]["remote_enabled"] is True
+    assert received[4]["meta"]["remote_tooling"] == {"gh_cli": False}
+
+
+def test_publish_without_listeners_or_remote_is_a_no_op() -> None:
+    namespace = _load_bus()
+    dispatcher = _dispatcher(namespace, "demo")
+    enriched: List[Any] = []
+    original_enrich = dispatcher._enrich
+    dispatcher._enrich = lambda payload: enriched.append(payload) or original_enrich(payload)
+
+    dispatcher.publish("demo", {"n": 1})
+    assert enriched == []
+    with pytest.raises(ValueError):
+        dispatcher.publish("unknown", {})
+
+    namespace["RUNTIME_SETTINGS"] = replace(
+        namespace["RUNTIME_SETTINGS"], remote_event_bus="http://bus.invalid"
+    )
+    remote = _dispatcher(namespace, "demo")
+    remote._enrich = dispatcher._enrich
+    remote.publish("demo", {"n": 2})
+    assert enriched == [{"n": 2}]
@@ -127,3 +127,82 @@ def test_thumbnailize_conversation_markdown(tmp_path):
     text_after = conv.read_text(encoding="utf-8")
     assert "images/first.png" in text_after
     assert "images/first_thumb.png" not in text_after
+
+
+@pytest.fixture
+def _fresh_image_cache(monkeypatch):
+    monkeypatch.setattr(ip, "_IMAGE_RESULT_CACHE", ip.OrderedDict())
+
+
+class _CountingEngine:
+    def __init__(self, text):
+        self.text = text
+        self.calls = 0
+
+    def image_to_string(self, image, lang="eng"):
+        self.calls += 1
+        return self.text
+
+
+@pytest.mark.skipif(ip.Image is None, reason="Pillow not installed")
+def test_perform_ocr_cached_reuses_result_for_same_content(
+    tmp_path, monkeypatch, _fresh_image_cache
+):
+    tesseract = _CountingEngine("Cached text")
+    monkeypatch.setattr(ip, "pytesseract", tesseract)
+
+    first = tmp_path / "first.png"
+    second = tmp_path / "second.png"
+    first.write_bytes(SMALL_PNG)
+    second.write_bytes(SMALL_PNG)
+
+    one = ip.perform_ocr_cached(first)
+    two = ip.perform_ocr_cached(second)
+    other_language = ip.perform_ocr_cached(second, language="deu")
+
+    assert one.ok and two.ok and other_language.ok
+    assert two.markdown == "Cached text"
+    assert tesseract.calls == 2
+
+
+@pytest.mark.skipif(ip.Image is None, reason="Pillow not installed")
+def test_perform_ocr_cached_does_not_share_results_with_custom_engines(
+    tmp_path, monkeypatch, _fresh_image_cache
+):
+    monkeypatch.setattr(ip, "pytesseract", _CountingEngine("Tesseract text"))
+    custom = _CountingEngine("Custom text")
+    img = tmp_path / "image.png"
+    img.write_bytes(SMALL_PNG)
+
+    default = ip.perform_ocr_cached(img)
+    first = ip.perform_ocr_cached(img, engine=custom)
+    second = ip.perform_ocr_cached(img, engine=custom)
+
+    assert default.markdown == "Tesseract text"
+    assert first.markdown == second.markdown == "Custom text"
+    assert custom.calls == 2
+
+
+def test_analyze_image_cached_keys_on_content_and_request(
+    tmp_path, _fresh_image_cache
+):
+    img = tmp_path / "image.png"
+    img.write_bytes(SMALL_PNG)
+
+    class StubClient:
+        def __init__(self):
+            self.calls = 0
+
+        def chat(self, model, messages, images=None):
+            self.calls += 1
+            return True, f"Summary {self.calls}", ""
+
+    client = StubClient()
+    kwargs = {"client": client, "model": "vision-model"}
+    first = ip.analyze_image_cached(img, "ocr", user_text="hello", **kwargs)
+    again = ip.analyze_image_cached(img, "ocr", user_text="hello", **kwargs)
+    other = ip.analyze_image_cached(img, "ocr", user_text="different", **kwargs)
+
+    assert first.summary == again.summary == "Summary 1"
+    assert other.summary == "Summary 2"
+    assert client.calls == 2
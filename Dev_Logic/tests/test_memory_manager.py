@@ -103,3 +103,26 @@ def test_search_images_uses_ocr_and_image_vectors(tmp_path):
         session_filter="missing",
     )
     assert filtered == []
+
+
+def test_search_images_ranks_across_sessions_and_sees_new_entries(tmp_path):
+    manager = MemoryManager(
+        tmp_path,
+        text_embedder=_text_embed,
+        image_embedder=_image_embed,
+        enable_embeddings=True,
+    )
+    world_img = tmp_path / "world.png"
+    world_img.write_text("landscape", encoding="utf-8")
+    diagram_img = tmp_path / "diagram.png"
+    diagram_img.write_text("diagram", encoding="utf-8")
+
+    manager.log_interaction("session-a", "user", "hello world", images=[world_img])
+    assert manager.search_images("diagram", k=5, session_filter="session-b") == []
+
+    manager.log_interaction("session-b", "user", "a diagram", images=[diagram_img])
+    results = manager.search_images("diagram", k=5)
+    assert [hit["session"] for hit in results][0] == "session-b"
+
+    filtered = manager.search_images("world", k=5, session_filter="session-a")
+    assert [hit["image_path"] for hit in filtered] == [world_img.as_posix()]
@@ -93,3 +93,175 @@ def test_repository_index_tracks_extra_roots(tmp_path):
         segment["metadata"].get("scan_root") == str(extra_root.resolve())
         for segment in segments
     )
+
+
+def test_repository_index_incremental_rebuild_only_touches_changed_files(tmp_path):
+    repo_root = tmp_path / "repo"
+    _write_file(repo_root / "alpha.py", "def alpha():\n    return 1\n")
+    _write_file(repo_root / "beta.py", "def beta():\n    return 2\n")
+    _write_file(repo_root / "gamma.md", "# Gamma\n\nNotes.\n")
+
+    embedded: list[str] = []
+
+    def _embedder(text: str) -> list[float]:
+        embedded.append(text)
+        return [1.0, float(len(text))]
+
+    data_root = tmp_path / "datasets"
+    index = RepositoryIndex(repo_root=repo_root, data_root=data_root, text_embedder=_embedder)
+    first = index.rebuild()
+    assert first["files_changed"] == 3
+    assert (data_root / "repo_index" / "files.json").exists()
+
+    embedded.clear()
+    second = index.rebuild()
+    assert embedded == []
+    assert second["files_changed"] == 0
+    assert second["files_reused"] == 3
+    assert second["segments"] == first["segments"]
+
+    _write_file(repo_root / "beta.py", "def beta():\n    return 3\n")
+    (repo_root / "gamma.md").unlink()
+    embedded.clear()
+
+    fresh = RepositoryIndex(repo_root=repo_root, data_root=data_root, text_embedder=_embedder)
+    third = fresh.rebuild()
+    assert third["files_changed"] == 1
+    assert third["files_removed"] == 1
+    assert embedded == ["def beta():\n    return 3"]
+    paths = {segment["path"] for segment in fresh.iter_segments()}
+    assert paths == {"alpha.py", "beta.py"}
+
+    embedded.clear()
+    full = fresh.rebuild(incremental=False)
+    assert full["files_changed"] == 2
+    assert len(embedded) == 2
+
+
+def test_repository_index_reembeds_files_with_mismatched_vector_width(tmp_path):
+    repo_root = tmp_path / "repo"
+    _write_file(repo_root / "alpha.py", "def alpha():\n    return 1\n")
+    _write_file(repo_root / "beta.py", "def beta():\n    return 2\n")
+    _write_file(repo_root / "gamma.py", "def gamma():\n    return 3\n")
+
+    embedded: list[str] = []
+
+    def _mixed(text: str) -> list[float]:
+        embedded.append(text)
+        return [1.0, 0.0, 0.0] if "beta" in text else [1.0, 0.0]
+
+    data_root = tmp_path / "datasets"
+    index = RepositoryIndex(repo_root=repo_root, data_root=data_root, text_embedder=_mixed)
+    index.rebuild()
+
+    files = json.loads((data_root / "repo_index" / "files.json").read_text(encoding="utf-8"))["files"]
+    stale = [key for key, state in files.items() if not state["embedded"]]
+    assert len(stale) == 1
+
+    embedded.clear()
+    fresh = RepositoryIndex(
+        repo_root=repo_root, data_root=data_root, text_embedder=lambda text: _mixed(text)[:2]
+    )
+    summary = fresh.rebuild()
+    assert summary["files_changed"] == 1
+    assert len(embedded) == 1 and embedded[0] in Path(stale[0]).read_text(encoding="utf-8")
+    files = json.loads((data_root / "repo_index" / "files.json").read_text(encoding="utf-8"))["files"]
+    assert all(state["embedded"] for state in files.values())
+
+
+def test_repository_index_stores_embeddings_in_binary_sidecar(tmp_path):
+    repo_root = tmp_path / "repo"
+    _write_file(repo_root / "alpha.py", "def alpha_task():\n    return 'task'\n")
+    _write_file(repo_root / "notes.md", "# Notes\n\nUnrelated prose.\n")
+
+    def _embedder(text: str) -> list[float]:
+        return [1.0, 0.0] if "alpha" in text else [0.0, 1.0]
+
+    data_root = tmp_path / "datasets"
+    index = RepositoryIndex(repo_root=repo_root, data_root=data_root, text_embedder=_embedder)
+    summary = index.rebuild()
+
+    index_dir = data_root / "repo_index"
+    manifest = json.loads((index_dir / "manifest.json").read_text(encoding="utf-8"))
+    sidecar = index_dir / "embeddings.f32"
+    assert sidecar.stat().st_size == manifest["embedding_rows"] * manifest["embedding_dim"] * 4
+    entries = [
+        json.loads(line)
+        for line in (index_dir / "index.jsonl").read_text(encoding="utf-8").splitlines()
+        if line
+    ]
+    assert len(entries) == summary["segments"]
+    assert all("embedding" not in entry for entry in entries)
+    assert sorted(entry["row"] for entry in entries) == list(range(len(entries)))
+
+    reloaded = RepositoryIndex(repo_root=repo_root, data_root=data_root, text_embedder=_embedder)
+    results = reloaded.search("alpha task", k=1)
+    assert results and results[0]["path"] == "alpha.py"
+
+
+def test_repository_index_reads_legacy_inline_embeddings(tmp_path):
+    data_root = tmp_path / "datasets"
+    index_dir = data_root / "repo_index"
+    index_dir.mkdir(parents=True)
+    legacy = [
+        {"id": "a", "path": "a.py", "start_line": 1, "end_line": 2, "text": "a", "embedding": [1.0, 0.0]},
+        {"id": "b", "path": "b.py", "start_line": 1, "end_line": 2, "text": "b", "embedding": [0.0, 1.0]},
+    ]
+    (index_dir / "index.jsonl").write_text(
+        "".join(json.dumps(entry) + "\n" for entry in legacy), encoding="utf-8"
+    )
+
+    index = RepositoryIndex(
+        repo_root=tmp_path / "repo",
+        data_root=data_root,
+        text_embedder=lambda text: [0.0, 1.0],
+    )
+    results = index.search("anything", k=2)
+    assert [hit["id"] for hit in results] == ["b"]
+
+
+def test_repository_index_parallel_rebuild_matches_serial(tmp_path):
+    repo_root = tmp_path / "repo"
+    for number in range(40):
+        _write_file(
+            repo_root / f"pkg{number % 4}" / f"mod{number}.py",
+            f"def handler_{number}(event):\n    return event + {number}\n",
+        )
+
+    batches: list[int] = []
+
+    def _batch_embedder(texts):
+        batches.append(len(texts))
+        return [[1.0, float(len(text))] for text in texts]
+
+    serial = RepositoryIndex(repo_root=repo_root, data_root=tmp_path / "serial")
+    serial.rebuild()
+    parallel = RepositoryIndex(
+        repo_root=repo_root,
+        data_root=tmp_path / "parallel",
+        text_batch_embedder=_batch_embedder,
+        workers=2,
+    )
+    summary = parallel.rebuild()
+
+    assert summary["files_indexed"] == 40
+    assert sum(batches) == summary["segments"]
+    assert max(batches) <= 64
+    serial_order = [(segment["path"], segment["start_line"]) for segment in serial.iter_segments()]
+    parallel_order = [(segment["path"], segment["start_line"]) for segment in parallel.iter_segments()]
+    assert parallel_order == serial_order
+
+
+def test_repository_index_skips_whitespace_only_segments_when_embedding(tmp_path):
+    seen: list[str] = []
+
+    def _batch_embedder(texts):
+        seen.extend(texts)
+        return [[1.0, float(len(text))] for text in texts]
+
+    index = RepositoryIndex(repo_root=tmp_path, data_root=tmp_path / "datasets", text_batch_embedder=_batch_embedder)
+    vectors = index._embed_many(["alpha", "  \n\t", "beta"], 1)
+
+    assert seen == ["alpha", "beta"]
+    assert vectors == [[1.0, 5.0], [], [1.0, 4.0]]
+    assert index._embed_many(["", " "], 4) == [[], []]
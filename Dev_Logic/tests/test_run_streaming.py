@@ -0,0 +1,146 @@
+"""Exercise the streaming ``run_checked`` helpers inlined in ACAGi."""
+
+from __future__ import annotations
+
+import ast
+import codecs
+import contextlib
+import locale
+import os
+import queue
+import selectors
+import subprocess
+import sys
+import threading
+import time
+import typing
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+ACAGI_SOURCE = (REPO_ROOT / "ACAGi.py").read_text(encoding="utf-8")
+
+_WANTED = {
+    "RUN_CHECKED_OUTPUT_CAP",
+    "RUN_CHECKED_READ_SIZE",
+    "RUN_CHECKED_PUBLISH_INTERVAL",
+    "_StreamCapture",
+    "_pump_process_output",
+    "_run_streaming",
+}
+
+
+class _RecordingWriter:
+    def __init__(self) -> None:
+        self.lines: List[Tuple[Optional[str], str]] = []
+
+    def write(self, lines: List[str], *, channel: Optional[str] = None) -> None:
+        self.lines.extend((channel, line) for line in lines)
+
+    @contextlib.contextmanager
+    def batch(self) -> Iterator["_RecordingWriter"]:
+        yield self
+
+
+def _load_streaming() -> Tuple[Dict[str, Any], _RecordingWriter, List[Dict[str, Any]]]:
+    """Compile the streaming helpers in isolation with a recording log and bus."""
+
+    module_ast = ast.parse(ACAGI_SOURCE)
+    body = []
+    for node in module_ast.body:
+        if isinstance(node, (ast.FunctionDef, ast.ClassDef)) and node.name in _WANTED:
+            body.append(node)
+        elif isinstance(node, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id in _WANTED for target in node.targets
+        ):
+            body.append(node)
+    writer = _RecordingWriter()
+    events: List[Dict[str, Any]] = []
+    namespace: Dict[str, Any] = {
+        "__name__": "test_run_streaming",
+        "codecs": codecs,
+        "contextlib": contextlib,
+        "locale": locale,
+        "os": os,
+        "queue": queue,
+        "selectors": selectors,
+        "subprocess": subprocess,
+        "threading": threading,
+        "time": time,
+        "Path": Path,
+        "publish": lambda topic, payload: events.append(dict(payload, topic=topic)),
+        "run_log_writer": lambda path: writer,
+    }
+    namespace.update({name: getattr(typing, name) for name in typing.__all__})
+    isolated_module = ast.Module(body=body, type_ignores=[])
+    exec(compile(isolated_module, filename=str(REPO_ROOT / "ACAGi.py"), mode="exec"), namespace)
+    return namespace, writer, events
+
+
+def test_stream_capture_holds_crlf_split_across_reads() -> None:
+    namespace, _, _ = _load_streaming()
+    capture = namespace["_StreamCapture"](1024, "utf-8")
+
+    assert capture.feed(b"first\r") == []
+    assert capture.feed(b"\nsecond\n") == ["first", "second"]
+    assert capture.feed(b"caf\xc3") == []
+    assert capture.feed(b"\xa9\nlast", final=False) == ["café"]
+    assert capture.feed(b"", final=True) == ["last"]
+    assert capture.text() == "first\nsecond\ncafé\nlast"
+
+
+def test_stream_capture_keeps_the_tail_on_a_line_boundary() -> None:
+    namespace, _, _ = _load_streaming()
+    capture = namespace["_StreamCapture"](16, "utf-8")
+
+    lines = capture.feed(b"line-1\nline-2\nline-3\nline-4\n")
+
+    assert lines == ["line-1", "line-2", "line-3", "line-4"]
+    assert capture.dropped == 28 - 16
+    assert capture.text() == "[... 12 bytes truncated ...]\nline-3\nline-4\n"
+
+
+def test_run_streaming_logs_every_line_but_caps_the_capture(tmp_path: Path) -> None:
+    namespace, writer, events = _load_streaming()
+    script = "import sys\nfor i in range(500):\n    print(f'row {i}')\nprint('oops', file=sys.stderr)\n"
+
+    code, stdout, stderr = namespace["_run_streaming"](
+        [sys.executable, "-c", script],
+        cwd=tmp_path,
+        env=None,
+        timeout=30,
+        output_limit=64,
+        log_path=tmp_path / "run.log",
+        task_id="task-1",
+    )
+
+    assert code == 0
+    assert stdout.startswith("[... ") and stdout.rstrip("\n").endswith("row 499")
+    assert len(stdout.encode("utf-8")) < 128
+    assert stderr.strip() == "oops"
+    logged = [line for channel, line in writer.lines if channel == "stdout"]
+    assert logged == [f"row {i}" for i in range(500)]
+    assert ("stderr", "oops") in writer.lines
+    statuses = [event["status"] for event in events]
+    assert statuses[0] == "started" and "output" in statuses
+    assert {event["task_id"] for event in events} == {"task-1"}
+
+
+def test_run_streaming_kills_the_process_at_the_deadline(tmp_path: Path) -> None:
+    namespace, writer, _ = _load_streaming()
+    script = "import time\nprint('ready', flush=True)\ntime.sleep(30)\n"
+
+    started = time.monotonic()
+    code, stdout, _ = namespace["_run_streaming"](
+        [sys.executable, "-c", script],
+        cwd=tmp_path,
+        env=None,
+        timeout=1,
+        output_limit=1024,
+        log_path=tmp_path / "run.log",
+    )
+
+    assert code is None
+    assert time.monotonic() - started < 10
+    assert stdout.strip() == "ready"
+    assert ("stdout", "ready") in writer.lines
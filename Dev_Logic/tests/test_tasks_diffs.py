@@ -121,7 +121,7 @@ def test_record_diff_uses_git_numstat_when_available(tmp_path):
     ]
 
     task_records = _read_jsonl(task_models.TASKS_FILE)
-    stored = next(item for item in task_records if item["id"] == "tsk_git")
+    stored = {item["id"]: item for item in task_records}["tsk_git"]
     assert stored["diffs"] == {"added": 2, "removed": 1}
 
     expected_event = {
@@ -178,12 +178,208 @@ def test_record_diff_falls_back_to_snapshots_for_non_git_files(tmp_path):
     assert diff_records[1]["removed"] == 1
 
     task_records = _read_jsonl(task_models.TASKS_FILE)
-    stored = next(item for item in task_records if item["id"] == "tsk_snap")
+    stored = {item["id"]: item for item in task_records}["tsk_snap"]
     assert stored["diffs"] == {"added": 1, "removed": 1}
 
-    snapshot_path = task_diffs._snapshot_file("tsk_snap", "notes.txt")
-    assert snapshot_path.exists()
-    assert snapshot_path.read_text(encoding="utf-8") == "first\nthird"
+    manifest = task_diffs._load_snapshot_index("tsk_snap")
+    blob_id = manifest["notes.txt"]["blob"]
+    assert task_diffs._load_snapshot_lines("tsk_snap", "notes.txt", blob_id) == [
+        "first",
+        "third",
+    ]
 
     assert events[0]["added"] == 2
     assert events[1]["added"] == 1
+
+
+def test_line_change_counts_matches_minimal_edit():
+    old = ["a", "b", "c", "d", "e"]
+    new = ["a", "c", "d", "x", "e", "f"]
+
+    assert task_diffs.line_change_counts(old, new) == (2, 1)
+    assert task_diffs.line_change_counts([], new) == (6, 0)
+    assert task_diffs.line_change_counts(old, old) == (0, 0)
+
+
+def test_record_diff_skips_unchanged_snapshot_files(tmp_path, monkeypatch):
+    workspace = tmp_path / "workspace"
+    workspace.mkdir()
+    target = workspace / "notes.txt"
+    target.write_text("first\nsecond\n", encoding="utf-8")
+    _create_task("tsk_skip")
+
+    task_diffs.record_diff("tsk_skip", files=["notes.txt"], workspace_root=workspace)
+
+    calls: list[tuple] = []
+    original = task_diffs.line_change_counts
+
+    def _tracking(old, new, **kwargs):
+        calls.append((old, new))
+        return original(old, new, **kwargs)
+
+    monkeypatch.setattr(task_diffs, "line_change_counts", _tracking)
+
+    unchanged = task_diffs.record_diff(
+        "tsk_skip", files=["notes.txt"], workspace_root=workspace
+    )
+    assert unchanged is not None
+    assert (unchanged.added, unchanged.removed) == (0, 0)
+    assert calls == []
+
+    target.write_text("first\nsecond\nthird\n", encoding="utf-8")
+    changed = task_diffs.record_diff(
+        "tsk_skip", files=["notes.txt"], workspace_root=workspace
+    )
+    assert (changed.added, changed.removed) == (1, 0)
+    assert len(calls) == 1
+
+
+def test_snapshot_blobs_are_shared_and_collected_on_archive(tmp_path):
+    workspace = tmp_path / "workspace"
+    workspace.mkdir()
+    (workspace / "shared.txt").write_text("same\n", encoding="utf-8")
+    _create_task("tsk_a")
+    _create_task("tsk_b")
+
+    for task_id in ("tsk_a", "tsk_b"):
+        task_diffs.record_diff(task_id, files=["shared.txt"], workspace_root=workspace)
+
+    blob_root = task_diffs._SNAPSHOT_ROOT / task_diffs._SNAPSHOT_BLOB_DIR
+    blobs = [path for path in blob_root.rglob("*") if path.is_file()]
+    assert len(blobs) == 1
+
+    assert task_diffs.archive_task_snapshots("tsk_a") == 0
+    assert blobs[0].exists()
+
+    task_diffs.archive_task_snapshots("tsk_b")
+    assert task_diffs.collect_snapshot_garbage(grace=0) == 1
+    assert not any(path.is_file() for path in blob_root.rglob("*"))
+
+
+def test_concurrent_blob_writes_do_not_share_a_temp_file():
+    import threading
+
+    payloads = [f"line {index}\n".encode("utf-8") * 2000 for index in range(20)]
+    blob_ids = [f"{index:02d}" + "ab" * 19 for index in range(len(payloads))]
+    barrier = threading.Barrier(4)
+    errors: list[BaseException] = []
+
+    def _writer() -> None:
+        barrier.wait()
+        for blob_id, data in zip(blob_ids, payloads):
+            try:
+                task_diffs._store_snapshot_blob(blob_id, data)
+            except BaseException as exc:  # pragma: no cover - failure path
+                errors.append(exc)
+
+    threads = [threading.Thread(target=_writer) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    blob_root = task_diffs._SNAPSHOT_ROOT / task_diffs._SNAPSHOT_BLOB_DIR
+    stored = sorted(path for path in blob_root.rglob("*") if path.is_file())
+    assert [path.parent.name + path.name for path in stored] == blob_ids
+    for blob_id, data in zip(blob_ids, payloads):
+        lines = task_diffs._load_snapshot_lines("tsk", "unused.txt", blob_id)
+        assert lines == data.decode("utf-8").splitlines()
+
+
+def test_drawer_delete_archives_task_snapshots(tmp_path):
+    from PySide6.QtWidgets import QApplication
+
+    from tasks.drawer import TaskDrawer
+
+    if QApplication.instance() is None:
+        QApplication([])
+    workspace = tmp_path / "workspace"
+    workspace.mkdir()
+    (workspace / "notes.txt").write_text("draft\n", encoding="utf-8")
+    _create_task("tsk_del")
+    task_diffs.record_diff("tsk_del", files=["notes.txt"], workspace_root=workspace)
+    manifest = task_diffs._SNAPSHOT_ROOT / "tsk_del" / task_diffs._SNAPSHOT_INDEX_NAME
+    assert manifest.exists()
+
+    deleted: list[dict] = []
+    subscribe("task.deleted", deleted.append)
+    drawer = TaskDrawer("sess", dataset_path=task_models.TASKS_FILE)
+    try:
+        drawer._apply_status_change("tsk_del", "closed")
+        assert manifest.exists()
+        drawer._apply_status_change("tsk_del", "deleted")
+    finally:
+        drawer.deleteLater()
+
+    assert deleted == [{"id": "tsk_del"}]
+    assert not manifest.exists()
+    assert not (task_diffs._SNAPSHOT_ROOT / "tsk_del" / "snapshot").exists()
+
+
+def _init_repo(repo: Path) -> None:
+    repo.mkdir()
+    for args in (
+        ["git", "init"],
+        ["git", "config", "user.email", "codex@example.com"],
+        ["git", "config", "user.name", "Codex"],
+    ):
+        subprocess.run(args, cwd=repo, check=True, stdout=subprocess.PIPE)
+
+
+def test_git_diff_session_matches_numstat_and_counts_untracked(tmp_path):
+    repo = tmp_path / "repo"
+    _init_repo(repo)
+    tracked = repo / "tracked.txt"
+    tracked.write_text("alpha\nbeta\n", encoding="utf-8")
+    subprocess.run(["git", "add", "tracked.txt"], cwd=repo, check=True)
+    subprocess.run(["git", "commit", "-m", "init"], cwd=repo, check=True)
+
+    tracked.write_text("alpha\nbeta updated\ncharlie\n", encoding="utf-8")
+    (repo / "fresh.txt").write_text("one\ntwo\n", encoding="utf-8")
+
+    root = task_diffs._detect_git_repo(repo.resolve())
+    assert task_diffs._detect_git_repo(repo.resolve()) is root
+    plain = task_diffs._git_numstat_rows(root, [])
+
+    task_diffs.configure_git_diff_session("batch")
+    try:
+        session = task_diffs._git_diff_session(root)
+        rows = session.numstat([])
+        assert task_diffs._git_diff_session(root) is session
+    finally:
+        task_diffs.configure_git_diff_session("off")
+
+    assert sorted(plain) == [(2, 0, "fresh.txt"), (2, 1, "tracked.txt")]
+    assert sorted(rows) == sorted(plain)
+
+
+@pytest.mark.parametrize("mode", task_diffs.GIT_DIFF_SESSION_MODES)
+def test_record_diff_counts_untracked_files_in_every_mode(tmp_path, mode):
+    repo = tmp_path / "repo"
+    _init_repo(repo)
+    (repo / ".gitignore").write_text("*.log\n", encoding="utf-8")
+    tracked = repo / "tracked.txt"
+    tracked.write_text("alpha\nbeta\n", encoding="utf-8")
+    subprocess.run(["git", "add", ".gitignore", "tracked.txt"], cwd=repo, check=True)
+    subprocess.run(["git", "commit", "-m", "init"], cwd=repo, check=True)
+
+    tracked.write_text("alpha\nbeta updated\ncharlie\n", encoding="utf-8")
+    (repo / "fresh.txt").write_text("one\ntwo\nthree\n", encoding="utf-8")
+    (repo / "build.log").write_text("ignored\n", encoding="utf-8")
+    _create_task("tsk_modes")
+
+    task_diffs.configure_git_diff_session(mode)
+    try:
+        whole = task_diffs.record_diff("tsk_modes", workspace_root=repo)
+        targeted = task_diffs.record_diff(
+            "tsk_modes", files=["fresh.txt"], workspace_root=repo
+        )
+    finally:
+        task_diffs.configure_git_diff_session("off")
+
+    assert (whole.added, whole.removed) == (5, 1)
+    assert sorted(whole.files) == ["fresh.txt", "tracked.txt"]
+    assert (targeted.added, targeted.removed) == (3, 0)
+    assert targeted.files == ["fresh.txt"]
+    assert task_diffs._load_snapshot_index("tsk_modes") == {}
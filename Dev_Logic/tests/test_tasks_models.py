@@ -17,7 +17,10 @@ from tasks.models import (
     append_run_log,
     append_run_output,
     append_task,
+    export_tasks,
     load_run_log_tail,
+    load_tasks,
+    run_log_writer,
     update_task,
 )
 
@@ -177,6 +180,39 @@ def test_update_task_missing_id_raises():
         update_task("missing", status="closed")
 
 
+def test_update_task_log_keeps_latest_record_and_compacts(monkeypatch):
+    monkeypatch.setattr(task_models, "TASK_LOG_COMPACT_MIN_DEAD", 4)
+    for idx in range(2):
+        append_task(
+            Task(
+                id=f"tsk_{idx}",
+                title="Task",
+                status="open",
+                created_ts=1.0,
+                updated_ts=1.0,
+                session_id="sess",
+                source="terminal",
+            )
+        )
+
+    update_task("tsk_1", status="running", updated_ts=2.0)
+    assert len(read_jsonl(task_models.TASKS_FILE)) == 3
+    assert [task.status for task in load_tasks()] == ["open", "running"]
+
+    for step in range(5):
+        update_task("tsk_0", updated_ts=float(10 + step))
+
+    records = read_jsonl(task_models.TASKS_FILE)
+    assert len(records) < 8
+    tasks = load_tasks()
+    assert [task.id for task in tasks] == ["tsk_0", "tsk_1"]
+    assert tasks[0].updated_ts == 14.0
+    assert tasks[1].status == "running"
+
+    exported = export_tasks(task_models.TASKS_FILE.parent / "export" / "tasks.jsonl")
+    assert [item["id"] for item in read_jsonl(exported)] == ["tsk_0", "tsk_1"]
+
+
 def test_append_event_appends_line():
     event = TaskEvent(ts=5.0, task_id="tsk_1", event="created", by="terminal")
     append_event(event)
@@ -284,3 +320,71 @@ def test_load_run_log_tail_returns_recent_lines(tmp_path):
     tail = load_run_log_tail(task, tmp_path, max_lines=3)
 
     assert tail == lines[-3:]
+
+
+def test_run_log_writer_batches_until_block_exits(tmp_path):
+    task = Task(
+        id="tsk_batch",
+        title="Buffered",
+        status="open",
+        created_ts=1.0,
+        updated_ts=1.0,
+        session_id="sess",
+        source="terminal",
+    )
+    path, _, _ = append_run_log(task, "header", dataset_root=tmp_path)
+    writer = run_log_writer(path)
+
+    with writer.batch():
+        append_run_output(task, stdout="a\nb\n", dataset_root=tmp_path)
+        append_run_log(task, "exit 0", dataset_root=tmp_path, channel="action")
+        assert path.read_text(encoding="utf-8").splitlines() == ["header"]
+
+    assert path.read_text(encoding="utf-8").splitlines() == [
+        "header",
+        "[stdout] a",
+        "[stdout] b",
+        "[action] exit 0",
+    ]
+
+
+def test_run_log_writer_rotates_to_gzip(tmp_path, monkeypatch):
+    import gzip
+
+    monkeypatch.setattr(task_models, "RUN_LOG_ROTATE_BYTES", 64)
+    task = Task(
+        id="tsk_rotate",
+        title="Rotate",
+        status="open",
+        created_ts=1.0,
+        updated_ts=1.0,
+        session_id="sess",
+        source="terminal",
+    )
+    path, _, _ = append_run_log(task, ["x" * 80], dataset_root=tmp_path)
+    append_run_log(task, "fresh", dataset_root=tmp_path)
+
+    rotated = path.with_name(path.name + ".1.gz")
+    assert gzip.decompress(rotated.read_bytes()).decode("utf-8") == "x" * 80 + "\n"
+    assert path.read_text(encoding="utf-8") == "fresh\n"
+
+
+def test_load_run_log_tail_reads_backwards_across_blocks(tmp_path):
+    run_rel = "runs/tsk_big/run.log"
+    task = Task(
+        id="tsk_big",
+        title="Big log",
+        status="open",
+        created_ts=1.0,
+        updated_ts=1.0,
+        session_id="sess",
+        source="terminal",
+        run_log_path=run_rel,
+    )
+    run_path = tmp_path / Path(run_rel)
+    run_path.parent.mkdir(parents=True, exist_ok=True)
+    lines = [f"line {idx} " + "-" * (idx % 97) for idx in range(5000)]
+    run_path.write_text("\r\n".join(lines) + "\r\n", encoding="utf-8")
+
+    assert load_run_log_tail(task, tmp_path, max_lines=700) == lines[-700:]
+    assert load_run_log_tail(task, tmp_path, max_lines=9000) == lines
@@ -0,0 +1,56 @@
+import token_budget
+
+
+def _word_counter(calls):
+    def _count(text, encoding):
+        calls.append(text)
+        return len(text.split())
+
+    return _count
+
+
+def test_count_tokens_caches_by_content(monkeypatch):
+    calls = []
+    monkeypatch.setattr(token_budget, "_count_tokens_uncached", _word_counter(calls))
+    monkeypatch.setattr(token_budget, "_TOKEN_CACHE", token_budget.OrderedDict())
+
+    assert token_budget.count_tokens("alpha beta gamma") == 3
+    assert token_budget.count_tokens("alpha beta " + "gamma") == 3
+    assert token_budget.count_tokens("delta") == 1
+    assert calls == ["alpha beta gamma", "delta"]
+
+
+def test_pack_by_priority_stops_context_at_first_miss(monkeypatch):
+    monkeypatch.setattr(token_budget, "count_tokens", lambda text, model=None: len(text))
+
+    candidates = [
+        ("context", "aaaa"),
+        ("context", "bbbbbbbbbb"),
+        ("context", "cc"),
+        ("reference", "dddddddd"),
+        ("reference", "eee"),
+    ]
+    flags, used = token_budget.pack_by_priority(
+        candidates, 9, contiguous=("context",)
+    )
+
+    assert flags == [True, False, False, False, True]
+    assert used == 7
+
+
+def test_count_tokens_capped_stops_early_on_large_text(monkeypatch):
+    chunks = []
+
+    def _count(text, model=None):
+        chunks.append(text)
+        return len(text.split())
+
+    monkeypatch.setattr(token_budget, "count_tokens", _count)
+    line = "word " * 20 + "\n"
+    text = line * 20_000
+
+    total = token_budget.count_tokens_capped(text, 100)
+
+    assert total > 100
+    assert len(chunks) == 1
+    assert all(chunk.endswith("\n") for chunk in chunks)
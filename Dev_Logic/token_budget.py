@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import hashlib
 import math
 import re
+import threading
+from collections import OrderedDict
 from functools import lru_cache
-from typing import Dict
+from typing import Any, Collection, Dict, List, Sequence, Set, Tuple
 
 try:
     import tiktoken  # type: ignore
@@ -34,6 +37,13 @@ _MODEL_TOKEN_LIMITS: Dict[str, int] = {
 _DEFAULT_MAX_TOKENS = 8192
 _WORD_RE = re.compile(r"\S+")
 
+TOKEN_CACHE_SIZE = 4096
+"""Distinct texts whose token counts are remembered (LRU, keyed by hash)."""
+
+_TOKEN_COUNT_CHUNK = 65_536
+_TOKEN_CACHE: "OrderedDict[Tuple[str, bytes], int]" = OrderedDict()
+_TOKEN_CACHE_LOCK = threading.Lock()
+
 
 @lru_cache(maxsize=32)
 def _encoding_for_model(model: str | None):  # pragma: no cover - simple cache
@@ -75,12 +85,35 @@ def prompt_token_budget(model: str | None, headroom_pct: int) -> int:
 
 
 def count_tokens(text: str, model: str | None = None) -> int:
-    """Count tokens for ``text`` using an optional tokenizer fallback."""
+    """Count tokens for ``text`` using an optional tokenizer fallback.
+
+    Counts are memoised in a content-hash LRU per tokenizer, so conversation
+    lines and reference payloads are only tokenised once across sends.
+    """
 
     if not text:
         return 0
     encoding = _encoding_for_model(model)
-    if encoding:
+    digest = hashlib.blake2b(
+        text.encode("utf-8", "surrogatepass"), digest_size=16
+    ).digest()
+    name = str(getattr(encoding, "name", "")) if encoding is not None else ""
+    key = (name, digest)
+    with _TOKEN_CACHE_LOCK:
+        cached = _TOKEN_CACHE.get(key)
+        if cached is not None:
+            _TOKEN_CACHE.move_to_end(key)
+            return cached
+    count = _count_tokens_uncached(text, encoding)
+    with _TOKEN_CACHE_LOCK:
+        _TOKEN_CACHE[key] = count
+        while len(_TOKEN_CACHE) > TOKEN_CACHE_SIZE:
+            _TOKEN_CACHE.popitem(last=False)
+    return count
+
+
+def _count_tokens_uncached(text: str, encoding: Any) -> int:
+    if encoding is not None:
         try:
             return len(encoding.encode(text))
         except Exception:
@@ -90,3 +123,63 @@ def count_tokens(text: str, model: str | None = None) -> int:
         return len(tokens)
     # Fallback heuristic when whitespace tokenisation fails (e.g. CJK text).
     return max(1, math.ceil(len(text) / 4))
+
+
+def count_tokens_capped(text: str, cap: int, model: str | None = None) -> int:
+    """Count tokens for ``text``, stopping early once the total exceeds ``cap``.
+
+    Large texts are counted in line-aligned chunks, so a multi-megabyte
+    payload that cannot fit is rejected after tokenising only about ``cap``
+    tokens' worth of it.  Any result above ``cap`` is a lower bound.
+    """
+
+    if len(text) <= _TOKEN_COUNT_CHUNK:
+        return count_tokens(text, model)
+    total = 0
+    start = 0
+    while start < len(text):
+        end = min(len(text), start + _TOKEN_COUNT_CHUNK)
+        if end < len(text):
+            newline = text.rfind("\n", start, end)
+            if newline > start:
+                end = newline + 1
+        total += count_tokens(text[start:end], model)
+        if total > cap:
+            return total
+        start = end
+    return total
+
+
+def pack_by_priority(
+    candidates: Sequence[Tuple[str, str]],
+    budget: int,
+    model: str | None = None,
+    *,
+    contiguous: Collection[str] = (),
+) -> Tuple[List[bool], int]:
+    """Greedily admit ``(group, text)`` candidates into ``budget`` by priority.
+
+    Each text is counted against the remaining budget only, so oversized
+    items stop tokenising early.  Groups named in ``contiguous`` admit no
+    further items after their first miss.  Returns one inclusion flag per
+    candidate and the tokens used.
+    """
+
+    remaining = max(0, int(budget))
+    closed: Set[str] = set()
+    flags: List[bool] = []
+    used = 0
+    for group, text in candidates:
+        if group in closed or (remaining <= 0 and text):
+            flags.append(False)
+            continue
+        tokens = count_tokens_capped(text, remaining, model)
+        if tokens <= remaining:
+            flags.append(True)
+            remaining -= tokens
+            used += tokens
+        else:
+            flags.append(False)
+            if group in contiguous:
+                closed.add(group)
+    return flags, used
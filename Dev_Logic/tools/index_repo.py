@@ -33,6 +33,12 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Skip embedding generation (querying will be disabled).",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for reading and segmenting files (0 uses every core; default: 1).",
+    )
 
     subparsers = parser.add_subparsers(dest="command")
 
@@ -68,6 +74,7 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         repo_root=repo_root,
         data_root=data_root,
         enable_embeddings=not args.no_embed,
+        workers=args.workers,
     )
 
     command = args.command or "rebuild"
@@ -77,6 +84,8 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         payload = {
             "files_indexed": summary.get("files_indexed", 0),
             "segments": summary.get("segments", 0),
+            "files_changed": summary.get("files_changed", 0),
+            "files_removed": summary.get("files_removed", 0),
             "timestamp": summary.get("timestamp"),
             "index_path": str(summary.get("index_path")),
         }
@@ -89,9 +89,11 @@ def _load_task_updates(tasks_file: Path) -> Mapping[str, float]:
     updates: MutableMapping[str, float] = {}
     if not tasks_file.exists():
         return updates
+    # tasks.jsonl is an append-only change log; the last line per id wins.
+    latest: Dict[str, Mapping[str, object]] = {}
     try:
         with tasks_file.open("r", encoding="utf-8") as handle:
-            for line in handle:
+            for line_no, line in enumerate(handle):
                 line = line.strip()
                 if not line:
                     continue
@@ -99,13 +101,16 @@ def _load_task_updates(tasks_file: Path) -> Mapping[str, float]:
                     payload = json.loads(line)
                 except json.JSONDecodeError:
                     continue
-                ts = float(payload.get("updated_ts") or payload.get("created_ts") or 0.0)
-                for file_path in payload.get("files", []) or []:
-                    key = _normalize_repo_path(file_path)
-                    current = updates.get(key, 0.0)
-                    updates[key] = max(current, ts)
+                if isinstance(payload, dict):
+                    latest[str(payload.get("id") or f"#{line_no}")] = payload
     except OSError:
         return updates
+    for payload in latest.values():
+        ts = float(payload.get("updated_ts") or payload.get("created_ts") or 0.0)
+        for file_path in payload.get("files", []) or []:
+            key = _normalize_repo_path(file_path)
+            current = updates.get(key, 0.0)
+            updates[key] = max(current, ts)
     return updates
 
 